@@ -0,0 +1,393 @@
+"""
+Benchmark suite for the Friday SDK hot paths.
+
+The SDK is benchmarked against the deterministic local fake backend, so the numbers measure Friday and not the
+network: per-call overhead of `generate_content` and `send_chat_message` over the raw backend call, `get_chat_history`
+as the history grows, `GoogleAIModel` and `Friday` construction, logger throughput, semantic cache lookups and
+concurrent session scaling.
+
+Results are stored as JSON and compared against a baseline. The benchmark fails when the median of a benchmark
+regresses by more than its threshold.
+
+Usage:
+    python benchmarks/sdk_benchmarks.py [--runs 50] [--only PATTERN] [--output results.json]
+        [--baseline baseline.json] [--save-baseline]
+"""
+
+# Standard Library
+import os
+import io
+import sys
+import json
+import time
+import fnmatch
+import asyncio
+import logging
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import contextlib
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+# Allowed regression of the median over the baseline, per benchmark name pattern. The first match applies.
+REGRESSION_THRESHOLDS = {
+    "concurrent_sessions.*": 0.5,
+    "*construction": 0.5,
+    "*": 0.25,
+}
+
+# Chat history sizes in turns for `get_chat_history`
+HISTORY_TURNS = [10, 100, 1000, 5000]
+
+# Number of concurrent chat sessions, and the time to first token of the fake backend in seconds
+CONCURRENT_SESSIONS = [1, 10, 100, 500]
+CONCURRENT_TTFT_SECONDS = 0.05
+
+
+def _summary(samples: list[float], unit: str = "ms") -> dict[str, float | int | str]:
+    """
+    Summarize the samples of a benchmark.
+
+    Args:
+        samples (list[float]): Samples of the benchmark.
+        unit (str, optional): Unit of the samples. Defaults to "ms".
+
+    Returns:
+        dict[str, float | int | str]: Median, 95th percentile, mean, min, number of runs and unit of the samples.
+    """
+    ordered = sorted(samples)
+    return {
+        "median": statistics.median(ordered),
+        "p95": ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))],
+        "mean": statistics.fmean(ordered),
+        "min": ordered[0],
+        "runs": len(ordered),
+        "unit": unit,
+    }
+
+
+def _time_ms(function: Callable[[], object], runs: int) -> list[float]:
+    """
+    Time the calls of a function after a warm up call.
+
+    Args:
+        function (Callable[[], object]): Function to time.
+        runs (int): Number of timed calls.
+
+    Returns:
+        list[float]: Wall time of every call in milliseconds.
+    """
+    function()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _overhead(sdk: list[float], backend: list[float]) -> dict[str, float | int | str]:
+    """
+    Summarize the SDK overhead over the raw backend call, quantile by quantile.
+
+    Args:
+        sdk (list[float]): Wall times of the SDK calls in milliseconds.
+        backend (list[float]): Wall times of the raw backend calls in milliseconds.
+
+    Returns:
+        dict[str, float | int | str]: Summary of the overhead.
+    """
+    return _summary([max(call - raw, 0.0) for call, raw in zip(sorted(sdk), sorted(backend))])
+
+
+def _chat_history(turns: int) -> list:
+    """
+    Build a chat history of user and model turns.
+
+    Args:
+        turns (int): Number of turns, a user message and a model reply each.
+
+    Returns:
+        list[protos.Content]: Chat history.
+    """
+    from google.generativeai import protos
+
+    history = []
+    for turn in range(turns):
+        history.append(protos.Content(role="user", parts=[protos.Part(text=f"Question {turn} about the weather?")]))
+        history.append(protos.Content(role="model", parts=[protos.Part(text=f"Answer {turn}: it is sunny today.")]))
+    return history
+
+
+def bench_generation(runs: int) -> dict[str, dict]:
+    """Benchmark the SDK per-call overhead of `generate_content` and `send_chat_message` over the raw backend call."""
+    from friday.sdk.fake import FridayFakeBackend
+    from friday.sdk.model import GoogleAIModel
+    from friday.sdk.generation import GoogleAIGeneration
+
+    ai_model = GoogleAIModel(system_instruction="You are Friday.", fake_backend=FridayFakeBackend())
+    generation = GoogleAIGeneration(genai_model=ai_model)
+    config = generation.generation_config()
+    history = _chat_history(10)
+
+    backend = _time_ms(lambda: ai_model.model.generate_content("Hello Friday!", generation_config=config), runs)
+    sdk = _time_ms(lambda: generation.generate_content("Hello Friday!", generation_config=config), runs)
+    chat_backend = _time_ms(
+        lambda: ai_model.model.start_chat(history=list(history)).send_message("Hello!", generation_config=config), runs
+    )
+    chat_sdk = _time_ms(
+        lambda: generation.send_chat_message(generation.start_new_chat(list(history)), "Hello!", config), runs
+    )
+    return {
+        "generate_content.backend": _summary(backend),
+        "generate_content.sdk": _summary(sdk),
+        "generate_content.overhead": _overhead(sdk, backend),
+        "send_chat_message.backend": _summary(chat_backend),
+        "send_chat_message.sdk": _summary(chat_sdk),
+        "send_chat_message.overhead": _overhead(chat_sdk, chat_backend),
+    }
+
+
+def bench_chat_history(runs: int) -> dict[str, dict]:
+    """Benchmark `get_chat_history` as the chat history grows."""
+    from friday.sdk.fake import FridayFakeBackend
+    from friday.sdk.model import GoogleAIModel
+    from friday.sdk.generation import GoogleAIGeneration
+
+    generation = GoogleAIGeneration(genai_model=GoogleAIModel(fake_backend=FridayFakeBackend()))
+    results = {}
+    for turns in HISTORY_TURNS:
+        chat = generation.start_new_chat(_chat_history(turns))
+        results[f"get_chat_history.{turns}_turns"] = _summary(
+            _time_ms(lambda: generation.get_chat_history(chat), max(runs * 10 // turns, 5))
+        )
+    return results
+
+
+def bench_construction(runs: int) -> dict[str, dict]:
+    """Benchmark `GoogleAIModel` and `Friday` construction on the fake backend."""
+    from friday.main import Friday
+    from friday.sdk.fake import FridayFakeBackend
+    from friday.sdk.model import GoogleAIModel
+
+    backend = FridayFakeBackend()
+    with contextlib.redirect_stderr(io.StringIO()):
+        return {
+            "google_ai_model.construction": _summary(
+                _time_ms(lambda: GoogleAIModel(system_instruction="You are Friday.", fake_backend=backend), runs)
+            ),
+            "friday.construction": _summary(_time_ms(Friday, min(runs, 20))),
+        }
+
+
+def bench_logger(runs: int) -> dict[str, dict]:
+    """
+    Benchmark the throughput of the Friday logger, with the console output discarded: as seen by the caller, and until
+    the records are written.
+    """
+    from friday.utilities.logger import CustomLogger
+
+    messages = 1000
+    with contextlib.redirect_stderr(open(os.devnull, "w")):
+        logger = CustomLogger(name="friday-benchmark")
+
+    def log() -> None:
+        for index in range(messages):
+            logger.info("Benchmark message %d of %d", index, messages)
+
+    def log_and_flush() -> None:
+        log()
+        CustomLogger.flush()
+
+    caller = _time_ms(log, max(runs // 10, 3))
+    CustomLogger.flush()
+    written = _time_ms(log_and_flush, max(runs // 10, 3))
+    return {
+        "logger.throughput": _summary([messages / (sample / 1000) for sample in caller], unit="messages/s"),
+        "logger.written_throughput": _summary([messages / (sample / 1000) for sample in written], unit="messages/s"),
+    }
+
+
+def bench_semantic_cache(runs: int) -> dict[str, dict]:
+    """Benchmark semantic cache lookups among 1000 cached prompts: a repeated prompt, and a new prompt to embed."""
+    from google.generativeai import protos
+    from google.generativeai.types.generation_types import GenerateContentResponse
+    from friday.sdk.semantic_cache import FridayHashingEmbedder, FridaySemanticCache
+
+    cache = FridaySemanticCache(embedder=FridayHashingEmbedder(), max_entries=1000)
+    scope = cache.make_scope("models/fake", None, None)
+    response = GenerateContentResponse.from_response(protos.GenerateContentResponse())
+    for index in range(1000):
+        cache.put(scope, f"Question number {index} about topic {index % 37}?", response)
+    prompts = (f"Another question {index} about topic {index % 41}?" for index in range(10**9))
+    return {
+        "semantic_cache.repeated_lookup": _summary(
+            _time_ms(lambda: cache.get(scope, "Question number 7 about topic 7?"), runs)
+        ),
+        "semantic_cache.new_lookup": _summary(_time_ms(lambda: cache.get(scope, next(prompts)), runs)),
+    }
+
+
+def bench_concurrent_sessions(runs: int) -> dict[str, dict]:
+    """Benchmark the wall time of concurrent chat sessions on one event loop, each sending one message."""
+    from friday.sdk.fake import FridayFakeBackend
+    from friday.sdk.model import GoogleAIModel
+    from friday.sdk.async_generation import AsyncGoogleAIGeneration
+
+    backend = FridayFakeBackend(ttft_seconds=CONCURRENT_TTFT_SECONDS, inter_token_seconds=0.0005)
+    generation = AsyncGoogleAIGeneration(genai_model=GoogleAIModel(fake_backend=backend))
+
+    async def chat(index: int) -> None:
+        stream = await generation.send_chat_message_stream(chat=generation.start_new_chat(), message=f"Hi {index}")
+        await stream.resolve()
+
+    async def sessions(count: int) -> None:
+        await asyncio.gather(*(chat(index) for index in range(count)))
+
+    return {
+        f"concurrent_sessions.{count}": _summary(
+            _time_ms(lambda: asyncio.run(sessions(count)), max(runs // 10, 3))
+        )
+        for count in CONCURRENT_SESSIONS
+    }
+
+
+BENCHMARKS: dict[str, Callable[[int], dict[str, dict]]] = {
+    "generation": bench_generation,
+    "chat_history": bench_chat_history,
+    "construction": bench_construction,
+    "logger": bench_logger,
+    "semantic_cache": bench_semantic_cache,
+    "concurrent_sessions": bench_concurrent_sessions,
+}
+
+
+def _metadata() -> dict[str, str]:
+    """Return the metadata of the run: time, git commit, Python version and platform."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def threshold(name: str) -> float:
+    """
+    Return the allowed regression of a benchmark.
+
+    Args:
+        name (str): Benchmark name.
+
+    Returns:
+        float: Allowed regression of the median as a ratio of the baseline.
+    """
+    return next(value for pattern, value in REGRESSION_THRESHOLDS.items() if fnmatch.fnmatch(name, pattern))
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict]) -> list[str]:
+    """
+    Compare results against a baseline and print the change of every benchmark.
+
+    Throughput benchmarks (per second units) regress when they decrease, time benchmarks when they increase.
+
+    Args:
+        results (dict[str, dict]): Benchmark results.
+        baseline (dict[str, dict]): Baseline benchmark results.
+
+    Returns:
+        list[str]: Regressions beyond the threshold of their benchmark.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline or not baseline[name]["median"]:
+            print(f"{name:<36} {result['median']:12.3f} {result['unit']:<11} (no baseline)")
+            continue
+        change = result["median"] / baseline[name]["median"] - 1
+        regression = -change if result["unit"].endswith("/s") else change
+        status = "REGRESSION" if regression > threshold(name) else "OK"
+        print(f"{name:<36} {result['median']:12.3f} {result['unit']:<11} {change:+8.1%}  {status}")
+        if status != "OK":
+            regressions.append(f"{name} regressed by {regression:.1%}, threshold is {threshold(name):.0%}")
+    return regressions
+
+
+def run(runs: int, only: Optional[str] = None) -> dict[str, dict]:
+    """
+    Run the benchmarks on the fake backend with an isolated Friday cache.
+
+    Args:
+        runs (int): Number of runs per benchmark.
+        only (Optional[str]): Glob pattern of the benchmark groups to run. Defaults to all.
+
+    Returns:
+        dict[str, dict]: Summary of every benchmark.
+    """
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ.update(FRIDAY_CACHE_DIR=cache_dir, FRIDAY_LOG_DIR=cache_dir, FRIDAY_FAKE_BACKEND="1")
+        logging.getLogger("friday").disabled = True
+        for group, benchmark in BENCHMARKS.items():
+            if only and not fnmatch.fnmatch(group, only):
+                continue
+            print(f"Running {group}...", file=sys.stderr)
+            results.update(benchmark(runs))
+    return results
+
+
+def main() -> int:
+    """
+    Run the benchmark suite.
+
+    Returns:
+        int: Exit code. 1 if a benchmark regressed beyond its threshold over the baseline.
+    """
+    parser = argparse.ArgumentParser(description="Friday SDK hot path benchmarks.")
+    parser.add_argument("--runs", type=int, default=50, help="Number of runs per benchmark (default: 50).")
+    parser.add_argument("--only", help="Glob pattern of the benchmark groups to run, e.g. 'generation'.")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file.")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=REPO_ROOT / ".friday_cache" / "benchmarks" / "baseline.json",
+        help="Baseline results to compare against (default: .friday_cache/benchmarks/baseline.json).",
+    )
+    parser.add_argument("--save-baseline", action="store_true", help="Save the results as the new baseline.")
+    args = parser.parse_args()
+
+    report = {"metadata": _metadata(), "results": run(args.runs, args.only)}
+
+    baseline = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+    regressions = compare(report["results"], baseline)
+
+    outputs = [args.output] if args.output else []
+    if args.save_baseline:
+        outputs.append(args.baseline)
+    for output in outputs:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Results written to {output}")
+
+    for regression in regressions:
+        print(f"FAIL: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
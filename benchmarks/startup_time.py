@@ -0,0 +1,133 @@
+"""
+Startup time benchmark for Friday CLI and GUI.
+
+Every measurement runs in a fresh interpreter. Import times come from `python -X importtime`, the CLI time is the wall
+time of `friday_cli --help`. The benchmark fails when a measurement exceeds its budget, or when a module which must be
+imported lazily (the google.generativeai SDK stack) is imported at startup.
+
+Usage:
+    python benchmarks/startup_time.py [--runs 5]
+"""
+
+# Standard Library
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+import importlib.util
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# Startup time budgets in milliseconds
+STARTUP_BUDGET_MS = {
+    "import friday.main": 150,
+    "import friday.ui.main": 400,
+    "friday_cli --help": 500,
+}
+
+# Modules which must not be imported at startup
+LAZY_MODULES = ["google.generativeai"]
+
+
+def _run(args: list[str]) -> subprocess.CompletedProcess:
+    """
+    Run a command in a fresh interpreter from the repository root.
+
+    Args:
+        args (list[str]): Arguments of the Python interpreter.
+
+    Returns:
+        subprocess.CompletedProcess: Completed process.
+    """
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    return subprocess.run(
+        [sys.executable, *args], cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def measure_import(module: str, runs: int) -> tuple[float, list[str]]:
+    """
+    Measure the cumulative import time of a module with `python -X importtime`.
+
+    Args:
+        module (str): Module to import.
+        runs (int): Number of runs.
+
+    Returns:
+        tuple[float, list[str]]: Median import time in milliseconds and the lazy modules imported at startup.
+    """
+    timings = []
+    imported = set()
+    for _ in range(runs):
+        stderr = _run(["-X", "importtime", "-c", f"import {module}"]).stderr
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            name = name.strip()
+            imported.add(name)
+            if name == module:
+                timings.append(int(cumulative) / 1000)
+
+    return statistics.median(timings), [module for module in LAZY_MODULES if module in imported]
+
+
+def measure_command(args: list[str], runs: int) -> float:
+    """
+    Measure the wall time of a command run in a fresh interpreter.
+
+    Args:
+        args (list[str]): Arguments of the Python interpreter.
+        runs (int): Number of runs.
+
+    Returns:
+        float: Median wall time in milliseconds.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        _run(args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    """
+    Run the startup time benchmark.
+
+    Returns:
+        int: Exit code. 1 if a budget is exceeded or a lazy module is imported at startup.
+    """
+    parser = argparse.ArgumentParser(description="Friday startup time benchmark.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs per measurement (default: 5).")
+    args = parser.parse_args()
+
+    results: dict[str, float] = {}
+    failures: list[str] = []
+
+    modules = ["friday.main"]
+    if importlib.util.find_spec("customtkinter"):
+        modules.append("friday.ui.main")
+    for module in modules:
+        results[f"import {module}"], eager_modules = measure_import(module, args.runs)
+        failures.extend(f"{module} imports {eager_module} at startup" for eager_module in eager_modules)
+    results["friday_cli --help"] = measure_command(["-m", "friday.main", "--help"], args.runs)
+
+    for name, elapsed in results.items():
+        budget = STARTUP_BUDGET_MS[name]
+        status = "OK" if elapsed <= budget else "OVER BUDGET"
+        print(f"{name:<25} {elapsed:8.1f} ms  (budget {budget} ms)  {status}")
+        if elapsed > budget:
+            failures.append(f"{name} took {elapsed:.1f} ms, budget is {budget} ms")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
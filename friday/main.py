@@ -1,8 +1,19 @@
 """Friday - AI Personal Assistant. Main module."""
 
+from __future__ import annotations
+
 # Standard Library
+import os
+import sys
+import json
+import time
+import argparse
+import functools
+import threading
 from pathlib import Path
-from typing import Literal
+from contextlib import contextmanager
+from concurrent.futures import Future
+from typing import IO, TYPE_CHECKING, Callable, Iterator, Literal, Optional, Sequence
 
 # Third Party Library
 from dotenv import load_dotenv
@@ -11,8 +22,18 @@ from colorama import init, Fore, Style
 # Project Library
 from friday.utilities.logger import CustomLogger
 from friday.utilities.exceptions import FridayBaseException
-from friday.sdk.model import GoogleAIModel, FridayModelCreationError
-from friday.sdk.generation import GoogleAIGeneration, FridayGenerationError
+
+# Type hints
+# The SDKs import google.generativeai (protobuf and gRPC stack), so they are imported on first use to keep the
+# startup fast. See benchmarks/startup_time.py for the startup time budget.
+if TYPE_CHECKING:
+    from friday.sdk.model import GoogleAIModel
+    from friday.sdk.generation import GoogleAIGeneration, FridayBatchUsage, FridayStreamResponse
+    from friday.sdk.history import FridayHistoryManager
+    from friday.sdk.sessions import FridaySessionStore
+    from friday.sdk.search import FridaySearchIndex
+    from friday.sdk.memory import FridayMemory
+    from friday.sdk.hedging import FridayHedgingPolicy
 
 
 # Load Environment Variables
@@ -23,20 +44,71 @@ CHAT_USER_FOREGROUND_COLOR = Fore.MAGENTA
 CHAT_FRIDAY_FOREGROUND_COLOR = Fore.CYAN
 CHAT_ERROR_FOREGROUND_COLOR = Fore.RED
 CHAT_COLOR_STYLE = Style.BRIGHT
+SYSTEM_MESSAGE_FILE = Path(__file__).parent / "assets" / "system_message.yaml"
+GREETING_PROMPT = "Who are you?"
 
 
 class FridayInitializationError(FridayBaseException):
     """Friday Initialization Error."""
 
 
+@functools.cache
+def static_message(key: Literal["initial_message", "farewell_message"]) -> str:
+    """
+    Read a static message of Friday from the system message, without creating Friday.
+
+    Args:
+        key (Literal["initial_message", "farewell_message"]): Top level key of the message in the system message.
+
+    Returns:
+        str: Static message, or an empty string when missing.
+    """
+    with open(SYSTEM_MESSAGE_FILE, "r") as file:
+        for line in file:
+            if line.startswith(f"{key}:"):
+                value = line.split(":", 1)[1].strip()
+                return json.loads(value) if value.startswith('"') else value.strip("'")
+    return ""
+
+
+@contextmanager
+def startup_phase(phase: str) -> Iterator[None]:
+    """
+    Time a phase of the startup of Friday in the log file. The timings are not written to the console, where they would
+    garble the input prompt drawn meanwhile.
+
+    Args:
+        phase (str): Name of the startup phase.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        CustomLogger(name="friday").info(
+            "Startup phase %s took %.1f ms.", phase, (time.perf_counter() - start) * 1000, extra={"console": False}
+        )
+
+
 class Friday:
     """Friday - AI Personal Assistant."""
 
     def __init__(self):
         """Initialize Friday AI Personal Assistant."""
+        from friday.sdk.sessions import FridaySessionStore
+        from friday.sdk.search import FridaySearchIndex
+
         self.logger = CustomLogger(name="friday")
-        self.google_ai_model = self._setup_google_ai_model()
-        self.google_ai_generation = self._setup_google_ai_generation()
+        with startup_phase("sessions"):
+            self.session_store: FridaySessionStore = FridaySessionStore()
+            # Index the turns as they are persisted, so the chat history is searchable with `friday_cli --search`
+            self.search_index: FridaySearchIndex = FridaySearchIndex(self.session_store)
+            self.session_store.on_append = self.search_index.index_session
+        with startup_phase("model"):
+            self.google_ai_model = self._setup_google_ai_model()
+        with startup_phase("generation"):
+            self.google_ai_generation = self._setup_google_ai_generation()
+        with startup_phase("memory"):
+            self.memory: Optional[FridayMemory] = self._setup_memory()
 
     def _system_instruction(self) -> str:
         """
@@ -45,8 +117,7 @@ class Friday:
         Returns:
             str: System instruction for Friday.
         """
-        system_instruction_file = Path(__file__).parent / "assets" / "system_message.yaml"
-        with open(system_instruction_file, "r") as file:
+        with open(SYSTEM_MESSAGE_FILE, "r") as file:
             system_instruction = file.read()
 
         return system_instruction
@@ -58,8 +129,14 @@ class Friday:
         Returns:
             GoogleAIModel: Google Generative AI Model for Friday.
         """
+        from friday.sdk.model import GoogleAIModel, FridayModelCreationError
+
         try:
-            return GoogleAIModel(model_name="gemini-1.5-flash", system_instruction=self._system_instruction())
+            return GoogleAIModel(
+                model_name="gemini-1.5-flash",
+                system_instruction=self._system_instruction(),
+                context_cache=os.getenv("FRIDAY_CONTEXT_CACHE", "").lower() in ("1", "true", "yes"),
+            )
         except FridayModelCreationError as err:
             self.logger.error("Failed to create Google AI Model for Friday.")
             raise FridayInitializationError(
@@ -73,14 +150,225 @@ class Friday:
         Returns:
             GoogleAIGeneration: Google Generative AI Generation for Friday.
         """
+        from friday.sdk.cache import FridayResponseCache
+        from friday.sdk.router import FridayModelRouter
+        from friday.sdk.rate_limit import FridayRateLimiter
+        from friday.sdk.semantic_cache import FridaySemanticCache
+        from friday.sdk.tokens import FridayTokenEstimator
+        from friday.sdk.generation import GoogleAIGeneration, FridayGenerationError
+
+        # The token estimator calibration is persisted across runs, unless fitted against the fake backend
+        fake = self.google_ai_model.fake_backend is not None
         try:
-            return GoogleAIGeneration(self.google_ai_model)
+            return GoogleAIGeneration(
+                self.google_ai_model,
+                cache=FridayResponseCache(),
+                token_estimator=FridayTokenEstimator.load(None if fake else FridayTokenEstimator.default_path()),
+                rate_limiter=FridayRateLimiter.from_env(self.google_ai_model.model_name),
+                semantic_cache=FridaySemanticCache.from_env(fake=fake),
+                hedging=self._setup_hedging(),
+                router=FridayModelRouter.from_env(self.google_ai_model),
+            )
         except FridayGenerationError as err:
             self.logger.error("Failed to create Google AI Generation for Friday.")
             raise FridayInitializationError(
                 message="Failed to create Google AI Generation for Friday...", logger=self.logger
             ) from err
 
+    def _setup_hedging(self) -> Optional[FridayHedgingPolicy]:
+        """
+        Setup the hedging of the slow requests, when enabled with `FRIDAY_HEDGING`. The hedges are sent to
+        `FRIDAY_HEDGING_FALLBACK_MODEL` when set, otherwise to the same model.
+
+        Returns:
+            Optional[FridayHedgingPolicy]: Hedging policy, or None when disabled.
+        """
+        from friday.sdk.model import GoogleAIModel
+        from friday.sdk.hedging import FridayHedgingPolicy
+
+        fallback_model_name = os.getenv("FRIDAY_HEDGING_FALLBACK_MODEL")
+        if not fallback_model_name:
+            return FridayHedgingPolicy.from_env()
+        return FridayHedgingPolicy.from_env(
+            fallback_model=GoogleAIModel(
+                model_name=fallback_model_name,
+                system_instruction=self.google_ai_model.system_instruction,
+                fake_backend=self.google_ai_model.fake_backend,
+            )
+        )
+
+    def _setup_memory(self) -> Optional[FridayMemory]:
+        """
+        Setup the long-term memory of Friday, when enabled with `FRIDAY_MEMORY`.
+
+        Returns:
+            Optional[FridayMemory]: Long-term memory of Friday, or None when disabled.
+        """
+        from friday.sdk.memory import FridayMemory
+
+        return FridayMemory.from_env(self.search_index, fake=self.google_ai_model.fake_backend is not None)
+
+    def start_new_chat(self) -> FridayHistoryManager:
+        """
+        Start a new chat session with Friday. The chat history is kept within a token budget by summarizing the older
+        turns, or with the long-term memory by sending the relevant past turns with the recent ones, and persisted to a
+        new session log.
+
+        Returns:
+            FridayHistoryManager: Chat session with Friday with a managed history.
+        """
+        from friday.sdk.history import FridayHistoryManager
+
+        return FridayHistoryManager(
+            self.google_ai_generation, session=self.session_store.session(), memory=self.memory
+        )
+
+    def resume_chat(self, session_id: Optional[str] = None) -> FridayHistoryManager:
+        """
+        Resume a persisted chat session with Friday.
+
+        Args:
+            session_id (Optional[str]): Identifier of the session to resume. Defaults to the most recent session.
+
+        Returns:
+            FridayHistoryManager: Resumed chat session with Friday with a managed history.
+
+        Raises:
+            FridayInitializationError: No session to resume.
+        """
+        from friday.sdk.history import FridayHistoryManager
+
+        session_id = session_id or self.session_store.latest_session_id()
+        if session_id is None or session_id not in self.session_store.list_sessions():
+            raise FridayInitializationError(message=f"No chat session to resume: {session_id}...", logger=self.logger)
+        return FridayHistoryManager.resume(
+            self.google_ai_generation, self.session_store.session(session_id), memory=self.memory
+        )
+
+
+class FridayStartup:
+    """
+    Overlapped startup of Friday.
+
+    Friday is created and its greeting generated on a background thread, so that the prompt is available right away
+    and the time to interactive includes no network round trip. The static `initial_message` of the system message is
+    served as the greeting until the model greeting is ready, and whenever it fails. Every phase is timed in the log
+    file.
+
+    Attributes:
+        initial_message (str): Static greeting of Friday.
+        greeting_prompt (Optional[str]): Prompt of the model greeting. None when no greeting is generated.
+    """
+
+    def __init__(
+        self, factory: Callable[[], Friday] = Friday, greeting_prompt: Optional[str] = GREETING_PROMPT
+    ) -> None:
+        """
+        Start Friday in the background.
+
+        Args:
+            factory (Callable[[], Friday], optional): Factory creating Friday. Defaults to `Friday`.
+            greeting_prompt (Optional[str], optional): Prompt of the model greeting, generated once Friday is created.
+                Defaults to "Who are you?". None to skip the model greeting, e.g. in the CLI.
+        """
+        self.logger = CustomLogger(name="friday")
+        self.initial_message = static_message("initial_message")
+        self.greeting_prompt = greeting_prompt
+
+        self.__started_at = time.perf_counter()
+        self.__friday: Future[Friday] = Future()
+        self.__greeting: Future[str] = Future()
+        threading.Thread(target=self.__start, args=(factory,), name="friday-startup", daemon=True).start()
+
+    def __start(self, factory: Callable[[], Friday]) -> None:
+        """
+        Create Friday, then generate its greeting. Runs on the startup thread.
+
+        Args:
+            factory (Callable[[], Friday]): Factory creating Friday.
+        """
+        try:
+            with startup_phase("friday"):
+                friday = factory()
+        except BaseException as err:
+            self.__friday.set_exception(err)
+            self.__greeting.set_result(self.initial_message)
+            return
+        self.__friday.set_result(friday)
+        self.mark("ready")
+
+        if self.greeting_prompt is None:
+            self.__greeting.set_result(self.initial_message)
+            return
+        try:
+            with startup_phase("greeting"):
+                greeting = friday.google_ai_generation.generate_content(prompt=self.greeting_prompt, use_cache=True)
+            self.__greeting.set_result(greeting.response.strip() or self.initial_message)
+        except Exception as err:
+            self.logger.warning("Friday greeting failed, serving the initial message: %s", err)
+            self.__greeting.set_result(self.initial_message)
+
+    def mark(self, milestone: str) -> None:
+        """
+        Log the time from the start to a milestone of the startup, e.g. `interactive`, to the log file only.
+
+        Args:
+            milestone (str): Name of the milestone.
+        """
+        self.logger.info(
+            "Startup %s after %.1f ms.",
+            milestone,
+            (time.perf_counter() - self.__started_at) * 1000,
+            extra={"console": False},
+        )
+
+    @property
+    def ready(self) -> bool:
+        """Friday is created."""
+        return self.__friday.done() and self.__friday.exception() is None
+
+    def friday(self, timeout: Optional[float] = None) -> Friday:
+        """
+        Return Friday, waiting until it is created.
+
+        Args:
+            timeout (Optional[float]): Maximum time to wait in seconds. Defaults to None, waiting until created.
+
+        Returns:
+            Friday: Friday AI Personal Assistant.
+
+        Raises:
+            FridayInitializationError: Friday failed to start.
+            TimeoutError: Friday is not created within the timeout.
+        """
+        return self.__friday.result(timeout)
+
+    def greeting(self, timeout: Optional[float] = 0.0) -> str:
+        """
+        Return the greeting of Friday: the model greeting when ready within the timeout, otherwise the initial message.
+
+        Args:
+            timeout (Optional[float]): Maximum time to wait for the model greeting in seconds. Defaults to 0, not
+                waiting. None to wait until it is ready.
+
+        Returns:
+            str: Greeting of Friday.
+        """
+        try:
+            return self.__greeting.result(timeout)
+        except TimeoutError:
+            return self.initial_message
+
+    def on_greeting(self, callback: Callable[[str], None]) -> None:
+        """
+        Call a callback with the greeting once ready, on the startup thread or right away when already ready.
+
+        Args:
+            callback (Callable[[str], None]): Callback receiving the greeting, the initial message when the model
+                greeting failed.
+        """
+        self.__greeting.add_done_callback(lambda future: callback(future.result()))
+
 
 def console_chat_color_formatter(message: str, role: Literal["User", "Friday", "Error"]) -> str:
     """
@@ -101,19 +389,197 @@ def console_chat_color_formatter(message: str, role: Literal["User", "Friday", "
         return f"{CHAT_ERROR_FOREGROUND_COLOR}{CHAT_COLOR_STYLE}Error: {message}{Style.RESET_ALL}"
 
 
-def main():
-    """Main function for Friday AI Personal Assistant."""
-    friday = Friday()
-    init()
-    response = friday.google_ai_generation.generate_content(prompt="Who are you?")
-    print(console_chat_color_formatter(response.response.strip(), role="Friday"))
-    friday_chat = friday.google_ai_generation.start_new_chat()
+def console_chat_stream_printer(stream: FridayStreamResponse) -> str:
+    """
+    Print the streamed response from Friday to the console as the chunks arrive.
+
+    Args:
+        stream (FridayStreamResponse): Streamed response from Friday.
+
+    Returns:
+        str: Full response printed to the console.
+
+    Raises:
+        FridayGenerationError: The stream failed before completion. The partial response is left on the console.
+    """
+    print(f"{CHAT_FRIDAY_FOREGROUND_COLOR}{CHAT_COLOR_STYLE}Friday: ", end="", flush=True)
+    try:
+        for index, chunk in enumerate(stream):
+            print(chunk.response.lstrip() if index == 0 else chunk.response, end="", flush=True)
+    finally:
+        print(f"{Style.RESET_ALL}\n", flush=True)
+
+    return stream.response.strip()
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command line arguments of Friday CLI.
+
+    Args:
+        argv (Optional[Sequence[str]]): Command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        argparse.Namespace: Parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(prog="friday_cli", description="Friday - Keys' AI Personal Assistant CLI.")
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="SESSION_ID",
+        help="Resume a persisted chat session. Defaults to the most recent session.",
+    )
+    parser.add_argument("--list-sessions", action="store_true", help="List the persisted chat sessions and exit.")
+    parser.add_argument(
+        "--search",
+        metavar="QUERY",
+        help='Search the persisted chat sessions for keywords and "quoted phrases" (prefix*) and exit.',
+    )
+    parser.add_argument("--limit", type=int, default=10, help="Maximum number of search results.")
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        metavar="PROMPTS_JSONL",
+        help='Generate a JSONL file of prompts (strings or {"prompt": ...} objects) and write the results as JSONL.',
+    )
+    parser.add_argument("--output", type=Path, help="Output JSONL file of the batch results. Defaults to stdout.")
+    parser.add_argument("--workers", type=int, default=8, help="Maximum number of concurrent batch requests.")
+    parser.add_argument(
+        "--as-completed", action="store_true", help="Write the batch results as completed instead of in input order."
+    )
+    parser.add_argument(
+        "--stats",
+        nargs="?",
+        const="text",
+        choices=["text", "json", "prometheus"],
+        help="Print the recorded latency and token metrics of the previous runs and exit (default format: text).",
+    )
+    return parser.parse_args(argv)
+
+
+def batch_records(prompts_file: IO[str]) -> Iterator[dict]:
+    """
+    Read the records of a JSONL file of prompts. A record is a prompt string or an object with a `prompt` key.
+
+    Args:
+        prompts_file (IO[str]): JSONL file of prompts.
 
+    Yields:
+        dict: Record with the `prompt` to generate.
+
+    Raises:
+        FridayInitializationError: Invalid record.
+    """
+    for line_number, line in enumerate(prompts_file, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as err:
+            raise FridayInitializationError(message=f"Invalid JSON on line {line_number}: {err}...") from err
+        record = {"prompt": record} if isinstance(record, str) else record
+        if not isinstance(record, dict) or not isinstance(record.get("prompt"), str):
+            raise FridayInitializationError(message=f"Missing prompt on line {line_number}...")
+        yield record
+
+
+def console_batch_runner(
+    generation: GoogleAIGeneration, prompts_file: IO[str], output: IO[str], max_workers: int = 8, ordered: bool = True
+) -> FridayBatchUsage:
+    """
+    Generate a JSONL file of prompts and stream the results as JSONL, one line per prompt as soon as it is available.
+    Other keys of the prompt records (e.g. `id`) are copied to the results.
+
+    Args:
+        generation (GoogleAIGeneration): Generation SDK.
+        prompts_file (IO[str]): JSONL file of prompts.
+        output (IO[str]): JSONL output of the results.
+        max_workers (int, optional): Maximum number of concurrent requests. Defaults to 8.
+        ordered (bool, optional): Write the results in input order, otherwise as completed. Defaults to True.
+
+    Returns:
+        FridayBatchUsage: Aggregate usage of the batch.
+    """
+    # Records of the prompts in flight, by index
+    records: dict[int, dict] = {}
+
+    def prompts() -> Iterator[str]:
+        for index, record in enumerate(batch_records(prompts_file)):
+            records[index] = record
+            yield record["prompt"]
+
+    batch = generation.generate_many(prompts(), max_workers=max_workers, ordered=ordered)
+    for result in batch:
+        record = dict(records.pop(result.index), index=result.index)
+        if result.ok:
+            record["response"] = result.response.response
+            usage_metadata = result.response.response_object.usage_metadata
+            record["usage"] = {
+                "prompt_token_count": usage_metadata.prompt_token_count,
+                "candidates_token_count": usage_metadata.candidates_token_count,
+                "total_token_count": usage_metadata.total_token_count,
+            }
+        else:
+            record["error"] = str(result.error)
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+    return batch.usage
+
+
+def run(startup: FridayStartup, args: argparse.Namespace) -> None:
+    """
+    Run Friday CLI in batch mode, or as an interactive chat. A new chat greets and prompts the user while Friday is
+    starting, and only the first message waits for it.
+
+    Args:
+        startup (FridayStartup): Startup of Friday AI Personal Assistant.
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+    if args.batch:
+        friday = startup.friday()
+        output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        try:
+            with open(args.batch, "r", encoding="utf-8") as prompts_file:
+                usage = console_batch_runner(
+                    friday.google_ai_generation,
+                    prompts_file,
+                    output,
+                    max_workers=args.workers,
+                    ordered=not args.as_completed,
+                )
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        print(f"Batch usage: {usage}", file=sys.stderr)
+        return
+
+    friday_chat = None
+    if args.resume is None:
+        print(console_chat_color_formatter(startup.greeting(), role="Friday"))
+    else:
+        friday = startup.friday()
+        try:
+            friday_chat = friday.resume_chat(args.resume or None)
+        except FridayInitializationError as err:
+            print(console_chat_color_formatter(str(err), role="Error"))
+            return
+        for entry in friday.google_ai_generation.get_chat_history(friday_chat.chat):
+            print(entry)
+        print()
+
+    startup.mark("interactive")
     while True:
         try:
             user_input = input(f"{CHAT_USER_FOREGROUND_COLOR}{CHAT_COLOR_STYLE}You: ")
+            if friday_chat is None:
+                friday_chat = startup.friday().start_new_chat()
+            # Imported once Friday is started, so that the SDK import does not delay the prompt
+            from friday.sdk.generation import FridayGenerationError
+
             try:
-                response = friday.google_ai_generation.send_chat_message(chat=friday_chat, message=user_input)
+                console_chat_stream_printer(friday_chat.send_message_stream(message=user_input))
             except FridayGenerationError as err:
                 print(
                     console_chat_color_formatter(
@@ -122,12 +588,61 @@ def main():
                 )
                 print(console_chat_color_formatter(f"Error: {err}", role="Error"))
                 continue
-            print(console_chat_color_formatter(response.response.strip(), role="Friday"))
         except KeyboardInterrupt:
-            response = friday.google_ai_generation.generate_content(prompt="Good Bye!")
-            print("\n" + console_chat_color_formatter(response.response.strip(), role="Friday"))
+            print()
+            console_chat_stream_printer(
+                startup.friday().google_ai_generation.generate_content_stream(prompt="Good Bye!", use_cache=True)
+            )
             break
 
 
+def main(argv: Optional[Sequence[str]] = None):
+    """
+    Main function for Friday AI Personal Assistant.
+
+    Args:
+        argv (Optional[Sequence[str]]): Command line arguments. Defaults to `sys.argv[1:]`.
+    """
+    args = parse_args(argv)
+    if args.list_sessions:
+        from friday.sdk.sessions import FridaySessionStore
+
+        for session_id in FridaySessionStore().list_sessions():
+            print(session_id)
+        return
+    if args.search:
+        from friday.sdk.search import FridaySearchIndex
+
+        search_index = FridaySearchIndex()
+        search_index.update()
+        for hit in search_index.search(args.search, limit=args.limit):
+            print(hit)
+        return
+    if args.stats:
+        from friday.sdk.metrics import FridayMetrics
+
+        metrics = FridayMetrics().load()
+        if args.stats == "json":
+            print(json.dumps(metrics.snapshot(), indent=2))
+        else:
+            print(metrics.to_prometheus() if args.stats == "prometheus" else metrics.to_text())
+        return
+
+    # Friday starts in the background. The CLI cannot replace its greeting once the prompt is shown, so it greets with
+    # the initial message and no model greeting is generated.
+    startup = FridayStartup(greeting_prompt=None)
+    init()
+    try:
+        run(startup, args)
+    except FridayInitializationError as err:
+        # Friday failed to start in the background: exit as when it was created before the prompt
+        print(console_chat_color_formatter(str(err), role="Error"), file=sys.stderr)
+        sys.exit(1)
+    finally:
+        # Persist the metrics of the run for `friday_cli --stats`
+        if startup.ready:
+            startup.friday().google_ai_generation.metrics.save()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,559 @@
+"""Asyncio Generation SDKs for Friday built from Google Generative AI."""
+
+# Standard Library
+import time
+import asyncio
+from typing import Annotated, AsyncGenerator, AsyncIterator, Awaitable, Callable, Optional
+from weakref import WeakKeyDictionary
+
+# Project Library
+from friday.sdk.model import GoogleAIModel
+from friday.sdk.tokens import TokenCountable
+from friday.sdk.rate_limit import FridayRateLimiter
+from friday.sdk.candidates import FridayCandidateSelector, response_candidates
+from friday.sdk.generation import FridayGenerationError, FridayResponse, FridayStreamResponse, GoogleAIBaseGeneration
+
+# Type hints
+from google.generativeai.generative_models import ChatSession, GenerativeModel
+from google.generativeai.types.generation_types import (
+    AsyncGenerateContentResponse,
+    BrokenResponseError,
+    GenerateContentResponse,
+    IncompleteIterationError,
+    StopCandidateException,
+)
+from google.generativeai.types import content_types
+from google.generativeai import GenerationConfig, protos
+
+
+class FridayAsyncStreamResponse(FridayStreamResponse):
+    """
+    Asynchronously streamed Friday Response for the Generation SDK.
+
+    Same as `FridayStreamResponse`, but iterated with `async for` and resolved with `await resolve()`. A stream which
+    is dropped without being iterated to the end should be closed with `await aclose()`, e.g. with
+    `contextlib.aclosing`, so that its done callbacks run right away. Otherwise they run once it is garbage collected.
+    """
+
+    # Async streams cannot be iterated synchronously
+    __iter__ = None
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._iterator: Optional[AsyncGenerator[FridayResponse, None]] = None
+
+    def __aiter__(self) -> AsyncIterator[FridayResponse]:
+        """
+        Asynchronously iterate over the partial responses from the model.
+
+        Returns:
+            AsyncIterator[FridayResponse]: Partial response chunks from the model.
+
+        Raises:
+            FridayGenerationError: Stream already consumed.
+        """
+        self._start()
+        self._iterator = self._iterate()
+        return self._iterator
+
+    async def _iterate(self) -> AsyncGenerator[FridayResponse, None]:
+        """
+        Asynchronously iterate over the partial responses from the model.
+
+        Yields:
+            FridayResponse: Partial response chunk from the model.
+
+        Raises:
+            FridayGenerationError: The model stopped the candidate abnormally.
+        """
+        try:
+            async for chunk in self.response_object:
+                yield self._receive(chunk)
+            self._complete()
+        except (StopCandidateException, BrokenResponseError, IncompleteIterationError) as err:
+            self.error = FridayGenerationError(message=str(err), logger=self.logger)
+            raise self.error from err
+        except Exception as err:
+            self.error = err
+            raise
+        finally:
+            self._finalize()
+
+    async def aclose(self) -> None:
+        """Close the stream. If it was not iterated to the end, the abort callback and the done callbacks run now."""
+        if self._iterator is not None:
+            await self._iterator.aclose()
+        self._iterated = True
+        self._finalize()
+
+    def __del__(self) -> None:
+        """Run the callbacks of a stream garbage collected without being iterated to the end or closed."""
+        if not getattr(self, "_finalized", True):
+            self._finalize()
+
+    async def resolve(self) -> FridayResponse:
+        """
+        Consume the remaining stream and return the full response.
+
+        Returns:
+            FridayResponse: Full response from the model.
+        """
+        if not self._iterated:
+            async for _ in self:
+                pass
+        return FridayResponse(
+            response=self.response,
+            response_object=self.response_object,
+            candidates=response_candidates(self.response_object),
+        )
+
+
+class AsyncGoogleAIGeneration(GoogleAIBaseGeneration):
+    """
+    Asyncio Generation SDK for Friday built from Google Generative AI, configured as `GoogleAIBaseGeneration`.
+
+    Async counterpart of `GoogleAIGeneration`, with the same caches, rate limiters, hedging and routing. All model calls
+    are awaitable, so a single event loop can drive many concurrent chat sessions. Messages sent to the same chat
+    session are serialized to keep its history coherent, while different chat sessions run concurrently.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Async generators for Google Generative AI.
+
+        Args:
+            *args: Arguments of `GoogleAIBaseGeneration`.
+            **kwargs: Keyword arguments of `GoogleAIBaseGeneration`.
+        """
+        super().__init__(*args, **kwargs)
+        self.__chat_locks: WeakKeyDictionary[ChatSession, asyncio.Lock] = WeakKeyDictionary()
+
+    @classmethod
+    def from_generation(cls, generation: GoogleAIBaseGeneration) -> "AsyncGoogleAIGeneration":
+        """
+        Create an async generation SDK sharing the model and the configuration of another generation SDK: caches,
+        token estimator, rate limiters, retry policy, metrics, candidate selection, hedging and router.
+
+        Args:
+            generation (GoogleAIBaseGeneration): Generation SDK to share the configuration of, e.g. the one of Friday.
+
+        Returns:
+            AsyncGoogleAIGeneration: Async generation SDK.
+        """
+        return cls(
+            generation._genai_model,
+            cache=generation.cache,
+            token_estimator=generation.token_estimator,
+            rate_limiter=generation.rate_limiter,
+            retry_policy=generation.retry_policy,
+            metrics=generation.metrics,
+            semantic_cache=generation.semantic_cache,
+            candidate_selector=generation.candidate_selector,
+            hedging=generation.hedging,
+            router=generation.router,
+        )
+
+    async def _call_model(
+        self,
+        call: Callable[[], Awaitable[AsyncGenerateContentResponse]],
+        contents: TokenCountable,
+        message: str = "",
+        genai_model: Optional[GoogleAIModel] = None,
+    ) -> tuple[AsyncGenerateContentResponse, int, Optional[FridayRateLimiter]]:
+        """
+        Call the model, throttled by its rate limiter and retried on rate limit and transient server errors.
+
+        Args:
+            call (Callable[[], Awaitable[AsyncGenerateContentResponse]]): Async model call.
+            contents (TokenCountable): Prompt or chat history sent with the call, to estimate its tokens.
+            message (str, optional): Message sent with the chat history. Defaults to "".
+            genai_model (Optional[GoogleAIModel]): Model of the call. Defaults to `genai_model`.
+
+        Returns:
+            tuple[AsyncGenerateContentResponse, int, Optional[FridayRateLimiter]]: Response of the model, the tokens
+                reserved for the call and the rate limiter they were reserved with.
+        """
+        rate_limiter = self._rate_limiter(genai_model or self._genai_model)
+        tokens = 0
+        if rate_limiter is not None:
+            tokens = self.token_estimator.count(contents) + self.token_estimator.count(message)
+        return await self.retry_policy.call_async(call, rate_limiter=rate_limiter, tokens=tokens), tokens, rate_limiter
+
+    async def _call_hedged(
+        self,
+        operation: str,
+        request: Callable[[GenerativeModel], Awaitable[AsyncGenerateContentResponse]],
+        contents: TokenCountable,
+        message: str = "",
+        genai_model: Optional[GoogleAIModel] = None,
+    ) -> tuple[AsyncGenerateContentResponse, int, Optional[FridayRateLimiter]]:
+        """
+        Call the model, hedged by the hedging policy when enabled, and record its latency for the router. The request
+        must not change any state, e.g. the chat session, since the hedge sends it again.
+
+        Args:
+            operation (str): SDK operation, e.g. `generate_content`.
+            request (Callable[[GenerativeModel], Awaitable[AsyncGenerateContentResponse]]): Async request to a
+                generative model.
+            contents (TokenCountable): Prompt or chat history sent with the call, to estimate its tokens.
+            message (str, optional): Message sent with the chat history. Defaults to "".
+            genai_model (Optional[GoogleAIModel]): Model chosen by the router. Defaults to `genai_model`.
+
+        Returns:
+            tuple[AsyncGenerateContentResponse, int, Optional[FridayRateLimiter]]: Response of the model, the tokens
+                reserved for the call and the rate limiter they were reserved with.
+        """
+        genai_model = genai_model or self._genai_model
+        start = time.perf_counter()
+        if self.hedging is None:
+            result = await self._call_model(lambda: request(genai_model.model), contents, message, genai_model)
+        else:
+            hedge_model = self.hedging.fallback_model or genai_model
+            result, won = await self.hedging.call_async(
+                operation,
+                lambda: self._call_model(lambda: request(genai_model.model), contents, message, genai_model),
+                lambda: self._call_model(lambda: request(hedge_model.model), contents, message, hedge_model),
+                cancel=self._cancel_hedge,
+            )
+            if won is not None:
+                self.metrics.record_hedge(operation, hedge_model.model_name, won)
+        if self.router is not None:
+            self.router.observe(genai_model.model_name, operation, time.perf_counter() - start)
+        return result
+
+    async def _cache_lookup_async(
+        self,
+        genai_model: GoogleAIModel,
+        prompt: str,
+        generation_config: Optional[GenerationConfig],
+        use_cache: Optional[bool],
+    ) -> tuple[Optional[GenerateContentResponse], Optional[Callable[[GenerateContentResponse], None]]]:
+        """
+        Look a request up in the caches on a worker thread, since the semantic cache may embed the prompt remotely.
+
+        Args:
+            genai_model (GoogleAIModel): Model of the request.
+            prompt (str): Prompt for generating content.
+            generation_config (Optional[GenerationConfig]): Generation configuration for the model.
+            use_cache (Optional[bool]): Use the caches. When None, only deterministic requests (temperature 0) are
+                cached.
+
+        Returns:
+            tuple[Optional[GenerateContentResponse], Optional[Callable[[GenerateContentResponse], None]]]: Cached
+                response, or None on a miss. On a miss of a cacheable request, the callback caching its response.
+        """
+        if self.cache is None and self.semantic_cache is None:
+            return None, None
+        return await asyncio.to_thread(self._cache_lookup, genai_model, prompt, generation_config, use_cache)
+
+    def _chat_lock(self, chat: ChatSession) -> asyncio.Lock:
+        """
+        Return the lock serializing the messages of a chat session.
+
+        Args:
+            chat (ChatSession): Chat session created with Friday.
+
+        Returns:
+            asyncio.Lock: Lock for the chat session.
+        """
+        lock = self.__chat_locks.get(chat)
+        if lock is None:
+            lock = self.__chat_locks[chat] = asyncio.Lock()
+        return lock
+
+    async def generate_content(
+        self,
+        prompt: str,
+        *,
+        generation_config: Optional[GenerationConfig] = GoogleAIBaseGeneration.generation_config(),
+        use_cache: Optional[bool] = None,
+        selector: Optional[FridayCandidateSelector] = None,
+        hint: Optional[str] = None,
+    ) -> FridayResponse:
+        """
+        Generate content using the configured model. With `candidate_count` > 1, every candidate is generated by the
+        same request and returned in `FridayResponse.candidates`.
+
+        Args:
+            prompt (str): Prompt for generating content.
+            generation_config (Optional[GenerationConfig]): Generation configuration for the model.
+                Defaults to AsyncGoogleAIGeneration.generation_config().
+            use_cache (Optional[bool]): Serve the response from the response cache, or the semantic cache, when
+                available. Defaults to None, which caches only deterministic requests (temperature 0). Ignored when
+                the caches are disabled.
+            selector (Optional[FridayCandidateSelector]): Selection of the response text among several candidates.
+                Defaults to `candidate_selector`.
+            hint (Optional[str]): Quality tier of the request for the router, e.g. `best`. Defaults to None, which
+                classifies the request by its size. Ignored when the router is disabled.
+
+        Returns:
+            FridayResponse: Response from the model for the prompt.
+        """
+        genai_model = self._route("generate_content", prompt, hint)
+        timer = self.metrics.timer("generate_content", genai_model.model_name)
+        response, cache_response = await self._cache_lookup_async(genai_model, prompt, generation_config, use_cache)
+        if response is not None:
+            timer.finish(response.usage_metadata, cache_hit=True)
+            return self._response(response, selector)
+
+        try:
+            response, tokens, rate_limiter = await self._call_hedged(
+                "generate_content",
+                lambda model: model.generate_content_async(prompt, generation_config=generation_config),
+                prompt,
+                genai_model=genai_model,
+            )
+        except Exception as err:
+            timer.finish(error=err)
+            raise
+        timer.finish(response.usage_metadata)
+        self._settle_usage(rate_limiter, tokens, response.usage_metadata)
+        if cache_response is not None:
+            await asyncio.to_thread(cache_response, response)
+        result = self._response(response, selector)
+        self.token_estimator.record(prompt, self._candidates_text(result), response.usage_metadata)
+        return result
+
+    async def generate_content_stream(
+        self,
+        prompt: str,
+        *,
+        generation_config: Optional[GenerationConfig] = GoogleAIBaseGeneration.generation_config(),
+        use_cache: Optional[bool] = None,
+        hint: Optional[str] = None,
+    ) -> FridayAsyncStreamResponse:
+        """
+        Generate content using the configured model and stream the response as it is generated.
+
+        Args:
+            prompt (str): Prompt for generating content.
+            generation_config (Optional[GenerationConfig]): Generation configuration for the model.
+                Defaults to AsyncGoogleAIGeneration.generation_config().
+            use_cache (Optional[bool]): Serve the response from the response cache, or the semantic cache, when
+                available. A cached response is streamed as a single chunk. Defaults to None, which caches only
+                deterministic requests (temperature 0). Ignored when the caches are disabled.
+            hint (Optional[str]): Quality tier of the request for the router, e.g. `best`. Defaults to None, which
+                classifies the request by its size. Ignored when the router is disabled.
+
+        Returns:
+            FridayAsyncStreamResponse: Streamed response from the model for the prompt.
+        """
+        genai_model = self._route("generate_content_stream", prompt, hint)
+        timer = self.metrics.timer("generate_content_stream", genai_model.model_name)
+        response, cache_response = await self._cache_lookup_async(genai_model, prompt, generation_config, use_cache)
+        if response is not None:
+            timer.first_token()
+            timer.finish(response.usage_metadata, cache_hit=True)
+            cached = AsyncGenerateContentResponse.from_response(protos.GenerateContentResponse(response.to_dict()))
+            return FridayAsyncStreamResponse(response_object=cached, logger=self.logger)
+
+        try:
+            response, tokens, rate_limiter = await self._call_hedged(
+                "generate_content_stream",
+                lambda model: model.generate_content_async(prompt, generation_config=generation_config, stream=True),
+                prompt,
+                genai_model=genai_model,
+            )
+        except Exception as err:
+            timer.finish(error=err)
+            raise
+        stream = self._timed_stream(FridayAsyncStreamResponse(response_object=response, logger=self.logger), timer)
+        stream.add_done_callback(lambda: self._settle_usage(rate_limiter, tokens, stream.usage_metadata))
+        if cache_response is not None:
+            loop = asyncio.get_running_loop()
+
+            def on_done() -> None:
+                if stream.done:
+                    loop.run_in_executor(None, cache_response, response)
+
+            stream.add_done_callback(on_done)
+        return stream
+
+    async def send_chat_message(
+        self,
+        chat: ChatSession,
+        message: str,
+        generation_config: Optional[GenerationConfig] = GoogleAIBaseGeneration.generation_config(),
+        selector: Optional[FridayCandidateSelector] = None,
+        hint: Optional[str] = None,
+    ) -> FridayResponse:
+        """
+        Send a message to the chat session with Friday and get the response from the chat session.
+
+        With `candidate_count` > 1, every candidate is generated by the same request and returned in
+        `FridayResponse.candidates`, and the selected candidate is added to the chat history as the reply. When the
+        message is hedged, only the reply of the first request to return is added to the chat history.
+
+        Args:
+            chat (ChatSession): Chat session created with Friday.
+            message (str): Message to be sent to the chat session.
+            generation_config (Optional[GenerationConfig]): Generation configuration for the model.
+                Defaults to AsyncGoogleAIGeneration.generation_config().
+            selector (Optional[FridayCandidateSelector]): Selection of the reply among several candidates. Defaults
+                to `candidate_selector`.
+            hint (Optional[str]): Quality tier of the chat session for the router, used by its first message.
+                Defaults to None, which classifies the first message by its size. Ignored when the router is disabled.
+
+        Returns:
+            FridayResponse: Response from the chat session for the message.
+
+        Raises:
+            FridayGenerationError: Failed to send message to the chat session with Friday.
+        """
+        async with self._chat_lock(chat):
+            genai_model = self._route_chat("send_chat_message", chat, message, hint)
+            timer = self.metrics.timer("send_chat_message", genai_model.model_name)
+            history = chat.history[:]
+            content = content_types.to_content(message)
+            content.role = content.role or "user"
+            direct = self._direct_chat(generation_config)
+
+            def request(model: GenerativeModel) -> Awaitable[AsyncGenerateContentResponse]:
+                if direct:
+                    return model.generate_content_async(history + [content], generation_config=generation_config)
+                # Rebind the chat session to the model of the request, which drops an expired or renamed context cache
+                chat.model = model
+                return chat.send_message_async(message, generation_config=generation_config)
+
+            try:
+                response, tokens, rate_limiter = await self._call_hedged(
+                    "send_chat_message", request, history, message, genai_model
+                )
+                result = self._response(response, selector)
+                if direct:
+                    self._add_chat_turn(chat, history, content, self._reply_content(result))
+            except StopCandidateException as err:
+                timer.finish(error=err)
+                raise FridayGenerationError(message=str(err), logger=self.logger) from err
+            except Exception as err:
+                timer.finish(error=err)
+                raise
+        timer.finish(response.usage_metadata)
+        self._settle_usage(rate_limiter, tokens, response.usage_metadata)
+        self.token_estimator.record(None, self._candidates_text(result), response.usage_metadata)
+        return result
+
+    async def send_chat_message_stream(
+        self,
+        chat: ChatSession,
+        message: str,
+        generation_config: Optional[GenerationConfig] = GoogleAIBaseGeneration.generation_config(),
+        hint: Optional[str] = None,
+    ) -> FridayAsyncStreamResponse:
+        """
+        Send a message to the chat session with Friday and stream the response from the chat session.
+
+        The chat session stays locked until the stream is exhausted or closed, so that the next message is sent with
+        the complete history. A stream dropped without being iterated, e.g. when the client disconnects, must be closed
+        with `aclose()` to unlock the chat session right away, otherwise it is unlocked once garbage collected. If the
+        stream fails or is closed before completion, the message is rolled back from the chat history. When the
+        message is hedged, the first stream to produce a chunk is used and the other one is closed.
+
+        Args:
+            chat (ChatSession): Chat session created with Friday.
+            message (str): Message to be sent to the chat session.
+            generation_config (Optional[GenerationConfig]): Generation configuration for the model.
+                Defaults to AsyncGoogleAIGeneration.generation_config().
+            hint (Optional[str]): Quality tier of the chat session for the router, used by its first message.
+                Defaults to None, which classifies the first message by its size. Ignored when the router is disabled.
+
+        Returns:
+            FridayAsyncStreamResponse: Streamed response from the chat session for the message.
+
+        Raises:
+            FridayGenerationError: Failed to send message to the chat session with Friday.
+        """
+        lock = self._chat_lock(chat)
+        await lock.acquire()
+        try:
+            genai_model = self._route_chat("send_chat_message_stream", chat, message, hint)
+        except BaseException:
+            lock.release()
+            raise
+        timer = self.metrics.timer("send_chat_message_stream", genai_model.model_name)
+        history = chat.history[:]
+        content = content_types.to_content(message)
+        content.role = content.role or "user"
+        direct = self.hedging is not None
+
+        def request(model: GenerativeModel) -> Awaitable[AsyncGenerateContentResponse]:
+            if direct:
+                return model.generate_content_async(
+                    history + [content], generation_config=generation_config, stream=True
+                )
+            chat.model = model
+            return chat.send_message_async(message, generation_config=generation_config, stream=True)
+
+        def rollback() -> None:
+            chat.history = history
+
+        try:
+            response, tokens, rate_limiter = await self._call_hedged(
+                "send_chat_message_stream", request, history, message, genai_model
+            )
+        except StopCandidateException as err:
+            lock.release()
+            timer.finish(error=err)
+            raise FridayGenerationError(message=str(err), logger=self.logger) from err
+        except BaseException as err:
+            lock.release()
+            timer.finish(error=err)
+            raise
+
+        stream = self._timed_stream(
+            FridayAsyncStreamResponse(response_object=response, logger=self.logger, on_abort=rollback), timer
+        )
+        stream.add_done_callback(lambda: self._settle_usage(rate_limiter, tokens, stream.usage_metadata))
+        if direct:
+
+            def add_chat_turn() -> None:
+                if stream.done:
+                    self._add_chat_turn(chat, history, content, response.candidates[0].content)
+
+            stream.add_done_callback(add_chat_turn)
+        stream.add_done_callback(lock.release)
+        return stream
+
+    async def _count_tokens(
+        self, text: str | Annotated[list[protos.Content], ChatSession.history], *, remote: bool = False
+    ) -> int:
+        """
+        Count the number of tokens in the text or chat history with the offline token estimator.
+
+        Args:
+            text (str | Annotated[list[protos.Content], ChatSession.history]): Text or chat history to count the tokens.
+            remote (bool, optional): Fall back to the exact remote `count_tokens` call. Defaults to False.
+
+        Returns:
+            int: Number of tokens in the text or chat history.
+        """
+        if remote:
+            return (await self._model.count_tokens_async(text)).total_tokens
+        return self.token_estimator.count(text)
+
+    def __str__(self):
+        return f"Friday - Keys' AI Personal Assistant Async Generation with model: {self._model.model_name}"
+
+
+if __name__ == "__main__":
+    # Test the Async Generation SDK
+    async def _demo() -> None:
+        model = GoogleAIModel()
+        ai_gen = AsyncGoogleAIGeneration(genai_model=model)
+        print(ai_gen)
+
+        # Test concurrent chat sessions
+        chats = [ai_gen.start_new_chat() for _ in range(3)]
+        responses = await asyncio.gather(
+            *(ai_gen.send_chat_message(chat=chat, message=f"Remember the number {i}.") for i, chat in enumerate(chats))
+        )
+        for response in responses:
+            print(f"Chat Response: {response.response.strip()}")
+
+        # Test streamed chat session
+        stream = await ai_gen.send_chat_message_stream(chat=chats[0], message="Which number did I ask you to remember?")
+        async for chunk in stream:
+            print(chunk.response, end="", flush=True)
+        print(f"\nUsage Metadata: {stream.usage_metadata}")
+
+    asyncio.run(_demo())
@@ -0,0 +1,264 @@
+"""Response Cache for the Friday Generation SDK."""
+
+# Standard Library
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+from collections import OrderedDict
+
+# Project Library
+from friday.utilities.logger import CustomLogger
+from friday.utilities.paths import friday_cache_dir
+
+# Type hints
+from google.generativeai import GenerationConfig, protos
+from google.generativeai.types.generation_types import GenerateContentResponse, to_generation_config_dict
+
+
+class FridayResponseCache:
+    """
+    Two level response cache for the Friday Generation SDK.
+
+    Responses are kept in memory with LRU eviction and persisted to a SQLite store under `.friday_cache` so that they
+    survive restarts. Entries expire after the TTL, and the least recently used entries of the disk store are evicted
+    once it grows beyond the size cap.
+
+    Attributes:
+        ttl_seconds (float): Time to live of a cached response in seconds.
+        max_memory_entries (int): Maximum number of responses kept in memory.
+        max_disk_bytes (int): Maximum total size of the responses persisted on disk.
+        hits (int): Number of cache hits.
+        misses (int): Number of cache misses.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 24 * 60 * 60,
+        max_memory_entries: int = 256,
+        max_disk_bytes: int = 10 * 1024 * 1024,
+        cache_path: Optional[Path] = None,
+        persistent: bool = True,
+    ) -> None:
+        """
+        Initialize the response cache.
+
+        Args:
+            ttl_seconds (float, optional): Time to live of a cached response in seconds. Defaults to 1 day.
+            max_memory_entries (int, optional): Maximum number of responses kept in memory. Defaults to 256.
+            max_disk_bytes (int, optional): Maximum total size of the responses persisted on disk. Defaults to 10MB.
+            cache_path (Optional[Path]): Path to the SQLite store. Defaults to `.friday_cache/responses.sqlite3`.
+            persistent (bool, optional): Persist the responses on disk. Defaults to True.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self.logger = CustomLogger(name="friday")
+
+        self.__lock = threading.Lock()
+        self.__memory: OrderedDict[str, tuple[float, protos.GenerateContentResponse]] = OrderedDict()
+        self.__db: Optional[sqlite3.Connection] = None
+        self.__disk_bytes = 0
+        if persistent:
+            self.__open_disk_store(cache_path or friday_cache_dir() / "responses.sqlite3")
+
+    def __open_disk_store(self, cache_path: Path) -> None:
+        """
+        Open the SQLite store, drop the expired responses and load the total size of the store.
+
+        Args:
+            cache_path (Path): Path to the SQLite store.
+        """
+        self.__db = sqlite3.connect(cache_path, check_same_thread=False, isolation_level=None)
+        self.__db.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, created REAL NOT NULL, accessed REAL NOT NULL, size INTEGER NOT NULL, value BLOB)"
+        )
+        self.__db.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_seconds,))
+        self.__disk_bytes = self.__db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self.__evict_from_disk()
+
+    @staticmethod
+    def make_key(
+        model_name: str, system_instruction: Optional[str], prompt: str, generation_config: Optional[GenerationConfig]
+    ) -> str:
+        """
+        Build the cache key of a request.
+
+        Args:
+            model_name (str): Name of the model.
+            system_instruction (Optional[str]): System instruction of the model.
+            prompt (str): Prompt of the request.
+            generation_config (Optional[GenerationConfig]): Generation configuration of the request.
+
+        Returns:
+            str: Cache key of the request.
+        """
+        system_instruction_hash = hashlib.sha256((system_instruction or "").encode()).hexdigest()
+        request = json.dumps(
+            [model_name, system_instruction_hash, prompt, to_generation_config_dict(generation_config)],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(request.encode()).hexdigest()
+
+    @staticmethod
+    def is_cacheable(response: GenerateContentResponse) -> bool:
+        """
+        Check a response is complete, so that a truncated or blocked response is not served again from the cache.
+
+        Args:
+            response (GenerateContentResponse): Resolved response from the model.
+
+        Returns:
+            bool: Every candidate of the response finished with `STOP`.
+        """
+        candidates = response.candidates
+        return bool(candidates) and all(
+            candidate.finish_reason == protos.Candidate.FinishReason.STOP for candidate in candidates
+        )
+
+    def get(self, key: str) -> Optional[GenerateContentResponse]:
+        """
+        Get a cached response.
+
+        Args:
+            key (str): Cache key of the request.
+
+        Returns:
+            Optional[GenerateContentResponse]: Cached response, or None on a cache miss.
+        """
+        now = time.time()
+        with self.__lock:
+            entry = self.__memory.get(key)
+            if entry and now - entry[0] < self.ttl_seconds:
+                self.__memory.move_to_end(key)
+            else:
+                self.__memory.pop(key, None)
+                entry = self.__get_from_disk(key, now)
+                if entry:
+                    self.__put_in_memory(key, entry)
+
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return GenerateContentResponse.from_response(entry[1])
+
+    def __get_from_disk(self, key: str, now: float) -> Optional[tuple[float, protos.GenerateContentResponse]]:
+        """
+        Get a response from the disk store. Expired responses are dropped.
+
+        Args:
+            key (str): Cache key of the request.
+            now (float): Current time.
+
+        Returns:
+            Optional[tuple[float, protos.GenerateContentResponse]]: Creation time and response, or None.
+        """
+        if self.__db is None:
+            return None
+
+        row = self.__db.execute("SELECT created, size, value FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        created, size, value = row
+        if now - created >= self.ttl_seconds:
+            self.__db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.__disk_bytes -= size
+            return None
+
+        self.__db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return created, protos.GenerateContentResponse.deserialize(value)
+
+    def put(self, key: str, response: GenerateContentResponse) -> None:
+        """
+        Cache a resolved response, unless it is incomplete, see `is_cacheable`.
+
+        Args:
+            key (str): Cache key of the request.
+            response (GenerateContentResponse): Resolved response from the model.
+        """
+        if not self.is_cacheable(response):
+            return
+        now = time.time()
+        result = protos.GenerateContentResponse(response.to_dict())
+        with self.__lock:
+            self.__put_in_memory(key, (now, result))
+            if self.__db is not None:
+                self.__put_on_disk(key, now, protos.GenerateContentResponse.serialize(result))
+
+    def __put_in_memory(self, key: str, entry: tuple[float, protos.GenerateContentResponse]) -> None:
+        """
+        Put a response in the memory cache and evict the least recently used responses.
+
+        Args:
+            key (str): Cache key of the request.
+            entry (tuple[float, protos.GenerateContentResponse]): Creation time and response.
+        """
+        self.__memory[key] = entry
+        self.__memory.move_to_end(key)
+        while len(self.__memory) > self.max_memory_entries:
+            self.__memory.popitem(last=False)
+
+    def __put_on_disk(self, key: str, now: float, value: bytes) -> None:
+        """
+        Persist a response in the disk store and evict the least recently used responses beyond the size cap.
+
+        Args:
+            key (str): Cache key of the request.
+            now (float): Current time.
+            value (bytes): Serialized response.
+        """
+        previous = self.__db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        self.__db.execute(
+            "INSERT OR REPLACE INTO responses (key, created, accessed, size, value) VALUES (?, ?, ?, ?, ?)",
+            (key, now, now, len(value), value),
+        )
+        self.__disk_bytes += len(value) - (previous[0] if previous else 0)
+        self.__evict_from_disk()
+
+    def __evict_from_disk(self) -> None:
+        """Evict the least recently used responses from the disk store until it fits in the size cap."""
+        while self.__disk_bytes > self.max_disk_bytes:
+            oldest = self.__db.execute("SELECT key, size FROM responses ORDER BY accessed LIMIT 1").fetchone()
+            if oldest is None:
+                break
+            self.__db.execute("DELETE FROM responses WHERE key = ?", (oldest[0],))
+            self.__disk_bytes -= oldest[1]
+            self.logger.debug("Evicted cached response %s from the disk store.", oldest[0])
+
+    def clear(self) -> None:
+        """Clear the memory cache and the disk store."""
+        with self.__lock:
+            self.__memory.clear()
+            if self.__db is not None:
+                self.__db.execute("DELETE FROM responses")
+                self.__disk_bytes = 0
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Return the cache statistics.
+
+        Returns:
+            dict[str, int | float]: Hits, misses, hit rate, memory entries and disk size of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_entries": len(self.__memory),
+            "disk_bytes": self.__disk_bytes,
+        }
+
+    def __str__(self) -> str:
+        """String representation of the FridayResponseCache."""
+        return f"FridayResponseCache: {self.stats()}"
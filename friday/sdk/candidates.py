@@ -0,0 +1,173 @@
+"""Response Candidates and Candidate Selectors for the Friday Generation SDK."""
+
+# Standard Library
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+# Type hints
+from google.generativeai import protos
+from google.generativeai.types.generation_types import GenerateContentResponse
+
+
+# Finish reasons for which a candidate is considered complete
+_COMPLETE_FINISH_REASONS = ("FINISH_REASON_UNSPECIFIED", "STOP", "MAX_TOKENS")
+
+
+@dataclass
+class FridayCandidate:
+    """
+    Candidate of a response, one of the `candidate_count` alternatives generated by a single request.
+
+    Attributes:
+        index (int): Index of the candidate in the response.
+        text (str): Text of the candidate.
+        finish_reason (str): Reason the model stopped generating the candidate, e.g. `STOP` or `SAFETY`.
+        safety_ratings (dict[str, str]): Probability of harm of the candidate per harm category.
+        token_count (int): Number of tokens of the candidate.
+        content (Optional[protos.Content]): Content of the candidate, appended to the chat history when selected.
+    """
+
+    index: int
+    text: str
+    finish_reason: str
+    safety_ratings: dict[str, str] = field(default_factory=dict)
+    token_count: int = 0
+    content: Optional[protos.Content] = field(default=None, repr=False, compare=False)
+
+    @property
+    def complete(self) -> bool:
+        """Whether the model stopped the candidate normally, rather than blocking it (safety, recitation...)."""
+        return self.finish_reason in _COMPLETE_FINISH_REASONS
+
+    @classmethod
+    def from_proto(cls, candidate: protos.Candidate, token_count: int = 0) -> "FridayCandidate":
+        """
+        Wrap a candidate of a response.
+
+        Args:
+            candidate (protos.Candidate): Candidate of the response.
+            token_count (int, optional): Number of tokens of the candidate, when the response does not report it.
+                Defaults to 0.
+
+        Returns:
+            FridayCandidate: Candidate of the response.
+        """
+        return cls(
+            index=candidate.index,
+            text="".join(part.text for part in candidate.content.parts if "text" in part),
+            finish_reason=protos.Candidate.FinishReason(candidate.finish_reason).name,
+            safety_ratings={
+                protos.HarmCategory(rating.category).name: protos.SafetyRating.HarmProbability(rating.probability).name
+                for rating in candidate.safety_ratings
+            },
+            token_count=candidate.token_count or token_count,
+            content=candidate.content,
+        )
+
+
+# Selection of the candidate of a response used as the reply, e.g. added to the chat history
+FridayCandidateSelector = Callable[[list[FridayCandidate]], FridayCandidate]
+
+
+def response_candidates(
+    response: GenerateContentResponse, count_tokens: Optional[Callable[[str], int]] = None
+) -> list[FridayCandidate]:
+    """
+    Wrap every candidate of a response. The API reports the tokens of all the candidates together, so the tokens of
+    each candidate are estimated when there are several and the response does not report them.
+
+    Args:
+        response (GenerateContentResponse): Response of the model.
+        count_tokens (Optional[Callable[[str], int]]): Token counter of a text, e.g. the offline token estimator.
+            Defaults to None, leaving the unreported token counts of several candidates at 0.
+
+    Returns:
+        list[FridayCandidate]: Candidates of the response, in order.
+    """
+    candidates = response.candidates
+    if len(candidates) == 1:
+        return [FridayCandidate.from_proto(candidates[0], response.usage_metadata.candidates_token_count)]
+    wrapped = [FridayCandidate.from_proto(candidate) for candidate in candidates]
+    if count_tokens is not None:
+        for candidate in wrapped:
+            candidate.token_count = candidate.token_count or count_tokens(candidate.text)
+    return wrapped
+
+
+def _eligible(candidates: list[FridayCandidate]) -> list[FridayCandidate]:
+    """Return the complete candidates, or every candidate when none is complete."""
+    return [candidate for candidate in candidates if candidate.complete] or candidates
+
+
+def select_first(candidates: list[FridayCandidate]) -> FridayCandidate:
+    """
+    Select the first complete candidate, the default of the generation SDK.
+
+    Args:
+        candidates (list[FridayCandidate]): Candidates of a response.
+
+    Returns:
+        FridayCandidate: Selected candidate.
+    """
+    return _eligible(candidates)[0]
+
+
+def select_longest(candidates: list[FridayCandidate]) -> FridayCandidate:
+    """
+    Select the longest complete candidate, by number of tokens.
+
+    Args:
+        candidates (list[FridayCandidate]): Candidates of a response.
+
+    Returns:
+        FridayCandidate: Selected candidate.
+    """
+    return max(_eligible(candidates), key=lambda candidate: (candidate.token_count, len(candidate.text)))
+
+
+def select_shortest(candidates: list[FridayCandidate]) -> FridayCandidate:
+    """
+    Select the shortest complete candidate, by number of tokens.
+
+    Args:
+        candidates (list[FridayCandidate]): Candidates of a response.
+
+    Returns:
+        FridayCandidate: Selected candidate.
+    """
+    return min(_eligible(candidates), key=lambda candidate: (candidate.token_count, len(candidate.text)))
+
+
+def select_by_score(scorer: Callable[[FridayCandidate], float]) -> FridayCandidateSelector:
+    """
+    Create a selector of the complete candidate with the highest score. Ties go to the first candidate.
+
+    Args:
+        scorer (Callable[[FridayCandidate], float]): Score of a candidate, higher is better.
+
+    Returns:
+        FridayCandidateSelector: Candidate selector.
+    """
+
+    def select(candidates: list[FridayCandidate]) -> FridayCandidate:
+        return max(_eligible(candidates), key=scorer)
+
+    return select
+
+
+if __name__ == "__main__":
+    response = GenerateContentResponse.from_response(
+        protos.GenerateContentResponse(
+            candidates=[
+                protos.Candidate(
+                    index=index,
+                    content=protos.Content(role="model", parts=[protos.Part(text=text)]),
+                    finish_reason=protos.Candidate.FinishReason.STOP,
+                )
+                for index, text in enumerate(["Hello!", "Hello, I am Friday.", "Hi."])
+            ]
+        )
+    )
+    candidates = response_candidates(response, count_tokens=lambda text: len(text) // 4 + 1)
+    for selector in (select_first, select_longest, select_shortest, select_by_score(lambda c: "Friday" in c.text)):
+        print(selector(candidates))
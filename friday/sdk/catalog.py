@@ -0,0 +1,179 @@
+"""Model Catalog for Friday built from Google Generative AI."""
+
+# Standard Library
+import os
+import json
+import time
+import threading
+import dataclasses
+from pathlib import Path
+from typing import Callable, Optional
+
+# Third Party Library
+import google.generativeai as genai
+
+# Project Library
+from friday.utilities.logger import CustomLogger
+from friday.utilities.paths import friday_cache_dir
+
+# Type hints
+from google.generativeai.types import Model
+
+
+class GoogleAIModelCatalog:
+    """
+    Disk cached catalog of the models supported by Google Generative AI.
+
+    The catalog is persisted under `.friday_cache` so that listing the models does not cost a paginated network fetch
+    in every process. A stale catalog is still served while it is refreshed in the background. The network is hit in
+    the foreground only when no catalog was ever fetched.
+
+    Attributes:
+        ttl_seconds (float): Time after which the catalog is refreshed in seconds.
+        catalog_path (Path): Path to the persisted catalog.
+    """
+
+    def __init__(self, ttl_seconds: float = 24 * 60 * 60, catalog_path: Optional[Path] = None) -> None:
+        """
+        Initialize the model catalog. Nothing is loaded until the catalog is first used.
+
+        Args:
+            ttl_seconds (float, optional): Time after which the catalog is refreshed in seconds. Defaults to 1 day.
+            catalog_path (Optional[Path]): Path to the persisted catalog. Defaults to `.friday_cache/models.json`.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.catalog_path = catalog_path
+        self.logger = CustomLogger(name="friday")
+
+        self.__lock = threading.Lock()
+        self.__models: Optional[list[Model]] = None
+        self.__fetched = 0.0
+        self.__loaded = False
+        self.__refresh_thread: Optional[threading.Thread] = None
+        self.__on_refresh: list[Callable[[list[Model]], None]] = []
+
+    def __path(self) -> Path:
+        """Return the path to the persisted catalog."""
+        return self.catalog_path or friday_cache_dir() / "models.json"
+
+    def __load(self) -> None:
+        """Load the persisted catalog once. A missing or corrupted catalog is ignored."""
+        if self.__loaded:
+            return
+        self.__loaded = True
+
+        try:
+            with open(self.__path(), "r") as file:
+                catalog = json.load(file)
+            self.__models = [Model(**model) for model in catalog["models"]]
+            self.__fetched = catalog["fetched"]
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError) as err:
+            self.logger.warning("Ignoring corrupted model catalog %s: %s", self.__path(), err)
+
+    def __save(self, models: list[Model], fetched: float) -> None:
+        """
+        Persist the catalog atomically.
+
+        Args:
+            models (list[Model]): Models of the catalog.
+            fetched (float): Time at which the catalog was fetched.
+        """
+        path = self.__path()
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, "w") as file:
+            json.dump({"fetched": fetched, "models": [dataclasses.asdict(model) for model in models]}, file)
+        os.replace(temp_path, path)
+
+    def cached_models(self) -> Optional[list[Model]]:
+        """
+        Return the cached models, possibly stale, without touching the network.
+
+        Returns:
+            Optional[list[Model]]: Cached models, or None if the catalog was never fetched.
+        """
+        with self.__lock:
+            self.__load()
+            return self.__models
+
+    def is_stale(self) -> bool:
+        """
+        Check whether the catalog is missing or older than the TTL.
+
+        Returns:
+            bool: True if the catalog should be refreshed.
+        """
+        with self.__lock:
+            self.__load()
+            return self.__models is None or time.time() - self.__fetched >= self.ttl_seconds
+
+    def models(self) -> list[Model]:
+        """
+        Return the models of the catalog. A stale catalog is refreshed in the background, a missing catalog is fetched.
+
+        Returns:
+            list[Model]: Models supported by Google Generative AI.
+        """
+        models = self.cached_models()
+        if models is None:
+            return self.refresh()
+        if self.is_stale():
+            self.refresh_in_background()
+        return models
+
+    def refresh(self) -> list[Model]:
+        """
+        Fetch the catalog from Google Generative AI and persist it.
+
+        Returns:
+            list[Model]: Models supported by Google Generative AI.
+        """
+        models = list(genai.list_models())
+        fetched = time.time()
+        with self.__lock:
+            self.__models, self.__fetched, self.__loaded = models, fetched, True
+            try:
+                self.__save(models, fetched)
+            except OSError as err:
+                self.logger.warning("Failed to persist the model catalog: %s", err)
+        self.logger.debug("Model catalog refreshed with %s models.", len(models))
+        return models
+
+    def refresh_in_background(
+        self, on_refresh: Optional[Callable[[list[Model]], None]] = None
+    ) -> Optional[threading.Thread]:
+        """
+        Refresh the catalog on a daemon thread, unless a refresh is already running. The callback is then invoked once
+        the running refresh completes.
+
+        Args:
+            on_refresh (Optional[Callable[[list[Model]], None]]): Callback invoked with the refreshed models.
+
+        Returns:
+            Optional[threading.Thread]: Refresh thread, or None if a refresh is already running.
+        """
+
+        def refresh() -> None:
+            try:
+                models = self.refresh()
+            except Exception as err:
+                self.logger.warning("Failed to refresh the model catalog in the background: %s", err)
+                models = None
+            with self.__lock:
+                callbacks, self.__on_refresh = self.__on_refresh, []
+                self.__refresh_thread = None
+            for callback in callbacks if models is not None else ():
+                try:
+                    callback(models)
+                except Exception as err:
+                    self.logger.warning("Model catalog refresh callback failed: %s", err)
+
+        with self.__lock:
+            if on_refresh is not None:
+                self.__on_refresh.append(on_refresh)
+            if self.__refresh_thread is not None:
+                return None
+            self.__refresh_thread = threading.Thread(target=refresh, name="friday-model-catalog", daemon=True)
+            self.__refresh_thread.start()
+            return self.__refresh_thread
@@ -0,0 +1,233 @@
+"""Server-side Context Caching for Friday built from Google Generative AI."""
+
+# Standard Library
+import os
+import json
+import time
+import hashlib
+import datetime
+import threading
+from pathlib import Path
+from typing import Optional
+
+# Third Party Library
+from google.generativeai import caching
+
+# Project Library
+from friday.utilities.logger import CustomLogger
+from friday.utilities.paths import friday_cache_dir
+
+
+class GoogleAIContextCache:
+    """
+    Server-side context cache for the static system instruction and fixed preamble of a model.
+
+    The system instruction and preamble are uploaded once as a cached content handle, so that requests made with the
+    handle are not billed and prefilled for them again. The handle is created and renewed on a background thread and
+    is persisted under `.friday_cache` to be reused across processes. While no live handle is available (not created
+    yet, expired, or rejected by the server), `cached_content` returns None and the caller falls back to sending the
+    system instruction with every request.
+
+    Note:
+        Google Generative AI only caches contents above a minimum size (32k tokens for Gemini 1.5) and for explicitly
+        versioned models (e.g. `gemini-1.5-flash-001`). Smaller contents are rejected and served by the fallback.
+
+    Attributes:
+        model_name (str): Model name the contents are cached for.
+        system_instruction (str): System instruction to cache.
+        preamble (Optional[str]): Large fixed preamble to cache with the system instruction.
+        ttl_seconds (float): Time to live of the handle in seconds.
+        renew_before_seconds (float): Time before the expiry at which the handle is renewed in seconds.
+        retry_seconds (float): Time before retrying after the cache was unavailable in seconds.
+        state_path (Path): Path to the persisted handle.
+        hits (int): Number of requests served with the cached contents.
+        fallbacks (int): Number of requests served without the cached contents.
+    """
+
+    # Cached content API of Google Generative AI, replaceable by a local stand-in
+    cached_content_api = caching.CachedContent
+
+    def __init__(
+        self,
+        model_name: str,
+        system_instruction: str,
+        preamble: Optional[str] = None,
+        ttl_seconds: float = 60 * 60,
+        renew_before_seconds: float = 5 * 60,
+        retry_seconds: float = 10 * 60,
+        state_path: Optional[Path] = None,
+    ) -> None:
+        """
+        Initialize the context cache. Nothing is created until the cache is first used.
+
+        Args:
+            model_name (str): Model name the contents are cached for.
+            system_instruction (str): System instruction to cache.
+            preamble (Optional[str]): Large fixed preamble to cache with the system instruction. Defaults to None.
+            ttl_seconds (float, optional): Time to live of the handle in seconds. Defaults to 1 hour.
+            renew_before_seconds (float, optional): Time before the expiry at which the handle is renewed in seconds.
+                Defaults to 5 minutes.
+            retry_seconds (float, optional): Time before retrying after the cache was unavailable in seconds.
+                Defaults to 10 minutes.
+            state_path (Optional[Path]): Path to the persisted handle. Defaults to `.friday_cache/context_cache.json`.
+        """
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+        self.preamble = preamble
+        self.ttl_seconds = ttl_seconds
+        self.renew_before_seconds = renew_before_seconds
+        self.retry_seconds = retry_seconds
+        self.state_path = state_path
+        self.hits = 0
+        self.fallbacks = 0
+        self.logger = CustomLogger(name="friday")
+
+        self.__lock = threading.Lock()
+        self.__handle: Optional[caching.CachedContent] = None
+        self.__expires = 0.0
+        self.__retry_at = 0.0
+        self.__refresh_thread: Optional[threading.Thread] = None
+
+    @property
+    def key(self) -> str:
+        """Key of the cached contents, which changes with the model, system instruction or preamble."""
+        contents = json.dumps([self.model_name, self.system_instruction, self.preamble])
+        return hashlib.sha256(contents.encode("utf-8")).hexdigest()
+
+    def __path(self) -> Path:
+        """Return the path to the persisted handle."""
+        return self.state_path or friday_cache_dir() / "context_cache.json"
+
+    def __load_state(self) -> dict:
+        """Load the persisted handles. A missing or corrupted state is ignored."""
+        try:
+            with open(self.__path(), "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except ValueError as err:
+            self.logger.warning("Ignoring corrupted context cache state %s: %s", self.__path(), err)
+            return {}
+
+    def __save_state(self, name: Optional[str], expires: float) -> None:
+        """
+        Persist the handle atomically. Expired handles of other contents are dropped.
+
+        Args:
+            name (Optional[str]): Name of the handle, or None to forget it.
+            expires (float): Expiry time of the handle.
+        """
+        state = {key: entry for key, entry in self.__load_state().items() if entry.get("expires", 0) > time.time()}
+        if name is None:
+            state.pop(self.key, None)
+        else:
+            state[self.key] = {"name": name, "expires": expires}
+
+        path = self.__path()
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(temp_path, "w") as file:
+                json.dump(state, file)
+            os.replace(temp_path, path)
+        except OSError as err:
+            self.logger.warning("Failed to persist the context cache state: %s", err)
+
+    def cached_content(self) -> Optional[caching.CachedContent]:
+        """
+        Return the live cached content handle without touching the network. The handle is created or renewed in the
+        background when it is missing or about to expire.
+
+        Returns:
+            Optional[caching.CachedContent]: Live cached content handle, or None to fall back to the system instruction.
+        """
+        now = time.time()
+        with self.__lock:
+            handle = self.__handle if now < self.__expires else None
+            refresh = (handle is None or self.__expires - now < self.renew_before_seconds) and now >= self.__retry_at
+            if handle is None:
+                self.fallbacks += 1
+            else:
+                self.hits += 1
+        if refresh:
+            self.refresh_in_background()
+        return handle
+
+    def refresh(self) -> caching.CachedContent:
+        """
+        Renew the cached content handle, reusing the persisted handle if any, or create it.
+
+        Returns:
+            caching.CachedContent: Live cached content handle.
+
+        Raises:
+            Exception: The cache is unavailable. Raised as is from the cached content API.
+        """
+        ttl = datetime.timedelta(seconds=self.ttl_seconds)
+        with self.__lock:
+            handle = self.__handle
+
+        if handle is None:
+            entry = self.__load_state().get(self.key)
+            if entry and entry["expires"] > time.time():
+                try:
+                    handle = self.cached_content_api.get(name=entry["name"])
+                except Exception as err:
+                    self.logger.debug("Persisted context cache %s is gone: %s", entry["name"], err)
+
+        if handle is not None:
+            try:
+                handle.update(ttl=ttl)
+            except Exception as err:
+                self.logger.debug("Failed to renew the context cache %s, creating a new one: %s", handle.name, err)
+                handle = None
+
+        if handle is None:
+            handle = self.cached_content_api.create(
+                model=self.model_name,
+                display_name="friday",
+                system_instruction=self.system_instruction,
+                contents=[self.preamble] if self.preamble else None,
+                ttl=ttl,
+            )
+            self.logger.debug("Created the context cache %s for %s.", handle.name, self.model_name)
+
+        expires = handle.expire_time.timestamp()
+        with self.__lock:
+            self.__handle, self.__expires, self.__retry_at = handle, expires, 0.0
+        self.__save_state(handle.name, expires)
+        return handle
+
+    def refresh_in_background(self) -> Optional[threading.Thread]:
+        """
+        Refresh the cached content handle on a daemon thread, unless a refresh is already running. If the cache is
+        unavailable, the refresh is retried after `retry_seconds`.
+
+        Returns:
+            Optional[threading.Thread]: Refresh thread, or None if a refresh is already running.
+        """
+
+        def refresh() -> None:
+            try:
+                self.refresh()
+            except Exception as err:
+                self.logger.warning("Context cache unavailable, sending the system instruction instead: %s", err)
+                with self.__lock:
+                    self.__retry_at = time.time() + self.retry_seconds
+
+        with self.__lock:
+            if self.__refresh_thread and self.__refresh_thread.is_alive():
+                return None
+            self.__refresh_thread = threading.Thread(target=refresh, name="friday-context-cache", daemon=True)
+            self.__refresh_thread.start()
+            return self.__refresh_thread
+
+    def delete(self) -> None:
+        """Delete the cached content handle from the server and forget it."""
+        with self.__lock:
+            handle, self.__handle, self.__expires = self.__handle, None, 0.0
+        if handle is not None:
+            try:
+                handle.delete()
+            except Exception as err:
+                self.logger.warning("Failed to delete the context cache %s: %s", handle.name, err)
+        self.__save_state(None, 0.0)
@@ -0,0 +1,365 @@
+"""
+Deterministic Local Fake Backend for the Friday Generation SDK.
+
+The fake backend simulates the `GenerativeModel` API in process, so that the SDKs, CLI and server can be tested,
+benchmarked and load tested without an API key or network. Replies are deterministic for a given seed and contents,
+latencies follow a configurable profile and every response carries usage metadata.
+
+Token accounting of the fake backend: a token is ~4 characters, and the reply is made of 3 letter words, one token each.
+"""
+
+# Standard Library
+import os
+import math
+import time
+import random
+import asyncio
+import threading
+from dataclasses import dataclass, fields
+from typing import AsyncIterator, Iterator, Optional
+
+# Third Party Library
+from google.api_core import exceptions
+
+# Project Library
+from friday.utilities.logger import CustomLogger
+from friday.utilities.exceptions import FridayBaseException
+
+# Type hints
+from google.generativeai import protos
+from google.generativeai.generative_models import ChatSession
+from google.generativeai.types import content_types
+from google.generativeai.types.generation_types import (
+    AsyncGenerateContentResponse,
+    GenerateContentResponse,
+    to_generation_config_dict,
+)
+
+
+VOCABULARY = (
+    "the", "and", "you", "can", "for", "are", "but", "not", "all", "any", "one", "our", "out", "day", "get", "has",
+    "him", "his", "how", "man", "new", "now", "old", "see", "two", "way", "who", "boy", "did", "its", "let", "put",
+    "say", "she", "too", "use", "yes", "sun", "sky", "sea", "key", "map", "run", "fix", "ask", "end", "top", "set",
+)  # fmt: skip
+
+
+class FridayFakeBackendError(FridayBaseException):
+    """Friday Fake Backend Error in the SDK."""
+
+
+@dataclass
+class FridayFakeBackend:
+    """
+    Configuration of the deterministic local fake backend.
+
+    Attributes:
+        ttft_seconds (float): Time to first token in seconds.
+        inter_token_seconds (float): Time between two generated tokens in seconds.
+        tokens_per_chunk (int): Number of tokens per streamed chunk.
+        min_reply_tokens (int): Minimum number of tokens of a reply.
+        max_reply_tokens (int): Maximum number of tokens of a reply, before `max_output_tokens`.
+        error_rate (float): Probability of a transient server error (503) per request.
+        rate_limit_rate (float): Probability of a rate limit error (429) per request.
+        seed (int): Seed of the replies and errors.
+    """
+
+    ttft_seconds: float = 0.0
+    inter_token_seconds: float = 0.0
+    tokens_per_chunk: int = 4
+    min_reply_tokens: int = 20
+    max_reply_tokens: int = 60
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    seed: int = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["FridayFakeBackend"]:
+        """
+        Return the fake backend configured by `FRIDAY_FAKE_BACKEND`, e.g. `1` for the defaults or
+        `ttft_seconds=0.3,inter_token_seconds=0.02` for a latency profile.
+
+        Returns:
+            Optional[FridayFakeBackend]: Fake backend, or None if not configured.
+
+        Raises:
+            FridayFakeBackendError: Malformed `FRIDAY_FAKE_BACKEND`.
+        """
+        config = os.getenv("FRIDAY_FAKE_BACKEND", "").strip()
+        if config.lower() in ("", "0", "false", "no"):
+            return None
+        if config.lower() in ("1", "true", "yes"):
+            return cls()
+
+        types = {field.name: field.type for field in fields(cls)}
+        try:
+            values = dict(item.split("=", 1) for item in config.split(","))
+            return cls(**{name.strip(): types[name.strip()](value) for name, value in values.items()})
+        except (KeyError, ValueError) as err:
+            raise FridayFakeBackendError(
+                message=f"Invalid FRIDAY_FAKE_BACKEND: {config}, expected 1 or comma separated name=value settings of "
+                f"{', '.join(types)}...",
+                logger=CustomLogger(name="friday"),
+            ) from err
+
+    def model(self, model_name: str, system_instruction: Optional[str] = None) -> "FridayFakeModel":
+        """
+        Create a fake generative model.
+
+        Args:
+            model_name (str): Model name.
+            system_instruction (Optional[str]): System instruction, accounted in the prompt tokens.
+
+        Returns:
+            FridayFakeModel: Fake generative model.
+        """
+        return FridayFakeModel(self, model_name, system_instruction)
+
+
+class FridayFakeModel:
+    """
+    In-process simulator of the `GenerativeModel` API: `generate_content` (sync, async, streamed), `start_chat` and
+    `count_tokens`.
+
+    Attributes:
+        backend (FridayFakeBackend): Configuration of the fake backend.
+        model_name (str): Model name.
+        system_instruction (Optional[str]): System instruction.
+        cached_content (None): The fake backend has no context cache.
+        requests (int): Number of requests received.
+    """
+
+    cached_content = None
+
+    def __init__(self, backend: FridayFakeBackend, model_name: str, system_instruction: Optional[str] = None) -> None:
+        """
+        Initialize the fake generative model.
+
+        Args:
+            backend (FridayFakeBackend): Configuration of the fake backend.
+            model_name (str): Model name.
+            system_instruction (Optional[str]): System instruction, accounted in the prompt tokens.
+        """
+        self.backend = backend
+        self.model_name = model_name if model_name.startswith("models/") else f"models/{model_name}"
+        self.system_instruction = system_instruction
+        self.requests = 0
+        self.__lock = threading.Lock()
+        self.__errors = random.Random(backend.seed)
+
+    @staticmethod
+    def _tokens(text: str) -> int:
+        """Count the tokens of a text, ~4 characters per token."""
+        return math.ceil(len(text) / 4)
+
+    def _prompt_text(self, contents) -> str:
+        """Return the text of the contents of a request."""
+        return "\n".join(
+            part.text for content in content_types.to_contents(contents) for part in content.parts if "text" in part
+        )
+
+    def _prompt_tokens(self, contents) -> int:
+        """Count the prompt tokens of a request, including the system instruction."""
+        return self._tokens(self._prompt_text(contents)) + self._tokens(self.system_instruction or "")
+
+    def _raise_error(self) -> None:
+        """Raise a simulated server error according to the error rates."""
+        with self.__lock:
+            self.requests += 1
+            draw = self.__errors.random()
+        if draw < self.backend.rate_limit_rate:
+            raise exceptions.TooManyRequests("Fake backend: resource exhausted.")
+        if draw < self.backend.rate_limit_rate + self.backend.error_rate:
+            raise exceptions.ServiceUnavailable("Fake backend: service unavailable.")
+
+    def _reply(
+        self, contents, generation_config, index: int = 0
+    ) -> tuple[list[str], int, protos.Candidate.FinishReason]:
+        """
+        Generate the deterministic reply of a request.
+
+        Args:
+            contents: Contents of the request.
+            generation_config: Generation configuration, `max_output_tokens` is honoured.
+            index (int, optional): Index of the candidate, each candidate has its own reply. Defaults to 0.
+
+        Returns:
+            tuple[list[str], int, protos.Candidate.FinishReason]: Tokens of the reply, prompt tokens and finish reason.
+        """
+        prompt_text = self._prompt_text(contents)
+        rng = random.Random(f"{self.backend.seed}:{self.model_name}:{prompt_text}" + (f":{index}" if index else ""))
+        length = rng.randint(self.backend.min_reply_tokens, self.backend.max_reply_tokens)
+        max_output_tokens = to_generation_config_dict(generation_config).get("max_output_tokens") or length
+        finish_reason = protos.Candidate.FinishReason.STOP
+        if max_output_tokens < length:
+            length, finish_reason = max_output_tokens, protos.Candidate.FinishReason.MAX_TOKENS
+        tokens = [f"{rng.choice(VOCABULARY)} " for _ in range(length)]
+        if tokens:
+            tokens[-1] = tokens[-1].strip() + "."
+        prompt_tokens = self._tokens(prompt_text) + self._tokens(self.system_instruction or "")
+        return tokens, prompt_tokens, finish_reason
+
+    def _chunks(self, contents, generation_config) -> Iterator[tuple[float, protos.GenerateContentResponse]]:
+        """
+        Generate the streamed chunks of a reply with the delay before each chunk.
+
+        Yields:
+            tuple[float, protos.GenerateContentResponse]: Delay before the chunk in seconds, and the chunk.
+        """
+        tokens, prompt_tokens, finish_reason = self._reply(contents, generation_config)
+        size = max(self.backend.tokens_per_chunk, 1)
+        for start in range(0, max(len(tokens), 1), size):
+            chunk = tokens[start : start + size]
+            last = start + size >= len(tokens)
+            delay = (self.backend.ttft_seconds if start == 0 else 0) + self.backend.inter_token_seconds * len(chunk)
+            yield delay, protos.GenerateContentResponse(
+                candidates=[
+                    protos.Candidate(
+                        index=0,
+                        content=protos.Content(role="model", parts=[protos.Part(text="".join(chunk))]),
+                        finish_reason=finish_reason if last else None,
+                    )
+                ],
+                usage_metadata=protos.GenerateContentResponse.UsageMetadata(
+                    prompt_token_count=prompt_tokens,
+                    candidates_token_count=start + len(chunk),
+                    total_token_count=prompt_tokens + start + len(chunk),
+                ),
+            )
+
+    @staticmethod
+    def _join(chunks: list[protos.GenerateContentResponse]) -> protos.GenerateContentResponse:
+        """Join the chunks of a reply into a single response."""
+        response = type(chunks[-1])(chunks[-1])
+        response.candidates[0].content.parts[0].text = "".join(
+            chunk.candidates[0].content.parts[0].text for chunk in chunks
+        )
+        return response
+
+    def _add_candidates(self, response: protos.GenerateContentResponse, contents, generation_config) -> None:
+        """
+        Add the candidates after the first one to a complete response, according to `candidate_count`. The candidates
+        are generated in parallel, so they add no latency.
+        """
+        candidate_count = to_generation_config_dict(generation_config).get("candidate_count") or 1
+        if candidate_count <= 1:
+            return
+        usage_metadata = response.usage_metadata
+        response.candidates[0].token_count = usage_metadata.candidates_token_count
+        for index in range(1, candidate_count):
+            tokens, _, finish_reason = self._reply(contents, generation_config, index)
+            response.candidates.append(
+                protos.Candidate(
+                    index=index,
+                    content=protos.Content(role="model", parts=[protos.Part(text="".join(tokens))]),
+                    finish_reason=finish_reason,
+                    token_count=len(tokens),
+                )
+            )
+            usage_metadata.candidates_token_count += len(tokens)
+            usage_metadata.total_token_count += len(tokens)
+
+    def generate_content(self, contents, *, generation_config=None, stream: bool = False, **kwargs):
+        """
+        Simulate `GenerativeModel.generate_content`.
+
+        Args:
+            contents: Contents of the request.
+            generation_config: Generation configuration, `max_output_tokens` is honoured, and `candidate_count` when
+                not streamed.
+            stream (bool, optional): Stream the reply. Defaults to False.
+
+        Returns:
+            GenerateContentResponse: Response of the fake backend.
+        """
+        self._raise_error()
+        chunks = self._chunks(contents, generation_config)
+        if not stream:
+            replies = []
+            for delay, chunk in chunks:
+                time.sleep(delay)
+                replies.append(chunk)
+            response = self._join(replies)
+            self._add_candidates(response, contents, generation_config)
+            return GenerateContentResponse.from_response(response)
+
+        def stream_chunks() -> Iterator[protos.GenerateContentResponse]:
+            for delay, chunk in chunks:
+                time.sleep(delay)
+                yield chunk
+
+        return GenerateContentResponse.from_iterator(stream_chunks())
+
+    async def generate_content_async(self, contents, *, generation_config=None, stream: bool = False, **kwargs):
+        """
+        Simulate `GenerativeModel.generate_content_async`.
+
+        Args:
+            contents: Contents of the request.
+            generation_config: Generation configuration, `max_output_tokens` is honoured, and `candidate_count` when
+                not streamed.
+            stream (bool, optional): Stream the reply. Defaults to False.
+
+        Returns:
+            AsyncGenerateContentResponse: Response of the fake backend.
+        """
+        self._raise_error()
+        chunks = self._chunks(contents, generation_config)
+        if not stream:
+            replies = []
+            for delay, chunk in chunks:
+                await asyncio.sleep(delay)
+                replies.append(chunk)
+            response = self._join(replies)
+            self._add_candidates(response, contents, generation_config)
+            return AsyncGenerateContentResponse.from_response(response)
+
+        async def stream_chunks() -> AsyncIterator[protos.GenerateContentResponse]:
+            for delay, chunk in chunks:
+                await asyncio.sleep(delay)
+                yield chunk
+
+        return await AsyncGenerateContentResponse.from_aiterator(stream_chunks())
+
+    def count_tokens(self, contents, **kwargs) -> protos.CountTokensResponse:
+        """
+        Simulate `GenerativeModel.count_tokens`.
+
+        Args:
+            contents: Contents to count.
+
+        Returns:
+            protos.CountTokensResponse: Token count of the contents, including the system instruction.
+        """
+        return protos.CountTokensResponse(total_tokens=self._prompt_tokens(contents))
+
+    async def count_tokens_async(self, contents, **kwargs) -> protos.CountTokensResponse:
+        """
+        Simulate `GenerativeModel.count_tokens_async`.
+
+        Args:
+            contents: Contents to count.
+
+        Returns:
+            protos.CountTokensResponse: Token count of the contents, including the system instruction.
+        """
+        return self.count_tokens(contents)
+
+    def start_chat(self, history=None, **kwargs) -> ChatSession:
+        """
+        Simulate `GenerativeModel.start_chat`.
+
+        Args:
+            history: History of the chat session.
+
+        Returns:
+            ChatSession: Chat session on the fake backend.
+        """
+        return ChatSession(model=self, history=history)
+
+    def _get_tools_lib(self, tools) -> None:
+        """The fake backend has no tools."""
+        return None
+
+    def __repr__(self) -> str:
+        """String representation of the fake model."""
+        return f"FridayFakeModel(model_name={self.model_name!r}, backend={self.backend})"
@@ -1,54 +1,648 @@
 """Generation SDKs for Friday built from Google Generative AI."""
 
 # Standard Library
-from typing import Annotated, Optional
-from dataclasses import dataclass
+import time
+import asyncio
+import inspect
+from itertools import islice
+from dataclasses import dataclass, field
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Annotated, Callable, Iterable, Iterator, Optional
 
 # Project Library
 from friday.utilities.logger import CustomLogger
 from friday.utilities.exceptions import FridayBaseException
 from friday.sdk.model import GoogleAIModel
+from friday.sdk.cache import FridayResponseCache
+from friday.sdk.candidates import FridayCandidate, FridayCandidateSelector, response_candidates, select_first
+from friday.sdk.hedging import FridayHedgingPolicy
+from friday.sdk.router import FridayModelRouter
+from friday.sdk.semantic_cache import FridaySemanticCache
+from friday.sdk.tokens import FridayTokenEstimator, TokenCountable
+from friday.sdk.rate_limit import FridayRateLimiter, FridayRetryPolicy
+from friday.sdk.metrics import FridayCallTimer, FridayMetrics
 
 # Type hints
-from google.generativeai.generative_models import ChatSession
-from google.generativeai.types.generation_types import GenerateContentResponse, StopCandidateException
+from google.generativeai.generative_models import ChatSession, GenerativeModel
+from google.generativeai.types.generation_types import (
+    BrokenResponseError,
+    GenerateContentResponse,
+    IncompleteIterationError,
+    StopCandidateException,
+    to_generation_config_dict,
+)
+from google.generativeai.types import content_types
 from google.generativeai import GenerationConfig, protos
 
 
+# Finish reasons for which a streamed candidate is considered complete
+_COMPLETE_FINISH_REASONS = (
+    protos.Candidate.FinishReason.FINISH_REASON_UNSPECIFIED,
+    protos.Candidate.FinishReason.STOP,
+    protos.Candidate.FinishReason.MAX_TOKENS,
+)
+
+
 class FridayGenerationError(FridayBaseException):
     """Friday Generation Error in the SDK."""
 
 
 @dataclass
 class FridayResponse:
-    """Friday Response for the Generation SDK."""
+    """
+    Friday Response for the Generation SDK.
+
+    Attributes:
+        response (str): Text of the response, the selected candidate when several candidates were generated.
+        response_object (Optional[GenerateContentResponse]): Response of the model.
+        candidates (list[FridayCandidate]): Every candidate of the response, with its finish reason, safety ratings
+            and token count. Empty for streamed chunks.
+        selected (int): Position of the selected candidate in `candidates`.
+    """
 
     response: str
     response_object: Optional[GenerateContentResponse] = None
+    candidates: list[FridayCandidate] = field(default_factory=list)
+    selected: int = 0
+
+    @property
+    def candidate(self) -> Optional[FridayCandidate]:
+        """Selected candidate of the response. None for streamed chunks."""
+        return self.candidates[self.selected] if self.candidates else None
+
+    @classmethod
+    def from_response(
+        cls,
+        response: GenerateContentResponse,
+        selector: FridayCandidateSelector = select_first,
+        count_tokens: Optional[Callable[[str], int]] = None,
+    ) -> "FridayResponse":
+        """
+        Wrap a complete response of the model with every candidate, and select the candidate used as the reply.
+
+        Args:
+            response (GenerateContentResponse): Response of the model.
+            selector (FridayCandidateSelector, optional): Selection of the reply among several candidates. Defaults
+                to the first complete candidate.
+            count_tokens (Optional[Callable[[str], int]]): Token counter estimating the tokens of each candidate
+                when several candidates are generated. Defaults to None.
+
+        Returns:
+            FridayResponse: Response with its candidates.
+        """
+        candidates = response_candidates(response, count_tokens)
+        if len(candidates) <= 1:
+            # A single candidate keeps the errors of the `text` accessor for blocked responses
+            return cls(response=response.text, response_object=response, candidates=candidates)
+        selected = candidates.index(selector(candidates))
+        return cls(
+            response=candidates[selected].text, response_object=response, candidates=candidates, selected=selected
+        )
 
     def __str__(self) -> str:
         """Return the response as a string."""
         return f"Response: {self.response.strip()}"
 
 
-class GoogleAIGeneration:
+class FridayStreamResponse:
+    """
+    Streamed Friday Response for the Generation SDK.
+
+    Iterating over the stream yields partial `FridayResponse` chunks as soon as the model produces them. Once the
+    stream is exhausted, `response` holds the full text and `response_object` the resolved response, including the
+    final usage metadata. A stream can be iterated only once.
+
+    Attributes:
+        response (str): Text received so far. Full response text once the stream is exhausted.
+        response_object (GenerateContentResponse): Streaming response object from the model.
+        done (bool): True once the stream has been fully received.
+        error (Optional[BaseException]): Error which ended the stream, if any.
+    """
+
+    def __init__(
+        self,
+        response_object: GenerateContentResponse,
+        logger=None,
+        on_abort: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Initialize the streamed Friday Response.
+
+        Args:
+            response_object (GenerateContentResponse): Streaming response object returned with `stream=True`.
+            logger (logging.Logger, optional): Logger for the stream errors. Defaults to None.
+            on_abort (Optional[Callable[[], None]]): Callback invoked when the stream fails or is closed before
+                completion. Used to roll back the chat history. Defaults to None.
+        """
+        self.response_object = response_object
+        self.logger = logger
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._chunks: list[str] = []
+        self._on_abort = on_abort
+        self._done_callbacks: list[Callable[[], None]] = []
+        self._iterated = False
+        self._finalized = False
+
+    @property
+    def response(self) -> str:
+        """Text received so far. Full response text once the stream is exhausted."""
+        return "".join(self._chunks)
+
+    @property
+    def usage_metadata(self) -> Optional[protos.GenerateContentResponse.UsageMetadata]:
+        """Usage metadata of the response. Available only once the stream is exhausted."""
+        if not self.done:
+            return None
+        return self.response_object.usage_metadata
+
+    @staticmethod
+    def _chunk_text(chunk: GenerateContentResponse) -> str:
+        """
+        Extract the text of a streamed chunk. Chunks without text parts (e.g. a trailing finish reason) are empty.
+
+        Args:
+            chunk (GenerateContentResponse): Streamed chunk from the model.
+
+        Returns:
+            str: Text of the chunk.
+        """
+        if not chunk.candidates:
+            return ""
+        return "".join(part.text for part in chunk.candidates[0].content.parts if "text" in part)
+
+    def _start(self) -> None:
+        """
+        Mark the stream as being iterated.
+
+        Raises:
+            FridayGenerationError: Stream already consumed.
+        """
+        if self._iterated:
+            raise FridayGenerationError(
+                message="Friday stream response can be iterated only once...", logger=self.logger
+            )
+        self._iterated = True
+
+    def _receive(self, chunk: GenerateContentResponse) -> FridayResponse:
+        """
+        Record a streamed chunk and wrap it as a partial response.
+
+        Args:
+            chunk (GenerateContentResponse): Streamed chunk from the model.
+
+        Returns:
+            FridayResponse: Partial response chunk.
+        """
+        text = self._chunk_text(chunk)
+        self._chunks.append(text)
+        return FridayResponse(response=text, response_object=chunk)
+
+    def _complete(self) -> None:
+        """
+        Validate the finish reason of the exhausted stream and mark it as done.
+
+        Raises:
+            StopCandidateException: The model stopped the candidate abnormally.
+        """
+        candidates = self.response_object.candidates
+        if candidates and candidates[0].finish_reason not in _COMPLETE_FINISH_REASONS:
+            raise StopCandidateException(candidates[0])
+        self.done = True
+
+    def add_done_callback(self, callback: Callable[[], None]) -> None:
+        """
+        Register a callback invoked once the stream ends, whether it completed, failed or was closed.
+
+        Args:
+            callback (Callable[[], None]): Callback to invoke.
+        """
+        self._done_callbacks.append(callback)
+
+    def _finalize(self) -> None:
+        """Invoke the abort callback if the stream ended without completing, then the done callbacks. Runs once."""
+        if self._finalized:
+            return
+        self._finalized = True
+        try:
+            if not self.done and self._on_abort:
+                self._on_abort()
+        finally:
+            for callback in self._done_callbacks:
+                callback()
+
+    def __iter__(self) -> Iterator[FridayResponse]:
+        """
+        Iterate over the partial responses from the model.
+
+        Yields:
+            FridayResponse: Partial response chunk from the model.
+
+        Raises:
+            FridayGenerationError: Stream already consumed, or the model stopped the candidate abnormally.
+        """
+        self._start()
+        try:
+            for chunk in self.response_object:
+                yield self._receive(chunk)
+            self._complete()
+        except (StopCandidateException, BrokenResponseError, IncompleteIterationError) as err:
+            self.error = FridayGenerationError(message=str(err), logger=self.logger)
+            raise self.error from err
+        except Exception as err:
+            self.error = err
+            raise
+        finally:
+            self._finalize()
+
+    def resolve(self) -> FridayResponse:
+        """
+        Consume the remaining stream and return the full response.
+
+        Returns:
+            FridayResponse: Full response from the model.
+        """
+        if not self._iterated:
+            for _ in self:
+                pass
+        return FridayResponse(
+            response=self.response,
+            response_object=self.response_object,
+            candidates=response_candidates(self.response_object),
+        )
+
+    def __str__(self) -> str:
+        """Return the response received so far as a string."""
+        return f"Response: {self.response.strip()}"
+
+
+@dataclass
+class FridayBatchResult:
+    """
+    Result of a prompt of a batch generation.
+
+    Attributes:
+        index (int): Index of the prompt in the batch.
+        prompt (str): Prompt for generating content.
+        response (Optional[FridayResponse]): Response from the model. None if the generation failed.
+        error (Optional[FridayGenerationError]): Error of the generation. None if the generation succeeded.
+    """
+
+    index: int
+    prompt: str
+    response: Optional[FridayResponse] = None
+    error: Optional[FridayGenerationError] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the generation succeeded."""
+        return self.error is None
+
+
+@dataclass
+class FridayBatchUsage:
+    """
+    Aggregate usage of a batch generation.
+
+    Attributes:
+        succeeded (int): Number of prompts generated.
+        failed (int): Number of prompts which failed.
+        prompt_token_count (int): Number of prompt tokens.
+        candidates_token_count (int): Number of response tokens.
+        total_token_count (int): Number of prompt and response tokens.
+    """
+
+    succeeded: int = 0
+    failed: int = 0
+    prompt_token_count: int = 0
+    candidates_token_count: int = 0
+    total_token_count: int = 0
+
+    def add(self, result: FridayBatchResult) -> None:
+        """
+        Add the usage of a result.
+
+        Args:
+            result (FridayBatchResult): Result of a prompt of the batch.
+        """
+        if not result.ok:
+            self.failed += 1
+            return
+        self.succeeded += 1
+        usage_metadata = result.response.response_object.usage_metadata
+        self.prompt_token_count += usage_metadata.prompt_token_count
+        self.candidates_token_count += usage_metadata.candidates_token_count
+        self.total_token_count += usage_metadata.total_token_count
+
+
+@dataclass
+class FridayBatchResponse:
+    """
+    Batch of prompts generated by a bounded worker pool.
+
+    Iterating over the batch runs the prompts on up to `max_workers` threads and yields a `FridayBatchResult` per
+    prompt, in input order or as completed. The prompts are read lazily and at most `4 * max_workers` prompts are in
+    flight or waiting to be yielded, so that arbitrarily large batches run in bounded memory. A failed prompt yields a
+    result with its `FridayGenerationError` and does not abort the batch. A batch can be iterated only once.
+
+    Attributes:
+        generate (Callable[[str], FridayResponse]): Generation of a prompt.
+        prompts (Iterable[str]): Prompts for generating content.
+        max_workers (int): Maximum number of concurrent requests.
+        ordered (bool): Yield the results in input order, otherwise as completed.
+        usage (FridayBatchUsage): Aggregate usage of the results yielded so far.
+        logger (Optional[CustomLogger]): Logger for the generation errors.
+    """
+
+    generate: Callable[[str], FridayResponse]
+    prompts: Iterable[str]
+    max_workers: int = 8
+    ordered: bool = True
+    usage: FridayBatchUsage = field(default_factory=FridayBatchUsage)
+    logger: Optional[CustomLogger] = None
+
+    def _run(self, index: int, prompt: str) -> FridayBatchResult:
+        """
+        Generate a prompt of the batch, isolating its error.
+
+        Args:
+            index (int): Index of the prompt in the batch.
+            prompt (str): Prompt for generating content.
+
+        Returns:
+            FridayBatchResult: Result of the prompt.
+        """
+        try:
+            return FridayBatchResult(index=index, prompt=prompt, response=self.generate(prompt))
+        except FridayGenerationError as err:
+            return FridayBatchResult(index=index, prompt=prompt, error=err)
+        except Exception as err:
+            error = FridayGenerationError(message=f"Failed to generate prompt {index}: {err}", logger=self.logger)
+            error.__cause__ = err
+            return FridayBatchResult(index=index, prompt=prompt, error=error)
+
+    def __iter__(self) -> Iterator[FridayBatchResult]:
+        """
+        Run the batch and iterate over the results.
+
+        Yields:
+            FridayBatchResult: Result of a prompt, in input order or as completed.
+        """
+        window = 4 * self.max_workers
+        prompts = enumerate(self.prompts)
+        pending: set[Future[FridayBatchResult]] = set()
+        completed: dict[int, FridayBatchResult] = {}
+        next_index = 0
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="friday-batch")
+
+        def submit() -> None:
+            for index, prompt in islice(prompts, max(window - len(pending) - len(completed), 0)):
+                pending.add(executor.submit(self._run, index, prompt))
+
+        try:
+            submit()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending.difference_update(done)
+                for future in done:
+                    result = future.result()
+                    self.usage.add(result)
+                    if self.ordered:
+                        completed[result.index] = result
+                    else:
+                        yield result
+
+                while next_index in completed:
+                    yield completed.pop(next_index)
+                    next_index += 1
+                submit()
+        finally:
+            # Prompts not started yet are dropped when the iteration is stopped early
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def resolve(self) -> list[FridayBatchResult]:
+        """
+        Run the batch and return every result in input order.
+
+        Returns:
+            list[FridayBatchResult]: Results of the prompts in input order.
+        """
+        return sorted(self, key=lambda result: result.index)
+
+
+class GoogleAIBaseGeneration:
     """
-    Generation SDK for Friday built from Google Generative AI.
+    Configuration and helpers shared by the sync and async Generation SDKs for Friday built from Google Generative
+    AI.
 
     Attributes:
         genai_model (GoogleAIModel): Google Generative AI Model Configuration for Friday.
+        cache (Optional[FridayResponseCache]): Response cache for `generate_content`. Disabled when None.
+        semantic_cache (Optional[FridaySemanticCache]): Semantic response cache for `generate_content`, looked up on
+            a response cache miss. Disabled when None.
+        token_estimator (FridayTokenEstimator): Offline token estimator, calibrated with the usage metadata of the
+            responses.
+        rate_limiter (Optional[FridayRateLimiter]): Client-side RPM/TPM rate limiter of `genai_model`. The models
+            chosen by the router and the hedging fallback model get their own `FridayRateLimiter.for_model`. Disabled
+            when None.
+        retry_policy (FridayRetryPolicy): Retry policy for rate limit and transient server errors.
+        metrics (FridayMetrics): Per-request latency and token metrics.
+        candidate_selector (FridayCandidateSelector): Selection of the reply when several candidates are generated
+            (`candidate_count` > 1), e.g. `select_longest`.
+        hedging (Optional[FridayHedgingPolicy]): Hedging policy duplicating the slow model calls. Disabled when None.
+        router (Optional[FridayModelRouter]): Router sending each request to the model meeting its quality tier. All
+            the requests are sent to `genai_model` when None.
     """
 
-    def __init__(self, genai_model: GoogleAIModel) -> None:
+    def __init__(
+        self,
+        genai_model: GoogleAIModel,
+        cache: Optional[FridayResponseCache] = None,
+        token_estimator: Optional[FridayTokenEstimator] = None,
+        rate_limiter: Optional[FridayRateLimiter] = None,
+        retry_policy: Optional[FridayRetryPolicy] = None,
+        metrics: Optional[FridayMetrics] = None,
+        semantic_cache: Optional[FridaySemanticCache] = None,
+        candidate_selector: FridayCandidateSelector = select_first,
+        hedging: Optional[FridayHedgingPolicy] = None,
+        router: Optional[FridayModelRouter] = None,
+    ) -> None:
         """
         Generators for Google Generative AI.
 
         Args:
             model (GoogleAIModel): Google Generative AI Model Configuration for Friday.
+            cache (Optional[FridayResponseCache]): Response cache for `generate_content`. Defaults to None (disabled).
+            token_estimator (Optional[FridayTokenEstimator]): Offline token estimator. Defaults to the saved
+                calibration, or the uncalibrated estimator, kept in memory. Pass `FridayTokenEstimator.load(path)` to
+                persist its calibrations.
+            rate_limiter (Optional[FridayRateLimiter]): Client-side RPM/TPM rate limiter of `genai_model`, e.g.
+                `FridayRateLimiter.for_model(model_name)`. The other models are rate limited with their own quota.
+                Defaults to None (disabled).
+            retry_policy (Optional[FridayRetryPolicy]): Retry policy for rate limit and transient server errors.
+                Defaults to `FridayRetryPolicy()`.
+            metrics (Optional[FridayMetrics]): Per-request latency and token metrics. Defaults to the process-wide
+                `FridayMetrics.default()`.
+            semantic_cache (Optional[FridaySemanticCache]): Semantic response cache for `generate_content`, serving
+                paraphrased prompts. Defaults to None (disabled).
+            candidate_selector (FridayCandidateSelector, optional): Selection of the reply when several candidates
+                are generated. Defaults to the first complete candidate.
+            hedging (Optional[FridayHedgingPolicy]): Hedging policy duplicating the model calls which are slower than
+                usual, possibly to a fallback model. Defaults to None (disabled).
+            router (Optional[FridayModelRouter]): Router sending each request to the cheapest or fastest model meeting
+                its quality tier, e.g. `FridayModelRouter.default(genai_model)`. Defaults to None, sending every
+                request to `genai_model`.
         """
-        self.__model = genai_model.model
+        self._genai_model = genai_model
+        self.cache = cache
+        self.semantic_cache = semantic_cache
+        self.token_estimator = token_estimator or FridayTokenEstimator.load()
+        if getattr(genai_model, "fake_backend", None) is not None:
+            # Never persist a calibration fitted against the fake backend
+            self.token_estimator.path = None
+        if self.token_estimator.remote_counter is None:
+            self.token_estimator.remote_counter = lambda text: self._model.count_tokens(text).total_tokens
+        self.rate_limiter = rate_limiter
+        self.__rate_limiters = {genai_model.model_name: rate_limiter} if rate_limiter is not None else {}
+        self.retry_policy = retry_policy or FridayRetryPolicy()
+        self.metrics = metrics or FridayMetrics.default()
+        self.candidate_selector = candidate_selector
+        self.hedging = hedging
+        self.router = router
         self.logger = CustomLogger(name="friday")
 
+    @property
+    def _model(self) -> GenerativeModel:
+        """Generative model for the next request, which switches to the context cached model while it is live."""
+        return self._genai_model.model
+
+    def _rate_limiter(self, genai_model: GoogleAIModel) -> Optional[FridayRateLimiter]:
+        """
+        Return the rate limiter of a model, created with its own quota the first time the router or the hedging policy
+        sends a request to it.
+
+        Args:
+            genai_model (GoogleAIModel): Model of the request.
+
+        Returns:
+            Optional[FridayRateLimiter]: Rate limiter of the model, or None when rate limiting is disabled.
+        """
+        if self.rate_limiter is None:
+            return None
+        rate_limiter = self.__rate_limiters.get(genai_model.model_name)
+        if rate_limiter is None:
+            rate_limiter = self.__rate_limiters.setdefault(
+                genai_model.model_name, FridayRateLimiter.for_model(genai_model.model_name)
+            )
+        return rate_limiter
+
+    def _route(self, operation: str, prompt: str, hint: Optional[str] = None) -> GoogleAIModel:
+        """
+        Choose the model of a request with the router, when enabled.
+
+        Args:
+            operation (str): SDK operation, e.g. `generate_content`.
+            prompt (str): Prompt of the request.
+            hint (Optional[str]): Quality tier requested for the request. Defaults to None.
+
+        Returns:
+            GoogleAIModel: Model of the request.
+        """
+        if self.router is None:
+            return self._genai_model
+        return self.router.route(operation, self.token_estimator.count(prompt), hint=hint).model
+
+    def _route_chat(self, operation: str, chat: ChatSession, message: str, hint: Optional[str] = None) -> GoogleAIModel:
+        """
+        Choose the model of a chat session with the router, when enabled. The chat session is routed on its first
+        message and pinned to that model, so that it does not hop models mid-conversation.
+
+        Args:
+            operation (str): SDK operation, e.g. `send_chat_message`.
+            chat (ChatSession): Chat session created with Friday.
+            message (str): Message to be sent to the chat session.
+            hint (Optional[str]): Quality tier requested for the chat session. Defaults to None.
+
+        Returns:
+            GoogleAIModel: Model of the chat session.
+        """
+        if self.router is None:
+            return self._genai_model
+        route = self.router.pinned(chat)
+        if route is None:
+            route = self.router.route(
+                operation, self.token_estimator.count(message), history_turns=len(chat.history) // 2, hint=hint
+            )
+            self.router.pin(chat, route)
+            chat.model = route.model.model
+        return route.model
+
+    @staticmethod
+    def _close_response(response: GenerateContentResponse) -> None:
+        """
+        Close a streamed response which is not read, cancelling the stream. Complete responses are left as they are.
+        An asynchronous stream is closed in the background on the running event loop.
+
+        Args:
+            response (GenerateContentResponse): Response of the model.
+        """
+        iterator = getattr(response, "_iterator", None)
+        close = next(
+            (getattr(iterator, name) for name in ("cancel", "close", "aclose") if hasattr(iterator, name)), None
+        )
+        if close is not None and inspect.isawaitable(closing := close()):
+            asyncio.ensure_future(closing)
+
+    def _cancel_hedge(self, result: tuple[GenerateContentResponse, int, Optional[FridayRateLimiter]]) -> None:
+        """
+        Cancel the losing call of a hedged request, and settle its reserved tokens with its usage metadata, or refund
+        them when it was cancelled before any usage was reported.
+
+        Args:
+            result (tuple[GenerateContentResponse, int, Optional[FridayRateLimiter]]): Response of the losing call,
+                the tokens reserved for it and the rate limiter they were reserved with.
+        """
+        response, tokens, rate_limiter = result
+        self._close_response(response)
+        if rate_limiter is not None:
+            usage_metadata = getattr(response, "usage_metadata", None)
+            rate_limiter.settle(tokens, usage_metadata.total_token_count if usage_metadata else 0)
+
+    @staticmethod
+    def _settle_usage(
+        rate_limiter: Optional[FridayRateLimiter],
+        tokens: int,
+        usage_metadata: Optional[protos.GenerateContentResponse.UsageMetadata],
+    ) -> None:
+        """
+        Settle the tokens reserved for a call with the usage metadata of its response.
+
+        Args:
+            rate_limiter (Optional[FridayRateLimiter]): Rate limiter the tokens were reserved with.
+            tokens (int): Tokens reserved for the call.
+            usage_metadata (Optional[protos.GenerateContentResponse.UsageMetadata]): Usage metadata of the response.
+        """
+        if rate_limiter is not None and usage_metadata is not None:
+            rate_limiter.settle(tokens, usage_metadata.total_token_count)
+
+    @staticmethod
+    def _timed_stream(stream: FridayStreamResponse, timer: FridayCallTimer) -> FridayStreamResponse:
+        """
+        Record the metrics of a streamed call once the stream ends. The model call returns with the first chunk, so
+        the time to first token is taken right away.
+
+        Args:
+            stream (FridayStreamResponse): Streamed response.
+            timer (FridayCallTimer): Timer of the call.
+
+        Returns:
+            FridayStreamResponse: The same streamed response.
+        """
+        timer.first_token()
+        stream.add_done_callback(lambda: timer.finish(stream.usage_metadata, error=stream.error))
+        return stream
+
     @staticmethod
     def generation_config(
         candidate_count: int = 1, max_output_tokens: int = 1000, temperature: float = 0.5
@@ -70,43 +664,392 @@ class GoogleAIGeneration:
             temperature=temperature,
         )
 
+    def _response(
+        self, response: GenerateContentResponse, selector: Optional[FridayCandidateSelector] = None
+    ) -> FridayResponse:
+        """
+        Wrap a complete response of the model with its candidates.
+
+        Args:
+            response (GenerateContentResponse): Response of the model.
+            selector (Optional[FridayCandidateSelector]): Selection of the reply among several candidates. Defaults
+                to `candidate_selector`.
+
+        Returns:
+            FridayResponse: Response with its candidates.
+        """
+        return FridayResponse.from_response(
+            response, selector=selector or self.candidate_selector, count_tokens=self.token_estimator.count
+        )
+
+    @staticmethod
+    def _candidates_text(response: FridayResponse) -> str:
+        """Text of every candidate of a response, which the candidate tokens of its usage metadata account for."""
+        return "".join(candidate.text for candidate in response.candidates) or response.response
+
+    def _cache_lookup(
+        self,
+        genai_model: GoogleAIModel,
+        prompt: str,
+        generation_config: Optional[GenerationConfig],
+        use_cache: Optional[bool],
+    ) -> tuple[Optional[GenerateContentResponse], Optional[Callable[[GenerateContentResponse], None]]]:
+        """
+        Look a request up in the response cache, then in the semantic cache.
+
+        Args:
+            genai_model (GoogleAIModel): Model of the request.
+            prompt (str): Prompt for generating content.
+            generation_config (Optional[GenerationConfig]): Generation configuration for the model.
+            use_cache (Optional[bool]): Use the caches. When None, only deterministic requests (temperature 0) are
+                cached.
+
+        Returns:
+            tuple[Optional[GenerateContentResponse], Optional[Callable[[GenerateContentResponse], None]]]: Cached
+                response, or None on a miss. On a miss of a cacheable request, the callback caching its response.
+        """
+        if self.cache is None and self.semantic_cache is None:
+            return None, None
+        if use_cache is None:
+            use_cache = to_generation_config_dict(generation_config).get("temperature") == 0
+        if not use_cache:
+            return None, None
+
+        cache_key = scope = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(
+                genai_model.model_name, genai_model.system_instruction, prompt, generation_config
+            )
+            if response := self.cache.get(cache_key):
+                return response, None
+        if self.semantic_cache is not None:
+            scope = self.semantic_cache.make_scope(
+                genai_model.model_name, genai_model.system_instruction, generation_config
+            )
+            if response := self.semantic_cache.get(scope, prompt):
+                return response, None
+
+        def cache_response(response: GenerateContentResponse) -> None:
+            if cache_key is not None:
+                self.cache.put(cache_key, response)
+            if scope is not None:
+                self.semantic_cache.put(scope, prompt, response)
+
+        return None, cache_response
+
+    def start_new_chat(self, history: Optional[list[protos.Content]] = None) -> ChatSession:
+        """
+        Start a new chat session with Friday using google generativeai ChatSession.
+
+        Args:
+            history (Optional[list[protos.Content]]): History to resume the chat session from. Defaults to empty.
+
+        Returns:
+            ChatSession: Chat session created with Friday using google generativeai ChatSession.
+        """
+        return self._model.start_chat(history=history or [])
+
+    @staticmethod
+    def _candidate_count(generation_config: Optional[GenerationConfig]) -> int:
+        """Number of candidates requested by a generation configuration."""
+        return to_generation_config_dict(generation_config).get("candidate_count") or 1
+
+    def _direct_chat(self, generation_config: Optional[GenerationConfig]) -> bool:
+        """
+        Whether chat turns are generated from the chat history directly rather than sent with `ChatSession`, which
+        only sends a single candidate and cannot send a message twice. The turn is then added to the history by
+        `_add_chat_turn`, so that the history stays consistent.
+        """
+        return self.hedging is not None or self._candidate_count(generation_config) > 1
+
+    def _reply_content(self, response: FridayResponse) -> protos.Content:
+        """
+        Return the content of the selected candidate of a chat turn generated directly, to add to the chat history.
+
+        Args:
+            response (FridayResponse): Response with its selected candidate.
+
+        Returns:
+            protos.Content: Reply of the chat turn.
+
+        Raises:
+            FridayGenerationError: The prompt was blocked, or the model stopped every candidate abnormally.
+        """
+        candidate = response.candidate
+        if candidate is None or not candidate.complete:
+            feedback = response.response_object.prompt_feedback
+            reason = f"finish reason {candidate.finish_reason}" if candidate else f"prompt feedback {feedback}"
+            raise FridayGenerationError(message=f"No candidate to reply with: {reason}...", logger=self.logger)
+        return candidate.content
+
+    @staticmethod
+    def _add_chat_turn(
+        chat: ChatSession, history: list[protos.Content], message: protos.Content, reply: protos.Content
+    ) -> None:
+        """
+        Add a chat turn generated directly to the chat history.
+
+        Args:
+            chat (ChatSession): Chat session created with Friday.
+            history (list[protos.Content]): Chat history the message was sent with.
+            message (protos.Content): Message sent to the chat session.
+            reply (protos.Content): Reply of the model.
+        """
+        reply = type(reply)(reply)
+        reply.role = reply.role or "model"
+        chat.history = history + [message, reply]
+
+    def get_chat_history(self, chat: ChatSession) -> list[str]:
+        """
+        Get chat history from the chat session with Friday and return the chat history as a dictionary with role as
+        key and message as value.
+
+        Args:
+            chat (ChatSession): Chat session created with Friday using google generativeai ChatSession.
+
+        Returns:
+            list[str]: Chat history from the chat session with Friday.
+        """
+        return [f"{message.role}: {message.parts[0].text}" for message in chat.history]
+
+
+class GoogleAIGeneration(GoogleAIBaseGeneration):
+    """
+    Generation SDK for Friday built from Google Generative AI, configured as `GoogleAIBaseGeneration`.
+    """
+
+    def _call_model(
+        self,
+        call: Callable[[], GenerateContentResponse],
+        contents: TokenCountable,
+        message: str = "",
+        genai_model: Optional[GoogleAIModel] = None,
+    ) -> tuple[GenerateContentResponse, int, Optional[FridayRateLimiter]]:
+        """
+        Call the model, throttled by its rate limiter and retried on rate limit and transient server errors.
+
+        Args:
+            call (Callable[[], GenerateContentResponse]): Model call.
+            contents (TokenCountable): Prompt or chat history sent with the call, to estimate its tokens.
+            message (str, optional): Message sent with the chat history. Defaults to "".
+            genai_model (Optional[GoogleAIModel]): Model of the call. Defaults to `genai_model`.
+
+        Returns:
+            tuple[GenerateContentResponse, int, Optional[FridayRateLimiter]]: Response of the model, the tokens
+                reserved for the call and the rate limiter they were reserved with.
+        """
+        rate_limiter = self._rate_limiter(genai_model or self._genai_model)
+        tokens = 0
+        if rate_limiter is not None:
+            tokens = self.token_estimator.count(contents) + self.token_estimator.count(message)
+        return self.retry_policy.call(call, rate_limiter=rate_limiter, tokens=tokens), tokens, rate_limiter
+
+    def _call_hedged(
+        self,
+        operation: str,
+        request: Callable[[GenerativeModel], GenerateContentResponse],
+        contents: TokenCountable,
+        message: str = "",
+        genai_model: Optional[GoogleAIModel] = None,
+    ) -> tuple[GenerateContentResponse, int, Optional[FridayRateLimiter]]:
+        """
+        Call the model, hedged by the hedging policy when enabled, and record its latency for the router. The request
+        must not change any state, e.g. the chat session, since the hedge sends it again.
+
+        Args:
+            operation (str): SDK operation, e.g. `generate_content`.
+            request (Callable[[GenerativeModel], GenerateContentResponse]): Request to a generative model.
+            contents (TokenCountable): Prompt or chat history sent with the call, to estimate its tokens.
+            message (str, optional): Message sent with the chat history. Defaults to "".
+            genai_model (Optional[GoogleAIModel]): Model chosen by the router. Defaults to `genai_model`.
+
+        Returns:
+            tuple[GenerateContentResponse, int, Optional[FridayRateLimiter]]: Response of the model, the tokens
+                reserved for the call and the rate limiter they were reserved with.
+        """
+        genai_model = genai_model or self._genai_model
+        start = time.perf_counter()
+        if self.hedging is None:
+            result = self._call_model(lambda: request(genai_model.model), contents, message, genai_model)
+        else:
+            hedge_model = self.hedging.fallback_model or genai_model
+            result, won = self.hedging.call(
+                operation,
+                lambda: self._call_model(lambda: request(genai_model.model), contents, message, genai_model),
+                lambda: self._call_model(lambda: request(hedge_model.model), contents, message, hedge_model),
+                cancel=self._cancel_hedge,
+            )
+            if won is not None:
+                self.metrics.record_hedge(operation, hedge_model.model_name, won)
+        if self.router is not None:
+            self.router.observe(genai_model.model_name, operation, time.perf_counter() - start)
+        return result
+
     def generate_content(
-        self, prompt: str, *, generation_config: Optional[GenerationConfig] = generation_config()
+        self,
+        prompt: str,
+        *,
+        generation_config: Optional[GenerationConfig] = GoogleAIBaseGeneration.generation_config(),
+        use_cache: Optional[bool] = None,
+        selector: Optional[FridayCandidateSelector] = None,
+        hint: Optional[str] = None,
     ) -> FridayResponse:
         """
-        Generate content using the configured model.
+        Generate content using the configured model. With `candidate_count` > 1, every candidate is generated by the
+        same request and returned in `FridayResponse.candidates`.
 
         Args:
             prompt (str): Prompt for generating content.
             generation_config (Optional[GenerationConfig]): Generation configuration for the model.
                 Defaults to GoogleAIGeneration.generation_config().
+            use_cache (Optional[bool]): Serve the response from the response cache, or the semantic cache, when
+                available. Defaults to None, which caches only deterministic requests (temperature 0). Ignored when
+                the caches are disabled.
+            selector (Optional[FridayCandidateSelector]): Selection of the response text among several candidates.
+                Defaults to `candidate_selector`.
+            hint (Optional[str]): Quality tier of the request for the router, e.g. `best`. Defaults to None, which
+                classifies the request by its size. Ignored when the router is disabled.
 
         Returns:
             FridayResponse: Response from the model for the prompt.
         """
-        response: GenerateContentResponse = self.__model.generate_content(prompt, generation_config=generation_config)
-        return FridayResponse(response=response.text, response_object=response)
+        genai_model = self._route("generate_content", prompt, hint)
+        timer = self.metrics.timer("generate_content", genai_model.model_name)
+        response, cache_response = self._cache_lookup(genai_model, prompt, generation_config, use_cache)
+        if response is not None:
+            timer.finish(response.usage_metadata, cache_hit=True)
+            return self._response(response, selector)
 
-    def start_new_chat(self) -> ChatSession:
+        try:
+            response, tokens, rate_limiter = self._call_hedged(
+                "generate_content",
+                lambda model: model.generate_content(prompt, generation_config=generation_config),
+                prompt,
+                genai_model=genai_model,
+            )
+        except Exception as err:
+            timer.finish(error=err)
+            raise
+        timer.finish(response.usage_metadata)
+        self._settle_usage(rate_limiter, tokens, response.usage_metadata)
+        if cache_response is not None:
+            cache_response(response)
+        result = self._response(response, selector)
+        self.token_estimator.record(prompt, self._candidates_text(result), response.usage_metadata)
+        return result
+
+    def generate_content_stream(
+        self,
+        prompt: str,
+        *,
+        generation_config: Optional[GenerationConfig] = GoogleAIBaseGeneration.generation_config(),
+        use_cache: Optional[bool] = None,
+        hint: Optional[str] = None,
+    ) -> FridayStreamResponse:
         """
-        Start a new chat session with Friday using google generativeai ChatSession.
+        Generate content using the configured model and stream the response as it is generated.
+
+        Args:
+            prompt (str): Prompt for generating content.
+            generation_config (Optional[GenerationConfig]): Generation configuration for the model.
+                Defaults to GoogleAIGeneration.generation_config().
+            use_cache (Optional[bool]): Serve the response from the response cache, or the semantic cache, when
+                available. A cached response is streamed as a single chunk. Defaults to None, which caches only
+                deterministic requests (temperature 0). Ignored when the caches are disabled.
+            hint (Optional[str]): Quality tier of the request for the router, e.g. `best`. Defaults to None, which
+                classifies the request by its size. Ignored when the router is disabled.
 
         Returns:
-            ChatSession: Chat session created with Friday using google generativeai ChatSession.
+            FridayStreamResponse: Streamed response from the model for the prompt.
+        """
+        genai_model = self._route("generate_content_stream", prompt, hint)
+        timer = self.metrics.timer("generate_content_stream", genai_model.model_name)
+        response, cache_response = self._cache_lookup(genai_model, prompt, generation_config, use_cache)
+        if response is not None:
+            timer.first_token()
+            timer.finish(response.usage_metadata, cache_hit=True)
+            return FridayStreamResponse(response_object=response, logger=self.logger)
+
+        try:
+            response, tokens, rate_limiter = self._call_hedged(
+                "generate_content_stream",
+                lambda model: model.generate_content(prompt, generation_config=generation_config, stream=True),
+                prompt,
+                genai_model=genai_model,
+            )
+        except Exception as err:
+            timer.finish(error=err)
+            raise
+        stream = self._timed_stream(FridayStreamResponse(response_object=response, logger=self.logger), timer)
+        stream.add_done_callback(lambda: self._settle_usage(rate_limiter, tokens, stream.usage_metadata))
+        if cache_response is not None:
+
+            def on_done() -> None:
+                if stream.done:
+                    cache_response(response)
+
+            stream.add_done_callback(on_done)
+        return stream
+
+    def generate_many(
+        self,
+        prompts: Iterable[str],
+        *,
+        generation_config: Optional[GenerationConfig] = GoogleAIBaseGeneration.generation_config(),
+        use_cache: Optional[bool] = None,
+        max_workers: int = 8,
+        ordered: bool = True,
+    ) -> FridayBatchResponse:
         """
-        return self.__model.start_chat(history=[])
+        Generate content for a batch of prompts with bounded concurrency.
+
+        Args:
+            prompts (Iterable[str]): Prompts for generating content. Read lazily, so a generator over a large file
+                can be passed.
+            generation_config (Optional[GenerationConfig]): Generation configuration for the model.
+                Defaults to GoogleAIGeneration.generation_config().
+            use_cache (Optional[bool]): Serve the responses from the response cache when available. Defaults to None,
+                which caches only deterministic requests (temperature 0). Ignored when the cache is disabled.
+            max_workers (int, optional): Maximum number of concurrent requests. Defaults to 8.
+            ordered (bool, optional): Yield the results in input order, otherwise as completed. Defaults to True.
+
+        Returns:
+            FridayBatchResponse: Batch of prompts, run when iterated.
+        """
+        return FridayBatchResponse(
+            generate=lambda prompt: self.generate_content(
+                prompt, generation_config=generation_config, use_cache=use_cache
+            ),
+            prompts=prompts,
+            max_workers=max_workers,
+            ordered=ordered,
+            logger=self.logger,
+        )
 
     def send_chat_message(
-        self, chat: ChatSession, message: str, generation_config: Optional[GenerationConfig] = generation_config()
+        self,
+        chat: ChatSession,
+        message: str,
+        generation_config: Optional[GenerationConfig] = GoogleAIBaseGeneration.generation_config(),
+        selector: Optional[FridayCandidateSelector] = None,
+        hint: Optional[str] = None,
     ) -> FridayResponse:
         """
         Send a message to the chat session with Friday and get the response from the chat session.
 
+        With `candidate_count` > 1, every candidate is generated by the same request and returned in
+        `FridayResponse.candidates`, and the selected candidate is added to the chat history as the reply. When the
+        message is hedged, only the reply of the first request to return is added to the chat history.
+
         Args:
             chat (ChatSession): Chat session created with Friday.
             message (str): Message to be sent to the chat session.
             generation_config (Optional[GenerationConfig]): Generation configuration for the model.
                 Defaults to GoogleAIGeneration.generation_config().
+            selector (Optional[FridayCandidateSelector]): Selection of the reply among several candidates. Defaults
+                to `candidate_selector`.
+            hint (Optional[str]): Quality tier of the chat session for the router, used by its first message.
+                Defaults to None, which classifies the first message by its size. Ignored when the router is disabled.
 
         Returns:
             FridayResponse: Response from the chat session for the message.
@@ -114,39 +1057,122 @@ class GoogleAIGeneration:
         Raises:
             FridayGenerationError: Failed to send message to the chat session with Friday.
         """
+        genai_model = self._route_chat("send_chat_message", chat, message, hint)
+        timer = self.metrics.timer("send_chat_message", genai_model.model_name)
+        history = chat.history[:]
+        content = content_types.to_content(message)
+        content.role = content.role or "user"
+        direct = self._direct_chat(generation_config)
+
+        def request(model: GenerativeModel) -> GenerateContentResponse:
+            if direct:
+                return model.generate_content(history + [content], generation_config=generation_config)
+            # Rebind the chat session to the model of the request, which drops an expired or renamed context cache
+            chat.model = model
+            return chat.send_message(message, generation_config=generation_config)
+
         try:
-            response: GenerateContentResponse = chat.send_message(message, generation_config=generation_config)
+            response, tokens, rate_limiter = self._call_hedged(
+                "send_chat_message", request, history, message, genai_model
+            )
+            result = self._response(response, selector)
+            if direct:
+                self._add_chat_turn(chat, history, content, self._reply_content(result))
         except StopCandidateException as err:
+            timer.finish(error=err)
             raise FridayGenerationError(message=str(err), logger=self.logger) from err
-        return FridayResponse(response=response.text, response_object=response)
+        except Exception as err:
+            timer.finish(error=err)
+            raise
+        timer.finish(response.usage_metadata)
+        self._settle_usage(rate_limiter, tokens, response.usage_metadata)
+        self.token_estimator.record(None, self._candidates_text(result), response.usage_metadata)
+        return result
 
-    def get_chat_history(self, chat: ChatSession) -> list[str]:
+    def send_chat_message_stream(
+        self,
+        chat: ChatSession,
+        message: str,
+        generation_config: Optional[GenerationConfig] = GoogleAIBaseGeneration.generation_config(),
+        hint: Optional[str] = None,
+    ) -> FridayStreamResponse:
         """
-        Get chat history from the chat session with Friday and return the chat history as a dictionary with role as
-        key and message as value.
+        Send a message to the chat session with Friday and stream the response from the chat session.
+
+        The chat history is updated once the stream is exhausted. If the stream fails or is closed before completion,
+        the message is rolled back from the chat history so that the chat session stays usable. When the message is
+        hedged, the first stream to produce a chunk is used and the other one is closed.
 
         Args:
-            chat (ChatSession): Chat session created with Friday using google generativeai ChatSession.
+            chat (ChatSession): Chat session created with Friday.
+            message (str): Message to be sent to the chat session.
+            generation_config (Optional[GenerationConfig]): Generation configuration for the model.
+                Defaults to GoogleAIGeneration.generation_config().
+            hint (Optional[str]): Quality tier of the chat session for the router, used by its first message.
+                Defaults to None, which classifies the first message by its size. Ignored when the router is disabled.
 
         Returns:
-            list[str]: Chat history from the chat session with Friday.
+            FridayStreamResponse: Streamed response from the chat session for the message.
+
+        Raises:
+            FridayGenerationError: Failed to send message to the chat session with Friday.
         """
-        return [f"{message.role}: {message.parts[0].text}" for message in chat.history]
+        genai_model = self._route_chat("send_chat_message_stream", chat, message, hint)
+        timer = self.metrics.timer("send_chat_message_stream", genai_model.model_name)
+        history = chat.history[:]
+        content = content_types.to_content(message)
+        content.role = content.role or "user"
+        direct = self.hedging is not None
+
+        def request(model: GenerativeModel) -> GenerateContentResponse:
+            if direct:
+                return model.generate_content(history + [content], generation_config=generation_config, stream=True)
+            chat.model = model
+            return chat.send_message(message, generation_config=generation_config, stream=True)
+
+        def rollback() -> None:
+            chat.history = history
+
+        try:
+            response, tokens, rate_limiter = self._call_hedged(
+                "send_chat_message_stream", request, history, message, genai_model
+            )
+        except StopCandidateException as err:
+            timer.finish(error=err)
+            raise FridayGenerationError(message=str(err), logger=self.logger) from err
+        except Exception as err:
+            timer.finish(error=err)
+            raise
+        stream = self._timed_stream(
+            FridayStreamResponse(response_object=response, logger=self.logger, on_abort=rollback), timer
+        )
+        stream.add_done_callback(lambda: self._settle_usage(rate_limiter, tokens, stream.usage_metadata))
+        if direct:
+
+            def add_chat_turn() -> None:
+                if stream.done:
+                    self._add_chat_turn(chat, history, content, response.candidates[0].content)
 
-    def _count_tokens(self, text: str | Annotated[list[protos.Content], ChatSession.history]) -> int:
+            stream.add_done_callback(add_chat_turn)
+        return stream
+
+    def _count_tokens(
+        self, text: str | Annotated[list[protos.Content], ChatSession.history], *, remote: bool = False
+    ) -> int:
         """
-        Count the number of tokens in the text or chat history.
+        Count the number of tokens in the text or chat history with the offline token estimator.
 
         Args:
             text (str | Annotated[list[protos.Content], ChatSession.history]): Text or chat history to count the tokens.
+            remote (bool, optional): Fall back to the exact remote `count_tokens` call. Defaults to False.
 
         Returns:
             int: Number of tokens in the text or chat history.
         """
-        return self.__model.count_tokens(text)
+        return self.token_estimator.count(text, remote=remote)
 
     def __str__(self):
-        return f"Friday - Keys' AI Personal Assistant Generation with model: {self.__model.model_name}"
+        return f"Friday - Keys' AI Personal Assistant Generation with model: {self._model.model_name}"
 
 
 if __name__ == "__main__":
@@ -163,6 +1189,13 @@ if __name__ == "__main__":
         )
         print(f"Response: {gen_response.response.strip()}, Response Object: {gen_response.response_object}")
 
+    # Test Batch Generation
+    if True:
+        batch = ai_gen.generate_many([f"What is {number} squared?" for number in range(5)], max_workers=4)
+        for result in batch:
+            print(f"Batch Result {result.index}: {result.response.response.strip() if result.ok else result.error}")
+        print(f"Batch Usage: {batch.usage}")
+
     # Test Chat Session
     if True:
         chat = ai_gen.start_new_chat()
@@ -172,3 +1205,14 @@ if __name__ == "__main__":
         print(f"Chat Response: {chat_response.response.strip()}")
         print(f"Chat History:\n{ai_gen.get_chat_history(chat=chat)}")
         print(f"Token Count: {ai_gen._count_tokens(text=chat.history)}")
+        print(f"Remote Token Count: {ai_gen._count_tokens(text=chat.history, remote=True)}")
+        print(f"Token Estimator Calibration: {ai_gen.token_estimator.calibrate()}")
+
+    # Test Streamed Chat Session
+    if True:
+        chat = ai_gen.start_new_chat()
+        stream_response = ai_gen.send_chat_message_stream(chat=chat, message="Count from 1 to 20.")
+        for chunk in stream_response:
+            print(chunk.response, end="", flush=True)
+        print(f"\nUsage Metadata: {stream_response.usage_metadata}")
+        print(f"Chat History:\n{ai_gen.get_chat_history(chat=chat)}")
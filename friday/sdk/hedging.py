@@ -0,0 +1,310 @@
+"""Hedged Requests for the Friday Generation SDK."""
+
+# Standard Library
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Awaitable, Callable, Optional, TypeVar
+
+# Project Library
+from friday.utilities.logger import CustomLogger
+from friday.sdk.model import GoogleAIModel
+
+
+T = TypeVar("T")
+
+
+class FridayHedgingPolicy:
+    """
+    Hedging policy cutting the tail latency of the model calls.
+
+    A call which has not returned by a percentile of the recent latencies of its operation is duplicated, to the
+    fallback model when configured, and whichever returns first is used. Streamed calls return with their first chunk,
+    so their deadline is a time to first token. The loser is cancelled: a streamed response is closed, and a response
+    which cannot be interrupted is discarded when it arrives.
+
+    The extra load is capped by a hedge budget: every call earns `max_extra_load` hedges, up to `burst`, and every
+    hedge spends one, so at most `max_extra_load` more requests are sent in the long run.
+
+    Attributes:
+        quantile (float): Percentile of the recent latencies after which a call is hedged, between 0 and 1.
+        fallback_model (Optional[GoogleAIModel]): Model the hedges are sent to. None to hedge to the same model.
+        max_extra_load (float): Maximum ratio of hedges to calls.
+        burst (float): Maximum number of hedges in a row, when the budget is full.
+        initial_delay (float): Hedging deadline in seconds until `min_samples` latencies are observed.
+        min_delay (float): Minimum hedging deadline in seconds.
+        min_samples (int): Number of latencies observed before the deadline follows the percentile.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        fallback_model: Optional[GoogleAIModel] = None,
+        max_extra_load: float = 0.1,
+        burst: float = 2.0,
+        initial_delay: float = 2.0,
+        min_delay: float = 0.05,
+        min_samples: int = 20,
+        window: int = 256,
+    ) -> None:
+        """
+        Initialize the hedging policy.
+
+        Args:
+            quantile (float, optional): Percentile of the recent latencies after which a call is hedged. Defaults to
+                0.95.
+            fallback_model (Optional[GoogleAIModel]): Model the hedges are sent to, e.g. a faster model. Defaults to
+                None, hedging to the same model.
+            max_extra_load (float, optional): Maximum ratio of hedges to calls. Defaults to 0.1.
+            burst (float, optional): Maximum number of hedges in a row, when the budget is full. Defaults to 2.
+            initial_delay (float, optional): Hedging deadline in seconds until `min_samples` latencies are observed.
+                Defaults to 2 seconds.
+            min_delay (float, optional): Minimum hedging deadline in seconds. Defaults to 50 milliseconds.
+            min_samples (int, optional): Number of latencies observed before the deadline follows the percentile.
+                Defaults to 20.
+            window (int, optional): Number of recent latencies kept per operation. Defaults to 256.
+        """
+        self.quantile = quantile
+        self.fallback_model = fallback_model
+        self.max_extra_load = max_extra_load
+        self.burst = burst
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.logger = CustomLogger(name="friday")
+
+        self.__window = window
+        self.__lock = threading.Lock()
+        self.__latencies: dict[str, deque[float]] = {}
+        self.__budget = burst
+        self.__stats = {"calls": 0, "hedges": 0, "hedge_wins": 0, "budget_exhausted": 0}
+
+    @classmethod
+    def from_env(cls, fallback_model: Optional[GoogleAIModel] = None) -> Optional["FridayHedgingPolicy"]:
+        """
+        Return the hedging policy enabled by `FRIDAY_HEDGING`, with the percentile from `FRIDAY_HEDGING_QUANTILE` and
+        the maximum extra load from `FRIDAY_HEDGING_MAX_EXTRA_LOAD`.
+
+        Args:
+            fallback_model (Optional[GoogleAIModel]): Model the hedges are sent to. Defaults to None, hedging to the
+                same model.
+
+        Returns:
+            Optional[FridayHedgingPolicy]: Hedging policy, or None when disabled.
+        """
+        if os.getenv("FRIDAY_HEDGING", "").lower() not in ("1", "true", "yes"):
+            return None
+        return cls(
+            quantile=float(os.getenv("FRIDAY_HEDGING_QUANTILE") or 0.95),
+            fallback_model=fallback_model,
+            max_extra_load=float(os.getenv("FRIDAY_HEDGING_MAX_EXTRA_LOAD") or 0.1),
+        )
+
+    def delay(self, operation: str) -> float:
+        """
+        Return the hedging deadline of an operation.
+
+        Args:
+            operation (str): SDK operation, e.g. `generate_content`.
+
+        Returns:
+            float: Time after which a call of the operation is hedged in seconds.
+        """
+        with self.__lock:
+            latencies = sorted(self.__latencies.get(operation, ()))
+        if len(latencies) < self.min_samples:
+            return self.initial_delay
+        return max(self.min_delay, latencies[min(int(self.quantile * len(latencies)), len(latencies) - 1)])
+
+    def observe(self, operation: str, seconds: float) -> None:
+        """
+        Record the latency of a call which was not hedged, or of the request a hedge duplicated.
+
+        Args:
+            operation (str): SDK operation, e.g. `generate_content`.
+            seconds (float): Time until the call returned in seconds.
+        """
+        with self.__lock:
+            latencies = self.__latencies.get(operation)
+            if latencies is None:
+                latencies = self.__latencies[operation] = deque(maxlen=self.__window)
+            latencies.append(seconds)
+
+    def __earn_budget(self) -> None:
+        """Count a call, which earns `max_extra_load` hedges up to `burst`."""
+        with self.__lock:
+            self.__stats["calls"] += 1
+            self.__budget = min(self.burst, self.__budget + self.max_extra_load)
+
+    def __spend_budget(self) -> bool:
+        """Spend a hedge from the budget, if any is left."""
+        with self.__lock:
+            if self.__budget < 1:
+                self.__stats["budget_exhausted"] += 1
+                return False
+            self.__budget -= 1
+            self.__stats["hedges"] += 1
+            return True
+
+    @staticmethod
+    def __start(function: Callable[[], T]) -> Future:
+        """
+        Run a call on a daemon thread, so that a loser which cannot be interrupted does not delay the exit.
+
+        Args:
+            function (Callable[[], T]): Call to run.
+
+        Returns:
+            Future: Future of the call.
+        """
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+
+        def run() -> None:
+            try:
+                future.set_result(function())
+            except BaseException as err:
+                future.set_exception(err)
+
+        threading.Thread(target=run, name="friday-hedge", daemon=True).start()
+        return future
+
+    def call(
+        self,
+        operation: str,
+        primary: Callable[[], T],
+        hedge: Callable[[], T],
+        cancel: Optional[Callable[[T], None]] = None,
+    ) -> tuple[T, Optional[bool]]:
+        """
+        Make a call, hedged when it has not returned by the deadline of its operation and the budget allows it.
+
+        Args:
+            operation (str): SDK operation, e.g. `generate_content`.
+            primary (Callable[[], T]): Call to make.
+            hedge (Callable[[], T]): Duplicate of the call, e.g. to the fallback model.
+            cancel (Optional[Callable[[T], None]]): Cancellation of the result of the loser, e.g. closing a stream.
+                Defaults to None, discarding it.
+
+        Returns:
+            tuple[T, Optional[bool]]: Result of the first call to return, and whether the hedge won. None when the
+                call was not hedged.
+
+        Raises:
+            Exception: Error of the call, when the call and its hedge both failed.
+        """
+        self.__earn_budget()
+        start = time.perf_counter()
+        primary_future = self.__start(primary)
+
+        def observe(future: Future) -> None:
+            if future.exception() is None:
+                self.observe(operation, time.perf_counter() - start)
+
+        primary_future.add_done_callback(observe)
+        delay = self.delay(operation)
+        if wait([primary_future], timeout=delay).done or not self.__spend_budget():
+            return primary_future.result(), None
+
+        self.logger.debug("Hedging %s after %.2fs.", operation, delay)
+        hedge_future = self.__start(hedge)
+        pending, winner = {primary_future, hedge_future}, None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if future.exception() is None), None)
+        if winner is None:
+            raise primary_future.exception()
+
+        loser = hedge_future if winner is primary_future else primary_future
+        if cancel is not None:
+            loser.add_done_callback(lambda future: future.exception() is None and cancel(future.result()))
+        won = winner is hedge_future
+        if won:
+            with self.__lock:
+                self.__stats["hedge_wins"] += 1
+        return winner.result(), won
+
+    async def call_async(
+        self,
+        operation: str,
+        primary: Callable[[], Awaitable[T]],
+        hedge: Callable[[], Awaitable[T]],
+        cancel: Optional[Callable[[T], None]] = None,
+    ) -> tuple[T, Optional[bool]]:
+        """
+        Asynchronously make a call, hedged when it has not returned by the deadline of its operation and the budget
+        allows it. Same as `call`, with the calls run as tasks of the event loop.
+
+        Args:
+            operation (str): SDK operation, e.g. `generate_content`.
+            primary (Callable[[], Awaitable[T]]): Async call to make.
+            hedge (Callable[[], Awaitable[T]]): Duplicate of the call, e.g. to the fallback model.
+            cancel (Optional[Callable[[T], None]]): Cancellation of the result of the loser, e.g. closing a stream.
+                Defaults to None, discarding it.
+
+        Returns:
+            tuple[T, Optional[bool]]: Result of the first call to return, and whether the hedge won. None when the
+                call was not hedged.
+
+        Raises:
+            Exception: Error of the call, when the call and its hedge both failed.
+        """
+        self.__earn_budget()
+        start = time.perf_counter()
+        primary_task = asyncio.ensure_future(primary())
+
+        def observe(task: asyncio.Future) -> None:
+            if not task.cancelled() and task.exception() is None:
+                self.observe(operation, time.perf_counter() - start)
+
+        primary_task.add_done_callback(observe)
+        delay = self.delay(operation)
+        done, _ = await asyncio.wait([primary_task], timeout=delay)
+        if done or not self.__spend_budget():
+            return await primary_task, None
+
+        self.logger.debug("Hedging %s after %.2fs.", operation, delay)
+        hedge_task = asyncio.ensure_future(hedge())
+        pending, winner = {primary_task, hedge_task}, None
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner = next((task for task in done if task.exception() is None), None)
+        if winner is None:
+            raise primary_task.exception()
+
+        def discard(task: asyncio.Future) -> None:
+            # Retrieving the error of a failed loser keeps it from being reported as never retrieved
+            if not task.cancelled() and task.exception() is None and cancel is not None:
+                cancel(task.result())
+
+        (hedge_task if winner is primary_task else primary_task).add_done_callback(discard)
+        won = winner is hedge_task
+        if won:
+            with self.__lock:
+                self.__stats["hedge_wins"] += 1
+        return winner.result(), won
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Return the hedging statistics.
+
+        Returns:
+            dict[str, int | float]: Calls, hedges, hedges which won, hedge win rate, hedges skipped because the budget
+                was exhausted, and the budget left.
+        """
+        with self.__lock:
+            hedges = self.__stats["hedges"]
+            return dict(
+                self.__stats, win_rate=self.__stats["hedge_wins"] / hedges if hedges else 0.0, budget=self.__budget
+            )
+
+
+if __name__ == "__main__":
+    policy = FridayHedgingPolicy(initial_delay=0.1, burst=1.0)
+    for seconds in (0.01, 0.5, 0.5):
+        result, won = policy.call("demo", lambda: time.sleep(seconds) or "primary", lambda: "hedge")
+        print(f"{seconds}s call: {result}, hedge won: {won}")
+    print(policy.stats())
@@ -0,0 +1,348 @@
+"""Chat History Management for the Friday Generation SDK."""
+
+# Standard Library
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+# Project Library
+from friday.utilities.logger import CustomLogger
+from friday.sdk.memory import FridayMemory
+from friday.sdk.sessions import FridaySession
+from friday.sdk.tokens import FridayHistoryTokenCounter
+from friday.sdk.generation import FridayGenerationError, FridayResponse, FridayStreamResponse, GoogleAIGeneration
+
+# Type hints
+from google.generativeai.generative_models import ChatSession
+from google.generativeai import GenerationConfig, protos
+
+
+SUMMARY_PROMPT = (
+    "Summarize the conversation below between the user and you (the model) for your own future reference. Keep every "
+    "fact, name, number, decision and open question the user may refer to later. Be concise, use bullet points and "
+    "do not add anything which was not said.\n\n"
+    "Summary of the earlier conversation:\n{summary}\n\n"
+    "Conversation to add to the summary:\n{conversation}"
+)
+SUMMARY_MESSAGE = "Summary of our conversation so far:\n{summary}"
+SUMMARY_ACKNOWLEDGEMENT = "Got it. I will keep this summary in mind."
+MEMORY_PROMPT = (
+    "Notes from our earlier conversations which may be relevant, use them only if they help:\n{memories}\n\n"
+    "Message:\n{message}"
+)
+
+
+def _summary_contents(summary: str) -> list[protos.Content]:
+    """
+    Return the contents carrying the rolling summary at the start of the chat history.
+
+    Args:
+        summary (str): Rolling summary of the folded turns.
+
+    Returns:
+        list[protos.Content]: Summary message and its acknowledgement.
+    """
+    return [
+        protos.Content(role="user", parts=[protos.Part(text=SUMMARY_MESSAGE.format(summary=summary))]),
+        protos.Content(role="model", parts=[protos.Part(text=SUMMARY_ACKNOWLEDGEMENT)]),
+    ]
+
+
+@dataclass
+class FridayHistoryStats:
+    """
+    Statistics of a managed chat history.
+
+    Attributes:
+        turns (int): Number of turns sent to the chat session.
+        summarized_turns (int): Number of turns folded into the rolling summary.
+        summaries (int): Number of summaries produced by the model.
+        history_tokens (int): Estimated number of tokens of the history sent with the next message.
+        tokens_saved (int): Estimated number of input tokens not resent thanks to the rolling summary.
+    """
+
+    turns: int = 0
+    summarized_turns: int = 0
+    summaries: int = 0
+    history_tokens: int = 0
+    tokens_saved: int = 0
+
+
+class FridayHistoryManager:
+    """
+    Token budgeted sliding window history for a Friday chat session.
+
+    The last turns of the chat session are kept verbatim. Once the history outgrows the token budget, the older turns
+    are folded into a rolling summary produced by the model, so that the input tokens of every message stay bounded.
+    The history size is read from the usage metadata of each response. Before a message is sent, the history is also
+    estimated offline with an incremental token counter, so that a history outgrowing the budget before any response,
+    e.g. a resumed one, is summarized first. The token counter is used to size the folded turns when summarizing.
+    With a session, every turn and summary is appended to the session log, so that the chat can be resumed later with
+    `FridayHistoryManager.resume`.
+
+    With a long-term memory, only the last turns are kept in the chat history. Every message is sent with the chunks of
+    the past turns most relevant to it, retrieved from the memory, so the prompt size stays bounded however long the
+    conversations grow.
+
+    Attributes:
+        generation (GoogleAIGeneration): Generation SDK used to send messages and summarize the history.
+        chat (ChatSession): Managed chat session.
+        token_budget (int): Maximum number of tokens of the history before it is summarized.
+        keep_last_turns (int): Number of most recent turns kept verbatim.
+        summary (str): Rolling summary of the folded turns.
+        session (Optional[FridaySession]): Session log the turns are persisted to.
+        memory (Optional[FridayMemory]): Long-term memory the relevant past turns are retrieved from.
+        memory_top_k (int): Number of chunks retrieved from the memory for every message.
+        stats (FridayHistoryStats): Statistics of the managed history.
+    """
+
+    def __init__(
+        self,
+        generation: GoogleAIGeneration,
+        chat: Optional[ChatSession] = None,
+        token_budget: int = 8000,
+        keep_last_turns: int = 6,
+        token_counter: Optional[Callable[[list[protos.Content]], int]] = None,
+        summary_generation_config: Optional[GenerationConfig] = None,
+        session: Optional[FridaySession] = None,
+        memory: Optional[FridayMemory] = None,
+        memory_top_k: int = 4,
+    ) -> None:
+        """
+        Initialize the history manager.
+
+        Args:
+            generation (GoogleAIGeneration): Generation SDK used to send messages and summarize the history.
+            chat (Optional[ChatSession]): Chat session to manage. Defaults to a new chat session.
+            token_budget (int, optional): Maximum number of tokens of the history before it is summarized.
+                Defaults to 8000.
+            keep_last_turns (int, optional): Number of most recent turns kept verbatim. Defaults to 6.
+            token_counter (Optional[Callable[[list[protos.Content]], int]]): Token counter for the folded turns.
+                Defaults to `GoogleAIGeneration._count_tokens`.
+            summary_generation_config (Optional[GenerationConfig]): Generation configuration for the summaries.
+                Defaults to a deterministic configuration with up to 500 output tokens.
+            session (Optional[FridaySession]): Session log to persist the turns to. Defaults to None.
+            memory (Optional[FridayMemory]): Long-term memory to retrieve the relevant past turns from. The chat
+                history is then trimmed to the last `keep_last_turns` turns. Defaults to None.
+            memory_top_k (int, optional): Number of chunks retrieved from the memory for every message. Defaults to 4.
+        """
+        self.generation = generation
+        self.chat = chat if chat is not None else generation.start_new_chat()
+        self.token_budget = token_budget
+        self.keep_last_turns = keep_last_turns
+        self.summary = ""
+        self.session = session
+        self.memory = memory
+        self.memory_top_k = memory_top_k
+        self.stats = FridayHistoryStats()
+        self.logger = CustomLogger(name="friday")
+
+        self.__token_counter = token_counter or generation._count_tokens
+        self.__history_token_counter = FridayHistoryTokenCounter(generation.token_estimator)
+        self.__summary_generation_config = summary_generation_config or GoogleAIGeneration.generation_config(
+            max_output_tokens=500, temperature=0
+        )
+        # Estimated tokens saved on every message by the current rolling summary
+        self.__tokens_saved_per_message = 0
+
+    def send_message(
+        self, message: str, generation_config: Optional[GenerationConfig] = GoogleAIGeneration.generation_config()
+    ) -> FridayResponse:
+        """
+        Send a message to the managed chat session and summarize the history if it outgrows the token budget.
+
+        Args:
+            message (str): Message to be sent to the chat session.
+            generation_config (Optional[GenerationConfig]): Generation configuration for the model.
+                Defaults to GoogleAIGeneration.generation_config().
+
+        Returns:
+            FridayResponse: Response from the chat session for the message.
+
+        Raises:
+            FridayGenerationError: Failed to send message to the chat session with Friday.
+        """
+        self._fit_budget(message)
+        response = self.generation.send_chat_message(
+            chat=self.chat, message=self._with_memory(message), generation_config=generation_config
+        )
+        self._on_turn(message, response.response, response.response_object.usage_metadata)
+        return response
+
+    def send_message_stream(
+        self, message: str, generation_config: Optional[GenerationConfig] = GoogleAIGeneration.generation_config()
+    ) -> FridayStreamResponse:
+        """
+        Send a message to the managed chat session and stream the response. The history is summarized once the stream
+        is exhausted, if it outgrows the token budget.
+
+        Args:
+            message (str): Message to be sent to the chat session.
+            generation_config (Optional[GenerationConfig]): Generation configuration for the model.
+                Defaults to GoogleAIGeneration.generation_config().
+
+        Returns:
+            FridayStreamResponse: Streamed response from the chat session for the message.
+
+        Raises:
+            FridayGenerationError: Failed to send message to the chat session with Friday.
+        """
+        self._fit_budget(message)
+        stream = self.generation.send_chat_message_stream(
+            chat=self.chat, message=self._with_memory(message), generation_config=generation_config
+        )
+
+        def on_done() -> None:
+            if stream.done:
+                self._on_turn(message, stream.response, stream.usage_metadata)
+
+        stream.add_done_callback(on_done)
+        return stream
+
+    @classmethod
+    def resume(cls, generation: GoogleAIGeneration, session: FridaySession, **kwargs) -> "FridayHistoryManager":
+        """
+        Resume a chat session from its session log. Only the summary and the turns kept after it are replayed.
+
+        Args:
+            generation (GoogleAIGeneration): Generation SDK used to send messages and summarize the history.
+            session (FridaySession): Session log to resume.
+            **kwargs: Other arguments of the history manager.
+
+        Returns:
+            FridayHistoryManager: Resumed chat session with a managed history.
+        """
+        session_log = session.load()
+        history = _summary_contents(session_log.summary) if session_log.summary else []
+        for user, model in session_log.turns:
+            history.append(protos.Content(role="user", parts=[protos.Part(text=user)]))
+            history.append(protos.Content(role="model", parts=[protos.Part(text=model)]))
+
+        manager = cls(generation, chat=generation.start_new_chat(history=history), session=session, **kwargs)
+        manager.summary = session_log.summary
+        manager.stats.turns = session_log.total_turns
+        manager.stats.summarized_turns = session_log.total_turns - len(session_log.turns)
+        manager.logger.debug("Resumed session %s with %s turns.", session.session_id, len(session_log.turns))
+        return manager
+
+    def _with_memory(self, message: str) -> str:
+        """
+        Return the message with the chunks of the past turns most relevant to it, retrieved from the memory. The
+        chunks of the turns still in the chat history are left out.
+
+        Args:
+            message (str): Message to be sent to the chat session.
+
+        Returns:
+            str: Message to send, unchanged without memory or relevant chunks.
+        """
+        if self.memory is None:
+            return message
+
+        history = self.chat.history
+        recent = [
+            f"{user.role}: {user.parts[0].text}\n{model.role}: {model.parts[0].text}"
+            for user, model in zip(history[::2], history[1::2])
+        ]
+        hits = self.memory.retrieve(message, top_k=self.memory_top_k + len(recent))
+        hits = [hit for hit in hits if not any(hit.text in turn for turn in recent)][: self.memory_top_k]
+        if not hits:
+            return message
+        return MEMORY_PROMPT.format(memories="\n".join(f"- {hit}" for hit in hits), message=message)
+
+    def _fit_budget(self, message: str) -> None:
+        """
+        Summarize the history before sending a message if the history and the message are estimated to outgrow the
+        token budget. The history is counted incrementally, only the turns appended since the last message are
+        estimated.
+
+        Args:
+            message (str): Message to be sent to the chat session.
+        """
+        history_tokens = self.__history_token_counter.count(self.chat.history)
+        if history_tokens + self.generation.token_estimator.count(message) <= self.token_budget:
+            return
+        try:
+            self.summarize()
+        except FridayGenerationError:
+            self.logger.warning("Failed to summarize the chat history, keeping the full history.")
+
+    def _forget(self, message: str) -> None:
+        """
+        Trim the chat history to the rolling summary and the last `keep_last_turns` turns, and replace the last
+        message sent with the memory chunks by the message itself.
+
+        Args:
+            message (str): Message sent to the chat session.
+        """
+        history = self.chat.history
+        if len(history) >= 2 and history[-2].role == "user":
+            history[-2] = protos.Content(role="user", parts=[protos.Part(text=message)])
+        # The summary stays at the start of the history, where `summarize` expects it
+        summary_contents = history[:2] if self.summary else []
+        turns = history[len(summary_contents) :]
+        self.chat.history = summary_contents + (turns[-2 * self.keep_last_turns :] if self.keep_last_turns else [])
+
+    def _on_turn(
+        self, message: str, response_text: str, usage_metadata: protos.GenerateContentResponse.UsageMetadata
+    ) -> None:
+        """
+        Persist a turn, update the statistics and summarize the history if it outgrows the token budget.
+
+        Args:
+            message (str): Message sent to the chat session.
+            response_text (str): Response of the chat session.
+            usage_metadata (protos.GenerateContentResponse.UsageMetadata): Usage metadata of the response.
+        """
+        if self.session is not None:
+            self.session.append_turn(user=message, model=response_text)
+        if self.memory is not None:
+            self._forget(message)
+
+        self.stats.turns += 1
+        self.stats.tokens_saved += self.__tokens_saved_per_message
+        self.stats.history_tokens = usage_metadata.total_token_count
+
+        if self.stats.history_tokens > self.token_budget:
+            try:
+                self.summarize()
+            except FridayGenerationError:
+                self.logger.warning("Failed to summarize the chat history, keeping the full history.")
+
+    def summarize(self) -> None:
+        """
+        Fold every turn but the last `keep_last_turns` turns into the rolling summary.
+
+        Raises:
+            FridayGenerationError: Failed to summarize the chat history.
+        """
+        history = self.chat.history
+        summary_contents = history[:2] if self.summary else []
+        turns = history[len(summary_contents) :]
+        folded = turns[: max(len(turns) - 2 * self.keep_last_turns, 0)]
+        if not folded:
+            return
+
+        conversation = "\n".join(f"{content.role}: {content.parts[0].text}" for content in folded)
+        prompt = SUMMARY_PROMPT.format(summary=self.summary or "(none)", conversation=conversation)
+        try:
+            response = self.generation.generate_content(
+                prompt, generation_config=self.__summary_generation_config, use_cache=False
+            )
+        except Exception as err:
+            raise FridayGenerationError(message=f"Failed to summarize the chat history: {err}") from err
+
+        folded_tokens = self.__token_counter(summary_contents + folded)
+        self.summary = response.response.strip()
+        summary_contents = _summary_contents(self.summary)
+        summary_tokens = self.__token_counter(summary_contents)
+        self.chat.history = summary_contents + turns[len(folded) :]
+        if self.session is not None:
+            self.session.append_summary(self.summary, keep_last_turns=(len(turns) - len(folded)) // 2)
+
+        self.__tokens_saved_per_message += folded_tokens - summary_tokens
+        self.stats.summaries += 1
+        self.stats.summarized_turns += len(folded) // 2
+        self.stats.history_tokens -= folded_tokens - summary_tokens
+        self.logger.debug(
+            "Folded %s turns into the chat summary: %s -> %s tokens.", len(folded) // 2, folded_tokens, summary_tokens
+        )
@@ -0,0 +1,343 @@
+"""
+Retrieval-augmented Long-term Memory for Friday.
+
+The turns of every persisted chat session are chunked, embedded and kept in a vector index on disk. For each new
+message, only the most relevant chunks are retrieved and sent with a short window of recent turns, so that Friday
+remembers past conversations while the prompt size of every turn stays bounded.
+
+The vectors are stored as a flat float32 file, memory-mapped and searched with a single matrix-vector product when
+NumPy is installed (`pip install numpy`), otherwise read into an array and searched in plain Python.
+"""
+
+# Standard Library
+import os
+import json
+import time
+import array
+import operator
+import threading
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Optional
+
+# Third Party Library
+try:
+    import numpy as np
+except ImportError:  # Optional dependency, the vectors are searched in plain Python
+    np = None
+
+# Project Library
+from friday.utilities.logger import CustomLogger
+from friday.utilities.paths import friday_cache_dir
+from friday.sdk.search import FridaySearchIndex
+from friday.sdk.semantic_cache import FridayEmbedder, FridayHashingEmbedder, FridaySemanticCache, GoogleAIEmbedder
+
+
+# Maximum number of texts embedded with one embedder call
+EMBEDDING_BATCH_SIZE = 100
+
+
+def chunk_text(text: str, max_chars: int) -> list[str]:
+    """
+    Split a text into chunks of at most `max_chars` characters, at whitespace when possible. Every chunk is a
+    substring of the text.
+
+    Args:
+        text (str): Text to split.
+        max_chars (int): Maximum number of characters of a chunk.
+
+    Returns:
+        list[str]: Chunks of the text.
+    """
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + max_chars
+        if end < len(text):
+            cut = max(text.rfind(" ", start, end), text.rfind("\n", start, end))
+            end = cut if cut > start else end
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end
+    return chunks
+
+
+@dataclass
+class FridayMemoryHit:
+    """
+    Chunk of a past turn retrieved from the memory.
+
+    Attributes:
+        session_id (str): Identifier of the session of the turn.
+        turn (int): Number of the turn in the session, starting at 1.
+        timestamp (float): Time of the turn.
+        text (str): Text of the chunk, `user: ...` and `model: ...` lines.
+        score (float): Cosine similarity to the query.
+    """
+
+    session_id: str
+    turn: int
+    timestamp: float
+    text: str
+    score: float
+
+    def __str__(self) -> str:
+        """Return the hit as a dated note."""
+        return f"({time.strftime('%Y-%m-%d', time.localtime(self.timestamp))}) {self.text}"
+
+
+class FridayMemory:
+    """
+    Long-term memory of Friday: a vector index of the chunks of the past turns, stored under `.friday_cache/memory`.
+
+    The turns are read from the full-text search index, which indexes the session logs as they are appended. Only the
+    turns indexed since the last update are embedded, with the query of the next retrieval in the same embedder call.
+    Chunks are appended to `chunks.jsonl` and their normalized vectors to `vectors.f32`.
+
+    Expected Environment Variables:
+    - `FRIDAY_MEMORY`: Optional, `1`/`true` to embed with the embedding API, `local` to use the local hashing embedder.
+      Disabled by default.
+
+    Attributes:
+        search_index (FridaySearchIndex): Full-text search index the turns are read from.
+        embedder (FridayEmbedder): Embedder of the chunks and queries.
+        path (Path): Directory of the memory.
+        max_chunk_chars (int): Maximum number of characters of a chunk.
+    """
+
+    def __init__(
+        self,
+        search_index: FridaySearchIndex,
+        embedder: Optional[FridayEmbedder] = None,
+        path: Optional[Path] = None,
+        max_chunk_chars: int = 1000,
+    ) -> None:
+        """
+        Initialize the memory and load the vector index from disk.
+
+        Args:
+            search_index (FridaySearchIndex): Full-text search index the turns are read from.
+            embedder (Optional[FridayEmbedder]): Embedder of the chunks and queries. Defaults to `GoogleAIEmbedder()`.
+            path (Optional[Path]): Directory of the memory. Defaults to `.friday_cache/memory`.
+            max_chunk_chars (int, optional): Maximum number of characters of a chunk. Defaults to 1000.
+        """
+        self.search_index = search_index
+        self.embedder = embedder or GoogleAIEmbedder()
+        self.path = path or friday_cache_dir("memory")
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_chunk_chars = max_chunk_chars
+        self.logger = CustomLogger(name="friday")
+
+        self.__lock = threading.Lock()
+        self.__chunks: list[dict] = []
+        self.__dimensions = 0
+        self.__vectors = None
+        self.__last_rowid = 0
+        self.__synced = False
+        self.__load()
+
+    @classmethod
+    def from_env(cls, search_index: FridaySearchIndex, fake: bool = False) -> Optional["FridayMemory"]:
+        """
+        Create the memory configured by `FRIDAY_MEMORY`.
+
+        Args:
+            search_index (FridaySearchIndex): Full-text search index the turns are read from.
+            fake (bool, optional): Running on the fake backend, which embeds with the local embedder. Defaults to
+                False.
+
+        Returns:
+            Optional[FridayMemory]: Memory, or None when disabled.
+        """
+        mode = os.getenv("FRIDAY_MEMORY", "").lower()
+        if mode not in ("1", "true", "yes", "local"):
+            return None
+        embedder = FridayHashingEmbedder() if fake or mode == "local" else GoogleAIEmbedder()
+        return cls(search_index, embedder=embedder)
+
+    @property
+    def chunks(self) -> int:
+        """Number of chunks in the memory."""
+        return len(self.__chunks)
+
+    def __load(self) -> None:
+        """Load the chunks and map their vectors. A chunk without its vector, from an interrupted update, is dropped."""
+        chunks_path, vectors_path = self.path / "chunks.jsonl", self.path / "vectors.f32"
+        if not chunks_path.exists() or not vectors_path.exists():
+            return
+
+        with open(chunks_path, "rb") as file:
+            lines = file.read().splitlines(keepends=True)
+        lines = [line for line in lines if line.endswith(b"\n")]
+        if not lines:
+            return
+        self.__dimensions = json.loads(lines[0])["dimensions"]
+        rows = min(len(lines), vectors_path.stat().st_size // (4 * self.__dimensions))
+        # Drop the chunks written after their vectors were lost, and a partially written chunk
+        with open(chunks_path, "r+b") as file:
+            file.truncate(sum(len(line) for line in lines[:rows]))
+        self.__chunks = [json.loads(line) for line in lines[:rows]]
+        self.__last_rowid = self.__chunks[-1]["rowid"] if rows else 0
+        self.__map_vectors()
+
+    def __map_vectors(self) -> None:
+        """Map the vectors of the chunks from disk."""
+        rows = len(self.__chunks)
+        vectors_path = self.path / "vectors.f32"
+        if not rows:
+            self.__vectors = None
+        elif np is not None:
+            self.__vectors = np.memmap(vectors_path, dtype="<f4", mode="r", shape=(rows, self.__dimensions))
+        else:
+            self.__vectors = array.array("f")
+            with open(vectors_path, "rb") as file:
+                self.__vectors.frombytes(file.read(4 * rows * self.__dimensions))
+
+    def __new_chunks(self) -> list[dict]:
+        """
+        Chunk the turns indexed by the search index since the last update.
+
+        Returns:
+            list[dict]: New chunks, with the row of the last message of their turn.
+        """
+        if not self.__synced:
+            # Index the sessions persisted by other processes or before the memory was enabled
+            self.search_index.update()
+            self.__synced = True
+
+        chunks = []
+        turn: dict[str, object] = {}
+        for rowid, session_id, number, role, timestamp, text in self.search_index.messages_since(self.__last_rowid):
+            if (turn.get("session_id"), turn.get("turn")) != (session_id, number):
+                turn = {"session_id": session_id, "turn": number, "ts": timestamp, "lines": []}
+            turn["lines"].append(f"{role}: {text}")
+            if role == "model":
+                for chunk in chunk_text("\n".join(turn["lines"]), self.max_chunk_chars):
+                    chunks.append(
+                        {"rowid": rowid, "session_id": session_id, "turn": number, "ts": timestamp, "text": chunk}
+                    )
+        return chunks
+
+    def __embed(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed and normalize texts, in batches.
+
+        Args:
+            texts (list[str]): Texts to embed.
+
+        Returns:
+            list[list[float]]: Normalized embedding of every text.
+        """
+        vectors = []
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            vectors.extend(self.embedder(texts[start : start + EMBEDDING_BATCH_SIZE]))
+        return [FridaySemanticCache._normalize(vector) for vector in vectors]
+
+    def __append(self, chunks: list[dict], vectors: list[list[float]]) -> None:
+        """
+        Append chunks and their vectors to the memory. The vectors are written first, so an interrupted update never
+        leaves a chunk without its vector.
+
+        Args:
+            chunks (list[dict]): New chunks.
+            vectors (list[list[float]]): Normalized vectors of the chunks.
+        """
+        if not chunks:
+            return
+        self.__dimensions = self.__dimensions or len(vectors[0])
+        with open(self.path / "vectors.f32", "ab") as file:
+            file.truncate(4 * len(self.__chunks) * self.__dimensions)
+            file.write(array.array("f", [value for vector in vectors for value in vector]).tobytes())
+        with open(self.path / "chunks.jsonl", "a", encoding="utf-8") as file:
+            for chunk in chunks:
+                file.write(json.dumps(dict(chunk, dimensions=self.__dimensions), ensure_ascii=False) + "\n")
+
+        self.__chunks.extend(chunks)
+        self.__last_rowid = chunks[-1]["rowid"]
+        if np is not None or self.__vectors is None:
+            self.__map_vectors()
+        else:
+            self.__vectors.extend(value for vector in vectors for value in vector)
+
+    def update(self) -> int:
+        """
+        Embed the turns indexed since the last update.
+
+        Returns:
+            int: Number of chunks added.
+        """
+        with self.__lock:
+            chunks = self.__new_chunks()
+            self.__append(chunks, self.__embed([chunk["text"] for chunk in chunks]))
+        return len(chunks)
+
+    def retrieve(self, query: str, top_k: int = 4, min_score: float = 0.0) -> list[FridayMemoryHit]:
+        """
+        Retrieve the chunks most similar to a query. The turns indexed since the last update are embedded first, with
+        the query in the same embedder call.
+
+        Args:
+            query (str): Query, e.g. the next message.
+            top_k (int, optional): Maximum number of chunks. Defaults to 4.
+            min_score (float, optional): Minimum cosine similarity of a chunk. Defaults to 0.0.
+
+        Returns:
+            list[FridayMemoryHit]: Retrieved chunks, most similar first.
+        """
+        with self.__lock:
+            chunks = self.__new_chunks()
+            *vectors, query_vector = self.__embed([chunk["text"] for chunk in chunks] + [query])
+            self.__append(chunks, vectors)
+            if self.__vectors is None or top_k <= 0:
+                return []
+
+            if np is not None:
+                scores = self.__vectors @ np.asarray(query_vector, dtype=np.float32)
+                rows = np.argsort(-scores)[:top_k] if len(scores) <= top_k else np.argpartition(-scores, top_k)[:top_k]
+                ranked = sorted(((float(scores[row]), int(row)) for row in rows), reverse=True)
+            else:
+                dimensions = self.__dimensions
+                scores = [
+                    sum(map(operator.mul, self.__vectors[row * dimensions : (row + 1) * dimensions], query_vector))
+                    for row in range(len(self.__chunks))
+                ]
+                ranked = sorted(((score, row) for row, score in enumerate(scores)), reverse=True)[:top_k]
+
+            return [
+                FridayMemoryHit(
+                    session_id=self.__chunks[row]["session_id"],
+                    turn=self.__chunks[row]["turn"],
+                    timestamp=self.__chunks[row]["ts"],
+                    text=self.__chunks[row]["text"],
+                    score=score,
+                )
+                for score, row in ranked
+                if score >= min_score
+            ]
+
+    def stats(self) -> dict[str, int | str]:
+        """
+        Return the memory statistics.
+
+        Returns:
+            dict[str, int | str]: Chunks, vector dimensions, size on disk and vector backend.
+        """
+        return {
+            "chunks": len(self.__chunks),
+            "dimensions": self.__dimensions,
+            "disk_bytes": sum(path.stat().st_size for path in self.path.iterdir() if path.is_file()),
+            "backend": "numpy" if np is not None else "python",
+        }
+
+    def __str__(self) -> str:
+        """String representation of the FridayMemory."""
+        return f"FridayMemory: {self.stats()}"
+
+
+if __name__ == "__main__":
+    memory = FridayMemory(FridaySearchIndex(), embedder=FridayHashingEmbedder())
+    print(f"Added {memory.update()} chunks.")
+    for hit in memory.retrieve("What did we talk about?"):
+        print(f"{hit.score:.3f} {hit}")
+    print(memory)
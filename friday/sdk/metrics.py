@@ -0,0 +1,570 @@
+"""
+Per-request Latency and Token Metrics for the Friday Generation SDK.
+
+Every SDK call records its wall time, time to first token, prompt/candidate/total tokens, output tokens per second,
+cache hits and errors, labelled by operation and model name. Values are kept in fixed bucket histograms, so recording
+is a bisect and a few additions under a lock, and exported as Prometheus text or JSON snapshots.
+
+This module only depends on the standard library, so `friday_cli --stats` does not load the Generative AI SDK.
+"""
+
+# Standard Library
+import os
+import json
+import math
+import time
+import bisect
+import tempfile
+import threading
+import contextlib
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+# Project Library
+from friday.utilities.paths import friday_cache_dir
+
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (16, 64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+RATE_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Histograms recorded per call, with their buckets and help text
+HISTOGRAMS = {
+    "request_duration_seconds": (LATENCY_BUCKETS, "Wall time of the SDK calls in seconds."),
+    "time_to_first_token_seconds": (LATENCY_BUCKETS, "Time to the first streamed chunk in seconds."),
+    "prompt_tokens": (TOKEN_BUCKETS, "Prompt tokens per call from the usage metadata."),
+    "candidates_tokens": (TOKEN_BUCKETS, "Candidate tokens per call from the usage metadata."),
+    "total_tokens": (TOKEN_BUCKETS, "Total tokens per call from the usage metadata."),
+    "output_tokens_per_second": (RATE_BUCKETS, "Candidate tokens per second of wall time."),
+}
+
+# Counters recorded per call, with their help text
+COUNTERS = {
+    "requests_total": "SDK calls.",
+    "cache_hits_total": "SDK calls served from the response cache.",
+    "errors_total": "SDK calls which failed, by error type.",
+    "hedges_total": "Duplicate requests sent by the hedging policy, labelled with the model they were sent to.",
+    "hedge_wins_total": "Duplicate requests which returned before the request they duplicated.",
+}
+
+# Fields of the series reported by the counters other than `errors_total`
+_COUNTER_FIELDS = {
+    "requests_total": "requests",
+    "cache_hits_total": "cache_hits",
+    "hedges_total": "hedges",
+    "hedge_wins_total": "hedge_wins",
+}
+
+
+class FridayHistogram:
+    """
+    Fixed bucket histogram.
+
+    Attributes:
+        buckets (tuple[float, ...]): Upper bounds of the buckets, an overflow bucket is implied.
+        counts (list[int]): Number of observations per bucket, not cumulative.
+        sum (float): Sum of the observations.
+        count (int): Number of observations.
+    """
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        """
+        Initialize the histogram.
+
+        Args:
+            buckets (tuple[float, ...]): Upper bounds of the buckets, sorted.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Record an observation.
+
+        Args:
+            value (float): Observed value.
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by linear interpolation within its bucket.
+
+        Args:
+            q (float): Quantile, between 0 and 1.
+
+        Returns:
+            Optional[float]: Estimated quantile, or None without observations. Quantiles in the overflow bucket are
+                reported as the largest bucket bound.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def merge(self, other: "FridayHistogram") -> None:
+        """
+        Add the observations of another histogram with the same buckets.
+
+        Args:
+            other (FridayHistogram): Histogram to merge.
+        """
+        self.counts = [count + other_count for count, other_count in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.count += other.count
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the histogram with its summary statistics as a JSON serializable dict."""
+        return {
+            "buckets": list(self.buckets),
+            "counts": list(self.counts),
+            "sum": self.sum,
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "FridayHistogram":
+        """Load a histogram from `to_dict`."""
+        histogram = cls(tuple(data["buckets"]))
+        histogram.counts = list(data["counts"])
+        histogram.sum = data["sum"]
+        histogram.count = data["count"]
+        return histogram
+
+
+class _Series:
+    """Metrics of one (operation, model) label pair."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics, with a histogram per metric of `HISTOGRAMS`."""
+        self.histograms = {name: FridayHistogram(buckets) for name, (buckets, _) in HISTOGRAMS.items()}
+        self.requests = 0
+        self.cache_hits = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.errors: dict[str, int] = {}
+
+    def merge(self, other: "_Series") -> None:
+        """
+        Add the metrics of another series.
+
+        Args:
+            other (_Series): Series of the same label pair.
+        """
+        for name, histogram in self.histograms.items():
+            histogram.merge(other.histograms[name])
+        self.requests += other.requests
+        self.cache_hits += other.cache_hits
+        self.hedges += other.hedges
+        self.hedge_wins += other.hedge_wins
+        for error, count in other.errors.items():
+            self.errors[error] = self.errors.get(error, 0) + count
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return a JSON serializable dictionary of the series.
+
+        Returns:
+            dict[str, Any]: Counters and histograms of the series.
+        """
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "errors": dict(self.errors),
+            "histograms": {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "_Series":
+        """
+        Create a series from its dictionary.
+
+        Args:
+            data (dict[str, Any]): Dictionary from `to_dict`.
+
+        Returns:
+            _Series: Series of the dictionary.
+        """
+        series = cls()
+        series.requests = data["requests"]
+        series.cache_hits = data["cache_hits"]
+        # Metrics persisted before hedging have no hedge counters
+        series.hedges = data.get("hedges", 0)
+        series.hedge_wins = data.get("hedge_wins", 0)
+        series.errors = dict(data["errors"])
+        for name, histogram in data["histograms"].items():
+            if name in series.histograms:
+                series.histograms[name] = FridayHistogram.from_dict(histogram)
+        return series
+
+
+class FridayCallTimer:
+    """
+    Timer of an SDK call, recorded into the metrics when it finishes.
+
+    Attributes:
+        operation (str): SDK operation.
+        model (str): Model name.
+        start (float): Start of the call, from `time.perf_counter`.
+        ttft_seconds (Optional[float]): Time to the first streamed chunk in seconds, once received.
+    """
+
+    def __init__(self, metrics: "FridayMetrics", operation: str, model: str) -> None:
+        """
+        Start timing an SDK call.
+
+        Args:
+            metrics (FridayMetrics): Metrics to record the call into.
+            operation (str): SDK operation.
+            model (str): Model name.
+        """
+        self.metrics = metrics
+        self.operation = operation
+        self.model = model
+        self.start = time.perf_counter()
+        self.ttft_seconds: Optional[float] = None
+
+    def first_token(self) -> None:
+        """Mark the first streamed chunk as received."""
+        self.ttft_seconds = time.perf_counter() - self.start
+
+    def finish(
+        self, usage_metadata: Any = None, cache_hit: bool = False, error: Optional[BaseException] = None
+    ) -> None:
+        """
+        Record the finished call.
+
+        Args:
+            usage_metadata (Any): Usage metadata of the response. Defaults to None.
+            cache_hit (bool, optional): Served from the response cache. Defaults to False.
+            error (Optional[BaseException]): Error of a failed call. Defaults to None.
+        """
+        self.metrics.record(
+            self.operation,
+            self.model,
+            wall_seconds=time.perf_counter() - self.start,
+            ttft_seconds=self.ttft_seconds,
+            usage_metadata=usage_metadata,
+            cache_hit=cache_hit,
+            error=error,
+        )
+
+
+class FridayMetrics:
+    """
+    Per-request latency and token metrics of the Friday Generation SDK, labelled by operation and model.
+
+    The process-wide registry is `FridayMetrics.default()`. `save` merges the metrics into the persisted metrics under
+    `.friday_cache`, which `friday_cli --stats` reports.
+
+    Attributes:
+        path (Path): Path to the persisted metrics.
+    """
+
+    __default: Optional["FridayMetrics"] = None
+    __default_lock = threading.Lock()
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """
+        Initialize the metrics.
+
+        Args:
+            path (Optional[Path]): Path to the persisted metrics. Defaults to `.friday_cache/metrics.json`.
+        """
+        self.path = Path(path) if path else friday_cache_dir() / "metrics.json"
+        self.__lock = threading.RLock()
+        self.__series: dict[tuple[str, str], _Series] = {}
+
+    @classmethod
+    def default(cls) -> "FridayMetrics":
+        """
+        Return the process-wide metrics registry.
+
+        Returns:
+            FridayMetrics: Process-wide metrics registry.
+        """
+        with cls.__default_lock:
+            if cls.__default is None:
+                cls.__default = cls()
+            return cls.__default
+
+    def timer(self, operation: str, model: str) -> FridayCallTimer:
+        """
+        Start timing an SDK call.
+
+        Args:
+            operation (str): SDK operation, e.g. `generate_content`.
+            model (str): Model name.
+
+        Returns:
+            FridayCallTimer: Timer recording the call into the metrics when it finishes.
+        """
+        return FridayCallTimer(self, operation, model)
+
+    def record(
+        self,
+        operation: str,
+        model: str,
+        *,
+        wall_seconds: float,
+        ttft_seconds: Optional[float] = None,
+        usage_metadata: Any = None,
+        cache_hit: bool = False,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Record an SDK call.
+
+        Args:
+            operation (str): SDK operation, e.g. `generate_content`.
+            model (str): Model name.
+            wall_seconds (float): Wall time of the call in seconds.
+            ttft_seconds (Optional[float]): Time to the first streamed chunk in seconds. Defaults to None.
+            usage_metadata (Any): Usage metadata of the response. Defaults to None.
+            cache_hit (bool, optional): Served from the response cache. Defaults to False.
+            error (Optional[BaseException]): Error of a failed call. Defaults to None.
+        """
+        with self.__lock:
+            series = self.__get_series(operation, model)
+            series.requests += 1
+            series.cache_hits += cache_hit
+            if error is not None:
+                error_type = type(error).__name__
+                series.errors[error_type] = series.errors.get(error_type, 0) + 1
+            histograms = series.histograms
+            histograms["request_duration_seconds"].observe(wall_seconds)
+            if ttft_seconds is not None:
+                histograms["time_to_first_token_seconds"].observe(ttft_seconds)
+            if usage_metadata is not None and not cache_hit:
+                histograms["prompt_tokens"].observe(usage_metadata.prompt_token_count)
+                histograms["candidates_tokens"].observe(usage_metadata.candidates_token_count)
+                histograms["total_tokens"].observe(usage_metadata.total_token_count)
+                if wall_seconds > 0:
+                    histograms["output_tokens_per_second"].observe(usage_metadata.candidates_token_count / wall_seconds)
+
+    def record_hedge(self, operation: str, model: str, won: bool) -> None:
+        """
+        Record a duplicate request sent by the hedging policy.
+
+        Args:
+            operation (str): SDK operation, e.g. `generate_content`.
+            model (str): Model name the duplicate request was sent to.
+            won (bool): The duplicate request returned before the request it duplicated.
+        """
+        with self.__lock:
+            series = self.__get_series(operation, model)
+            series.hedges += 1
+            series.hedge_wins += won
+
+    def __get_series(self, operation: str, model: str) -> _Series:
+        """Return the series of an (operation, model) label pair, created on first use. Called under the lock."""
+        model = model.removeprefix("models/")
+        series = self.__series.get((operation, model))
+        if series is None:
+            series = self.__series[(operation, model)] = _Series()
+        return series
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Return a JSON serializable snapshot of the metrics.
+
+        Returns:
+            dict[str, Any]: Series of metrics with their operation and model labels, histograms with summary statistics.
+        """
+        with self.__lock:
+            return {
+                "series": [
+                    {"operation": operation, "model": model, **series.to_dict()}
+                    for (operation, model), series in sorted(self.__series.items())
+                ]
+            }
+
+    def merge_snapshot(self, snapshot: dict[str, Any]) -> None:
+        """
+        Add the metrics of a snapshot.
+
+        Args:
+            snapshot (dict[str, Any]): Snapshot from `snapshot`.
+        """
+        with self.__lock:
+            for data in snapshot.get("series", []):
+                series = _Series.from_dict(data)
+                labels = (data["operation"], data["model"])
+                if labels in self.__series:
+                    self.__series[labels].merge(series)
+                else:
+                    self.__series[labels] = series
+
+    def reset(self) -> None:
+        """Clear the metrics."""
+        with self.__lock:
+            self.__series.clear()
+
+    def to_prometheus(self) -> str:
+        """
+        Export the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Metrics in the Prometheus text format.
+        """
+        snapshot = self.snapshot()["series"]
+        lines = []
+
+        def labels(data: dict[str, Any], **extra: str) -> str:
+            values = {"operation": data["operation"], "model": data["model"], **extra}
+            return ",".join(f'{key}="{_escape(value)}"' for key, value in values.items())
+
+        for name, help_text in COUNTERS.items():
+            lines += [f"# HELP friday_{name} {help_text}", f"# TYPE friday_{name} counter"]
+            for data in snapshot:
+                if name == "errors_total":
+                    lines += [
+                        f"friday_{name}{{{labels(data, error=error)}}} {count}"
+                        for error, count in sorted(data["errors"].items())
+                    ]
+                else:
+                    lines.append(f"friday_{name}{{{labels(data)}}} {data[_COUNTER_FIELDS[name]]}")
+
+        for name, (_, help_text) in HISTOGRAMS.items():
+            lines += [f"# HELP friday_{name} {help_text}", f"# TYPE friday_{name} histogram"]
+            for data in snapshot:
+                histogram = data["histograms"][name]
+                cumulative = 0
+                for bound, count in zip([*histogram["buckets"], math.inf], histogram["counts"]):
+                    cumulative += count
+                    le = "+Inf" if bound == math.inf else f"{bound:g}"
+                    lines.append(f"friday_{name}_bucket{{{labels(data, le=le)}}} {cumulative}")
+                lines.append(f"friday_{name}_sum{{{labels(data)}}} {histogram['sum']:g}")
+                lines.append(f"friday_{name}_count{{{labels(data)}}} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def load(self) -> "FridayMetrics":
+        """
+        Load the persisted metrics into a new registry.
+
+        Returns:
+            FridayMetrics: Persisted metrics, empty if none were saved.
+        """
+        metrics = FridayMetrics(self.path)
+        try:
+            metrics.merge_snapshot(json.loads(self.path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return metrics
+
+    def save(self) -> None:
+        """
+        Merge the metrics into the persisted metrics and clear them, so that saving again does not count them twice.
+        The merge holds a file lock, so that processes saving at the same time do not lose each other's metrics. The
+        metrics are taken out before the merge, so that calls recorded meanwhile are kept for the next save, and put
+        back if the save fails.
+        """
+        with _file_lock(self.path):
+            with self.__lock:
+                snapshot = self.snapshot()
+                self.__series.clear()
+            try:
+                persisted = self.load()
+                persisted.merge_snapshot(snapshot)
+                with tempfile.NamedTemporaryFile(
+                    "w",
+                    dir=self.path.parent,
+                    prefix=f"{self.path.name}.",
+                    suffix=".tmp",
+                    delete=False,
+                    encoding="utf-8",
+                ) as temp_file:
+                    json.dump(persisted.snapshot(), temp_file, indent=2)
+                os.replace(temp_file.name, self.path)
+            except BaseException:
+                self.merge_snapshot(snapshot)
+                raise
+
+    def to_text(self) -> str:
+        """
+        Render the metrics as a human readable table.
+
+        Returns:
+            str: Table of the metrics per operation and model.
+        """
+
+        def value(number: Optional[float], scale: float = 1.0, digits: int = 0) -> str:
+            return "-" if number is None else f"{number * scale:.{digits}f}"
+
+        header = (
+            f"{'operation':<26} {'model':<22} {'calls':>6} {'errors':>6} {'cached':>6} {'hedged':>6} {'won':>4} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'ttft ms':>8} {'tok/s':>7} {'tokens':>9}"
+        )
+        lines = [header, "-" * len(header)]
+        for data in self.snapshot()["series"]:
+            histograms = data["histograms"]
+            lines.append(
+                f"{data['operation']:<26} {data['model']:<22} {data['requests']:>6} "
+                f"{sum(data['errors'].values()):>6} {data['cache_hits']:>6} "
+                f"{data['hedges']:>6} {data['hedge_wins']:>4} "
+                f"{value(histograms['request_duration_seconds']['p50'], 1000):>8} "
+                f"{value(histograms['request_duration_seconds']['p95'], 1000):>8} "
+                f"{value(histograms['time_to_first_token_seconds']['p50'], 1000):>8} "
+                f"{value(histograms['output_tokens_per_second']['mean'], digits=1):>7} "
+                f"{histograms['total_tokens']['sum']:>9.0f}"
+            )
+        return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock on the lock file of a path, to serialize its updates across processes.
+
+    Args:
+        path (Path): Path to lock. The lock file is created next to it.
+    """
+    with open(path.with_name(f"{path.name}.lock"), "a+b") as lock_file:
+        if os.name == "nt":
+            import msvcrt
+
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+if __name__ == "__main__":
+    metrics = FridayMetrics.default().load()
+    print(metrics.to_text())
+    print(metrics.to_prometheus())
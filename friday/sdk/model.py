@@ -11,6 +11,9 @@ import google.generativeai as genai
 # Project Library
 from friday.utilities.logger import CustomLogger
 from friday.utilities.exceptions import FridayBaseException
+from friday.sdk.catalog import GoogleAIModelCatalog
+from friday.sdk.context_cache import GoogleAIContextCache
+from friday.sdk.fake import FridayFakeBackend
 
 # Type hints
 from google.generativeai.generative_models import GenerativeModel
@@ -29,30 +32,42 @@ class GoogleAIModel:
     Google Generative AI Model Configuration for Friday.
 
     Expected Environment Variables:
-    - `GOOGLE_API_KEY`: Google API Key for Generative AI.
+    - `GOOGLE_API_KEY`: Google API Key for Generative AI, not needed with the fake backend.
+    - `FRIDAY_FAKE_BACKEND`: Optional, use the deterministic local fake backend instead of Google Generative AI.
+
+    With `context_cache`, the system instruction and preamble are cached server side and requests are made with the
+    cached content handle while it is live. Otherwise, or while the cache is unavailable, they are sent with every
+    request.
 
     Attributes:
-        model (GenerativeModel): Generative Model from Google Generative AI.
+        model (GenerativeModel): Generative Model from Google Generative AI for the next request.
         model_name (str): Supported model name from Google Generative AI. Default: "gemini-1.5-flash".
         system_instruction (str): System instruction for the model. Default: None.
+        preamble (str): Large fixed preamble for the model. Default: None.
+        context_cache (Optional[GoogleAIContextCache]): Server-side context cache. Default: None.
+        fake_backend (Optional[FridayFakeBackend]): Local fake backend used instead of Google Generative AI.
     """
 
-    __supported_models: list[Model] = None
+    # Disk cached catalog shared by every model
+    catalog = GoogleAIModelCatalog()
 
     @classmethod
     def get_supported_models(cls) -> list[Model]:
         """
-        List supported models from Google Generative AI.
+        List supported models from Google Generative AI. Served from the disk cached model catalog.
 
         Returns:
             list[Model]: List of supported models from Google Generative AI.
         """
-        if not cls.__supported_models:
-            cls.__supported_models = list(genai.list_models())
-        return cls.__supported_models
+        return cls.catalog.models()
 
     def __init__(
-        self, model_name: Optional[str] = "gemini-1.5-flash", system_instruction: Optional[str] = None
+        self,
+        model_name: Optional[str] = "gemini-1.5-flash",
+        system_instruction: Optional[str] = None,
+        preamble: Optional[str] = None,
+        context_cache: bool = False,
+        fake_backend: Optional[FridayFakeBackend] = None,
     ) -> None:
         """
         Generators for Google Generative AI.
@@ -60,10 +75,24 @@ class GoogleAIModel:
         Args:
             model_name (Optional[str]): Supported model name from Google Generative AI (default: "gemini-1.5-flash").
             system_instruction (Optional[str]): System instruction for the model (default: None).
+            preamble (Optional[str]): Large fixed preamble for the model, e.g. reference documents (default: None).
+            context_cache (bool): Cache the system instruction and preamble server side (default: False).
+            fake_backend (Optional[FridayFakeBackend]): Local fake backend used instead of Google Generative AI
+                (default: configured by `FRIDAY_FAKE_BACKEND`, otherwise None).
         """
         self.model_name = model_name
         self.system_instruction = system_instruction
+        self.preamble = preamble
+        self.fake_backend = fake_backend or FridayFakeBackend.from_env()
+        self.context_cache: Optional[GoogleAIContextCache] = None
+        if context_cache and (system_instruction or preamble) and self.fake_backend is None:
+            self.context_cache = GoogleAIContextCache(
+                model_name=model_name, system_instruction=system_instruction, preamble=preamble
+            )
         self.logger = CustomLogger(name="friday")
+        if self.fake_backend is not None:
+            self._configure()
+            return
 
         # Load API key from the environment variables
         self.__api_key = os.getenv("GOOGLE_API_KEY")
@@ -72,8 +101,8 @@ class GoogleAIModel:
                 message="API Key not found in the environment variables...", logger=self.logger
             )
 
-        self.__supported_models: list[Model] = GoogleAIModel.supported_models()
         self._configure()
+        self._validate_model_name_lazily()
 
     @staticmethod
     def supported_models() -> list[Model]:
@@ -99,16 +128,86 @@ class GoogleAIModel:
             if "generateContent" in model.supported_generation_methods
         ]
 
+    def validate_model_name(self, models: list[Model]) -> None:
+        """
+        Validate the model name against the supported generation models.
+
+        Args:
+            models (list[Model]): Models from the model catalog.
+
+        Raises:
+            FridayModelCreationError: Model is not supported for content generation.
+        """
+        model_name = self.model_name if self.model_name.startswith("models/") else f"models/{self.model_name}"
+        generation_models = [model.name for model in models if "generateContent" in model.supported_generation_methods]
+        if model_name not in generation_models:
+            raise FridayModelCreationError(
+                message=f"Model {self.model_name} is not supported for content generation...", logger=self.logger
+            )
+
+    def _validate_model_name_lazily(self) -> None:
+        """
+        Validate the model name without blocking on the network.
+
+        The model name is validated right away against the cached model catalog. When the catalog is missing or stale,
+        it is refreshed in the background and the model name is validated once the refresh completes.
+
+        Raises:
+            FridayModelCreationError: Model is not supported for content generation by the cached model catalog.
+        """
+        models = GoogleAIModel.catalog.cached_models()
+        if models is not None:
+            self.validate_model_name(models)
+        if GoogleAIModel.catalog.is_stale():
+            GoogleAIModel.catalog.refresh_in_background(on_refresh=self.__validate_refreshed_models)
+
+    def __validate_refreshed_models(self, models: list[Model]) -> None:
+        """
+        Validate the model name against the refreshed model catalog. The error is only logged, as it is raised on the
+        background refresh thread.
+
+        Args:
+            models (list[Model]): Models from the refreshed model catalog.
+        """
+        try:
+            self.validate_model_name(models)
+        except FridayModelCreationError:
+            pass
+
     def _configure(self) -> None:
         """
         Configure Friday with Google Generative AI. Once configured, the model can be accessed using the `model`
-        attribute.
+        attribute. With the fake backend, the model is simulated locally.
         """
+        # Fallback model sending the preamble with the system instruction
+        system_instruction = "\n\n".join(filter(None, [self.system_instruction, self.preamble])) or None
+        self.__cached_model: Optional[GenerativeModel] = None
+        if self.fake_backend is not None:
+            self.__model = self.fake_backend.model(self.model_name, system_instruction=system_instruction)
+            return
+
         genai.configure(api_key=self.__api_key)
-        self.model: GenerativeModel = genai.GenerativeModel(
-            model_name=self.model_name, system_instruction=self.system_instruction
+        self.__model: GenerativeModel = genai.GenerativeModel(
+            model_name=self.model_name, system_instruction=system_instruction
         )
 
+    @property
+    def model(self) -> GenerativeModel:
+        """
+        Generative Model for the next request. The context cached model while the context cache is live, otherwise the
+        model sending the system instruction.
+
+        Returns:
+            GenerativeModel: Generative Model from Google Generative AI.
+        """
+        cached_content = self.context_cache.cached_content() if self.context_cache is not None else None
+        if cached_content is None:
+            return self.__model
+
+        if self.__cached_model is None or self.__cached_model.cached_content != cached_content.name:
+            self.__cached_model = genai.GenerativeModel.from_cached_content(cached_content)
+        return self.__cached_model
+
     def __str__(self) -> str:
         """String representation of the GoogleAIModel."""
         return f"GoogleAIModel:\n{self.model}"
@@ -0,0 +1,344 @@
+"""Client-side Rate Limiting and Retries for the Friday Generation SDK."""
+
+# Standard Library
+import os
+import time
+import random
+import asyncio
+import threading
+from typing import Awaitable, Callable, Optional, TypeVar
+
+# Third Party Library
+from google.api_core import exceptions
+
+# Project Library
+from friday.utilities.logger import CustomLogger
+
+
+T = TypeVar("T")
+
+# Requests and tokens per minute of the Google Generative AI free tier, used by the rate limiter when only one of
+# FRIDAY_RPM and FRIDAY_TPM is set
+DEFAULT_QUOTAS = {
+    "gemini-1.5-flash": (15, 1_000_000),
+    "gemini-1.5-flash-8b": (15, 1_000_000),
+    "gemini-1.5-pro": (2, 32_000),
+}
+DEFAULT_QUOTA = (15, 1_000_000)
+
+# Errors worth retrying: quota exhausted and transient server errors
+RETRYABLE_ERRORS = (
+    exceptions.TooManyRequests,
+    exceptions.ResourceExhausted,
+    exceptions.InternalServerError,
+    exceptions.ServiceUnavailable,
+    exceptions.DeadlineExceeded,
+)
+RATE_LIMIT_ERRORS = (exceptions.TooManyRequests, exceptions.ResourceExhausted)
+
+
+class _TokenBucket:
+    """
+    Token bucket refilled continuously up to its capacity per minute.
+
+    Capacity is reserved up front: the level may go negative, and the reservation is delayed until the bucket refills
+    back to zero. Concurrent callers are thus spaced out at the refill rate instead of bursting together.
+    """
+
+    def __init__(self, capacity_per_minute: float) -> None:
+        self.capacity = capacity_per_minute
+        self.rate = capacity_per_minute / 60
+        self.level = capacity_per_minute
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Reserve capacity and return the delay before it is available in seconds."""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= amount
+        return max(-self.level / self.rate, 0.0)
+
+    def adjust(self, amount: float) -> None:
+        """Return (positive) or take (negative) capacity, e.g. once the actual usage is known."""
+        self.level = min(self.capacity, self.level + amount)
+
+
+class FridayRateLimiter:
+    """
+    Client-side requests per minute (RPM) and tokens per minute (TPM) rate limiter, shared by model name.
+
+    Every request reserves one request and its estimated tokens before it is sent. The estimate is settled with the
+    usage metadata of the response. When the server answers with a rate limit error anyway, every caller of the model
+    holds back until the retry delay has passed, so that concurrent callers do not hammer the quota together.
+
+    Attributes:
+        model_name (str): Model name the quota applies to.
+        requests_per_minute (float): Requests per minute.
+        tokens_per_minute (float): Tokens per minute.
+    """
+
+    __limiters: dict[str, "FridayRateLimiter"] = {}
+    __limiters_lock = threading.Lock()
+
+    def __init__(self, model_name: str, requests_per_minute: float, tokens_per_minute: float) -> None:
+        """
+        Initialize the rate limiter.
+
+        Args:
+            model_name (str): Model name the quota applies to.
+            requests_per_minute (float): Requests per minute.
+            tokens_per_minute (float): Tokens per minute.
+        """
+        self.model_name = model_name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.logger = CustomLogger(name="friday")
+
+        self.__lock = threading.Lock()
+        self.__requests = _TokenBucket(requests_per_minute)
+        self.__tokens = _TokenBucket(tokens_per_minute)
+        self.__blocked_until = 0.0
+        self.__stats = {"requests": 0, "throttled_requests": 0, "throttled_seconds": 0.0, "rate_limited": 0}
+
+    @classmethod
+    def for_model(cls, model_name: str) -> "FridayRateLimiter":
+        """
+        Return the rate limiter shared by every caller of a model. The quota is read from `FRIDAY_RPM` and
+        `FRIDAY_TPM`, or defaults to the free tier quota of the model.
+
+        Args:
+            model_name (str): Model name.
+
+        Returns:
+            FridayRateLimiter: Shared rate limiter of the model.
+        """
+        model_name = model_name.removeprefix("models/")
+        with cls.__limiters_lock:
+            if model_name not in cls.__limiters:
+                requests_per_minute, tokens_per_minute = DEFAULT_QUOTAS.get(model_name, DEFAULT_QUOTA)
+                cls.__limiters[model_name] = cls(
+                    model_name,
+                    requests_per_minute=float(os.getenv("FRIDAY_RPM") or requests_per_minute),
+                    tokens_per_minute=float(os.getenv("FRIDAY_TPM") or tokens_per_minute),
+                )
+            return cls.__limiters[model_name]
+
+    @classmethod
+    def from_env(cls, model_name: str) -> Optional["FridayRateLimiter"]:
+        """
+        Return the shared rate limiter of a model when client-side rate limiting is enabled with `FRIDAY_RPM` or
+        `FRIDAY_TPM`. Paid tiers have far higher quotas than the free tier defaults, so it is disabled otherwise.
+
+        Args:
+            model_name (str): Model name.
+
+        Returns:
+            Optional[FridayRateLimiter]: Shared rate limiter of the model, or None when disabled.
+        """
+        if not (os.getenv("FRIDAY_RPM") or os.getenv("FRIDAY_TPM")):
+            return None
+        return cls.for_model(model_name)
+
+    def reserve(self, tokens: int) -> float:
+        """
+        Reserve a request and its estimated tokens.
+
+        Args:
+            tokens (int): Estimated tokens of the request.
+
+        Returns:
+            float: Delay before the request may be sent in seconds.
+        """
+        with self.__lock:
+            now = time.monotonic()
+            delay = max(
+                self.__requests.reserve(1, now),
+                self.__tokens.reserve(min(tokens, self.tokens_per_minute), now),
+                self.__blocked_until - now,
+            )
+            self.__stats["requests"] += 1
+            if delay > 0:
+                self.__stats["throttled_requests"] += 1
+                self.__stats["throttled_seconds"] += delay
+        if delay > 0:
+            self.logger.debug("Throttling %s request for %.2fs.", self.model_name, delay)
+        return delay
+
+    def acquire(self, tokens: int) -> None:
+        """
+        Wait until a request with its estimated tokens may be sent.
+
+        Args:
+            tokens (int): Estimated tokens of the request.
+        """
+        if delay := self.reserve(tokens):
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: int) -> None:
+        """
+        Asynchronously wait until a request with its estimated tokens may be sent.
+
+        Args:
+            tokens (int): Estimated tokens of the request.
+        """
+        if delay := self.reserve(tokens):
+            await asyncio.sleep(delay)
+
+    def settle(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """
+        Settle the estimated tokens of a request with its actual usage.
+
+        Args:
+            estimated_tokens (int): Estimated tokens reserved for the request.
+            actual_tokens (int): Total tokens of the request from the usage metadata.
+        """
+        with self.__lock:
+            self.__tokens.adjust(min(estimated_tokens, self.tokens_per_minute) - actual_tokens)
+
+    def block(self, seconds: float) -> None:
+        """
+        Hold back every request for a while after the server rate limited a request.
+
+        Args:
+            seconds (float): Time to hold back the requests in seconds.
+        """
+        with self.__lock:
+            self.__blocked_until = max(self.__blocked_until, time.monotonic() + seconds)
+            self.__stats["rate_limited"] += 1
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Return the rate limiter statistics.
+
+        Returns:
+            dict[str, int | float]: Requests, throttled requests, time spent throttled in seconds and rate limit errors.
+        """
+        with self.__lock:
+            return dict(self.__stats)
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """
+    Return the retry delay requested by the server with an error, from the `RetryInfo` details or the `Retry-After`
+    header.
+
+    Args:
+        error (Exception): Error raised by the API call.
+
+    Returns:
+        Optional[float]: Requested retry delay in seconds, or None if the server did not request one.
+    """
+    for detail in getattr(error, "details", None) or ():
+        retry_delay = getattr(detail, "retry_delay", None)
+        if retry_delay is not None:
+            return retry_delay.seconds + retry_delay.nanos / 1e9
+
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers["retry-after"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class FridayRetryPolicy:
+    """
+    Retry policy for the API calls with jittered exponential backoff.
+
+    Rate limit errors (429) and transient server errors (5xx, deadline exceeded) are retried after the delay requested
+    by the server, or after a full jitter exponential backoff. Other errors are raised right away.
+
+    Attributes:
+        max_retries (int): Maximum number of retries of a call.
+        base_delay (float): Backoff delay of the first retry in seconds.
+        max_delay (float): Maximum backoff delay in seconds.
+        retries (int): Number of retries made.
+    """
+
+    def __init__(self, max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0) -> None:
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_retries (int, optional): Maximum number of retries of a call. Defaults to 5.
+            base_delay (float, optional): Backoff delay of the first retry in seconds. Defaults to 1 second.
+            max_delay (float, optional): Maximum backoff delay in seconds. Defaults to 60 seconds.
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self.logger = CustomLogger(name="friday")
+
+    def _delay(self, attempt: int, error: Exception, rate_limiter: Optional[FridayRateLimiter]) -> float:
+        """
+        Return the delay before retrying a failed call, or raise the error if it should not be retried.
+
+        Args:
+            attempt (int): Number of the failed attempt, starting at 0.
+            error (Exception): Error raised by the call.
+            rate_limiter (Optional[FridayRateLimiter]): Rate limiter of the model, held back on rate limit errors.
+
+        Returns:
+            float: Delay before retrying in seconds.
+        """
+        if not isinstance(error, RETRYABLE_ERRORS) or attempt >= self.max_retries:
+            raise error
+
+        delay = retry_after(error)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        if rate_limiter is not None and isinstance(error, RATE_LIMIT_ERRORS):
+            rate_limiter.block(delay)
+        self.retries += 1
+        self.logger.warning("Retrying in %.2fs after %s: %s", delay, type(error).__name__, error)
+        return delay
+
+    def call(
+        self, function: Callable[[], T], rate_limiter: Optional[FridayRateLimiter] = None, tokens: int = 0
+    ) -> T:
+        """
+        Call a function, throttled by the rate limiter and retried on transient errors. Every attempt is a request,
+        but the estimated tokens of a failed attempt are refunded, so that they are only spent once.
+
+        Args:
+            function (Callable[[], T]): API call.
+            rate_limiter (Optional[FridayRateLimiter]): Rate limiter of the model. Defaults to None (unlimited).
+            tokens (int, optional): Estimated tokens of the call. Defaults to 0.
+
+        Returns:
+            T: Result of the call.
+        """
+        for attempt in range(self.max_retries + 1):
+            if rate_limiter is not None:
+                rate_limiter.acquire(tokens)
+            try:
+                return function()
+            except Exception as err:
+                if rate_limiter is not None:
+                    rate_limiter.settle(tokens, 0)
+                time.sleep(self._delay(attempt, err, rate_limiter))
+
+    async def call_async(
+        self, function: Callable[[], Awaitable[T]], rate_limiter: Optional[FridayRateLimiter] = None, tokens: int = 0
+    ) -> T:
+        """
+        Asynchronously call a function, throttled by the rate limiter and retried on transient errors. Every attempt
+        is a request, but the estimated tokens of a failed attempt are refunded, so that they are only spent once.
+
+        Args:
+            function (Callable[[], Awaitable[T]]): Async API call.
+            rate_limiter (Optional[FridayRateLimiter]): Rate limiter of the model. Defaults to None (unlimited).
+            tokens (int, optional): Estimated tokens of the call. Defaults to 0.
+
+        Returns:
+            T: Result of the call.
+        """
+        for attempt in range(self.max_retries + 1):
+            if rate_limiter is not None:
+                await rate_limiter.acquire_async(tokens)
+            try:
+                return await function()
+            except Exception as err:
+                if rate_limiter is not None:
+                    rate_limiter.settle(tokens, 0)
+                await asyncio.sleep(self._delay(attempt, err, rate_limiter))
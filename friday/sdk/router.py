@@ -0,0 +1,321 @@
+"""Latency-aware Model Router for the Friday Generation SDK."""
+
+# Standard Library
+import os
+import time
+import threading
+from dataclasses import dataclass
+from weakref import WeakKeyDictionary
+from typing import Any, Literal, Optional
+
+# Project Library
+from friday.utilities.logger import CustomLogger
+from friday.utilities.exceptions import FridayBaseException
+from friday.sdk.model import GoogleAIModel
+
+
+# Quality tiers of the models, from the fastest to the best
+QUALITY_TIERS = ("fast", "balanced", "best")
+
+# Default routes: model name, quality tier, price per million prompt tokens in USD and latency until observed
+DEFAULT_ROUTES = (
+    ("gemini-1.5-flash-8b", "fast", 0.0375, 0.4),
+    ("gemini-1.5-flash", "balanced", 0.075, 0.6),
+    ("gemini-1.5-pro", "best", 1.25, 1.5),
+)
+
+
+class FridayRouterError(FridayBaseException):
+    """Friday Router Error in the SDK."""
+
+
+@dataclass
+class FridayModelRoute:
+    """
+    Model the router can send requests to.
+
+    Attributes:
+        model (GoogleAIModel): Google Generative AI Model.
+        tier (str): Quality tier of the model, one of `QUALITY_TIERS`.
+        cost (float): Price per million prompt tokens, to compare the cost of the models.
+        latency (float): Latency of the model in seconds until it is observed.
+    """
+
+    model: GoogleAIModel
+    tier: str
+    cost: float
+    latency: float
+
+    @property
+    def model_name(self) -> str:
+        """Model name of the route."""
+        return self.model.model_name
+
+
+class FridayModelRouter:
+    """
+    Router sending each request to the cheapest or fastest model which meets its quality tier.
+
+    A request is classified by its estimated prompt tokens, the number of turns of its chat history and an optional
+    hint: short questions need the `fast` tier, long prompts the `best` tier and the others the `balanced` tier, never
+    below `min_tier`. The latency of each model is learned per operation from the observed timings, with an
+    exponentially weighted moving average, and falls back to the route latency once stale so that a model which was
+    slow for a while is tried again. A chat session is pinned to the model of its first message, so that it does not
+    hop models mid-conversation.
+
+    Attributes:
+        routes (list[FridayModelRoute]): Models the requests are sent to.
+        min_tier (str): Minimum quality tier of every request.
+        prefer (Literal["fastest", "cheapest"]): Choice among the models meeting the quality tier of a request.
+        short_prompt_tokens (int): Maximum prompt tokens of a short question.
+        short_history_turns (int): Maximum chat history turns of a short question.
+        long_prompt_tokens (int): Minimum prompt tokens of a long prompt.
+        smoothing (float): Weight of a new timing in the moving average of the latencies.
+        stale_seconds (float): Time after which a latency which is not observed again is stale.
+    """
+
+    def __init__(
+        self,
+        routes: list[FridayModelRoute],
+        min_tier: str = "fast",
+        prefer: Literal["fastest", "cheapest"] = "fastest",
+        short_prompt_tokens: int = 64,
+        short_history_turns: int = 4,
+        long_prompt_tokens: int = 8000,
+        smoothing: float = 0.2,
+        stale_seconds: float = 300.0,
+    ) -> None:
+        """
+        Initialize the model router.
+
+        Args:
+            routes (list[FridayModelRoute]): Models the requests are sent to.
+            min_tier (str, optional): Minimum quality tier of every request. Defaults to "fast".
+            prefer (Literal["fastest", "cheapest"], optional): Choice among the models meeting the quality tier of a
+                request. Defaults to "fastest".
+            short_prompt_tokens (int, optional): Maximum prompt tokens of a short question. Defaults to 64.
+            short_history_turns (int, optional): Maximum chat history turns of a short question. Defaults to 4.
+            long_prompt_tokens (int, optional): Minimum prompt tokens of a long prompt. Defaults to 8000.
+            smoothing (float, optional): Weight of a new timing in the moving average of the latencies. Defaults to
+                0.2.
+            stale_seconds (float, optional): Time after which a latency which is not observed again is stale.
+                Defaults to 5 minutes.
+
+        Raises:
+            FridayRouterError: No route, or unknown quality tier.
+        """
+        self.logger = CustomLogger(name="friday")
+        if not routes:
+            raise FridayRouterError(message="Friday model router needs at least one route...", logger=self.logger)
+        for tier in [min_tier, *(route.tier for route in routes)]:
+            if tier not in QUALITY_TIERS:
+                raise FridayRouterError(message=f"Unknown quality tier: {tier}...", logger=self.logger)
+        self.routes = list(routes)
+        self.min_tier = min_tier
+        self.prefer = prefer
+        self.short_prompt_tokens = short_prompt_tokens
+        self.short_history_turns = short_history_turns
+        self.long_prompt_tokens = long_prompt_tokens
+        self.smoothing = smoothing
+        self.stale_seconds = stale_seconds
+
+        self.__lock = threading.Lock()
+        # Moving average of the latency and time of the last timing per (model name, operation)
+        self.__latencies: dict[tuple[str, str], tuple[float, float]] = {}
+        self.__routed: dict[str, int] = {route.model_name: 0 for route in self.routes}
+        self.__pins: WeakKeyDictionary[Any, FridayModelRoute] = WeakKeyDictionary()
+
+    @classmethod
+    def default(cls, model: GoogleAIModel, **kwargs) -> "FridayModelRouter":
+        """
+        Create a router over the Gemini 1.5 Flash-8B, Flash and Pro models, with the system instruction and backend of
+        a model. The model is reused for its own route.
+
+        Args:
+            model (GoogleAIModel): Model configuration shared by the routes.
+            **kwargs: Options of the router.
+
+        Returns:
+            FridayModelRouter: Model router.
+        """
+        routes = []
+        for model_name, tier, cost, latency in DEFAULT_ROUTES:
+            if model.model_name != model_name:
+                route_model = GoogleAIModel(
+                    model_name=model_name,
+                    system_instruction=model.system_instruction,
+                    preamble=model.preamble,
+                    context_cache=model.context_cache is not None,
+                    fake_backend=model.fake_backend,
+                )
+            else:
+                route_model = model
+            routes.append(FridayModelRoute(model=route_model, tier=tier, cost=cost, latency=latency))
+        return cls(routes, **kwargs)
+
+    @classmethod
+    def from_env(cls, model: GoogleAIModel) -> Optional["FridayModelRouter"]:
+        """
+        Return the default router enabled by `FRIDAY_ROUTER`, `fastest` (or `1`) or `cheapest`, with the minimum
+        quality tier from `FRIDAY_ROUTER_MIN_TIER`.
+
+        Args:
+            model (GoogleAIModel): Model configuration shared by the routes.
+
+        Returns:
+            Optional[FridayModelRouter]: Model router, or None when disabled.
+        """
+        prefer = os.getenv("FRIDAY_ROUTER", "").strip().lower()
+        if prefer in ("", "0", "false", "no"):
+            return None
+        return cls.default(
+            model,
+            min_tier=os.getenv("FRIDAY_ROUTER_MIN_TIER") or "fast",
+            prefer="cheapest" if prefer == "cheapest" else "fastest",
+        )
+
+    def classify(self, prompt_tokens: int, history_turns: int = 0, hint: Optional[str] = None) -> str:
+        """
+        Classify a request into the quality tier it needs.
+
+        Args:
+            prompt_tokens (int): Estimated prompt tokens of the request, without the chat history.
+            history_turns (int, optional): Number of turns of the chat history. Defaults to 0.
+            hint (Optional[str]): Quality tier requested by the caller, one of `QUALITY_TIERS`. Defaults to None.
+
+        Returns:
+            str: Quality tier of the request.
+
+        Raises:
+            FridayRouterError: Unknown quality tier hint.
+        """
+        if hint is not None and hint not in QUALITY_TIERS:
+            raise FridayRouterError(message=f"Unknown quality tier: {hint}...", logger=self.logger)
+        if hint is not None:
+            tier = hint
+        elif prompt_tokens <= self.short_prompt_tokens and history_turns <= self.short_history_turns:
+            tier = "fast"
+        elif prompt_tokens >= self.long_prompt_tokens:
+            tier = "best"
+        else:
+            tier = "balanced"
+        return max(tier, self.min_tier, key=QUALITY_TIERS.index)
+
+    def expected_latency(self, route: FridayModelRoute, operation: str) -> float:
+        """
+        Return the expected latency of a model for an operation: the moving average of its timings, or the route
+        latency when it was not observed recently.
+
+        Args:
+            route (FridayModelRoute): Route of the model.
+            operation (str): SDK operation, e.g. `generate_content`.
+
+        Returns:
+            float: Expected latency in seconds.
+        """
+        with self.__lock:
+            latency, observed_at = self.__latencies.get((route.model_name, operation), (route.latency, 0.0))
+        if time.monotonic() - observed_at > self.stale_seconds:
+            return route.latency
+        return latency
+
+    def route(
+        self, operation: str, prompt_tokens: int, history_turns: int = 0, hint: Optional[str] = None
+    ) -> FridayModelRoute:
+        """
+        Choose the model of a request: the fastest, or the cheapest, of the models meeting its quality tier. When no
+        model meets it, the best model is chosen.
+
+        Args:
+            operation (str): SDK operation, e.g. `generate_content`.
+            prompt_tokens (int): Estimated prompt tokens of the request, without the chat history.
+            history_turns (int, optional): Number of turns of the chat history. Defaults to 0.
+            hint (Optional[str]): Quality tier requested by the caller, one of `QUALITY_TIERS`. Defaults to None.
+
+        Returns:
+            FridayModelRoute: Route of the request.
+        """
+        tier = QUALITY_TIERS.index(self.classify(prompt_tokens, history_turns, hint))
+        eligible = [route for route in self.routes if QUALITY_TIERS.index(route.tier) >= tier] or [
+            max(self.routes, key=lambda route: QUALITY_TIERS.index(route.tier))
+        ]
+        latencies = {route.model_name: self.expected_latency(route, operation) for route in eligible}
+        if self.prefer == "cheapest":
+            route = min(eligible, key=lambda route: (route.cost, latencies[route.model_name]))
+        else:
+            route = min(eligible, key=lambda route: (latencies[route.model_name], route.cost))
+        with self.__lock:
+            self.__routed[route.model_name] += 1
+        self.logger.debug("Routing %s (%s tier) to %s.", operation, QUALITY_TIERS[tier], route.model_name)
+        return route
+
+    def observe(self, model_name: str, operation: str, seconds: float) -> None:
+        """
+        Record the latency of a request, for the choice of the fastest model.
+
+        Args:
+            model_name (str): Model name the request was sent to.
+            operation (str): SDK operation, e.g. `generate_content`.
+            seconds (float): Time until the model call returned in seconds, the first chunk for streams.
+        """
+        now = time.monotonic()
+        with self.__lock:
+            latency, observed_at = self.__latencies.get((model_name, operation), (seconds, now))
+            if now - observed_at > self.stale_seconds:
+                latency = seconds
+            self.__latencies[(model_name, operation)] = (latency + self.smoothing * (seconds - latency), now)
+
+    def pin(self, key: Any, route: FridayModelRoute) -> None:
+        """
+        Pin a chat session to a model, for as long as the session is alive.
+
+        Args:
+            key (Any): Chat session, weakly referenced.
+            route (FridayModelRoute): Route of the chat session.
+        """
+        with self.__lock:
+            self.__pins[key] = route
+
+    def pinned(self, key: Any) -> Optional[FridayModelRoute]:
+        """
+        Return the model a chat session is pinned to.
+
+        Args:
+            key (Any): Chat session.
+
+        Returns:
+            Optional[FridayModelRoute]: Route of the chat session, or None if not pinned yet.
+        """
+        with self.__lock:
+            return self.__pins.get(key)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Return the routing statistics.
+
+        Returns:
+            dict[str, dict[str, Any]]: Per model, its tier, number of requests routed to it and expected latency per
+                observed operation in seconds.
+        """
+        with self.__lock:
+            operations = {operation for _, operation in self.__latencies}
+            routed = dict(self.__routed)
+        return {
+            route.model_name: {
+                "tier": route.tier,
+                "routed": routed[route.model_name],
+                "latency": {operation: self.expected_latency(route, operation) for operation in sorted(operations)},
+            }
+            for route in self.routes
+        }
+
+
+if __name__ == "__main__":
+    # Project Library
+    from friday.sdk.fake import FridayFakeBackend
+
+    router = FridayModelRouter.default(GoogleAIModel(fake_backend=FridayFakeBackend()))
+    for prompt_tokens, history_turns, hint in ((5, 0, None), (500, 10, None), (20_000, 0, None), (5, 0, "best")):
+        print(prompt_tokens, history_turns, hint, router.route("generate_content", prompt_tokens, history_turns, hint))
+    router.observe("gemini-1.5-flash-8b", "generate_content", 3.0)
+    print(router.route("generate_content", 5).model_name, router.stats())
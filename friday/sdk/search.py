@@ -0,0 +1,303 @@
+"""Full-text Search over the Persisted Friday Chat Sessions."""
+
+# Standard Library
+import re
+import sys
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Literal, Optional
+
+# Project Library
+from friday.utilities.logger import CustomLogger
+from friday.utilities.paths import friday_cache_dir
+from friday.utilities.exceptions import FridayBaseException
+from friday.sdk.sessions import SESSION_LOG_SUFFIX, FridaySession, FridaySessionStore
+
+
+# Keywords and "quoted phrases" of a query, a trailing * matches a prefix
+_QUERY_TERMS = re.compile(r'"([^"]*)"|(\S+)')
+
+
+class FridaySearchError(FridayBaseException):
+    """Friday Search Error in the SDK."""
+
+
+@dataclass
+class FridaySearchHit:
+    """
+    Message of a persisted chat session matching a search.
+
+    Attributes:
+        session_id (str): Identifier of the session.
+        turn (int): Number of the turn in the session, starting at 1.
+        role (str): Role of the message, `user` or `model`.
+        timestamp (float): Time of the turn.
+        text (str): Text of the message.
+        snippet (str): Excerpt of the message with the matches in [brackets].
+        score (float): Relevance of the message (BM25), higher is better.
+    """
+
+    session_id: str
+    turn: int
+    role: str
+    timestamp: float
+    text: str
+    snippet: str
+    score: float
+
+    def __str__(self) -> str:
+        """Return the hit as a line of search results."""
+        return f"{self.session_id} #{self.turn} {self.role}: {self.snippet}"
+
+
+class FridaySearchIndex:
+    """
+    Incremental inverted index over the messages of the persisted chat sessions, stored in a SQLite FTS5 table under
+    `.friday_cache`.
+
+    Each session log is indexed up to the byte offset read so far, so indexing a session only reads the records
+    appended since. Session logs rewritten by compaction are read again from the start, and only the turns newer than
+    the last indexed one are added, so the folded turns stay searchable. Queries are ranked with BM25.
+
+    Attributes:
+        store (FridaySessionStore): Store of the indexed sessions.
+        path (Path): Path to the SQLite index.
+    """
+
+    def __init__(self, store: Optional[FridaySessionStore] = None, path: Optional[Path] = None) -> None:
+        """
+        Initialize the search index. The index is opened on first use.
+
+        Args:
+            store (Optional[FridaySessionStore]): Store of the sessions to index. Defaults to the default store.
+            path (Optional[Path]): Path to the SQLite index. Defaults to `.friday_cache/search.sqlite3`.
+        """
+        self.store = store or FridaySessionStore()
+        self.path = path or friday_cache_dir() / "search.sqlite3"
+        self.logger = CustomLogger(name="friday")
+        self.__lock = threading.Lock()
+        self.__db: Optional[sqlite3.Connection] = None
+
+    def __connect(self) -> sqlite3.Connection:
+        """
+        Open the SQLite index and create its tables.
+
+        Returns:
+            sqlite3.Connection: Connection to the index.
+
+        Raises:
+            FridaySearchError: SQLite is built without FTS5.
+        """
+        if self.__db is None:
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            try:
+                db.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS messages USING fts5"
+                    "(text, session_id UNINDEXED, turn UNINDEXED, role UNINDEXED, ts UNINDEXED, "
+                    "tokenize = 'porter unicode61')"
+                )
+            except sqlite3.OperationalError as err:
+                db.close()
+                raise FridaySearchError(
+                    message=f"Full-text search is not available: {err}...", logger=self.logger
+                ) from err
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS sources (session_id TEXT PRIMARY KEY, inode INTEGER NOT NULL, "
+                "offset INTEGER NOT NULL, turns INTEGER NOT NULL, last_ts REAL NOT NULL)"
+            )
+            self.__db = db
+        return self.__db
+
+    def index_session(self, session: FridaySession) -> int:
+        """
+        Index the records appended to a session log since it was last indexed. Can be passed as the `on_append`
+        callback of the session store, to index the turns as they are appended.
+
+        Args:
+            session (FridaySession): Session log to index.
+
+        Returns:
+            int: Number of turns indexed.
+        """
+        with self.__lock:
+            return self.__index_session(session.session_id, session.path)
+
+    def __index_session(self, session_id: str, path: Path) -> int:
+        """
+        Index the records appended to a session log since it was last indexed.
+
+        Args:
+            session_id (str): Identifier of the session.
+            path (Path): Path to the session log.
+
+        Returns:
+            int: Number of turns indexed.
+        """
+        db = self.__connect()
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return 0
+        source = db.execute(
+            "SELECT inode, offset, turns, last_ts FROM sources WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        inode, offset, turns, last_ts = source or (stat.st_ino, 0, 0, 0.0)
+        # Compaction keeps the records as they are, so the turns already indexed are skipped by their timestamp
+        skip_until: Optional[float] = None
+        if inode != stat.st_ino or stat.st_size < offset:
+            # Rewritten by compaction: read again, skipping the turns already indexed
+            inode, offset, skip_until = stat.st_ino, 0, last_ts
+        if stat.st_size == offset:
+            return 0
+
+        with open(path, "rb") as file:
+            file.seek(offset)
+            data = file.read()
+        # Only complete records are indexed, a partially written record is read again next time
+        data = data[: data.rfind(b"\n") + 1]
+
+        rows = []
+        for line in data.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("type") != "turn" or (skip_until is not None and record["ts"] <= skip_until):
+                continue
+            turns += 1
+            last_ts = max(last_ts, record["ts"])
+            rows.append((record["user"], session_id, turns, "user", record["ts"]))
+            rows.append((record["model"], session_id, turns, "model", record["ts"]))
+
+        db.execute("BEGIN")
+        try:
+            db.executemany("INSERT INTO messages (text, session_id, turn, role, ts) VALUES (?, ?, ?, ?, ?)", rows)
+            db.execute(
+                "INSERT OR REPLACE INTO sources (session_id, inode, offset, turns, last_ts) VALUES (?, ?, ?, ?, ?)",
+                (session_id, inode, offset + len(data), turns, last_ts),
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return len(rows) // 2
+
+    def update(self) -> int:
+        """
+        Index the records appended to every session log of the store since it was last indexed.
+
+        Returns:
+            int: Number of turns indexed.
+        """
+        with self.__lock:
+            return sum(
+                self.__index_session(path.name.removesuffix(SESSION_LOG_SUFFIX), path)
+                for path in self.store.root.glob(f"*{SESSION_LOG_SUFFIX}")
+            )
+
+    @staticmethod
+    def _match_expression(query: str) -> str:
+        """
+        Convert a search query to an FTS5 match expression. Keywords and "quoted phrases" must all match, a trailing
+        `*` matches a prefix. Other characters have no special meaning.
+
+        Args:
+            query (str): Search query.
+
+        Returns:
+            str: FTS5 match expression.
+        """
+        terms = []
+        for phrase, keyword in _QUERY_TERMS.findall(query):
+            term = phrase or keyword
+            prefix = not phrase and term.endswith("*")
+            term = term.rstrip("*") if prefix else term
+            if term.strip():
+                terms.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+        return " AND ".join(terms)
+
+    def search(
+        self,
+        query: str,
+        *,
+        limit: int = 10,
+        session_id: Optional[str] = None,
+        role: Optional[Literal["user", "model"]] = None,
+    ) -> list[FridaySearchHit]:
+        """
+        Search the indexed messages. Call `update` first to index the sessions persisted by other processes.
+
+        Args:
+            query (str): Keywords and "quoted phrases", all of which must match. A trailing `*` matches a prefix.
+            limit (int, optional): Maximum number of hits. Defaults to 10.
+            session_id (Optional[str]): Only search this session. Defaults to all sessions.
+            role (Optional[Literal["user", "model"]]): Only search the messages of this role. Defaults to both.
+
+        Returns:
+            list[FridaySearchHit]: Matching messages, most relevant first.
+        """
+        expression = self._match_expression(query)
+        if not expression:
+            return []
+
+        sql = (
+            "SELECT session_id, turn, role, ts, text, snippet(messages, 0, '[', ']', '...', 12), bm25(messages) "
+            "FROM messages WHERE messages MATCH ?"
+        )
+        parameters: list = [expression]
+        if session_id is not None:
+            sql += " AND session_id = ?"
+            parameters.append(session_id)
+        if role is not None:
+            sql += " AND role = ?"
+            parameters.append(role)
+        sql += " ORDER BY rank LIMIT ?"
+        parameters.append(limit)
+
+        with self.__lock:
+            rows = self.__connect().execute(sql, parameters).fetchall()
+        return [
+            FridaySearchHit(
+                session_id=session_id,
+                turn=turn,
+                role=role,
+                timestamp=ts,
+                text=text,
+                snippet=snippet,
+                score=-score,
+            )
+            for session_id, turn, role, ts, text, snippet, score in rows
+        ]
+
+    def messages_since(self, rowid: int = 0) -> list[tuple[int, str, int, str, float, str]]:
+        """
+        Return the indexed messages in insertion order, after a row. The two messages of a turn are consecutive.
+
+        Args:
+            rowid (int, optional): Row of the last message already read. Defaults to 0, all the messages.
+
+        Returns:
+            list[tuple[int, str, int, str, float, str]]: Row, session id, turn, role, timestamp and text of every
+                message.
+        """
+        with self.__lock:
+            return self.__connect().execute(
+                "SELECT rowid, session_id, turn, role, ts, text FROM messages WHERE rowid > ? ORDER BY rowid", (rowid,)
+            ).fetchall()
+
+    def close(self) -> None:
+        """Close the index. It is reopened on next use."""
+        with self.__lock:
+            if self.__db is not None:
+                self.__db.close()
+                self.__db = None
+
+
+if __name__ == "__main__":
+    index = FridaySearchIndex()
+    print(f"Indexed {index.update()} new turns.")
+    for hit in index.search(" ".join(sys.argv[1:]) or "friday"):
+        print(hit)
@@ -0,0 +1,451 @@
+"""
+Semantic Response Cache for the Friday Generation SDK.
+
+Paraphrased prompts ("Who are you?", "What are you?") miss the exact-match response cache. The semantic cache embeds
+the prompts and serves the response of the most similar cached prompt, once the cosine similarity reaches a threshold.
+
+The embeddings are kept in a NumPy matrix and searched with a single matrix-vector product when NumPy is installed
+(`pip install numpy`), otherwise in plain Python lists.
+"""
+
+# Standard Library
+import re
+import os
+import math
+import time
+import zlib
+import operator
+import threading
+from dataclasses import dataclass
+from collections import OrderedDict
+from typing import Callable, Optional, Sequence
+
+# Third Party Library
+import google.generativeai as genai
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency, the vectors are searched in plain Python
+    np = None
+
+# Project Library
+from friday.utilities.logger import CustomLogger
+from friday.sdk.cache import FridayResponseCache
+
+# Type hints
+from google.generativeai import GenerationConfig, protos
+from google.generativeai.types.generation_types import GenerateContentResponse
+
+
+# Embedder of a batch of texts, returning one vector per text
+FridayEmbedder = Callable[[Sequence[str]], list[Sequence[float]]]
+
+DEFAULT_EMBEDDING_MODEL = "models/text-embedding-004"
+_WORDS = re.compile(r"\w+")
+
+
+class GoogleAIEmbedder:
+    """
+    Embedder backed by the Google Generative AI embedding API. The API key is configured by `GoogleAIModel`.
+
+    Attributes:
+        model_name (str): Name of the embedding model.
+        task_type (str): Embedding task type.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL, task_type: str = "SEMANTIC_SIMILARITY") -> None:
+        """
+        Initialize the embedder.
+
+        Args:
+            model_name (str, optional): Name of the embedding model. Defaults to "models/text-embedding-004".
+            task_type (str, optional): Embedding task type. Defaults to "SEMANTIC_SIMILARITY".
+        """
+        self.model_name = model_name
+        self.task_type = task_type
+
+    def __call__(self, texts: Sequence[str]) -> list[Sequence[float]]:
+        """
+        Embed a batch of texts with one API call.
+
+        Args:
+            texts (Sequence[str]): Texts to embed.
+
+        Returns:
+            list[Sequence[float]]: Embedding of every text.
+        """
+        return genai.embed_content(model=self.model_name, content=list(texts), task_type=self.task_type)["embedding"]
+
+
+class FridayHashingEmbedder:
+    """
+    Local embedder hashing the words and character trigrams of a text into a fixed size vector.
+
+    The embeddings are lexical: prompts sharing most of their words are similar, synonyms are not. It needs no API
+    call, which suits offline runs with the fake backend and tests; paraphrases are better matched by the embedding
+    model.
+
+    Attributes:
+        dimensions (int): Size of the vectors.
+    """
+
+    def __init__(self, dimensions: int = 256) -> None:
+        """
+        Initialize the embedder.
+
+        Args:
+            dimensions (int, optional): Size of the vectors. Defaults to 256.
+        """
+        self.dimensions = dimensions
+
+    def embed(self, text: str) -> list[float]:
+        """
+        Embed a text.
+
+        Args:
+            text (str): Text to embed.
+
+        Returns:
+            list[float]: Embedding of the text.
+        """
+        vector = [0.0] * self.dimensions
+        for word in _WORDS.findall(text.lower()):
+            padded = f"#{word}#"
+            for feature in [word] + [padded[index : index + 3] for index in range(len(padded) - 2)]:
+                digest = zlib.crc32(feature.encode())
+                vector[digest % self.dimensions] += 1.0 if digest & 0x80000000 else -1.0
+        return vector
+
+    def __call__(self, texts: Sequence[str]) -> list[Sequence[float]]:
+        """
+        Embed a batch of texts.
+
+        Args:
+            texts (Sequence[str]): Texts to embed.
+
+        Returns:
+            list[Sequence[float]]: Embedding of every text.
+        """
+        return [self.embed(text) for text in texts]
+
+
+@dataclass
+class _SemanticEntry:
+    """
+    Cached response of a prompt.
+
+    Attributes:
+        scope (str): Scope of the request: model, system instruction and generation configuration.
+        prompt (str): Prompt of the request.
+        created (float): Time the response was cached.
+        response (protos.GenerateContentResponse): Cached response.
+    """
+
+    scope: str
+    prompt: str
+    created: float
+    response: protos.GenerateContentResponse
+
+
+class FridaySemanticCache:
+    """
+    In-memory semantic response cache for the Friday Generation SDK.
+
+    A prompt is embedded and compared with the cosine similarity to the prompts cached in the same scope (model,
+    system instruction and generation configuration). The response of the most similar prompt is served when the
+    similarity reaches the threshold. The embeddings of the recent prompts are memoized, so a repeated prompt is
+    served without an embedding call. Entries expire after the TTL and the least recently used entries are evicted
+    beyond `max_entries`.
+
+    Expected Environment Variables:
+    - `FRIDAY_SEMANTIC_CACHE`: Optional, `1`/`true` to embed with the embedding API, `local` to use the local hashing
+      embedder. Disabled by default.
+    - `FRIDAY_SEMANTIC_CACHE_THRESHOLD`: Optional, similarity threshold. Defaults to 0.9.
+
+    Attributes:
+        embedder (FridayEmbedder): Embedder of the prompts.
+        threshold (float): Minimum cosine similarity of a hit, in [-1, 1].
+        ttl_seconds (float): Time to live of a cached response in seconds.
+        max_entries (int): Maximum number of cached responses.
+        hits (int): Number of cache hits.
+        misses (int): Number of cache misses.
+        embeddings (int): Number of embedded prompts.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[FridayEmbedder] = None,
+        threshold: float = 0.9,
+        ttl_seconds: float = 24 * 60 * 60,
+        max_entries: int = 1024,
+        max_memoized_embeddings: int = 256,
+    ) -> None:
+        """
+        Initialize the semantic cache.
+
+        Args:
+            embedder (Optional[FridayEmbedder]): Embedder of the prompts. Defaults to `GoogleAIEmbedder()`.
+            threshold (float, optional): Minimum cosine similarity of a hit, in [-1, 1]. Defaults to 0.9.
+            ttl_seconds (float, optional): Time to live of a cached response in seconds. Defaults to 1 day.
+            max_entries (int, optional): Maximum number of cached responses. Defaults to 1024.
+            max_memoized_embeddings (int, optional): Maximum number of memoized prompt embeddings. Defaults to 256.
+        """
+        self.embedder = embedder or GoogleAIEmbedder()
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_memoized_embeddings = max_memoized_embeddings
+        self.hits = 0
+        self.misses = 0
+        self.embeddings = 0
+        self.logger = CustomLogger(name="friday")
+
+        self.__lock = threading.Lock()
+        # Entries by row of the vectors, in least recently used order
+        self.__entries: OrderedDict[int, _SemanticEntry] = OrderedDict()
+        self.__free_rows: list[int] = []
+        self.__scope_ids: dict[str, int] = {}
+        self.__memo: OrderedDict[str, list[float]] = OrderedDict()
+        # Normalized vectors by row, with the scope id (-1 for a free row) and creation time of every row
+        self.__vectors = None
+        self.__row_scopes = None
+        self.__row_created = None
+
+    @classmethod
+    def from_env(cls, fake: bool = False) -> Optional["FridaySemanticCache"]:
+        """
+        Create the semantic cache configured by `FRIDAY_SEMANTIC_CACHE` and `FRIDAY_SEMANTIC_CACHE_THRESHOLD`.
+
+        Args:
+            fake (bool, optional): Running on the fake backend, which embeds with the local embedder. Defaults to
+                False.
+
+        Returns:
+            Optional[FridaySemanticCache]: Semantic cache, or None when disabled.
+        """
+        mode = os.getenv("FRIDAY_SEMANTIC_CACHE", "").lower()
+        if mode not in ("1", "true", "yes", "local"):
+            return None
+        embedder = FridayHashingEmbedder() if fake or mode == "local" else GoogleAIEmbedder()
+        return cls(embedder=embedder, threshold=float(os.getenv("FRIDAY_SEMANTIC_CACHE_THRESHOLD") or 0.9))
+
+    @staticmethod
+    def make_scope(
+        model_name: str, system_instruction: Optional[str], generation_config: Optional[GenerationConfig]
+    ) -> str:
+        """
+        Build the scope of a request. Only the prompts of the same scope are compared.
+
+        Args:
+            model_name (str): Name of the model.
+            system_instruction (Optional[str]): System instruction of the model.
+            generation_config (Optional[GenerationConfig]): Generation configuration of the request.
+
+        Returns:
+            str: Scope of the request.
+        """
+        return FridayResponseCache.make_key(model_name, system_instruction, "", generation_config)
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> list[float]:
+        """
+        Scale a vector to unit length, so that the dot product of two vectors is their cosine similarity.
+
+        Args:
+            vector (Sequence[float]): Vector to scale.
+
+        Returns:
+            list[float]: Unit vector, or the zero vector.
+        """
+        norm = math.sqrt(sum(value * value for value in vector))
+        return [value / norm for value in vector] if norm else [0.0 for _ in vector]
+
+    def __embed(self, prompt: str) -> list[float]:
+        """
+        Return the normalized embedding of a prompt, memoized.
+
+        Args:
+            prompt (str): Prompt to embed.
+
+        Returns:
+            list[float]: Normalized embedding of the prompt.
+        """
+        with self.__lock:
+            vector = self.__memo.get(prompt)
+            if vector is not None:
+                self.__memo.move_to_end(prompt)
+                return vector
+
+        vector = self._normalize(self.embedder([prompt])[0])
+        with self.__lock:
+            self.embeddings += 1
+            self.__memo[prompt] = vector
+            while len(self.__memo) > self.max_memoized_embeddings:
+                self.__memo.popitem(last=False)
+        return vector
+
+    def __most_similar(self, vector: list[float], scope_id: int, now: float) -> Optional[tuple[float, int]]:
+        """
+        Return the most similar live entry of a scope.
+
+        Args:
+            vector (list[float]): Normalized embedding of the prompt.
+            scope_id (int): Id of the scope.
+            now (float): Current time.
+
+        Returns:
+            Optional[tuple[float, int]]: Similarity and row of the entry, or None when the scope has no live entry.
+        """
+        if self.__vectors is None:
+            return None
+        oldest = now - self.ttl_seconds
+        if np is not None:
+            scores = self.__vectors @ np.asarray(vector, dtype=np.float32)
+            scores[(self.__row_scopes != scope_id) | (self.__row_created <= oldest)] = -np.inf
+            row = int(np.argmax(scores))
+            return (float(scores[row]), row) if np.isfinite(scores[row]) else None
+
+        candidates = [
+            (sum(map(operator.mul, self.__vectors[row], vector)), row)
+            for row, entry in self.__entries.items()
+            if self.__row_scopes[row] == scope_id and entry.created > oldest
+        ]
+        return max(candidates) if candidates else None
+
+    def get(self, scope: str, prompt: str) -> Optional[GenerateContentResponse]:
+        """
+        Get the cached response of the most similar prompt of the scope.
+
+        Args:
+            scope (str): Scope of the request, see `make_scope`.
+            prompt (str): Prompt of the request.
+
+        Returns:
+            Optional[GenerateContentResponse]: Cached response, or None on a cache miss.
+        """
+        vector = self.__embed(prompt)
+        now = time.time()
+        with self.__lock:
+            scope_id = self.__scope_ids.get(scope)
+            best = self.__most_similar(vector, scope_id, now) if scope_id is not None else None
+            if best is None or best[0] < self.threshold:
+                self.misses += 1
+                return None
+            similarity, row = best
+            entry = self.__entries[row]
+            self.__entries.move_to_end(row)
+            self.hits += 1
+
+        self.logger.debug("Semantic cache hit (similarity %.3f): %r served as %r.", similarity, prompt, entry.prompt)
+        return GenerateContentResponse.from_response(entry.response)
+
+    def put(self, scope: str, prompt: str, response: GenerateContentResponse) -> None:
+        """
+        Cache a resolved response, unless it is incomplete, see `FridayResponseCache.is_cacheable`.
+
+        Args:
+            scope (str): Scope of the request, see `make_scope`.
+            prompt (str): Prompt of the request.
+            response (GenerateContentResponse): Resolved response from the model.
+        """
+        if not FridayResponseCache.is_cacheable(response):
+            return
+        vector = self.__embed(prompt)
+        entry = _SemanticEntry(scope, prompt, time.time(), protos.GenerateContentResponse(response.to_dict()))
+        with self.__lock:
+            scope_id = self.__scope_ids.setdefault(scope, len(self.__scope_ids))
+            self.__evict(entry.created)
+            row = self.__free_rows.pop() if self.__free_rows else len(self.__entries)
+            self.__set_row(row, vector, scope_id, entry.created)
+            self.__entries[row] = entry
+
+    def __evict(self, now: float) -> None:
+        """
+        Free the rows of the expired entries, and of the least recently used entries until one more entry fits.
+
+        Args:
+            now (float): Current time.
+        """
+        expired = [row for row, entry in self.__entries.items() if now - entry.created >= self.ttl_seconds]
+        while len(self.__entries) - len(expired) >= self.max_entries:
+            row = next(row for row in self.__entries if row not in expired)
+            expired.append(row)
+        for row in expired:
+            del self.__entries[row]
+            self.__row_scopes[row] = -1
+            self.__free_rows.append(row)
+
+    def __set_row(self, row: int, vector: list[float], scope_id: int, created: float) -> None:
+        """
+        Store the vector of an entry, growing the vectors when needed.
+
+        Args:
+            row (int): Row of the entry.
+            vector (list[float]): Normalized embedding of the prompt.
+            scope_id (int): Id of the scope.
+            created (float): Time the response was cached.
+        """
+        if np is None:
+            if self.__vectors is None:
+                self.__vectors, self.__row_scopes, self.__row_created = [], [], []
+            if row == len(self.__vectors):
+                self.__vectors.append(vector)
+                self.__row_scopes.append(scope_id)
+                self.__row_created.append(created)
+            else:
+                self.__vectors[row], self.__row_scopes[row], self.__row_created[row] = vector, scope_id, created
+            return
+
+        if self.__vectors is None or row >= len(self.__vectors):
+            # Grow by doubling, up to the maximum number of entries
+            rows = min(max(2 * row, 16), max(self.max_entries, row + 1))
+            vectors = np.zeros((rows, len(vector)), dtype=np.float32)
+            row_scopes = np.full(rows, -1, dtype=np.int64)
+            row_created = np.zeros(rows, dtype=np.float64)
+            if self.__vectors is not None:
+                vectors[: len(self.__vectors)] = self.__vectors
+                row_scopes[: len(self.__vectors)] = self.__row_scopes
+                row_created[: len(self.__vectors)] = self.__row_created
+            self.__vectors, self.__row_scopes, self.__row_created = vectors, row_scopes, row_created
+        self.__vectors[row] = vector
+        self.__row_scopes[row] = scope_id
+        self.__row_created[row] = created
+
+    def clear(self) -> None:
+        """Clear the cached responses and the memoized embeddings."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__free_rows.clear()
+            self.__scope_ids.clear()
+            self.__memo.clear()
+            self.__vectors = self.__row_scopes = self.__row_created = None
+
+    def stats(self) -> dict[str, int | float | str]:
+        """
+        Return the cache statistics.
+
+        Returns:
+            dict[str, int | float | str]: Hits, misses, hit rate, entries, embedding calls and vector backend.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.__entries),
+            "embeddings": self.embeddings,
+            "backend": "numpy" if np is not None else "python",
+        }
+
+    def __str__(self) -> str:
+        """String representation of the FridaySemanticCache."""
+        return f"FridaySemanticCache: {self.stats()}"
+
+
+if __name__ == "__main__":
+    cache = FridaySemanticCache(embedder=FridayHashingEmbedder(), threshold=0.6)
+    scope = cache.make_scope("models/gemini-1.5-flash", None, None)
+    cache.put(scope, "Who are you?", GenerateContentResponse.from_response(protos.GenerateContentResponse()))
+    for prompt in ("Who are you?", "who are you", "What are you?", "What is the weather?"):
+        print(f"{prompt!r}: {'hit' if cache.get(scope, prompt) else 'miss'}")
+    print(cache)
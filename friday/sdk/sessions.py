@@ -0,0 +1,292 @@
+"""Persistent Chat Sessions for the Friday Generation SDK."""
+
+# Standard Library
+import os
+import json
+import time
+import uuid
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import IO, Callable, Iterator, Optional
+
+# Project Library
+from friday.utilities.logger import CustomLogger
+from friday.utilities.paths import friday_cache_dir
+from friday.utilities.exceptions import FridayBaseException
+
+
+SESSION_LOG_SUFFIX = ".jsonl"
+
+
+class FridaySessionError(FridayBaseException):
+    """Friday Session Error in the SDK."""
+
+
+@dataclass
+class FridaySessionLog:
+    """
+    Chat session replayed from its log.
+
+    Attributes:
+        summary (str): Rolling summary of the turns folded out of the history.
+        turns (list[tuple[str, str]]): User message and model response of the turns kept after the summary.
+        total_turns (int): Number of turns in the log.
+    """
+
+    summary: str = ""
+    turns: list[tuple[str, str]] = field(default_factory=list)
+    total_turns: int = 0
+
+
+class FridaySession:
+    """
+    Append-only, crash-safe log of a Friday chat session.
+
+    Every turn is written as one JSON line appended to the log and flushed to disk, so saving a turn costs the same
+    however long the session is. A partially written last line (e.g. after a crash) is ignored on replay. Summaries of
+    the managed history are logged as records too, so that the replayed history matches the live one.
+
+    Record types:
+        - `{"type": "turn", "ts": ..., "user": ..., "model": ...}`: A turn of the chat session.
+        - `{"type": "summary", "ts": ..., "summary": ..., "keep_last_turns": ...}`: The turns but the last
+          `keep_last_turns` were folded into the summary. A compacted summary also records the number of
+          `folded_turns` dropped from the log.
+
+    Attributes:
+        session_id (str): Identifier of the session.
+        path (Path): Path to the session log.
+        fsync (bool): Sync every record to disk before returning.
+        on_append (Optional[Callable[[FridaySession], None]]): Callback invoked after a record is appended.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        path: Path,
+        fsync: bool = True,
+        on_append: Optional[Callable[["FridaySession"], None]] = None,
+    ) -> None:
+        """
+        Initialize the session log. The log file is opened on the first append.
+
+        Args:
+            session_id (str): Identifier of the session.
+            path (Path): Path to the session log.
+            fsync (bool, optional): Sync every record to disk before returning. Defaults to True.
+            on_append (Optional[Callable[[FridaySession], None]]): Callback invoked after a record is appended, e.g.
+                to index it. Its errors are logged and do not fail the append. Defaults to None.
+        """
+        self.session_id = session_id
+        self.path = path
+        self.fsync = fsync
+        self.on_append = on_append
+        self.logger = CustomLogger(name="friday")
+        self.__lock = threading.Lock()
+        self.__file: Optional[IO[str]] = None
+
+    def _append(self, record: dict) -> None:
+        """
+        Append a record to the session log.
+
+        Args:
+            record (dict): Record to append.
+        """
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self.__lock:
+            if self.__file is None:
+                self.__file = open(self.path, "a", encoding="utf-8")
+                # Terminate a partially written record, so that it does not corrupt the next one
+                if self.__file.tell() and not self.__ends_with_newline():
+                    self.__file.write("\n")
+            self.__file.write(line)
+            self.__file.flush()
+            if self.fsync:
+                os.fsync(self.__file.fileno())
+        if self.on_append is not None:
+            try:
+                self.on_append(self)
+            except Exception as err:
+                self.logger.warning("Failed to process the record appended to session %s: %s", self.session_id, err)
+
+    def __ends_with_newline(self) -> bool:
+        """Check whether the session log ends with a complete record."""
+        with open(self.path, "rb") as file:
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b"\n"
+
+    def append_turn(self, user: str, model: str, timestamp: Optional[float] = None) -> None:
+        """
+        Append a turn to the session log.
+
+        Args:
+            user (str): Message of the user.
+            model (str): Response of the model.
+            timestamp (Optional[float]): Time of the turn. Defaults to now.
+        """
+        self._append({"type": "turn", "ts": timestamp or time.time(), "user": user, "model": model})
+
+    def append_summary(self, summary: str, keep_last_turns: int) -> None:
+        """
+        Append a summary to the session log.
+
+        Args:
+            summary (str): Rolling summary of the folded turns.
+            keep_last_turns (int): Number of most recent turns kept verbatim.
+        """
+        self._append({"type": "summary", "ts": time.time(), "summary": summary, "keep_last_turns": keep_last_turns})
+
+    def records(self) -> Iterator[dict]:
+        """
+        Stream the records of the session log. Partially written or corrupted records are skipped.
+
+        Yields:
+            dict: Record of the session log.
+        """
+        try:
+            file = open(self.path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with file:
+            for line in file:
+                if not line.endswith("\n"):
+                    self.logger.warning("Ignoring partially written record in session %s.", self.session_id)
+                    break
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    self.logger.warning("Ignoring corrupted record in session %s.", self.session_id)
+
+    def load(self) -> FridaySessionLog:
+        """
+        Replay the session log.
+
+        Returns:
+            FridaySessionLog: Chat session replayed from its log.
+        """
+        session_log = FridaySessionLog()
+        for record in self.records():
+            if record.get("type") == "turn":
+                session_log.turns.append((record["user"], record["model"]))
+                session_log.total_turns += 1
+            elif record.get("type") == "summary":
+                session_log.summary = record["summary"]
+                session_log.total_turns += record.get("folded_turns", 0)
+                keep_last_turns = record["keep_last_turns"]
+                session_log.turns = session_log.turns[-keep_last_turns:] if keep_last_turns else []
+        return session_log
+
+    def compact(self) -> None:
+        """
+        Compact the session log to the records needed to resume it: the last summary and the turns kept after it.
+
+        The compacted log is written to a temporary file and atomically swapped in, so a crash leaves either log
+        intact. Folded turns are dropped from the log, and counted in the summary record. Appends wait until the
+        compacted log is swapped in, so that none is lost.
+        """
+        with self.__lock:
+            summary: Optional[dict] = None
+            turns: list[dict] = []
+            folded_turns = 0
+            for record in self.records():
+                if record.get("type") == "turn":
+                    turns.append(record)
+                elif record.get("type") == "summary":
+                    keep_last_turns = record["keep_last_turns"]
+                    kept_turns = turns[-keep_last_turns:] if keep_last_turns else []
+                    folded_turns += record.get("folded_turns", 0) + len(turns) - len(kept_turns)
+                    summary = dict(record, keep_last_turns=0, folded_turns=folded_turns)
+                    turns = kept_turns
+
+            temp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with open(temp_path, "w", encoding="utf-8") as file:
+                for record in ([summary] if summary else []) + turns:
+                    file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                file.flush()
+                os.fsync(file.fileno())
+
+            self.close()
+            os.replace(temp_path, self.path)
+        self.logger.debug("Compacted session %s to %s turns.", self.session_id, len(turns))
+
+    def close(self) -> None:
+        """Close the session log file. It is reopened on the next append."""
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+
+class FridaySessionStore:
+    """
+    Store of the persistent Friday chat sessions. One append-only log per session under `.friday_cache/sessions`.
+
+    Attributes:
+        root (Path): Directory of the session logs.
+        on_append (Optional[Callable[[FridaySession], None]]): Callback of the sessions invoked after a record is
+            appended.
+    """
+
+    def __init__(
+        self, root: Optional[Path] = None, on_append: Optional[Callable[[FridaySession], None]] = None
+    ) -> None:
+        """
+        Initialize the session store.
+
+        Args:
+            root (Optional[Path]): Directory of the session logs. Defaults to `.friday_cache/sessions`.
+            on_append (Optional[Callable[[FridaySession], None]]): Callback of the sessions invoked after a record is
+                appended, e.g. `FridaySearchIndex.index_session`. Defaults to None.
+        """
+        self.root = root or friday_cache_dir("sessions")
+        self.on_append = on_append
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def new_session_id() -> str:
+        """
+        Create a new session identifier. Identifiers sort by creation time.
+
+        Returns:
+            str: Session identifier.
+        """
+        return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    def list_sessions(self) -> list[str]:
+        """
+        List the identifiers of the stored sessions, oldest first. No session log is read.
+
+        Returns:
+            list[str]: Identifiers of the stored sessions.
+        """
+        return sorted(path.stem for path in self.root.glob(f"*{SESSION_LOG_SUFFIX}"))
+
+    def latest_session_id(self) -> Optional[str]:
+        """
+        Return the identifier of the most recent session.
+
+        Returns:
+            Optional[str]: Identifier of the most recent session, or None if there is no session.
+        """
+        sessions = self.list_sessions()
+        return sessions[-1] if sessions else None
+
+    def session(self, session_id: Optional[str] = None, fsync: bool = True) -> FridaySession:
+        """
+        Open a session log. A new session is created when no identifier is given.
+
+        Args:
+            session_id (Optional[str]): Identifier of the session. Defaults to a new session.
+            fsync (bool, optional): Sync every record to disk before returning. Defaults to True.
+
+        Returns:
+            FridaySession: Session log.
+
+        Raises:
+            FridaySessionError: Invalid session identifier.
+        """
+        session_id = session_id or self.new_session_id()
+        if Path(session_id).name != session_id:
+            raise FridaySessionError(message=f"Invalid session identifier {session_id}...")
+        return FridaySession(
+            session_id, self.root / f"{session_id}{SESSION_LOG_SUFFIX}", fsync=fsync, on_append=self.on_append
+        )
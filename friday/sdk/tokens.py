@@ -0,0 +1,399 @@
+"""
+Offline Token Estimation for the Friday Generation SDK.
+
+Token counts are estimated locally with a linear model over the characters, words and messages of a text or chat
+history, so that token accounting costs microseconds instead of a `count_tokens` round trip.
+
+Error bounds:
+    - Uncalibrated, the estimator follows the rule of thumb of ~4 characters per token, which is typically within
+      ±25% for English prose and worse for code, non latin scripts or emoji heavy text.
+    - Once calibrated against recorded usage metadata, `error_bound` is the largest relative error observed over the
+      calibration samples and `bounds` returns the matching range. Calibrate on traffic similar to the one estimated.
+      An estimator loaded from an explicit path calibrates itself every `calibrate_every` recorded samples and saves
+      the calibration there, so the next process starts from it.
+    - Fits with a negative weight or too few distinct samples are rejected, and the error bound never drops below
+      `MIN_ERROR_BOUND`, so a degenerate calibration cannot claim exact estimates.
+    - When an exact count is needed, count with `remote=True` to fall back to the remote `count_tokens` call.
+"""
+
+# Standard Library
+import os
+import json
+import math
+import threading
+from pathlib import Path
+from collections import deque
+from dataclasses import dataclass
+from typing import Annotated, Callable, Iterable, Optional
+
+# Project Library
+from friday.utilities.logger import CustomLogger
+from friday.utilities.paths import friday_cache_dir
+
+# Type hints
+from google.generativeai.generative_models import ChatSession
+from google.generativeai import protos
+
+
+TokenCountable = str | Annotated[list[protos.Content], ChatSession.history]
+
+# Features of the linear model: characters, words, messages and the fixed prompt overhead (e.g. system instruction)
+DEFAULT_WEIGHTS = (0.25, 0.0, 0.0, 0.0)
+DEFAULT_ERROR_BOUND = 0.25
+# Floor of the calibrated error bound, and minimum number of distinct samples of a calibration
+MIN_ERROR_BOUND = 0.05
+MIN_CALIBRATION_SAMPLES = 20
+
+
+@dataclass
+class FridayCalibrationReport:
+    """
+    Report of a token estimator calibration.
+
+    Attributes:
+        samples (int): Number of samples used for the calibration.
+        weights (tuple[float, ...]): Fitted weights for the characters, words, messages and prompt overhead.
+        mean_error (float): Mean relative error over the samples.
+        max_error (float): Max relative error over the samples.
+    """
+
+    samples: int
+    weights: tuple[float, ...]
+    mean_error: float
+    max_error: float
+
+
+def _features(text: str, messages: int, prompt: bool) -> tuple[float, ...]:
+    """
+    Return the features of the linear model for a text.
+
+    Args:
+        text (str): Text to estimate.
+        messages (int): Number of messages of the text.
+        prompt (bool): Whether the text is a whole prompt, which carries the fixed prompt overhead.
+
+    Returns:
+        tuple[float, ...]: Features of the text.
+    """
+    return float(len(text)), float(len(text.split())), float(messages), 1.0 if prompt else 0.0
+
+
+def _solve(matrix: list[list[float]], vector: list[float]) -> list[float]:
+    """
+    Solve a small linear system with Gaussian elimination and partial pivoting.
+
+    Args:
+        matrix (list[list[float]]): Square matrix of the system.
+        vector (list[float]): Right hand side of the system.
+
+    Returns:
+        list[float]: Solution of the system.
+    """
+    size = len(vector)
+    rows = [row[:] + [value] for row, value in zip(matrix, vector)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row: abs(rows[row][column]))
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        for row in range(column + 1, size):
+            factor = rows[row][column] / rows[column][column]
+            for index in range(column, size + 1):
+                rows[row][index] -= factor * rows[column][index]
+
+    solution = [0.0] * size
+    for row in reversed(range(size)):
+        total = sum(rows[row][index] * solution[index] for index in range(row + 1, size))
+        solution[row] = (rows[row][size] - total) / rows[row][row]
+    return solution
+
+
+class FridayTokenEstimator:
+    """
+    Offline token estimator for the Friday Generation SDK.
+
+    Attributes:
+        weights (tuple[float, ...]): Weights for the characters, words, messages and prompt overhead.
+        error_bound (float): Relative error bound of the estimates.
+        remote_counter (Optional[Callable[[TokenCountable], int]]): Remote token counter used with `remote=True`.
+        path (Optional[Path]): Path the calibration is saved to every `calibrate_every` recorded samples. Not saved
+            when None.
+        calibrate_every (int): Number of recorded samples between the calibrations saved to `path`.
+    """
+
+    def __init__(
+        self,
+        weights: tuple[float, ...] = DEFAULT_WEIGHTS,
+        error_bound: float = DEFAULT_ERROR_BOUND,
+        remote_counter: Optional[Callable[[TokenCountable], int]] = None,
+        max_samples: int = 1000,
+        path: Optional[Path] = None,
+        calibrate_every: int = 50,
+    ) -> None:
+        """
+        Initialize the token estimator.
+
+        Args:
+            weights (tuple[float, ...], optional): Weights for the characters, words, messages and prompt overhead.
+                Defaults to ~4 characters per token.
+            error_bound (float, optional): Relative error bound of the estimates. Defaults to 0.25.
+            remote_counter (Optional[Callable[[TokenCountable], int]]): Remote token counter used with
+                `remote=True`. Defaults to None.
+            max_samples (int, optional): Maximum number of recorded calibration samples. Defaults to 1000.
+            path (Optional[Path]): Path the calibration is saved to every `calibrate_every` recorded samples.
+                Defaults to None, not saved.
+            calibrate_every (int, optional): Number of recorded samples between the calibrations saved to `path`.
+                Defaults to 50.
+        """
+        self.weights = tuple(weights)
+        self.error_bound = error_bound
+        self.remote_counter = remote_counter
+        self.path = path
+        self.calibrate_every = calibrate_every
+        self.logger = CustomLogger(name="friday")
+        self.__samples: deque[tuple[tuple[float, ...], int]] = deque(maxlen=max_samples)
+        self.__lock = threading.Lock()
+        self.__uncalibrated_samples = 0
+
+    @staticmethod
+    def _text_features(text: TokenCountable, prompt: bool = False) -> tuple[float, ...]:
+        """
+        Return the features of a text or chat history.
+
+        Args:
+            text (TokenCountable): Text or chat history.
+            prompt (bool, optional): Whether the text is a whole prompt. Defaults to False.
+
+        Returns:
+            tuple[float, ...]: Features of the text.
+        """
+        if isinstance(text, str):
+            return _features(text, messages=1, prompt=prompt)
+
+        features = [0.0, 0.0, 0.0, 1.0 if prompt else 0.0]
+        for content in text:
+            content_features = _features(
+                "".join(part.text for part in content.parts if "text" in part), messages=1, prompt=False
+            )
+            for index in range(3):
+                features[index] += content_features[index]
+        return tuple(features)
+
+    def _estimate(self, features: Iterable[float]) -> float:
+        """
+        Estimate the token count of features.
+
+        Args:
+            features (Iterable[float]): Features of a text.
+
+        Returns:
+            float: Estimated token count.
+        """
+        return sum(weight * feature for weight, feature in zip(self.weights, features))
+
+    def count(self, text: TokenCountable, *, remote: bool = False) -> int:
+        """
+        Count the number of tokens in the text or chat history.
+
+        Args:
+            text (TokenCountable): Text or chat history to count the tokens.
+            remote (bool, optional): Fall back to the exact remote count. Defaults to False.
+
+        Returns:
+            int: Estimated (or remote) number of tokens in the text or chat history.
+        """
+        if remote and self.remote_counter:
+            return self.remote_counter(text)
+        return max(round(self._estimate(self._text_features(text))), 0)
+
+    def bounds(self, text: TokenCountable) -> tuple[int, int]:
+        """
+        Return the range of the token count of the text or chat history within the error bound.
+
+        Args:
+            text (TokenCountable): Text or chat history to count the tokens.
+
+        Returns:
+            tuple[int, int]: Lower and upper bounds of the token count.
+        """
+        estimate = self._estimate(self._text_features(text))
+        return max(math.floor(estimate * (1 - self.error_bound)), 0), math.ceil(estimate * (1 + self.error_bound))
+
+    def record(
+        self,
+        prompt: Optional[TokenCountable],
+        response_text: str,
+        usage_metadata: protos.GenerateContentResponse.UsageMetadata,
+    ) -> None:
+        """
+        Record calibration samples from a request and the usage metadata of its response. With a `path`, the estimator
+        is calibrated and saved every `calibrate_every` samples.
+
+        Args:
+            prompt (Optional[TokenCountable]): Prompt or contents sent to the model. None to record the response only.
+            response_text (str): Text of the response.
+            usage_metadata (protos.GenerateContentResponse.UsageMetadata): Usage metadata of the response.
+        """
+        samples = []
+        if prompt is not None and usage_metadata.prompt_token_count:
+            samples.append((self._text_features(prompt, prompt=True), usage_metadata.prompt_token_count))
+        if response_text and usage_metadata.candidates_token_count:
+            samples.append((_features(response_text, messages=0, prompt=False), usage_metadata.candidates_token_count))
+
+        with self.__lock:
+            self.__samples.extend(samples)
+            self.__uncalibrated_samples += len(samples)
+            if self.path is None or self.__uncalibrated_samples < self.calibrate_every:
+                return
+            self.__uncalibrated_samples = 0
+            if self.calibrate() is None:
+                return
+        try:
+            self.save(self.path)
+        except OSError as err:
+            self.logger.warning("Failed to save the token estimator calibration %s: %s", self.path, err)
+
+    def calibrate(self, regularization: float = 1e-6) -> Optional[FridayCalibrationReport]:
+        """
+        Fit the weights against the recorded samples with ridge regularized least squares towards the current weights,
+        and update the error bound with the largest relative error observed.
+
+        The fit is rejected, and the estimator left unchanged, when there are fewer than `MIN_CALIBRATION_SAMPLES`
+        distinct samples or a fitted weight is negative. The error bound is at least `MIN_ERROR_BOUND`.
+
+        Args:
+            regularization (float, optional): Ridge regularization, relative to the scale of each feature.
+                Defaults to 1e-6.
+
+        Returns:
+            Optional[FridayCalibrationReport]: Calibration report, or None when the fit is rejected.
+        """
+        samples = list(self.__samples)
+        if len(set(samples)) < MIN_CALIBRATION_SAMPLES:
+            self.logger.debug("Token estimator not calibrated: %s distinct samples.", len(set(samples)))
+            return None
+
+        size = len(self.weights)
+        gram = [[sum(features[i] * features[j] for features, _ in samples) for j in range(size)] for i in range(size)]
+        moment = [sum(features[i] * tokens for features, tokens in samples) for i in range(size)]
+        for i in range(size):
+            penalty = max(gram[i][i], 1.0) * regularization
+            gram[i][i] += penalty
+            moment[i] += penalty * self.weights[i]
+
+        weights = tuple(_solve(gram, moment))
+        if any(weight < 0 for weight in weights):
+            self.logger.debug("Token estimator calibration rejected, negative weights: %s", weights)
+            return None
+
+        self.weights = weights
+        errors = [abs(self._estimate(features) - tokens) / tokens for features, tokens in samples]
+        report = FridayCalibrationReport(
+            samples=len(samples),
+            weights=self.weights,
+            mean_error=sum(errors) / len(errors),
+            max_error=max(errors),
+        )
+        self.error_bound = max(report.max_error, MIN_ERROR_BOUND)
+        self.logger.debug("Token estimator calibrated: %s", report)
+        return report
+
+    @staticmethod
+    def default_path() -> Path:
+        """
+        Return the default path to the calibration file.
+
+        Returns:
+            Path: Path to `.friday_cache/token_estimator.json`.
+        """
+        return friday_cache_dir() / "token_estimator.json"
+
+    def save(self, path: Optional[Path] = None) -> None:
+        """
+        Persist the calibrated weights and error bound.
+
+        Args:
+            path (Optional[Path]): Path to the calibration file. Defaults to `default_path()`.
+        """
+        path = path or self.default_path()
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, "w") as file:
+            json.dump({"weights": self.weights, "error_bound": self.error_bound}, file)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(
+        cls, path: Optional[Path] = None, remote_counter: Optional[Callable[[TokenCountable], int]] = None
+    ) -> "FridayTokenEstimator":
+        """
+        Load a calibrated token estimator. Falls back to the uncalibrated defaults if no calibration was saved.
+
+        Persistence is opt-in: only an estimator loaded from an explicit path saves its later calibrations to it.
+        Without a path, the default calibration is read, and the estimator is kept in memory.
+
+        Args:
+            path (Optional[Path]): Path to the calibration file, where the later calibrations are saved. Defaults to
+                None, reading `default_path()` without saving to it.
+            remote_counter (Optional[Callable[[TokenCountable], int]]): Remote token counter used with
+                `remote=True`. Defaults to None.
+
+        Returns:
+            FridayTokenEstimator: Token estimator.
+        """
+        save_path, path = path, path or cls.default_path()
+        try:
+            with open(path, "r") as file:
+                calibration = json.load(file)
+            weights = tuple(float(weight) for weight in calibration["weights"])
+            if any(weight < 0 for weight in weights):
+                raise ValueError(f"negative weights {weights}")
+            return cls(
+                weights=weights,
+                error_bound=max(float(calibration["error_bound"]), MIN_ERROR_BOUND),
+                remote_counter=remote_counter,
+                path=save_path,
+            )
+        except FileNotFoundError:
+            return cls(remote_counter=remote_counter, path=save_path)
+        except (ValueError, KeyError, TypeError) as err:
+            CustomLogger(name="friday").warning(f"Ignoring corrupted token estimator calibration {path}: {err}")
+            return cls(remote_counter=remote_counter, path=save_path)
+
+
+class FridayHistoryTokenCounter:
+    """
+    Incremental token counter for a growing chat history.
+
+    Only the messages appended since the last count are estimated. The history is counted again from scratch when it
+    was rewritten (e.g. summarized or rewound).
+    """
+
+    def __init__(self, estimator: FridayTokenEstimator) -> None:
+        """
+        Initialize the incremental token counter.
+
+        Args:
+            estimator (FridayTokenEstimator): Token estimator.
+        """
+        self.estimator = estimator
+        self.__counted = 0
+        self.__last: Optional[protos.Content] = None
+        self.__features = [0.0, 0.0, 0.0, 0.0]
+
+    def count(self, history: Annotated[list[protos.Content], ChatSession.history]) -> int:
+        """
+        Count the number of tokens of the chat history.
+
+        Args:
+            history (Annotated[list[protos.Content], ChatSession.history]): Chat history.
+
+        Returns:
+            int: Estimated number of tokens of the chat history.
+        """
+        if self.__counted > len(history) or (self.__counted and history[self.__counted - 1] is not self.__last):
+            self.__counted, self.__last, self.__features = 0, None, [0.0, 0.0, 0.0, 0.0]
+
+        appended = history[self.__counted :]
+        if appended:
+            for index, feature in enumerate(self.estimator._text_features(appended)):
+                self.__features[index] += feature
+            self.__counted, self.__last = len(history), history[-1]
+        return max(round(self.estimator._estimate(self.__features)), 0)
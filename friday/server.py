@@ -0,0 +1,569 @@
+"""Friday - AI Personal Assistant. Multi-user HTTP server module."""
+
+from __future__ import annotations
+
+# Standard Library
+import json
+import time
+import uuid
+import asyncio
+import argparse
+import contextlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional, Sequence
+from urllib.parse import urlsplit
+
+# Project Library
+from friday.utilities.logger import CustomLogger
+from friday.utilities.exceptions import FridayBaseException
+
+# Type hints
+# The SDKs import google.generativeai, so they are imported on first use. See friday/main.py.
+if TYPE_CHECKING:
+    from google.generativeai.generative_models import ChatSession
+    from friday.sdk.async_generation import AsyncGoogleAIGeneration
+
+
+# Constants
+MAX_BODY_BYTES = 64 * 1024
+HTTP_REASONS = {
+    200: "OK",
+    201: "Created",
+    204: "No Content",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class FridayHTTPError(FridayBaseException):
+    """
+    Friday HTTP Error, answered to the client with its status.
+
+    Attributes:
+        status (int): HTTP status of the error.
+        retry_after (Optional[float]): Delay before the client may retry in seconds.
+    """
+
+    def __init__(self, status: int, message: str, retry_after: Optional[float] = None) -> None:
+        """
+        Initialize Friday HTTP Error.
+
+        Args:
+            status (int): HTTP status of the error.
+            message (str): Message for the exception.
+            retry_after (Optional[float]): Delay before the client may retry in seconds. Defaults to None.
+        """
+        super().__init__(message=message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+@dataclass
+class FridayServerSession:
+    """
+    Chat session served by Friday server.
+
+    Attributes:
+        session_id (str): Identifier of the session.
+        chat (ChatSession): Chat session with Friday.
+        created (float): Time at which the session was created.
+        last_active (float): Time of the last request of the session.
+        in_flight (int): Number of requests of the session in flight.
+    """
+
+    session_id: str
+    chat: ChatSession
+    created: float = field(default_factory=time.monotonic)
+    last_active: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
+
+
+class FridaySessionRegistry:
+    """
+    Registry of the chat sessions served by Friday server.
+
+    Sessions idle for longer than `idle_timeout` are evicted. When the registry is full, idle sessions are evicted
+    first and new sessions are refused if none is idle.
+
+    Attributes:
+        generation (AsyncGoogleAIGeneration): Async generation SDK the sessions chat with.
+        idle_timeout (float): Time after which an idle session is evicted in seconds.
+        max_sessions (int): Maximum number of sessions.
+        max_requests_per_session (int): Maximum number of concurrent requests per session.
+    """
+
+    def __init__(
+        self,
+        generation: AsyncGoogleAIGeneration,
+        idle_timeout: float = 30 * 60,
+        max_sessions: int = 1000,
+        max_requests_per_session: int = 1,
+    ) -> None:
+        """
+        Initialize the session registry.
+
+        Args:
+            generation (AsyncGoogleAIGeneration): Async generation SDK the sessions chat with.
+            idle_timeout (float, optional): Time after which an idle session is evicted in seconds.
+                Defaults to 30 minutes.
+            max_sessions (int, optional): Maximum number of sessions. Defaults to 1000.
+            max_requests_per_session (int, optional): Maximum number of concurrent requests per session. Requests over
+                the limit are refused. Defaults to 1.
+        """
+        self.generation = generation
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.max_requests_per_session = max_requests_per_session
+        self.logger = CustomLogger(name="friday")
+        self.__sessions: dict[str, FridayServerSession] = {}
+
+    def __len__(self) -> int:
+        """Return the number of sessions."""
+        return len(self.__sessions)
+
+    def create(self) -> FridayServerSession:
+        """
+        Create a new chat session.
+
+        Returns:
+            FridayServerSession: New chat session.
+
+        Raises:
+            FridayHTTPError: The registry is full.
+        """
+        if len(self.__sessions) >= self.max_sessions and not self.evict_idle():
+            raise FridayHTTPError(503, "Too many chat sessions, try again later...", retry_after=self.idle_timeout)
+
+        session = FridayServerSession(session_id=uuid.uuid4().hex, chat=self.generation.start_new_chat())
+        self.__sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id: str) -> FridayServerSession:
+        """
+        Return a chat session.
+
+        Args:
+            session_id (str): Identifier of the session.
+
+        Returns:
+            FridayServerSession: Chat session.
+
+        Raises:
+            FridayHTTPError: Unknown or evicted session.
+        """
+        try:
+            return self.__sessions[session_id]
+        except KeyError:
+            raise FridayHTTPError(404, f"Chat session {session_id} not found...") from None
+
+    def delete(self, session_id: str) -> None:
+        """
+        Delete a chat session.
+
+        Args:
+            session_id (str): Identifier of the session.
+
+        Raises:
+            FridayHTTPError: Unknown or evicted session.
+        """
+        self.get(session_id)
+        del self.__sessions[session_id]
+
+    def evict_idle(self, idle_timeout: Optional[float] = None) -> int:
+        """
+        Evict the sessions idle for longer than the idle timeout. Sessions with requests in flight are kept.
+
+        Args:
+            idle_timeout (Optional[float]): Idle timeout in seconds. Defaults to `idle_timeout`.
+
+        Returns:
+            int: Number of evicted sessions.
+        """
+        deadline = time.monotonic() - (self.idle_timeout if idle_timeout is None else idle_timeout)
+        idle = [
+            session_id
+            for session_id, session in self.__sessions.items()
+            if not session.in_flight and session.last_active <= deadline
+        ]
+        for session_id in idle:
+            del self.__sessions[session_id]
+        if idle:
+            self.logger.debug("Evicted %s idle chat sessions.", len(idle))
+        return len(idle)
+
+    @contextlib.contextmanager
+    def request(self, session: FridayServerSession):
+        """
+        Account a request of a chat session, within the per session concurrency limit.
+
+        Args:
+            session (FridayServerSession): Chat session.
+
+        Raises:
+            FridayHTTPError: The session already has the maximum number of requests in flight.
+        """
+        if session.in_flight >= self.max_requests_per_session:
+            raise FridayHTTPError(429, f"Chat session {session.session_id} is busy, try again later...", retry_after=1)
+        session.in_flight += 1
+        session.last_active = time.monotonic()
+        try:
+            yield session
+        finally:
+            session.in_flight -= 1
+            session.last_active = time.monotonic()
+
+
+class FridayServer:
+    """
+    Multi-user asyncio HTTP server exposing Friday chat sessions.
+
+    Routes:
+        - `POST /sessions`: Create a chat session. Returns `{"session_id": ...}`.
+        - `POST /sessions/{session_id}/messages`: Send `{"message": ...}` to a chat session. The reply is streamed as
+          server-sent events (`chunk`, then `done` or `error`) when the client accepts `text/event-stream`, otherwise
+          returned as JSON once complete.
+        - `GET /sessions/{session_id}/history`: Chat history of a session.
+        - `DELETE /sessions/{session_id}`: Delete a chat session.
+        - `GET /health`: Statistics of the server.
+        - `GET /metrics`: Per-request latency and token metrics of the generation SDK in the Prometheus text format.
+
+    Backpressure: at most `max_in_flight` messages are generated at once, further messages are refused with 503 and a
+    `Retry-After` header instead of queueing without bound. Streamed chunks are only pulled from the model as fast as
+    the client reads them.
+
+    Attributes:
+        registry (FridaySessionRegistry): Registry of the chat sessions.
+        host (str): Host to bind.
+        port (int): Port to bind. 0 binds a free port.
+        max_in_flight (int): Maximum number of messages generated at once.
+        eviction_interval (float): Interval between idle session evictions in seconds.
+    """
+
+    def __init__(
+        self,
+        registry: FridaySessionRegistry,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        max_in_flight: int = 64,
+        eviction_interval: float = 60,
+    ) -> None:
+        """
+        Initialize Friday server.
+
+        Args:
+            registry (FridaySessionRegistry): Registry of the chat sessions.
+            host (str, optional): Host to bind. Defaults to "127.0.0.1".
+            port (int, optional): Port to bind. 0 binds a free port. Defaults to 8000.
+            max_in_flight (int, optional): Maximum number of messages generated at once. Defaults to 64.
+            eviction_interval (float, optional): Interval between idle session evictions in seconds. Defaults to 60.
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.max_in_flight = max_in_flight
+        self.eviction_interval = eviction_interval
+        self.logger = CustomLogger(name="friday")
+
+        self.__in_flight = 0
+        self.__stats = {"requests": 0, "messages": 0, "rejected": 0, "errors": 0}
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__eviction_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start serving and evicting idle sessions in the background."""
+        self.__server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.__server.sockets[0].getsockname()[1]
+        self.__eviction_task = asyncio.create_task(self._evict_idle_sessions())
+        self.logger.info("Friday server listening on http://%s:%s", self.host, self.port)
+
+    async def serve_forever(self) -> None:
+        """Start serving until cancelled."""
+        if self.__server is None:
+            await self.start()
+        try:
+            await self.__server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop serving."""
+        if self.__eviction_task is not None:
+            self.__eviction_task.cancel()
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+
+    async def _evict_idle_sessions(self) -> None:
+        """Evict the idle sessions periodically."""
+        while True:
+            await asyncio.sleep(self.eviction_interval)
+            self.registry.evict_idle()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return the server statistics.
+
+        Returns:
+            dict[str, int]: Sessions, messages in flight, requests, messages, rejected requests and errors.
+        """
+        return dict(self.__stats, sessions=len(self.registry), in_flight=self.__in_flight)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Handle a client connection. One request is served per connection.
+
+        Args:
+            reader (asyncio.StreamReader): Reader of the connection.
+            writer (asyncio.StreamWriter): Writer of the connection.
+        """
+        self.__stats["requests"] += 1
+        try:
+            method, path, headers, body = await self._read_request(reader)
+            await self._route(method, path, headers, body, writer)
+        except FridayHTTPError as err:
+            self.__stats["rejected" if err.status in (429, 503) else "errors"] += 1
+            await self._write_json(writer, err.status, {"error": err.message}, retry_after=err.retry_after)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as err:
+            self.__stats["errors"] += 1
+            self.logger.error("Friday server failed to handle a request: %s", err)
+            with contextlib.suppress(ConnectionError):
+                await self._write_json(writer, 500, {"error": "Internal server error..."})
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> tuple[str, str, dict[str, str], dict]:
+        """
+        Read an HTTP request.
+
+        Args:
+            reader (asyncio.StreamReader): Reader of the connection.
+
+        Returns:
+            tuple[str, str, dict[str, str], dict]: Method, path, lower cased headers and JSON body of the request.
+
+        Raises:
+            FridayHTTPError: Malformed request.
+        """
+        try:
+            request_line = await reader.readuntil(b"\r\n")
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+        except (ValueError, asyncio.LimitOverrunError) as err:
+            raise FridayHTTPError(400, f"Malformed request: {err}...") from err
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError as err:
+            raise FridayHTTPError(400, f"Invalid Content-Length: {headers['content-length']}...") from err
+        if length < 0:
+            raise FridayHTTPError(400, f"Invalid Content-Length: {length}...")
+        if length > MAX_BODY_BYTES:
+            raise FridayHTTPError(413, "Request body too large...")
+        try:
+            body = json.loads(await reader.readexactly(length)) if length else {}
+        except ValueError as err:
+            raise FridayHTTPError(400, f"Invalid JSON body: {err}...") from err
+        return method.upper(), urlsplit(target).path.rstrip("/"), headers, body
+
+    async def _route(
+        self, method: str, path: str, headers: dict[str, str], body: dict, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Route an HTTP request.
+
+        Args:
+            method (str): Method of the request.
+            path (str): Path of the request.
+            headers (dict[str, str]): Lower cased headers of the request.
+            body (dict): JSON body of the request.
+            writer (asyncio.StreamWriter): Writer of the connection.
+
+        Raises:
+            FridayHTTPError: Unknown route or failed request.
+        """
+        parts = path.strip("/").split("/")
+        if parts == ["health"] and method == "GET":
+            await self._write_json(writer, 200, self.stats())
+        elif parts == ["metrics"] and method == "GET":
+            body = self.registry.generation.metrics.to_prometheus().encode("utf-8")
+            await self._write_head(writer, 200, "text/plain; version=0.0.4", len(body))
+            writer.write(body)
+            await writer.drain()
+        elif parts == ["sessions"] and method == "POST":
+            await self._write_json(writer, 201, {"session_id": self.registry.create().session_id})
+        elif len(parts) == 2 and parts[0] == "sessions" and method == "DELETE":
+            self.registry.delete(parts[1])
+            await self._write_json(writer, 204, None)
+        elif len(parts) == 3 and parts[0] == "sessions" and parts[2] == "history" and method == "GET":
+            session = self.registry.get(parts[1])
+            history = [
+                {"role": content.role, "text": "".join(part.text for part in content.parts)}
+                for content in session.chat.history
+            ]
+            await self._write_json(writer, 200, {"history": history})
+        elif len(parts) == 3 and parts[0] == "sessions" and parts[2] == "messages" and method == "POST":
+            if not isinstance(body.get("message"), str):
+                raise FridayHTTPError(400, "Missing message...")
+            stream = "text/event-stream" in headers.get("accept", "")
+            await self._send_message(self.registry.get(parts[1]), body["message"], stream, writer)
+        else:
+            raise FridayHTTPError(404, f"No route for {method} {path}...")
+
+    async def _send_message(
+        self, session: FridayServerSession, message: str, stream: bool, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Send a message to a chat session and write the reply.
+
+        Args:
+            session (FridayServerSession): Chat session.
+            message (str): Message to send.
+            stream (bool): Stream the reply as server-sent events.
+            writer (asyncio.StreamWriter): Writer of the connection.
+
+        Raises:
+            FridayHTTPError: Too many messages in flight, or the session is busy.
+        """
+        from friday.sdk.generation import FridayGenerationError
+
+        if self.__in_flight >= self.max_in_flight:
+            raise FridayHTTPError(503, "Friday is busy, try again later...", retry_after=1)
+
+        with self.registry.request(session):
+            self.__in_flight += 1
+            self.__stats["messages"] += 1
+            try:
+                if not stream:
+                    response = await self.registry.generation.send_chat_message(session.chat, message)
+                    await self._write_json(writer, 200, {"response": response.response})
+                    return
+
+                reply = await self.registry.generation.send_chat_message_stream(session.chat, message)
+                # The reply is closed even if the client disconnects before it is iterated, to unlock the chat session
+                async with contextlib.aclosing(reply):
+                    await self._write_head(
+                        writer, 200, "text/event-stream", extra_headers={"Cache-Control": "no-cache"}
+                    )
+                    try:
+                        async for chunk in reply:
+                            await self._write_event(writer, "chunk", {"text": chunk.response})
+                        await self._write_event(writer, "done", {"response": reply.response})
+                    except FridayGenerationError as err:
+                        self.__stats["errors"] += 1
+                        await self._write_event(writer, "error", {"error": str(err)})
+            except FridayGenerationError as err:
+                raise FridayHTTPError(500, f"Failed to send message to the chat session: {err}...") from err
+            finally:
+                self.__in_flight -= 1
+
+    async def _write_head(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        content_type: str,
+        content_length: Optional[int] = None,
+        extra_headers: Optional[dict[str, str]] = None,
+    ) -> None:
+        """
+        Write the status line and headers of a response.
+
+        Args:
+            writer (asyncio.StreamWriter): Writer of the connection.
+            status (int): HTTP status.
+            content_type (str): Content type of the body.
+            content_length (Optional[int]): Length of the body. None for a body streamed until the connection closes.
+            extra_headers (Optional[dict[str, str]]): Other headers.
+        """
+        headers = {"Content-Type": content_type, "Connection": "close", **(extra_headers or {})}
+        if content_length is not None:
+            headers["Content-Length"] = str(content_length)
+        head = f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+        writer.write(head.encode("latin-1"))
+        await writer.drain()
+
+    async def _write_json(
+        self, writer: asyncio.StreamWriter, status: int, payload: Optional[dict], retry_after: Optional[float] = None
+    ) -> None:
+        """
+        Write a JSON response.
+
+        Args:
+            writer (asyncio.StreamWriter): Writer of the connection.
+            status (int): HTTP status.
+            payload (Optional[dict]): JSON body. None for no body.
+            retry_after (Optional[float]): Delay before the client may retry in seconds. Defaults to None.
+        """
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        extra_headers = {"Retry-After": str(max(round(retry_after), 1))} if retry_after else None
+        await self._write_head(writer, status, "application/json", len(body), extra_headers)
+        writer.write(body)
+        await writer.drain()
+
+    async def _write_event(self, writer: asyncio.StreamWriter, event: str, data: dict) -> None:
+        """
+        Write a server-sent event. Waits until the client reads it, so that slow clients slow down the stream.
+
+        Args:
+            writer (asyncio.StreamWriter): Writer of the connection.
+            event (str): Event name.
+            data (dict): JSON data of the event.
+        """
+        writer.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+        await writer.drain()
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command line arguments of Friday server.
+
+    Args:
+        argv (Optional[Sequence[str]]): Command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        argparse.Namespace: Parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(prog="friday_server", description="Friday - Keys' AI Personal Assistant Server.")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind.")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind.")
+    parser.add_argument("--max-in-flight", type=int, default=64, help="Maximum number of messages generated at once.")
+    parser.add_argument("--max-sessions", type=int, default=1000, help="Maximum number of chat sessions.")
+    parser.add_argument("--idle-timeout", type=float, default=30 * 60, help="Idle chat session timeout in seconds.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """
+    Main function for Friday server.
+
+    Args:
+        argv (Optional[Sequence[str]]): Command line arguments. Defaults to `sys.argv[1:]`.
+    """
+    args = parse_args(argv)
+
+    from friday.main import Friday
+    from friday.sdk.async_generation import AsyncGoogleAIGeneration
+
+    friday = Friday()
+    # Serve with the caches, rate limiters, hedging and router configured for Friday
+    generation = AsyncGoogleAIGeneration.from_generation(friday.google_ai_generation)
+    registry = FridaySessionRegistry(generation, idle_timeout=args.idle_timeout, max_sessions=args.max_sessions)
+    server = FridayServer(registry, host=args.host, port=args.port, max_in_flight=args.max_in_flight)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(server.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,74 @@
 """Friday UI Main Module."""
 
+from __future__ import annotations
+
 # Standard Library
+import queue
+import functools
 from pathlib import Path
 from configparser import ConfigParser
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Literal, Optional
 
 # Third Party Library
 import customtkinter
 
 # Project Library
-from friday.main import Friday
-from friday.sdk.generation import FridayGenerationError
+from friday.main import Friday, FridayStartup
+from friday.utilities.logger import CustomLogger
+from friday.utilities.exceptions import FridayBaseException
+from friday.ui.transcript import FridayTranscript, FridayTranscriptUpdate
 
+# Type hints
+if TYPE_CHECKING:
+    from friday.sdk.history import FridayHistoryManager
+    from friday.sdk.generation import FridayStreamResponse
 
-class FridayUIConstants:
-    """Friday AI Personal Assistant User Interface Constants."""
 
-    # Friday UI Configs
-    __friday_config_dir = Path(__file__).parent.parent / "configs"
+@functools.cache
+def load_friday_ui_config() -> ConfigParser:
+    """
+    Load the Friday UI configs on first use.
+
+    Returns:
+        ConfigParser: Friday UI configs.
+    """
     friday_config = ConfigParser()
-    friday_config.read(__friday_config_dir / "ui_configs.ini")
+    friday_config.read(Path(__file__).parent.parent / "configs" / "ui_configs.ini")
+    return friday_config
+
+
+class FridayUIConfig:
+    """Friday UI config value, read from the Friday UI configs on first access."""
+
+    def __init__(self, section: str, option: str) -> None:
+        """
+        Initialize the Friday UI config value.
+
+        Args:
+            section (str): Section of the config.
+            option (str): Option of the config.
+        """
+        self.section = section
+        self.option = option
+
+    def __get__(self, instance, owner) -> str:
+        """Return the config value."""
+        return load_friday_ui_config()[self.section][self.option]
+
+
+class FridayUIConstants:
+    """Friday AI Personal Assistant User Interface Constants."""
 
     # Friday UI Assets
     __ui_assets_dir = Path(__file__).parent.parent / "assets" / "ui"
     logo_path = __ui_assets_dir / "icon.ico"
 
-    # Appearance
-    TITLE = friday_config["Friday"]["Title"]
-    TOOL_MIN_WIDTH = friday_config["Friday"]["ToolMinWidth"]
-    TOOL_MIN_HEIGHT = friday_config["Friday"]["ToolMinHeight"]
-    TOOL_THEME = friday_config["Friday"]["ToolTheme"]
+    # Appearance, loaded from the Friday UI configs on first access
+    TITLE = FridayUIConfig("Friday", "Title")
+    TOOL_MIN_WIDTH = FridayUIConfig("Friday", "ToolMinWidth")
+    TOOL_MIN_HEIGHT = FridayUIConfig("Friday", "ToolMinHeight")
+    TOOL_THEME = FridayUIConfig("Friday", "ToolTheme")
 
     # UI Constants
     FRAME_PAD = 5
@@ -39,6 +79,15 @@ class FridayUIConstants:
     APP_NAME = "FRIDAY"
     HEADER_FONT = ("Chiller", 25, "bold")
     CHAT_DISPLAY_FONT = ("Comic Sans MS", 15)
+    STATUS_FONT = ("Comic Sans MS", 12, "italic")
+
+    # Transcript Constants
+    TRANSCRIPT_MAX_LINES = 2000
+    TRANSCRIPT_PAGE_TURNS = 20
+
+    # Worker Constants
+    RESULT_QUEUE_POLL_INTERVAL_MS = 16
+    ERROR_MESSAGE = "Apologize, Unable to process your request..."
 
 
 class HeaderFrame(customtkinter.CTkFrame):
@@ -113,6 +162,15 @@ class PromptFrame(customtkinter.CTkFrame):
             sticky="nsew",
         )
 
+        self.status_label = customtkinter.CTkLabel(self, text="", anchor="w", font=FridayUIConstants.STATUS_FONT)
+        self.status_label.grid(
+            row=1,
+            column=0,
+            columnspan=2,
+            padx=FridayUIConstants.PROMPT_FRAME_WIDGETS_PAD,
+            sticky="nsew",
+        )
+
 
 class FridayChatDisplayFrame(customtkinter.CTkFrame):
     """Friday AI Personal Assistant User Interface Chat Display Frame."""
@@ -142,6 +200,7 @@ class FridayAPP(customtkinter.CTk):
 
     def __init__(self) -> None:
         super().__init__()
+        self.logger = CustomLogger(name="friday")
         self._friday_ui_configure()
 
         # Add Frames to Friday UI
@@ -173,11 +232,36 @@ class FridayAPP(customtkinter.CTk):
         # Bind Theme Switch
         self.header_frame.dark_theme_switch.bind("<Button-1>", self._handle_theme_switch)
 
-        # Initialize Friday AI Personal Assistant
-        self.friday = Friday()
-        self.friday_chat = self.friday.google_ai_generation.start_new_chat()
-        response = self.friday.google_ai_generation.generate_content(prompt="Who are you?")
-        self._append_text_to_chat_display(text=f"Friday: {response.response.strip()}\n\n")
+        # Page the older turns in when scrolling up at the top of the chat display
+        for sequence in ("<MouseWheel>", "<Button-4>"):
+            self.chat_display_frame.chat_display_text.bind(sequence, self._handle_chat_scroll, add="+")
+
+        # Only the last lines of the chat are kept in the chat display, text is applied once per frame
+        self.transcript = FridayTranscript(
+            max_lines=FridayUIConstants.TRANSCRIPT_MAX_LINES, page_turns=FridayUIConstants.TRANSCRIPT_PAGE_TURNS
+        )
+
+        # Close the worker along with the window
+        self.protocol("WM_DELETE_WINDOW", self._handle_close)
+
+        # Model calls run on a single worker thread, so queued prompts are answered in order. The worker posts
+        # events to the result queue, which is drained on the Tk main loop.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="friday-worker")
+        self._results: queue.Queue[
+            tuple[Literal["session", "start", "chunk", "end", "end_turn", "error", "greeting"], Any]
+        ] = queue.Queue()
+        self._pending_requests = 0
+
+        # Start Friday AI Personal Assistant in the background. The initial message is shown right away, and replaced
+        # by the model greeting if it is ready before the first prompt.
+        self.startup = FridayStartup()
+        self.friday: Optional[Friday] = None
+        self.friday_chat = None
+        self._prompted = False
+        self._show_greeting(self.startup.initial_message)
+        self.startup.on_greeting(lambda greeting: self._results.put(("greeting", greeting)))
+        self.after(FridayUIConstants.RESULT_QUEUE_POLL_INTERVAL_MS, self._drain_results)
+        self.startup.mark("interactive")
 
     def _friday_ui_configure(self):
         """Configure Friday AI Personal Assistant User Interface."""
@@ -189,47 +273,182 @@ class FridayAPP(customtkinter.CTk):
         customtkinter.set_appearance_mode(mode_string=FridayUIConstants.TOOL_THEME)
 
     def _handle_send(self, event=None):
-        """Handle the send button click or Enter key press."""
+        """
+        Handle the send button click or Enter key press. The prompt is queued for the worker, and shown in the chat
+        display once the worker starts it, so that it never lands in the middle of the response streamed before.
+        """
         text = self.prompt_frame.prompt_entry.get()
         if text.strip():
-            self._append_text_to_chat_display(text=f"User: {text}\n")
-            response = self._get_chat_response(user_input=text)
-            if response:
-                self._append_text_to_chat_display(text=f"Friday: {response}\n")
-            else:
-                self._append_text_to_chat_display(text=f"Friday: Apologize, Unable to process your request...\n")
-            self._append_text_to_chat_display(text="\n")
+            self._prompted = True
             self.prompt_frame.prompt_entry.delete(0, "end")
+            self._submit(lambda: self._get_chat_response(user_input=text))
             return "break"
 
-    def _append_text_to_chat_display(self, text: str) -> None:
+    def _show_greeting(self, greeting: str) -> None:
         """
-        Append text to the chat display and scroll to the bottom.
+        Show the greeting of Friday, in place of the greeting shown so far until the first prompt.
 
         Args:
-            text (str): Text to append to the chat display.
+            greeting (str): Greeting of Friday.
+        """
+        if self._prompted:
+            return
+        self.transcript.clear()
+        self.transcript.append(f"Friday: {greeting}\n\n")
+        self.transcript.end_block(turn=False)
+        self._render_transcript()
+
+    def _render_transcript(self) -> None:
+        """
+        Apply the changes of the transcript to the chat display at once. The chat display follows the new text only
+        when it was scrolled to the bottom.
         """
-        self.chat_display_frame.chat_display_text.configure(state="normal")
-        self.chat_display_frame.chat_display_text.insert("end", text)
-        self.chat_display_frame.chat_display_text.configure(state="disabled")
-        # Scroll to the bottom
-        self.chat_display_frame.chat_display_text.see("end")
+        update: Optional[FridayTranscriptUpdate] = self.transcript.flush()
+        if update is None:
+            return
+
+        chat_display_text = self.chat_display_frame.chat_display_text
+        at_bottom = chat_display_text.yview()[1] >= 1.0
+        chat_display_text.configure(state="normal")
+        chat_display_text.insert("end", update.text)
+        if update.delete_lines:
+            chat_display_text.delete("1.0", f"{update.delete_lines + 1}.0")
+        chat_display_text.configure(state="disabled")
+        if at_bottom:
+            chat_display_text.see("end")
+
+    def _handle_chat_scroll(self, event=None) -> None:
+        """Handle scrolling the chat display. The older turns are paged in from the session log at the top."""
+        chat_display_text = self.chat_display_frame.chat_display_text
+        scrolling_up = getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0
+        if not scrolling_up or chat_display_text.yview()[0] > 0.0:
+            return
+
+        text = self.transcript.page_older()
+        if text:
+            chat_display_text.configure(state="normal")
+            chat_display_text.insert("1.0", text)
+            chat_display_text.configure(state="disabled")
+            # Keep the first line shown before paging in view
+            paged_lines = text.count("\n")
+            chat_display_text.see(f"{paged_lines + 1}.0")
+
+    def _submit(self, request: Callable[[], None]) -> None:
+        """
+        Queue a request for the worker and update the pending indicator.
 
-    def _get_chat_response(self, user_input: str) -> str:
+        Args:
+            request (Callable[[], None]): Request to run on the worker thread.
         """
-        Get chat response from Friday AI Personal Assistant.
+        self._pending_requests += 1
+        self._update_status()
+        self._executor.submit(request)
+
+    def _update_status(self) -> None:
+        """Update the pending indicator with the number of requests waiting for Friday."""
+        if self._pending_requests == 0:
+            status = ""
+        elif self._pending_requests == 1:
+            status = "Friday is typing..."
+        else:
+            status = f"Friday is typing... ({self._pending_requests - 1} more queued)"
+        self.prompt_frame.status_label.configure(text=status)
+
+    def _drain_results(self) -> None:
+        """
+        Drain the worker result queue on the Tk main loop and reschedule itself.
+
+        All text received since the last drain is appended to the chat display at once.
+        """
+        transcript = self.transcript
+        drained = False
+        while True:
+            try:
+                event, payload = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            drained = True
+            if event == "greeting":
+                self._show_greeting(payload)
+            elif event == "session":
+                transcript.session = payload
+            elif event == "start":
+                transcript.start_block()
+                transcript.append(f"User: {payload}\nFriday: ")
+            elif event == "chunk":
+                transcript.append(payload)
+            elif event == "error":
+                transcript.append(FridayUIConstants.ERROR_MESSAGE)
+            elif event in ("end", "end_turn"):
+                transcript.append("\n\n")
+                transcript.end_block(turn=event == "end_turn")
+                self._pending_requests -= 1
+
+        if drained:
+            self._render_transcript()
+            self._update_status()
+        self.after(FridayUIConstants.RESULT_QUEUE_POLL_INTERVAL_MS, self._drain_results)
+
+    def _stream_to_results(
+        self, prompt: str, stream_factory: Callable[[], FridayStreamResponse], turn: bool = False
+    ) -> None:
+        """
+        Run a streamed request and post its prompt and chunks to the result queue. Runs on the worker thread.
+
+        Every request posts a "start" event and an "end" event, also when it fails, so that the pending indicator
+        always goes back down.
 
         Args:
-            user_input (str): User input to send to Friday AI.
+            prompt (str): Prompt of the user, shown when the request starts.
+            stream_factory (Callable[[], FridayStreamResponse]): Callable starting the streamed request.
+            turn (bool, optional): The request is a turn persisted to the session log. Defaults to False.
+        """
+        self._results.put(("start", prompt))
+        completed = False
+        try:
+            first = True
+            for chunk in stream_factory():
+                self._results.put(("chunk", chunk.response.lstrip() if first else chunk.response))
+                first = False
+            completed = True
+        except FridayBaseException as err:
+            self._results.put(("error", str(err)))
+        except Exception as err:
+            self.logger.exception("Friday request failed: %s", err)
+            self._results.put(("error", str(err)))
+        finally:
+            self._results.put(("end_turn" if turn and completed else "end", ""))
+
+    def _start_chat(self) -> FridayHistoryManager:
+        """
+        Wait until Friday is started and start the chat session, on the first prompt. Runs on the worker thread.
 
         Returns:
-            str: Chat response from Friday AI.
+            FridayHistoryManager: Chat session with Friday.
+
+        Raises:
+            FridayBaseException: Friday failed to start.
         """
-        try:
-            response = self.friday.google_ai_generation.send_chat_message(chat=self.friday_chat, message=user_input)
-        except FridayGenerationError:
-            return ""
-        return response.response.strip()
+        if self.friday_chat is None:
+            self.friday = self.startup.friday()
+            self.friday_chat = self.friday.start_new_chat()
+            # The transcript is only used on the Tk main loop, the session log is handed over with the result queue
+            self._results.put(("session", self.friday_chat.session))
+        return self.friday_chat
+
+    def _get_chat_response(self, user_input: str) -> None:
+        """
+        Get chat response from Friday AI Personal Assistant. Runs on the worker thread.
+
+        Args:
+            user_input (str): User input to send to Friday AI.
+        """
+        self._stream_to_results(
+            prompt=user_input,
+            stream_factory=lambda: self._start_chat().send_message_stream(message=user_input),
+            turn=True,
+        )
 
     def _handle_theme_switch(self, event=None):
         """Handle the theme switch."""
@@ -239,6 +458,11 @@ class FridayAPP(customtkinter.CTk):
         else:
             customtkinter.set_appearance_mode(mode_string="light")
 
+    def _handle_close(self) -> None:
+        """Handle the window close. Pending requests are cancelled and the worker is shut down."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
+
     def run(self):
         """Run Friday AI Personal Assistant User Interface."""
         self.mainloop()
@@ -0,0 +1,197 @@
+"""Chat Transcript View Model for the Friday UI."""
+
+from __future__ import annotations
+
+# Standard Library
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+# Type hints
+if TYPE_CHECKING:
+    from friday.sdk.sessions import FridaySession
+
+
+@dataclass
+class FridayTranscriptUpdate:
+    """
+    Changes to apply to the chat display at once: the text is appended first, then the lines are deleted.
+
+    Attributes:
+        text (str): Text to append to the chat display.
+        delete_lines (int): Number of lines to delete from the top of the chat display, once the text is appended.
+    """
+
+    text: str = ""
+    delete_lines: int = 0
+
+
+@dataclass
+class _Block:
+    """
+    Block of lines of the chat display: a turn of the session, or a message which is not persisted (greeting, error).
+
+    Attributes:
+        lines (int): Number of lines of the block.
+        turn (bool): The block is a turn of the session.
+    """
+
+    lines: int
+    turn: bool
+
+
+class FridayTranscript:
+    """
+    View model of the chat display, which keeps the widget small however long the chat grows.
+
+    Text is buffered as it arrives and applied to the widget once per frame with `flush`. Only the last `max_lines`
+    lines are kept in the widget: the oldest blocks are deleted as new text arrives, and the text of the deleted turns
+    is not kept in memory. Older turns are paged back in from the session log with `page_older`, when the user scrolls
+    to the top of the chat display.
+
+    Attributes:
+        max_lines (int): Maximum number of lines kept in the chat display when text is appended.
+        page_turns (int): Number of turns paged in at once.
+        session (Optional[FridaySession]): Session log of the chat, to page the older turns from.
+    """
+
+    def __init__(self, max_lines: int = 2000, page_turns: int = 20, session: Optional[FridaySession] = None) -> None:
+        """
+        Initialize the transcript view model.
+
+        Args:
+            max_lines (int, optional): Maximum number of lines kept in the chat display when text is appended.
+                Defaults to 2000.
+            page_turns (int, optional): Number of turns paged in at once. Defaults to 20.
+            session (Optional[FridaySession]): Session log of the chat, to page the older turns from. Defaults to
+                None.
+        """
+        self.max_lines = max_lines
+        self.page_turns = page_turns
+        self.session = session
+
+        self.__blocks: deque[_Block] = deque()
+        self.__lines = 0
+        self.__open_lines = 0
+        self.__pending: list[str] = []
+        self.__deleted_lines = 0
+        # Number of turns of the session shown in the chat display, the last turns of the session log
+        self.__turns = 0
+
+    @property
+    def lines(self) -> int:
+        """Number of lines of the chat display, once the pending text is flushed."""
+        return self.__lines
+
+    @staticmethod
+    def format_turn(user: str, model: str) -> str:
+        """
+        Format a turn of the session as shown in the chat display.
+
+        Args:
+            user (str): Message of the user.
+            model (str): Response of Friday.
+
+        Returns:
+            str: Text of the turn.
+        """
+        return f"User: {user}\nFriday: {model}\n\n"
+
+    def append(self, text: str) -> None:
+        """
+        Buffer text to append to the open block of the chat display.
+
+        Args:
+            text (str): Text to append.
+        """
+        if text:
+            self.__pending.append(text)
+            lines = text.count("\n")
+            self.__open_lines += lines
+            self.__lines += lines
+
+    def start_block(self) -> None:
+        """
+        Open a new block, when a request starts and its user line is appended. Text left open by an earlier block is
+        closed as a message which is not persisted, so that it is never counted into the turn of the request.
+        """
+        if self.__open_lines:
+            self.end_block(turn=False)
+
+    def end_block(self, turn: bool) -> None:
+        """
+        Close the open block, once a response is complete.
+
+        Args:
+            turn (bool): The block is a turn persisted to the session log, otherwise a message which is not
+                persisted (greeting, error).
+        """
+        self.__blocks.append(_Block(lines=self.__open_lines, turn=turn))
+        self.__turns += turn
+        self.__open_lines = 0
+        self.__evict()
+
+    def clear(self) -> None:
+        """Clear the chat display, e.g. to replace the greeting. The lines shown are deleted with the next flush."""
+        pending_lines = sum(text.count("\n") for text in self.__pending)
+        self.__deleted_lines += self.__lines - pending_lines
+        self.__blocks.clear()
+        self.__pending.clear()
+        self.__lines = 0
+        self.__open_lines = 0
+        self.__turns = 0
+
+    def __evict(self) -> None:
+        """Delete the oldest closed blocks beyond the maximum number of lines."""
+        while self.__lines > self.max_lines and self.__blocks:
+            block = self.__blocks.popleft()
+            self.__lines -= block.lines
+            self.__deleted_lines += block.lines
+            self.__turns -= block.turn
+
+    def flush(self) -> Optional[FridayTranscriptUpdate]:
+        """
+        Return the changes buffered since the last flush, to apply to the chat display at once.
+
+        Returns:
+            Optional[FridayTranscriptUpdate]: Changes to apply, or None when there is none.
+        """
+        if not self.__pending and not self.__deleted_lines:
+            return None
+        update = FridayTranscriptUpdate(text="".join(self.__pending), delete_lines=self.__deleted_lines)
+        self.__pending.clear()
+        self.__deleted_lines = 0
+        return update
+
+    def page_older(self) -> Optional[str]:
+        """
+        Page in the turns of the session log before the first turn shown. The text is inserted at the top of the chat
+        display, and may exceed the maximum number of lines until text is appended again.
+
+        Returns:
+            Optional[str]: Text of the older turns, or None when every turn of the session log is shown.
+        """
+        if self.session is None:
+            return None
+        turns = [(record["user"], record["model"]) for record in self.session.records() if record["type"] == "turn"]
+        first = len(turns) - self.__turns
+        if first <= 0:
+            return None
+
+        page = [self.format_turn(user, model) for user, model in turns[max(first - self.page_turns, 0) : first]]
+        for text in reversed(page):
+            lines = text.count("\n")
+            self.__blocks.appendleft(_Block(lines=lines, turn=True))
+            self.__lines += lines
+        self.__turns += len(page)
+        return "".join(page)
+
+
+if __name__ == "__main__":
+    transcript = FridayTranscript(max_lines=6)
+    for index in range(5):
+        transcript.start_block()
+        transcript.append(f"User: message {index}\n")
+        transcript.append(f"Friday: response {index}\n\n")
+        transcript.end_block(turn=False)
+        print(transcript.flush(), transcript.lines)
@@ -2,10 +2,13 @@
 
 # Standard Library
 import os
-from pathlib import Path
-from typing import Annotated, Literal
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import threading
+from pathlib import Path
+from typing import Annotated, Literal, Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 # Third Party Library
 from dotenv import load_dotenv
@@ -15,11 +18,49 @@ from colorlog import ColoredFormatter
 # Load Environment Variables
 load_dotenv()
 
+# Defaults of the logging configuration, overridden with FRIDAY_LOG_LEVEL, FRIDAY_LOG_MAX_BYTES and
+# FRIDAY_LOG_BACKUP_COUNT
+DEFAULT_LOG_LEVEL = "DEBUG"
+DEFAULT_LOG_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_LOG_BACKUP_COUNT = 5
+
+
+class _LazyQueueHandler(QueueHandler):
+    """
+    Queue handler which enqueues the records as they are.
+
+    The stock `QueueHandler` formats every record on the calling thread. Records are only passed between threads of
+    the same process here, so the message and the traceback are formatted on the listener thread instead.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Return the record unformatted."""
+        return record
+
+
+class _ConsoleFilter(logging.Filter):
+    """Filter dropping the records logged with `extra={"console": False}` from the console, e.g. while it prompts."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return whether the record is written to the console."""
+        return getattr(record, "console", True)
+
 
 class CustomLogger:
     """
     Custom Logger for Friday AI Personal Assistant.
 
+    Loggers are kept in a registry: the handlers of a logger are configured once, on its first creation, and later
+    creations return the same logger. Records are put on a queue without blocking, and formatted and written to the
+    console and the rotating log file by a background listener thread, so logging never adds I/O to the caller. Records
+    logged with `extra={"console": False}` are only written to the log file.
+
+    Expected Environment Variables:
+    - `FRIDAY_LOG_DIR`: Optional, directory of the log files. Defaults to `.friday_cache/logs`.
+    - `FRIDAY_LOG_LEVEL`: Optional, log level. Defaults to the `log_level` argument.
+    - `FRIDAY_LOG_MAX_BYTES`: Optional, size at which the log file is rotated. Defaults to 10MB.
+    - `FRIDAY_LOG_BACKUP_COUNT`: Optional, number of rotated log files kept. Defaults to 5.
+
     Attributes:
         name (str): Name of the Logger.
         log_level (Annotated[log_levels, str]): Log Level.
@@ -28,40 +69,56 @@ class CustomLogger:
 
     log_levels = Literal["NOTSET", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
 
+    __loggers: dict[str, logging.Logger] = {}
+    __listeners: dict[str, QueueListener] = {}
+    __lock = threading.Lock()
+
     def __new__(cls, *args, **kwargs):
         """Create a new instance of the Logger. Return the Logger Object created from CustomLogger when initialized."""
         instance = super(CustomLogger, cls).__new__(cls)
         instance.__init__(*args, **kwargs)
         return instance.logger
 
-    def __init__(self, name: str = "friday", log_level: Annotated[log_levels, str] = "DEBUG") -> None:
+    def __init__(self, name: str = "friday", log_level: Optional[Annotated[log_levels, str]] = None) -> None:
         """
         Initialize the CustomLogger.
 
         Args:
             name (str): Name of the Logger (Default: "friday").
-            log_level (Annotated[log_levels, str]): Log Level (Default: "DEBUG").
+            log_level (Optional[Annotated[log_levels, str]]): Log Level, used when the logger is first created and
+                `FRIDAY_LOG_LEVEL` is not set (Default: "DEBUG").
         """
         self.name = name
-        self.log_level = log_level
+        self.log_level = os.getenv("FRIDAY_LOG_LEVEL") or log_level or DEFAULT_LOG_LEVEL
+
+        with CustomLogger.__lock:
+            logger = CustomLogger.__loggers.get(name)
+            if logger is None:
+                logger = CustomLogger.__loggers[name] = self.__create_logger(log_path=self.__log_path())
+        self.logger = logger
 
+    def __log_path(self) -> Path:
+        """
+        Return the path to the log file, under `FRIDAY_LOG_DIR` when it exists, otherwise under `.friday_cache/logs`.
+
+        Returns:
+            Path: Path to the log file.
+        """
         log_dir = os.getenv("FRIDAY_LOG_DIR")
         if log_dir and Path(log_dir).exists():
-            log_path = Path(log_dir) / f"{name}.log"
-        else:
-            default_log_dir = Path(__file__).parent.parent.parent / ".friday_cache" / "logs"
-            if not default_log_dir.exists():
-                default_log_dir.mkdir(parents=True, exist_ok=True)
-            log_path = Path(__file__).parent.parent.parent / ".friday_cache" / "logs" / f"{name}.log"
+            return Path(log_dir) / f"{self.name}.log"
 
-        self.logger = self.__create_logger(log_path=log_path)
+        default_log_dir = Path(__file__).parent.parent.parent / ".friday_cache" / "logs"
+        default_log_dir.mkdir(parents=True, exist_ok=True)
+        return default_log_dir / f"{self.name}.log"
 
     def __create_logger(self, log_path: Path) -> logging.Logger:
         """
         Create and configure the logger.
 
-        Include Console and Rotating File Handlers. Color Logging for Console. Plain Logging for File. The Log File
-        will be rotated when it reaches 10KB and will keep the last 5 logs.
+        The logger only has a queue handler. Console and Rotating File Handlers are run by a queue listener thread.
+        Color Logging for Console. Plain Logging for File. The Log File is rotated when it reaches
+        `FRIDAY_LOG_MAX_BYTES` and the last `FRIDAY_LOG_BACKUP_COUNT` logs are kept.
 
         Args:
             log_path (Path): Valid Path to the Log File.
@@ -70,35 +127,66 @@ class CustomLogger:
         """
         plain_log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         color_log_format = "%(log_color)s" + plain_log_format
-        log_file_max_size = 100 * 1024
-        log_file_max_backup = 5
+        log_file_max_size = int(os.getenv("FRIDAY_LOG_MAX_BYTES") or DEFAULT_LOG_MAX_BYTES)
+        log_file_max_backup = int(os.getenv("FRIDAY_LOG_BACKUP_COUNT") or DEFAULT_LOG_BACKUP_COUNT)
 
         # Create Logger
         logger = logging.getLogger(self.name)
         logger.setLevel(self.log_level)
+        logger.propagate = False
 
         # Create a console handler
         console_handler = logging.StreamHandler()
         console_handler.setLevel(self.log_level)
+        console_handler.addFilter(_ConsoleFilter())
 
         # Create a color logging format
         color_formatter = ColoredFormatter(color_log_format)
         console_handler.setFormatter(color_formatter)
 
-        # Create a rotating file handler
-        rot_file_handler = RotatingFileHandler(log_path, maxBytes=log_file_max_size, backupCount=log_file_max_backup)
+        # Create a rotating file handler, opened on the first record
+        rot_file_handler = RotatingFileHandler(
+            log_path, maxBytes=log_file_max_size, backupCount=log_file_max_backup, delay=True
+        )
         rot_file_handler.setLevel(self.log_level)
 
         # Create a basic logging format
         plain_formatter = logging.Formatter(plain_log_format)
         rot_file_handler.setFormatter(plain_formatter)
 
-        # Set the handlers
-        logger.addHandler(rot_file_handler)
-        logger.addHandler(console_handler)
+        # Set the queue handler, the listener thread runs the console and file handlers
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, rot_file_handler, console_handler, respect_handler_level=True)
+        listener.start()
+        CustomLogger.__listeners[self.name] = listener
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.addHandler(_LazyQueueHandler(log_queue))
 
         return logger
 
+    @classmethod
+    def flush(cls) -> None:
+        """Wait until the queued records of every logger are written."""
+        with cls.__lock:
+            for listener in cls.__listeners.values():
+                if listener._thread is not None:
+                    listener.stop()
+                    listener.start()
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Write the queued records and stop the listener threads. Registered to run at exit."""
+        with cls.__lock:
+            for listener in cls.__listeners.values():
+                if listener._thread is not None:
+                    listener.stop()
+                for handler in listener.handlers:
+                    handler.close()
+
+
+atexit.register(CustomLogger.shutdown)
+
 
 if __name__ == "__main__":
     logger = CustomLogger(name="friday", log_level="DEBUG")
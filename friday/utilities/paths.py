@@ -0,0 +1,31 @@
+"""Paths Module for Friday."""
+
+# Standard Library
+import os
+from pathlib import Path
+
+# Third Party Library
+from dotenv import load_dotenv
+
+
+# Load Environment Variables
+load_dotenv()
+
+
+def friday_cache_dir(*parts: str) -> Path:
+    """
+    Return a directory under the Friday cache and create it if missing.
+
+    The cache root is `FRIDAY_CACHE_DIR` when set, otherwise `.friday_cache` at the root of the repository.
+
+    Args:
+        *parts (str): Sub directories under the cache root.
+
+    Returns:
+        Path: Path to the cache directory.
+    """
+    cache_dir = os.getenv("FRIDAY_CACHE_DIR")
+    cache_root = Path(cache_dir) if cache_dir else Path(__file__).parent.parent.parent / ".friday_cache"
+    path = cache_root.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,13 @@
+"""Shared fixtures of the Friday tests."""
+
+# Third Party Library
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def friday_cache_dir(tmp_path_factory):
+    """Keep the Friday cache of the tests under a temporary directory, away from the developer's cache."""
+    monkeypatch = pytest.MonkeyPatch()
+    monkeypatch.setenv("FRIDAY_CACHE_DIR", str(tmp_path_factory.mktemp("friday_cache")))
+    yield
+    monkeypatch.undo()
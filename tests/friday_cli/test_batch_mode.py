@@ -0,0 +1,43 @@
+"""Test Friday CLI batch mode against a local stub backend."""
+
+# Standard Library
+import io
+import json
+
+# Third Party Library
+import pytest
+
+# Project Library
+from friday.main import FridayInitializationError, console_batch_runner
+from friday.sdk.generation import GoogleAIGeneration
+
+# Local Library
+from tests.friday_sdks.test_history import StubGoogleAIModel
+
+
+class TestBatch:
+    """Test Friday CLI batch mode."""
+
+    @pytest.fixture
+    def generation(self):
+        """Generation SDK on the stub backend."""
+        return GoogleAIGeneration(genai_model=StubGoogleAIModel())
+
+    def test_results_written_as_jsonl(self, generation):
+        """Test every prompt record gets a JSONL result with its extra keys."""
+        prompts_file = io.StringIO('"Hello there"\n\n{"id": "b", "prompt": "How are you?"}\n')
+        output = io.StringIO()
+
+        usage = console_batch_runner(generation, prompts_file, output, max_workers=2)
+
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [result["prompt"] for result in results] == ["Hello there", "How are you?"]
+        assert results[1]["id"] == "b"
+        assert results[0]["response"] == "summary"
+        assert results[0]["usage"]["prompt_token_count"] == 2
+        assert usage.succeeded == 2
+
+    def test_invalid_record(self, generation):
+        """Test a record without prompt is rejected."""
+        with pytest.raises(FridayInitializationError):
+            console_batch_runner(generation, io.StringIO('{"id": "a"}\n'), io.StringIO())
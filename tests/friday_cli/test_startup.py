@@ -0,0 +1,101 @@
+"""Test Friday CLI startup stays lightweight."""
+
+# Standard Library
+import sys
+import time
+import threading
+import subprocess
+from types import SimpleNamespace
+from pathlib import Path
+
+# Third Party Library
+import pytest
+
+# Project Library
+from friday import main as friday_main
+from friday.main import FridayInitializationError, FridayStartup, static_message
+from friday.sdk.fake import FridayFakeBackend
+from friday.sdk.model import GoogleAIModel
+from friday.sdk.generation import GoogleAIGeneration
+
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+
+
+class TestStartup:
+    """Test Friday CLI startup stays lightweight."""
+
+    def test_cli_import_is_lazy(self):
+        """Test importing Friday CLI does not import the google.generativeai SDK stack."""
+        code = "import sys, friday.main; print('google.generativeai' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True)
+
+        assert result.stdout.strip() == "False"
+
+    def test_cli_help(self):
+        """Test Friday CLI help does not create Friday."""
+        result = subprocess.run(
+            [sys.executable, "-m", "friday.main", "--help"], cwd=REPO_ROOT, capture_output=True, text=True
+        )
+
+        assert result.returncode == 0
+        assert "friday_cli" in result.stdout
+
+    def test_static_messages(self):
+        """Test the static messages are read from the system message, unquoted."""
+        assert static_message("initial_message").startswith("Bello! I am Friday")
+        assert static_message("farewell_message") == "Bye! Don't have a good day, have a great day!"
+
+
+class TestFridayStartup:
+    """Test the overlapped startup of Friday."""
+
+    def test_greeting_overlapped(self):
+        """Test the initial message is served while Friday starts, then the model greeting once generated."""
+        started = threading.Event()
+        model = GoogleAIModel(fake_backend=FridayFakeBackend(ttft_seconds=0.05))
+
+        def factory():
+            started.wait(5.0)
+            return SimpleNamespace(google_ai_generation=GoogleAIGeneration(model))
+
+        start = time.perf_counter()
+        startup = FridayStartup(factory=factory)
+        greetings = []
+        startup.on_greeting(greetings.append)
+        assert startup.greeting() == startup.initial_message
+        assert not startup.ready
+        assert time.perf_counter() - start < 0.5
+
+        started.set()
+        greeting = startup.greeting(timeout=5.0)
+        assert startup.ready
+        assert greeting != startup.initial_message
+        assert greetings == [greeting]
+        assert model.model.requests == 1
+
+    def test_failed_startup(self):
+        """Test the initial message is served when Friday fails to start, and the error is raised on first use."""
+
+        def factory():
+            raise FridayInitializationError(message="Failed to create Google AI Model for Friday...")
+
+        startup = FridayStartup(factory=factory)
+        assert startup.greeting(timeout=5.0) == startup.initial_message
+        assert not startup.ready
+        with pytest.raises(FridayInitializationError):
+            startup.friday()
+
+    def test_failed_startup_exits(self, monkeypatch, capsys):
+        """Test the CLI exits with the startup error and exit code 1 when Friday fails to start in the background."""
+
+        def factory():
+            raise FridayInitializationError(message="Failed to create Google AI Model for Friday...")
+
+        monkeypatch.setattr(friday_main, "FridayStartup", lambda greeting_prompt: FridayStartup(factory, None))
+        monkeypatch.setattr("builtins.input", lambda prompt: "Hello Friday!")
+        with pytest.raises(SystemExit) as exit_info:
+            friday_main.main([])
+
+        assert exit_info.value.code == 1
+        assert "Failed to create Google AI Model for Friday..." in capsys.readouterr().err
@@ -0,0 +1,225 @@
+"""Test Friday SDKs for asyncio generation against a local stub backend."""
+
+# Standard Library
+import gc
+import time
+import asyncio
+
+# Third Party Library
+import pytest
+from google.generativeai import protos
+from google.generativeai.generative_models import ChatSession
+from google.generativeai.types.generation_types import AsyncGenerateContentResponse
+
+# Project Library
+from friday.sdk.fake import FridayFakeBackend
+from friday.sdk.model import GoogleAIModel
+from friday.sdk.cache import FridayResponseCache
+from friday.sdk.router import FridayModelRouter
+from friday.sdk.metrics import FridayMetrics
+from friday.sdk.generation import GoogleAIGeneration
+from friday.sdk.async_generation import AsyncGoogleAIGeneration
+
+
+class StubAsyncModel:
+    """Local stub of the async GenerativeModel API which echoes the last message after a fixed latency."""
+
+    model_name = "models/stub"
+
+    def __init__(self, latency: float = 0.1) -> None:
+        self.latency = latency
+
+    @staticmethod
+    def _chunk(text: str, finished: bool) -> protos.GenerateContentResponse:
+        return protos.GenerateContentResponse(
+            candidates=[
+                protos.Candidate(
+                    content=protos.Content(role="model", parts=[protos.Part(text=text)]),
+                    finish_reason=protos.Candidate.FinishReason.STOP if finished else None,
+                )
+            ],
+            usage_metadata=protos.GenerateContentResponse.UsageMetadata(
+                prompt_token_count=1, candidates_token_count=len(text.split()), total_token_count=1 + len(text.split())
+            ),
+        )
+
+    async def generate_content_async(self, contents, *, stream=False, **kwargs) -> AsyncGenerateContentResponse:
+        last = contents if isinstance(contents, str) else contents[-1].parts[0].text
+        words = f"echo: {last}".split()
+        await asyncio.sleep(self.latency)
+        if not stream:
+            return AsyncGenerateContentResponse.from_response(self._chunk(" ".join(words), finished=True))
+
+        async def chunks():
+            for index, word in enumerate(words):
+                if index:
+                    await asyncio.sleep(self.latency / len(words))
+                yield self._chunk(f"{word} " if index < len(words) - 1 else word, finished=index == len(words) - 1)
+
+        return await AsyncGenerateContentResponse.from_aiterator(chunks())
+
+    async def count_tokens_async(self, contents) -> protos.CountTokensResponse:
+        await asyncio.sleep(self.latency)
+        return protos.CountTokensResponse(total_tokens=len(str(contents).split()))
+
+    def start_chat(self, history=None) -> ChatSession:
+        return ChatSession(model=self, history=history)
+
+    def _get_tools_lib(self, tools):
+        return None
+
+
+class StubGoogleAIModel:
+    """Local stub of GoogleAIModel exposing the stub backend as `model`."""
+
+    model_name = "stub"
+    system_instruction = None
+
+    def __init__(self, latency: float = 0.1) -> None:
+        self.model = StubAsyncModel(latency=latency)
+
+
+class TestAsyncGeneration:
+    """Test Friday SDKs for asyncio generation."""
+
+    def setup_class(self):
+        """Set up the test class."""
+        self.ai_generation = AsyncGoogleAIGeneration(genai_model=StubGoogleAIModel(latency=0.1))
+
+    def test_generation_config(self):
+        """Test generation configuration is shared with the sync SDK."""
+        config = AsyncGoogleAIGeneration.generation_config()
+
+        assert config.candidate_count == 1
+        assert config.max_output_tokens == 1000
+        assert config.temperature == 0.5
+
+    def test_generate_content(self):
+        """Test async generate content."""
+        response = asyncio.run(self.ai_generation.generate_content(prompt="hello"))
+
+        assert response.response == "echo: hello"
+        assert response.response_object is not None
+
+    def test_count_tokens(self):
+        """Test async remote token count."""
+        assert asyncio.run(self.ai_generation._count_tokens(text="one two three", remote=True)) == 3
+
+    @pytest.mark.parametrize("sessions", [300])
+    def test_concurrent_chat_sessions(self, sessions):
+        """Test a single event loop drives hundreds of concurrent chat sessions."""
+
+        async def run_sessions():
+            chats = [self.ai_generation.start_new_chat() for _ in range(sessions)]
+            responses = await asyncio.gather(
+                *(self.ai_generation.send_chat_message(chat=chat, message=f"msg {i}") for i, chat in enumerate(chats))
+            )
+            return chats, responses
+
+        start = time.perf_counter()
+        chats, responses = asyncio.run(run_sessions())
+        elapsed = time.perf_counter() - start
+
+        # Sequential calls would take sessions * latency = 30s
+        assert elapsed < 3
+        assert [response.response for response in responses] == [f"echo: msg {i}" for i in range(sessions)]
+        assert all(len(chat.history) == 2 for chat in chats)
+
+    def test_same_chat_messages_serialized(self):
+        """Test concurrent messages to the same chat session keep a coherent history."""
+
+        async def run_chat():
+            chat = self.ai_generation.start_new_chat()
+            await asyncio.gather(*(self.ai_generation.send_chat_message(chat=chat, message=f"{i}") for i in range(3)))
+            return chat
+
+        chat = asyncio.run(run_chat())
+
+        assert [content.role for content in chat.history] == ["user", "model"] * 3
+
+    def test_start_chat_with_history(self):
+        """Test an async chat session is seeded with a history, like a sync one."""
+        history = [
+            protos.Content(role="user", parts=[protos.Part(text="hello")]),
+            protos.Content(role="model", parts=[protos.Part(text="echo: hello")]),
+        ]
+
+        async def run_chat():
+            chat = self.ai_generation.start_new_chat(history=history)
+            await self.ai_generation.send_chat_message(chat=chat, message="again")
+            return chat
+
+        chat = asyncio.run(run_chat())
+
+        assert self.ai_generation.get_chat_history(chat=chat) == [
+            "user: hello",
+            "model: echo: hello",
+            "user: again",
+            "model: echo: again",
+        ]
+
+    def test_send_chat_message_stream(self):
+        """Test async streamed chat message keeps the chat history and reports usage metadata."""
+
+        async def run_stream():
+            chat = self.ai_generation.start_new_chat()
+            stream = await self.ai_generation.send_chat_message_stream(chat=chat, message="one two three")
+            chunks = [chunk.response async for chunk in stream]
+            return chat, stream, chunks
+
+        chat, stream, chunks = asyncio.run(run_stream())
+
+        assert len(chunks) == 4
+        assert stream.response == "echo: one two three"
+        assert stream.usage_metadata.total_token_count > 0
+        assert self.ai_generation.get_chat_history(chat=chat) == ["user: one two three", "model: echo: one two three"]
+
+    @pytest.mark.parametrize("close", [True, False])
+    def test_send_chat_message_stream_never_iterated(self, close):
+        """Test a stream dropped without being iterated unlocks the chat session, once closed or garbage collected."""
+
+        async def run_stream():
+            chat = self.ai_generation.start_new_chat()
+            stream = await self.ai_generation.send_chat_message_stream(chat=chat, message="dropped")
+            if close:
+                await stream.aclose()
+            del stream
+            gc.collect()
+            response = await asyncio.wait_for(self.ai_generation.send_chat_message(chat=chat, message="next"), 5.0)
+            return chat, response
+
+        chat, response = asyncio.run(run_stream())
+
+        assert response.response == "echo: next"
+        assert self.ai_generation.get_chat_history(chat=chat) == ["user: next", "model: echo: next"]
+
+    def test_shares_sync_configuration(self, tmp_path):
+        """Test the async SDK serves the caches, routes and calibrates the token estimator like the sync SDK."""
+        model = GoogleAIModel(fake_backend=FridayFakeBackend())
+        router = FridayModelRouter.default(model)
+        generation = GoogleAIGeneration(
+            model,
+            cache=FridayResponseCache(persistent=False),
+            metrics=FridayMetrics(tmp_path / "metrics.json"),
+            router=router,
+        )
+        ai_generation = AsyncGoogleAIGeneration.from_generation(generation)
+        recorded = []
+        ai_generation.token_estimator.record = lambda *args: recorded.append(args)
+        generation_config = ai_generation.generation_config(temperature=0)
+
+        async def run() -> list[str]:
+            responses = [
+                await ai_generation.generate_content("Who are you?", generation_config=generation_config)
+                for _ in range(2)
+            ]
+            chat = ai_generation.start_new_chat()
+            responses.append(await ai_generation.send_chat_message(chat, "Hi!"))
+            return [response.response for response in responses]
+
+        replies = asyncio.run(run())
+
+        assert replies[0] == replies[1]
+        assert {route.model_name: route.model.model.requests for route in router.routes}["gemini-1.5-flash-8b"] == 2
+        assert generation.cache.hits == 1
+        assert len(recorded) == 2
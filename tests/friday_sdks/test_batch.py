@@ -0,0 +1,82 @@
+"""Test Friday SDK batch generation against a local stub backend."""
+
+# Standard Library
+import time
+import threading
+
+# Third Party Library
+import pytest
+
+# Project Library
+from friday.sdk.generation import FridayGenerationError, GoogleAIGeneration
+
+# Local Library
+from tests.friday_sdks.test_history import StubGoogleAIModel, StubModel
+
+
+class SlowStubModel(StubModel):
+    """Stub backend which sleeps for the number of seconds in the prompt, fails on `fail` and tracks concurrency."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def generate_content(self, contents, *, stream=False, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if contents == "fail":
+                raise RuntimeError("Quota exceeded.")
+            time.sleep(float(contents.split()[-1]))
+            return super().generate_content(contents, stream=stream, **kwargs)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class TestBatchGeneration:
+    """Test Friday SDK batch generation."""
+
+    @pytest.fixture
+    def ai_model(self):
+        """Stub Google AI model on the slow stub backend."""
+        ai_model = StubGoogleAIModel()
+        ai_model.model = SlowStubModel()
+        return ai_model
+
+    @pytest.fixture
+    def generation(self, ai_model):
+        """Generation SDK on the slow stub backend."""
+        return GoogleAIGeneration(genai_model=ai_model)
+
+    def test_results_in_input_order_with_isolated_errors(self, generation):
+        """Test results keep the input order, failed prompts become errors and usage is aggregated."""
+        batch = generation.generate_many(["sleep 0.05", "fail", "sleep 0"], max_workers=3)
+        results = list(batch)
+
+        assert [result.index for result in results] == [0, 1, 2]
+        assert [result.ok for result in results] == [True, False, True]
+        assert isinstance(results[1].error, FridayGenerationError)
+        assert (batch.usage.succeeded, batch.usage.failed) == (2, 1)
+        assert batch.usage.prompt_token_count == 4
+        assert batch.usage.candidates_token_count == 2
+        assert batch.usage.total_token_count == 6
+
+    def test_results_as_completed(self, generation):
+        """Test results are yielded as completed when not ordered."""
+        results = generation.generate_many(["sleep 0.2", "sleep 0"], max_workers=2, ordered=False)
+
+        assert [result.index for result in results] == [1, 0]
+
+    def test_concurrency_is_bounded(self, ai_model, generation):
+        """Test prompts run concurrently up to the worker limit."""
+        started = time.perf_counter()
+        results = generation.generate_many(("sleep 0.05" for _ in range(32)), max_workers=8).resolve()
+        elapsed = time.perf_counter() - started
+
+        assert len(results) == 32
+        assert ai_model.model.max_in_flight == 8
+        assert elapsed < 32 * 0.05 / 4
@@ -0,0 +1,125 @@
+"""Test Friday SDK response cache."""
+
+# Standard Library
+import time
+
+# Third Party Library
+import pytest
+from google.generativeai import protos
+from google.generativeai.types.generation_types import GenerateContentResponse
+
+# Project Library
+from friday.sdk.fake import FridayFakeBackend
+from friday.sdk.model import GoogleAIModel
+from friday.sdk.cache import FridayResponseCache
+from friday.sdk.generation import GoogleAIGeneration
+
+
+def make_response(
+    text: str, finish_reason: protos.Candidate.FinishReason = protos.Candidate.FinishReason.STOP
+) -> GenerateContentResponse:
+    """Make a resolved response with the given text and finish reason."""
+    return GenerateContentResponse.from_response(
+        protos.GenerateContentResponse(
+            candidates=[
+                protos.Candidate(
+                    content=protos.Content(role="model", parts=[protos.Part(text=text)]), finish_reason=finish_reason
+                )
+            ],
+            usage_metadata=protos.GenerateContentResponse.UsageMetadata(total_token_count=3),
+        )
+    )
+
+
+class TestResponseCache:
+    """Test Friday SDK response cache."""
+
+    @pytest.fixture
+    def cache_path(self, tmp_path):
+        """Path to the SQLite store of the cache."""
+        return tmp_path / "responses.sqlite3"
+
+    def test_make_key(self):
+        """Test the cache key depends on every part of the request."""
+        config = GoogleAIGeneration.generation_config()
+        key = FridayResponseCache.make_key("gemini-1.5-flash", "system", "Who are you?", config)
+
+        assert key == FridayResponseCache.make_key("gemini-1.5-flash", "system", "Who are you?", config)
+        assert key != FridayResponseCache.make_key("gemini-1.5-pro", "system", "Who are you?", config)
+        assert key != FridayResponseCache.make_key("gemini-1.5-flash", "other", "Who are you?", config)
+        assert key != FridayResponseCache.make_key("gemini-1.5-flash", "system", "Who are they?", config)
+        assert key != FridayResponseCache.make_key(
+            "gemini-1.5-flash", "system", "Who are you?", GoogleAIGeneration.generation_config(temperature=0)
+        )
+
+    def test_hit_and_miss(self, cache_path):
+        """Test cache hits and misses are counted."""
+        cache = FridayResponseCache(cache_path=cache_path)
+
+        assert cache.get("key") is None
+        cache.put("key", make_response("Bello!"))
+        response = cache.get("key")
+
+        assert response.text == "Bello!"
+        assert response.usage_metadata.total_token_count == 3
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_persistent(self, cache_path):
+        """Test responses survive a new cache instance."""
+        FridayResponseCache(cache_path=cache_path).put("key", make_response("Bello!"))
+
+        assert FridayResponseCache(cache_path=cache_path).get("key").text == "Bello!"
+
+    def test_memory_lru_eviction(self):
+        """Test the least recently used responses are evicted from memory."""
+        cache = FridayResponseCache(max_memory_entries=2, persistent=False)
+        cache.put("first", make_response("1"))
+        cache.put("second", make_response("2"))
+        cache.get("first")
+        cache.put("third", make_response("3"))
+
+        assert cache.get("second") is None
+        assert cache.get("first").text == "1"
+        assert cache.get("third").text == "3"
+
+    def test_ttl(self, cache_path):
+        """Test expired responses are not served."""
+        cache = FridayResponseCache(ttl_seconds=0.05, cache_path=cache_path)
+        cache.put("key", make_response("Bello!"))
+        time.sleep(0.1)
+
+        assert cache.get("key") is None
+        assert cache.stats()["disk_bytes"] == 0
+
+    def test_disk_size_cap(self, cache_path):
+        """Test the least recently used responses are evicted from disk beyond the size cap."""
+        cache = FridayResponseCache(max_memory_entries=0, cache_path=cache_path)
+        cache.put("first", make_response("1"))
+        entry_size = cache.stats()["disk_bytes"]
+
+        cache = FridayResponseCache(max_memory_entries=0, max_disk_bytes=2 * entry_size, cache_path=cache_path)
+        cache.put("second", make_response("2"))
+        cache.put("third", make_response("3"))
+
+        assert cache.get("first") is None
+        assert cache.get("third").text == "3"
+        assert cache.stats()["disk_bytes"] <= 2 * entry_size
+
+    def test_incomplete_responses_not_cached(self):
+        """Test truncated and blocked responses are not cached, by the response cache and the generation SDK."""
+        cache = FridayResponseCache(persistent=False)
+        cache.put("truncated", make_response("Bel", protos.Candidate.FinishReason.MAX_TOKENS))
+        cache.put("blocked", make_response("", protos.Candidate.FinishReason.SAFETY))
+
+        assert cache.get("truncated") is None
+        assert cache.get("blocked") is None
+
+        model = GoogleAIModel(fake_backend=FridayFakeBackend())
+        generation = GoogleAIGeneration(model, cache=cache)
+        config = GoogleAIGeneration.generation_config(max_output_tokens=5, temperature=0)
+        generation.generate_content("Who are you?", generation_config=config)
+        "".join(chunk.response for chunk in generation.generate_content_stream("Who are you?", generation_config=config))
+
+        assert model.model.requests == 2
+        assert cache.stats()["memory_entries"] == 0
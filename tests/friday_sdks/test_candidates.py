@@ -0,0 +1,95 @@
+"""Test Friday response candidates and candidate selectors."""
+
+# Standard Library
+import asyncio
+
+# Third Party Library
+import pytest
+
+# Project Library
+from friday.sdk.fake import FridayFakeBackend
+from friday.sdk.model import GoogleAIModel
+from friday.sdk.generation import GoogleAIGeneration
+from friday.sdk.async_generation import AsyncGoogleAIGeneration
+from friday.sdk.candidates import FridayCandidate, select_by_score, select_first, select_longest, select_shortest
+
+
+THREE_CANDIDATES = GoogleAIGeneration.generation_config(candidate_count=3)
+
+
+class TestCandidates:
+    """Test Friday response candidates and candidate selectors."""
+
+    @pytest.fixture
+    def model(self):
+        """Model on the fake backend."""
+        return GoogleAIModel(fake_backend=FridayFakeBackend())
+
+    def test_selectors(self):
+        """Test the selectors pick among the complete candidates, and fall back to all when none is complete."""
+        candidates = [
+            FridayCandidate(index=0, text="blocked", finish_reason="SAFETY", token_count=50),
+            FridayCandidate(index=1, text="a medium reply", finish_reason="STOP", token_count=10),
+            FridayCandidate(index=2, text="short", finish_reason="STOP", token_count=2),
+            FridayCandidate(index=3, text="a long reply cut short", finish_reason="MAX_TOKENS", token_count=30),
+        ]
+
+        assert select_first(candidates).index == 1
+        assert select_longest(candidates).index == 3
+        assert select_shortest(candidates).index == 2
+        assert select_by_score(lambda candidate: "medium" in candidate.text)(candidates).index == 1
+        assert select_first(candidates[:1]).index == 0
+
+    def test_generate_content_candidates(self, model):
+        """Test every candidate is returned by a single request, with its finish reason and token count."""
+        generation = GoogleAIGeneration(model)
+        response = generation.generate_content("Name a color.", generation_config=THREE_CANDIDATES)
+        usage_metadata = response.response_object.usage_metadata
+
+        assert model.model.requests == 1
+        assert [candidate.index for candidate in response.candidates] == [0, 1, 2]
+        assert len({candidate.text for candidate in response.candidates}) == 3
+        assert all(candidate.finish_reason == "STOP" for candidate in response.candidates)
+        assert sum(candidate.token_count for candidate in response.candidates) == usage_metadata.candidates_token_count
+        assert response.response == response.candidates[0].text
+
+        longest = generation.generate_content(
+            "Name a color.", generation_config=THREE_CANDIDATES, selector=select_longest
+        )
+        assert longest.response == max(response.candidates, key=lambda candidate: candidate.token_count).text
+
+    def test_single_candidate(self, model):
+        """Test a single candidate response carries its candidate, counted from the usage metadata."""
+        response = GoogleAIGeneration(model).generate_content("Name a color.")
+
+        assert len(response.candidates) == 1
+        assert response.candidate.text == response.response
+        assert response.candidate.token_count == response.response_object.usage_metadata.candidates_token_count
+
+    def test_chat_turn_selected_candidate(self, model):
+        """Test the selected candidate of a chat turn is added to the history, and the chat can continue."""
+        generation = GoogleAIGeneration(model, candidate_selector=select_shortest)
+        chat = generation.start_new_chat()
+        response = generation.send_chat_message(chat, "Tell me a story.", generation_config=THREE_CANDIDATES)
+
+        assert model.model.requests == 1
+        assert len(response.candidates) == 3
+        assert response.response == min(response.candidates, key=lambda candidate: candidate.token_count).text
+        assert [content.role for content in chat.history] == ["user", "model"]
+        assert chat.history[0].parts[0].text == "Tell me a story."
+        assert chat.history[1].parts[0].text == response.response
+
+        generation.send_chat_message(chat, "Tell me another one.")
+        assert len(chat.history) == 4
+
+    def test_async_chat_turn_selected_candidate(self, model):
+        """Test the asyncio SDK adds the selected candidate of a chat turn to the history."""
+        generation = AsyncGoogleAIGeneration(model, candidate_selector=select_longest)
+        chat = generation.start_new_chat()
+        response = asyncio.run(
+            generation.send_chat_message(chat, "Tell me a story.", generation_config=THREE_CANDIDATES)
+        )
+
+        assert model.model.requests == 1
+        assert response.response == max(response.candidates, key=lambda candidate: candidate.token_count).text
+        assert chat.history[1].parts[0].text == response.response
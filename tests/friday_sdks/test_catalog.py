@@ -0,0 +1,85 @@
+"""Test Friday SDK model catalog."""
+
+# Standard Library
+import time
+import threading
+
+# Third Party Library
+import pytest
+import google.generativeai as genai
+from google.generativeai.types import Model
+
+# Project Library
+from friday.sdk.catalog import GoogleAIModelCatalog
+
+
+def make_model(name: str) -> Model:
+    """Make a model supporting content generation."""
+    return Model(
+        name=name,
+        base_model_id="",
+        version="001",
+        display_name=name,
+        description="",
+        input_token_limit=1000,
+        output_token_limit=100,
+        supported_generation_methods=["generateContent", "countTokens"],
+    )
+
+
+class TestModelCatalog:
+    """Test Friday SDK model catalog."""
+
+    @pytest.fixture
+    def list_models_calls(self, monkeypatch):
+        """Count the calls to `genai.list_models`."""
+        calls = []
+
+        def list_models():
+            calls.append(time.time())
+            return iter([make_model("models/gemini-1.5-flash")])
+
+        monkeypatch.setattr(genai, "list_models", list_models)
+        return calls
+
+    def test_missing_catalog_is_fetched_and_persisted(self, tmp_path, list_models_calls):
+        """Test a missing catalog is fetched once and served from disk afterwards."""
+        catalog_path = tmp_path / "models.json"
+
+        assert GoogleAIModelCatalog(catalog_path=catalog_path).cached_models() is None
+        assert [model.name for model in GoogleAIModelCatalog(catalog_path=catalog_path).models()] == [
+            "models/gemini-1.5-flash"
+        ]
+        assert GoogleAIModelCatalog(catalog_path=catalog_path).models()[0] == make_model("models/gemini-1.5-flash")
+        assert len(list_models_calls) == 1
+
+    def test_stale_catalog_refreshed_in_background(self, tmp_path, list_models_calls):
+        """Test a stale catalog is served while it is refreshed in the background."""
+        catalog_path = tmp_path / "models.json"
+        GoogleAIModelCatalog(catalog_path=catalog_path).refresh()
+
+        catalog = GoogleAIModelCatalog(ttl_seconds=0, catalog_path=catalog_path)
+        assert catalog.is_stale()
+        refreshed = []
+        catalog.refresh_in_background(on_refresh=refreshed.append).join()
+
+        assert len(list_models_calls) == 2
+        assert refreshed and refreshed[0][0].name == "models/gemini-1.5-flash"
+
+    def test_callbacks_chained_onto_running_refresh(self, tmp_path, monkeypatch):
+        """Test a callback registered while a refresh is running is invoked once that refresh completes."""
+        release = threading.Event()
+
+        def list_models():
+            release.wait(5.0)
+            return iter([make_model("models/gemini-1.5-flash")])
+
+        monkeypatch.setattr(genai, "list_models", list_models)
+        catalog = GoogleAIModelCatalog(catalog_path=tmp_path / "models.json")
+        refreshed = []
+        thread = catalog.refresh_in_background(on_refresh=lambda models: refreshed.append("first"))
+        assert catalog.refresh_in_background(on_refresh=lambda models: refreshed.append("second")) is None
+
+        release.set()
+        thread.join()
+        assert refreshed == ["first", "second"]
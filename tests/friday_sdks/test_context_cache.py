@@ -0,0 +1,171 @@
+"""Test Friday SDK server-side context caching against a local stand-in of the cached content API."""
+
+# Standard Library
+import uuid
+import datetime
+import threading
+
+# Third Party Library
+import pytest
+import google.generativeai as genai
+from google.generativeai import protos
+from google.generativeai.types.generation_types import GenerateContentResponse
+
+# Project Library
+from friday.sdk.model import GoogleAIModel
+from friday.sdk.generation import GoogleAIGeneration
+from friday.sdk.context_cache import GoogleAIContextCache
+
+
+def wait_for_refresh() -> None:
+    """Wait for the background refreshes of the context caches."""
+    for thread in threading.enumerate():
+        if thread.name == "friday-context-cache":
+            thread.join()
+
+
+class LocalCachedContent:
+    """Local stand-in of `google.generativeai.caching.CachedContent`."""
+
+    handles: dict = {}
+    calls: list = []
+    unavailable = False
+
+    def __init__(self, model: str, ttl: datetime.timedelta) -> None:
+        self.name = f"cachedContents/{uuid.uuid4().hex}"
+        self.model = f"models/{model}"
+        self.expire_time = datetime.datetime.now(datetime.timezone.utc) + ttl
+
+    @classmethod
+    def create(cls, model, *, display_name=None, system_instruction=None, contents=None, ttl=None):
+        cls.calls.append("create")
+        if cls.unavailable:
+            raise RuntimeError("Cached content is too small.")
+        handle = cls.handles[model] = cls(model, ttl)
+        return handle
+
+    @classmethod
+    def get(cls, name):
+        cls.calls.append("get")
+        return next(handle for handle in cls.handles.values() if handle.name == name)
+
+    def update(self, *, ttl=None):
+        self.calls.append("update")
+        self.expire_time = datetime.datetime.now(datetime.timezone.utc) + ttl
+
+    def delete(self):
+        self.calls.append("delete")
+
+
+class TestContextCache:
+    """Test Friday SDK server-side context caching."""
+
+    @pytest.fixture(autouse=True)
+    def cached_content_api(self, monkeypatch):
+        """Replace the cached content API with the local stand-in."""
+        monkeypatch.setattr(LocalCachedContent, "handles", {})
+        monkeypatch.setattr(LocalCachedContent, "calls", [])
+        monkeypatch.setattr(LocalCachedContent, "unavailable", False)
+        monkeypatch.setattr(GoogleAIContextCache, "cached_content_api", LocalCachedContent)
+        return LocalCachedContent
+
+    @pytest.fixture
+    def state_path(self, tmp_path):
+        """Path to the persisted handle."""
+        return tmp_path / "context_cache.json"
+
+    def test_handle_created_in_background(self, state_path, cached_content_api):
+        """Test the first request falls back while the handle is created, later requests use the handle."""
+        cache = GoogleAIContextCache("gemini-1.5-flash-001", "You are Friday.", state_path=state_path)
+
+        assert cache.cached_content() is None
+        wait_for_refresh()
+        handle = cache.cached_content()
+
+        assert handle is cached_content_api.handles["gemini-1.5-flash-001"]
+        assert (cache.hits, cache.fallbacks) == (1, 1)
+        assert cached_content_api.calls == ["create"]
+
+    def test_handle_renewed_before_expiry(self, state_path, cached_content_api):
+        """Test a handle about to expire is still used while its TTL is renewed in the background."""
+        cache = GoogleAIContextCache(
+            "gemini-1.5-flash-001", "You are Friday.", ttl_seconds=60, renew_before_seconds=120, state_path=state_path
+        )
+        handle = cache.refresh()
+
+        assert cache.cached_content() is handle
+        wait_for_refresh()
+        assert cached_content_api.calls == ["create", "update"]
+
+    def test_unavailable_cache_falls_back(self, state_path, cached_content_api):
+        """Test an unavailable cache falls back to the system instruction and is not retried right away."""
+        cached_content_api.unavailable = True
+        cache = GoogleAIContextCache("gemini-1.5-flash", "You are Friday.", state_path=state_path)
+
+        assert cache.cached_content() is None
+        wait_for_refresh()
+        assert cache.cached_content() is None
+        wait_for_refresh()
+        assert cached_content_api.calls == ["create"]
+
+    def test_persisted_handle_reused(self, state_path, cached_content_api):
+        """Test a new process reuses and renews the persisted handle instead of creating a new one."""
+        handle = GoogleAIContextCache("gemini-1.5-flash-001", "You are Friday.", state_path=state_path).refresh()
+        cache = GoogleAIContextCache("gemini-1.5-flash-001", "You are Friday.", state_path=state_path)
+
+        assert cache.refresh() is handle
+        assert cached_content_api.calls == ["create", "get", "update"]
+        # Different contents get their own handle
+        other = GoogleAIContextCache("gemini-1.5-flash-001", "You are Jarvis.", state_path=state_path)
+        assert other.key != cache.key
+
+    def test_model_switches_to_cached_content(self, monkeypatch, state_path):
+        """Test the model sends the system instruction until the context cache is live."""
+        monkeypatch.setenv("GOOGLE_API_KEY", "local")
+        monkeypatch.setattr(GoogleAIModel, "_validate_model_name_lazily", lambda self: None)
+        ai_model = GoogleAIModel(
+            "gemini-1.5-flash-001", system_instruction="You are Friday.", preamble="Preamble.", context_cache=True
+        )
+        ai_model.context_cache.state_path = state_path
+
+        fallback_model = ai_model.model
+        assert fallback_model.cached_content is None
+        assert "Preamble." in repr(fallback_model)
+        wait_for_refresh()
+        handle = LocalCachedContent.handles["gemini-1.5-flash-001"]
+        assert ai_model.model.cached_content == handle.name
+        assert ai_model.model is ai_model.model
+
+    def test_chat_follows_expired_cache(self, monkeypatch, state_path):
+        """Test a live chat session falls back once the handle expires, then uses the handle created again."""
+        monkeypatch.setenv("GOOGLE_API_KEY", "local")
+        monkeypatch.setattr(GoogleAIModel, "_validate_model_name_lazily", lambda self: None)
+        sent_with = []
+
+        def generate_content(model, contents, **kwargs):
+            sent_with.append(model.cached_content)
+            candidate = protos.Candidate(
+                content=protos.Content(role="model", parts=[protos.Part(text="Hi.")]),
+                finish_reason=protos.Candidate.FinishReason.STOP,
+            )
+            return GenerateContentResponse.from_response(protos.GenerateContentResponse(candidates=[candidate]))
+
+        monkeypatch.setattr(genai.GenerativeModel, "generate_content", generate_content)
+        ai_model = GoogleAIModel("gemini-1.5-flash-001", system_instruction="You are Friday.", context_cache=True)
+        ai_model.context_cache.state_path = state_path
+        ai_generation = GoogleAIGeneration(genai_model=ai_model)
+        ai_model.model
+        wait_for_refresh()
+        handle = LocalCachedContent.handles["gemini-1.5-flash-001"]
+
+        chat = ai_generation.start_new_chat()
+        ai_generation.send_chat_message(chat=chat, message="one")
+        ai_model.context_cache.delete()
+        ai_generation.send_chat_message(chat=chat, message="two")
+        wait_for_refresh()
+        renewed = LocalCachedContent.handles["gemini-1.5-flash-001"]
+        ai_generation.send_chat_message(chat=chat, message="three")
+
+        assert renewed.name != handle.name
+        assert sent_with == [handle.name, None, renewed.name]
+        assert len(chat.history) == 6
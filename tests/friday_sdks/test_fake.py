@@ -0,0 +1,128 @@
+"""Test the deterministic local fake backend of the Friday SDKs."""
+
+# Standard Library
+import time
+import asyncio
+
+# Third Party Library
+import pytest
+from google.api_core import exceptions
+from google.generativeai import protos
+
+# Project Library
+from friday.sdk.fake import FridayFakeBackend, FridayFakeBackendError
+from friday.sdk.model import GoogleAIModel
+from friday.sdk.generation import GoogleAIGeneration
+from friday.sdk.rate_limit import FridayRetryPolicy
+from friday.sdk.async_generation import AsyncGoogleAIGeneration
+
+
+class TestFakeBackend:
+    """Test the deterministic local fake backend of the Friday SDKs."""
+
+    def test_replies_are_deterministic(self):
+        """Test the same seed and prompt give the same reply and usage, another seed gives another reply."""
+        replies = [
+            GoogleAIGeneration(GoogleAIModel(fake_backend=FridayFakeBackend(seed=seed))).generate_content("Hello")
+            for seed in (1, 1, 2)
+        ]
+
+        assert replies[0].response == replies[1].response
+        assert replies[0].response != replies[2].response
+        usage = replies[0].response_object.usage_metadata
+        assert 20 <= usage.candidates_token_count <= 60
+        assert usage.total_token_count == usage.prompt_token_count + usage.candidates_token_count
+
+    def test_max_output_tokens(self):
+        """Test the reply is truncated to the maximum output tokens."""
+        model = FridayFakeBackend(min_reply_tokens=30).model("gemini-1.5-flash")
+        response = model.generate_content("Hello", generation_config={"max_output_tokens": 5})
+
+        assert response.usage_metadata.candidates_token_count == 5
+        assert response.candidates[0].finish_reason == protos.Candidate.FinishReason.MAX_TOKENS
+
+    def test_count_tokens_includes_system_instruction(self):
+        """Test the prompt tokens account for the system instruction."""
+        model = FridayFakeBackend().model("gemini-1.5-flash", system_instruction="You are Friday.")
+
+        assert model.count_tokens("12345678").total_tokens == 2 + 4
+        assert model.generate_content("12345678").usage_metadata.prompt_token_count == 2 + 4
+
+    def test_stream_latency_profile(self):
+        """Test the streamed reply follows the time to first token and inter-token delay."""
+        backend = FridayFakeBackend(
+            ttft_seconds=0.2, inter_token_seconds=0.01, tokens_per_chunk=5, min_reply_tokens=20, max_reply_tokens=20
+        )
+        generation = GoogleAIGeneration(GoogleAIModel(fake_backend=backend))
+
+        start = time.perf_counter()
+        stream = generation.generate_content_stream("Hello")
+        arrivals = [time.perf_counter() - start for _ in stream]
+
+        assert len(arrivals) == 4
+        assert arrivals[0] >= 0.2 + 0.05
+        assert arrivals[-1] == pytest.approx(0.2 + 0.2, abs=0.06)
+        assert stream.usage_metadata.candidates_token_count == 20
+
+    def test_errors_retried(self):
+        """Test simulated server errors are raised at the configured rate and retried by the SDK."""
+        model = FridayFakeBackend(error_rate=0.5, seed=3).model("gemini-1.5-flash")
+        errors = 0
+        for _ in range(200):
+            try:
+                model.generate_content("Hello")
+            except exceptions.ServiceUnavailable:
+                errors += 1
+        assert 70 < errors < 130
+
+        backend = FridayFakeBackend(error_rate=0.3, rate_limit_rate=0.2, seed=3)
+        retry_policy = FridayRetryPolicy(max_retries=20, base_delay=0.001, max_delay=0.001)
+        generation = GoogleAIGeneration(GoogleAIModel(fake_backend=backend), retry_policy=retry_policy)
+        responses = [generation.generate_content(f"Prompt {index}") for index in range(10)]
+
+        assert all(response.response for response in responses)
+        assert retry_policy.retries > 0
+
+    def test_async_chat(self):
+        """Test the async SDK streams chat replies from the fake backend concurrently."""
+        backend = FridayFakeBackend(ttft_seconds=0.2, inter_token_seconds=0.001)
+        generation = AsyncGoogleAIGeneration(GoogleAIModel(fake_backend=backend))
+
+        async def chat(message: str) -> str:
+            chat_session = generation.start_new_chat()
+            stream = await generation.send_chat_message_stream(chat=chat_session, message=message)
+            response = await stream.resolve()
+            assert len(chat_session.history) == 2
+            return response.response
+
+        async def chats() -> list[str]:
+            return await asyncio.gather(*(chat(f"Hello {index}") for index in range(10)))
+
+        start = time.perf_counter()
+        replies = asyncio.run(chats())
+
+        assert time.perf_counter() - start < 1
+        assert len(set(replies)) == 10
+
+    def test_from_env(self, monkeypatch):
+        """Test the fake backend is configured from the environment."""
+        monkeypatch.delenv("FRIDAY_FAKE_BACKEND", raising=False)
+        assert FridayFakeBackend.from_env() is None
+
+        monkeypatch.setenv("FRIDAY_FAKE_BACKEND", "1")
+        assert FridayFakeBackend.from_env() == FridayFakeBackend()
+
+        monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+        monkeypatch.setenv("FRIDAY_FAKE_BACKEND", "ttft_seconds=0.3, error_rate=0.1,seed=7")
+        ai_model = GoogleAIModel(system_instruction="You are Friday.", context_cache=True)
+        assert ai_model.fake_backend == FridayFakeBackend(ttft_seconds=0.3, error_rate=0.1, seed=7)
+        assert ai_model.context_cache is None
+        assert ai_model.model.system_instruction == "You are Friday."
+
+    @pytest.mark.parametrize("config", ["fast", "ttft=0.3", "ttft_seconds=slow"])
+    def test_malformed_from_env(self, config, monkeypatch):
+        """Test a malformed fake backend configuration raises an error listing the settings."""
+        monkeypatch.setenv("FRIDAY_FAKE_BACKEND", config)
+
+        with pytest.raises(FridayFakeBackendError, match="ttft_seconds, inter_token_seconds"):
+            FridayFakeBackend.from_env()
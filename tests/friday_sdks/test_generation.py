@@ -1,9 +1,17 @@
-"""Test Friday SDKs for generation."""
+"""
+Test Friday SDKs for generation.
+
+The tests run offline against the fake backend. Set `FRIDAY_LIVE_TESTS=1` to run them against Google Generative AI.
+"""
+
+# Standard Library
+import os
 
 # Third Party Library
 import pytest
 
 # Project Library
+from friday.sdk.fake import FridayFakeBackend
 from friday.sdk.model import GoogleAIModel
 from friday.sdk.generation import GoogleAIGeneration
 
@@ -13,7 +21,8 @@ class TestGeneration:
 
     def setup_class(self):
         """Set up the test class."""
-        self.model = GoogleAIModel()
+        live = os.getenv("FRIDAY_LIVE_TESTS", "").lower() in ("1", "true", "yes")
+        self.model = GoogleAIModel(fake_backend=None if live else FridayFakeBackend())
         self.ai_generation = GoogleAIGeneration(genai_model=self.model)
 
     def test_generation_config(self):
@@ -52,3 +61,27 @@ class TestGeneration:
         response_token_count = response.response_object.usage_metadata.candidates_token_count
 
         assert response_token_count <= 10
+
+    @pytest.mark.parametrize(
+        "prompt",
+        [
+            "Count from 1 to 20.",
+        ],
+    )
+    def test_generate_content_stream(self, prompt):
+        """Test streamed generate content."""
+        stream = self.ai_generation.generate_content_stream(prompt=prompt)
+        chunks = [chunk.response for chunk in stream]
+
+        assert stream.done
+        assert "".join(chunks) == stream.response
+        assert stream.usage_metadata.total_token_count > 0
+
+    def test_send_chat_message_stream(self):
+        """Test streamed chat message keeps the chat history."""
+        chat = self.ai_generation.start_new_chat()
+        stream = self.ai_generation.send_chat_message_stream(chat=chat, message="There are 5 apples in a basket.")
+        response = stream.resolve()
+
+        assert response.response
+        assert len(chat.history) == 2
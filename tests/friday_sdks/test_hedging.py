@@ -0,0 +1,121 @@
+"""Test Friday hedged requests."""
+
+# Standard Library
+import time
+import asyncio
+
+# Third Party Library
+import pytest
+
+# Project Library
+from friday.sdk.fake import FridayFakeBackend
+from friday.sdk.model import GoogleAIModel
+from friday.sdk.metrics import FridayMetrics
+from friday.sdk.hedging import FridayHedgingPolicy
+from friday.sdk.generation import GoogleAIGeneration
+from friday.sdk.async_generation import AsyncGoogleAIGeneration
+
+
+def slow(seconds: float, result: str):
+    """Call returning a result after a delay."""
+    return lambda: time.sleep(seconds) or result
+
+
+def fail(seconds: float, message: str):
+    """Call raising an error after a delay."""
+
+    def call():
+        time.sleep(seconds)
+        raise RuntimeError(message)
+
+    return call
+
+
+class TestHedging:
+    """Test Friday hedged requests."""
+
+    @pytest.fixture
+    def metrics(self, tmp_path):
+        """Metrics isolated from the process-wide registry."""
+        return FridayMetrics(tmp_path / "metrics.json")
+
+    def test_slow_call_hedged_within_budget(self):
+        """Test a slow call is hedged and the hedge wins, until the hedge budget is exhausted."""
+        policy = FridayHedgingPolicy(initial_delay=0.05, max_extra_load=0.0, burst=1.0)
+
+        assert policy.call("op", slow(0.0, "primary"), slow(0.0, "hedge")) == ("primary", None)
+        start = time.perf_counter()
+        assert policy.call("op", slow(1.0, "primary"), slow(0.0, "hedge")) == ("hedge", True)
+        assert time.perf_counter() - start < 0.5
+        assert policy.call("op", slow(0.2, "primary"), slow(0.0, "hedge")) == ("primary", None)
+
+        stats = policy.stats()
+        assert (stats["calls"], stats["hedges"], stats["hedge_wins"], stats["budget_exhausted"]) == (3, 1, 1, 1)
+        assert stats["win_rate"] == 1.0
+
+    def test_deadline_follows_percentile(self):
+        """Test the deadline is the percentile of the recent latencies once enough are observed."""
+        policy = FridayHedgingPolicy(quantile=0.9, initial_delay=2.0, min_samples=10)
+        for latency in range(1, 10):
+            policy.observe("op", latency / 10)
+        assert policy.delay("op") == 2.0
+
+        policy.observe("op", 1.0)
+        assert policy.delay("op") == 1.0
+        assert policy.delay("other") == 2.0
+
+    def test_errors(self):
+        """Test a call failing once hedged falls back to its hedge, and its error is raised when both fail."""
+        policy = FridayHedgingPolicy(initial_delay=0.05, burst=2.0)
+        assert policy.call("op", fail(0.1, "primary"), slow(0.2, "hedge")) == ("hedge", True)
+
+        with pytest.raises(RuntimeError, match="primary"):
+            policy.call("op", fail(0.1, "primary"), fail(0.0, "hedge"))
+        with pytest.raises(RuntimeError, match="primary"):
+            policy.call("op", fail(0.0, "primary"), slow(0.0, "hedge"))
+
+    def test_chat_hedged_to_fallback_model(self, metrics):
+        """Test a slow chat turn is answered by the fallback model, and the history holds a single turn."""
+        primary = GoogleAIModel(fake_backend=FridayFakeBackend(ttft_seconds=1.0))
+        fallback = GoogleAIModel(model_name="gemini-1.5-flash-8b", fake_backend=FridayFakeBackend())
+        policy = FridayHedgingPolicy(fallback_model=fallback, initial_delay=0.05)
+        generation = GoogleAIGeneration(primary, metrics=metrics, hedging=policy)
+        chat = generation.start_new_chat()
+
+        start = time.perf_counter()
+        response = generation.send_chat_message(chat, "Hello Friday!")
+        assert time.perf_counter() - start < 0.5
+        assert [content.role for content in chat.history] == ["user", "model"]
+        assert chat.history[1].parts[0].text == response.response
+
+        stream = generation.send_chat_message_stream(chat, "How are you?")
+        assert len(chat.history) == 2
+        stream.resolve()
+        assert len(chat.history) == 4
+        assert chat.history[3].parts[0].text == stream.response
+
+        series = [data for data in metrics.snapshot()["series"] if data["model"] == "gemini-1.5-flash-8b"]
+        assert sum(data["hedges"] for data in series) == sum(data["hedge_wins"] for data in series) == 2
+        assert fallback.model.requests == 2
+
+    def test_async_chat_hedged_to_fallback_model(self, metrics):
+        """Test a slow async chat turn is answered by the fallback model, and the history holds a single turn."""
+        primary = GoogleAIModel(fake_backend=FridayFakeBackend(ttft_seconds=1.0))
+        fallback = GoogleAIModel(model_name="gemini-1.5-flash-8b", fake_backend=FridayFakeBackend())
+        policy = FridayHedgingPolicy(fallback_model=fallback, initial_delay=0.05)
+        generation = AsyncGoogleAIGeneration(primary, metrics=metrics, hedging=policy)
+        chat = generation.start_new_chat()
+
+        async def run() -> str:
+            response = await generation.send_chat_message(chat, "Hello Friday!")
+            stream = await generation.send_chat_message_stream(chat, "How are you?")
+            await stream.resolve()
+            return response.response
+
+        start = time.perf_counter()
+        response = asyncio.run(run())
+        assert time.perf_counter() - start < 0.5
+        assert [content.role for content in chat.history] == ["user", "model"] * 2
+        assert chat.history[1].parts[0].text == response
+        assert fallback.model.requests == 2
+        assert policy.stats()["hedge_wins"] == 2
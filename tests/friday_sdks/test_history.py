@@ -0,0 +1,128 @@
+"""Test Friday SDK chat history management against a local stub backend."""
+
+# Third Party Library
+import pytest
+from google.generativeai import protos
+from google.generativeai.generative_models import ChatSession
+from google.generativeai.types.generation_types import GenerateContentResponse
+
+# Project Library
+from friday.sdk.generation import GoogleAIGeneration
+from friday.sdk.history import FridayHistoryManager
+
+
+def count_words(contents) -> int:
+    """Count the words of a prompt or a list of contents, used as the token count of the stub backend."""
+    if isinstance(contents, str):
+        return len(contents.split())
+    return sum(len(part.text.split()) for content in contents for part in content.parts)
+
+
+class StubModel:
+    """Local stub of the GenerativeModel API which replies with a fixed number of words."""
+
+    model_name = "models/stub"
+
+    def __init__(self) -> None:
+        self.prompts = []
+
+    def generate_content(self, contents, *, stream=False, **kwargs) -> GenerateContentResponse:
+        self.prompts.append(contents)
+        text = "summary" if isinstance(contents, str) else "ok " * 10
+        prompt_tokens = count_words(contents)
+        return GenerateContentResponse.from_response(
+            protos.GenerateContentResponse(
+                candidates=[
+                    protos.Candidate(
+                        content=protos.Content(role="model", parts=[protos.Part(text=text.strip())]),
+                        finish_reason=protos.Candidate.FinishReason.STOP,
+                    )
+                ],
+                usage_metadata=protos.GenerateContentResponse.UsageMetadata(
+                    prompt_token_count=prompt_tokens,
+                    candidates_token_count=count_words(text),
+                    total_token_count=prompt_tokens + count_words(text),
+                ),
+            )
+        )
+
+    def start_chat(self, history=None) -> ChatSession:
+        return ChatSession(model=self, history=history)
+
+    def _get_tools_lib(self, tools):
+        return None
+
+
+class StubGoogleAIModel:
+    """Local stub of GoogleAIModel exposing the stub backend as `model`."""
+
+    model_name = "stub"
+    system_instruction = None
+
+    def __init__(self) -> None:
+        self.model = StubModel()
+
+
+class TestHistoryManager:
+    """Test Friday SDK chat history management."""
+
+    @pytest.fixture
+    def ai_model(self):
+        """Stub Google AI model."""
+        return StubGoogleAIModel()
+
+    @pytest.fixture
+    def generation(self, ai_model):
+        """Generation SDK on the stub backend."""
+        return GoogleAIGeneration(genai_model=ai_model)
+
+    def test_history_within_budget_is_kept(self, generation):
+        """Test the history is kept verbatim within the token budget."""
+        manager = FridayHistoryManager(generation, token_budget=1000, keep_last_turns=2, token_counter=count_words)
+        for turn in range(5):
+            manager.send_message(f"message {turn}")
+
+        assert len(manager.chat.history) == 10
+        assert manager.stats.summaries == 0
+        assert manager.stats.tokens_saved == 0
+
+    def test_history_over_budget_is_summarized(self, ai_model, generation):
+        """Test older turns are folded into the rolling summary and the history stays bounded."""
+        manager = FridayHistoryManager(generation, token_budget=50, keep_last_turns=2, token_counter=count_words)
+        for turn in range(10):
+            manager.send_message(f"message number {turn}")
+
+        history = manager.chat.history
+        assert manager.summary == "summary"
+        assert manager.stats.summaries > 0
+        assert manager.stats.turns == 10
+        assert manager.stats.tokens_saved > 0
+        assert len(history) == 2 + 2 * 2
+        assert history[0].parts[0].text.endswith("summary")
+        assert history[-2].parts[0].text == "message number 9"
+        # The last message was sent with the summary and the recent turns only
+        assert count_words(ai_model.model.prompts[-2]) < 60
+
+    def test_seeded_history_over_budget_is_summarized_first(self, ai_model, generation):
+        """Test a history outgrowing the budget before any response is summarized before the message is sent."""
+        history = []
+        for turn in range(8):
+            history.append(protos.Content(role="user", parts=[protos.Part(text=f"long message {turn} " * 20)]))
+            history.append(protos.Content(role="model", parts=[protos.Part(text=f"long reply {turn} " * 20)]))
+        chat = generation.start_new_chat(history=history)
+        manager = FridayHistoryManager(generation, chat=chat, token_budget=200, keep_last_turns=1)
+        manager.send_message("hello")
+
+        assert manager.stats.summaries == 1
+        assert isinstance(ai_model.model.prompts[0], str)
+        assert len(ai_model.model.prompts[1]) == 2 + 2 + 1
+
+    def test_stream_is_summarized_once_exhausted(self, generation):
+        """Test streamed turns are accounted once the stream is exhausted."""
+        manager = FridayHistoryManager(generation, token_budget=50, keep_last_turns=1, token_counter=count_words)
+        for turn in range(6):
+            manager.send_message_stream(f"message number {turn}").resolve()
+
+        assert manager.stats.turns == 6
+        assert manager.stats.summaries > 0
+        assert len(manager.chat.history) == 2 + 2
@@ -0,0 +1,134 @@
+"""Test Friday retrieval-augmented long-term memory."""
+
+# Third Party Library
+import pytest
+
+# Project Library
+from friday.sdk import memory as friday_memory
+from friday.sdk.fake import FridayFakeBackend
+from friday.sdk.model import GoogleAIModel
+from friday.sdk.search import FridaySearchIndex
+from friday.sdk.history import FridayHistoryManager
+from friday.sdk.memory import FridayMemory, chunk_text
+from friday.sdk.sessions import FridaySessionStore
+from friday.sdk.generation import GoogleAIGeneration
+
+# Local Library
+from tests.friday_sdks.test_semantic_cache import CountingEmbedder
+
+
+FILLER = [
+    "Tell me a fun fact about the ocean.",
+    "How do airplanes stay in the air?",
+    "Suggest a name for a bakery.",
+    "What is the capital of Australia?",
+    "Explain recursion to a child.",
+]
+
+
+class TestMemory:
+    """Test Friday retrieval-augmented long-term memory."""
+
+    @pytest.fixture(params=["numpy", "python"], autouse=True)
+    def backend(self, request, monkeypatch):
+        """Search the vectors with NumPy, when installed, and in plain Python."""
+        if request.param == "numpy" and friday_memory.np is None:
+            pytest.skip("NumPy is not installed.")
+        if request.param == "python":
+            monkeypatch.setattr(friday_memory, "np", None)
+        return request.param
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Session store in a temporary directory."""
+        return FridaySessionStore(root=tmp_path / "sessions")
+
+    @pytest.fixture
+    def index(self, store, tmp_path):
+        """Search index of the session store, indexing the turns as they are appended."""
+        index = FridaySearchIndex(store, path=tmp_path / "search.sqlite3")
+        store.on_append = index.index_session
+        return index
+
+    @pytest.fixture
+    def embedder(self):
+        """Local embedder counting the embedded texts."""
+        return CountingEmbedder()
+
+    @pytest.fixture
+    def memory(self, index, embedder, tmp_path):
+        """Memory of the session store."""
+        return FridayMemory(index, embedder=embedder, path=tmp_path / "memory")
+
+    def test_chunk_text(self):
+        """Test long texts are split at whitespace into substrings of bounded size."""
+        text = "user: " + " ".join(f"word{index}" for index in range(100))
+        chunks = chunk_text(text, max_chars=50)
+
+        assert all(len(chunk) <= 50 and chunk in text for chunk in chunks)
+        assert " ".join(chunks) == text
+
+    def test_incremental_and_persistent_index(self, store, memory, embedder, tmp_path):
+        """Test only the new turns are embedded, and the index is reloaded from disk without embedding again."""
+        session = store.session(fsync=False)
+        session.append_turn(user="My cat is called Tigger.", model="Tigger is a lovely name for a cat.")
+        session.append_turn(user="I work as a nurse.", model="Nursing is a caring profession.")
+
+        assert memory.update() == 2
+        assert memory.update() == 0
+        session.append_turn(user="I live in Lisbon.", model="Lisbon is a sunny city.")
+        assert memory.update() == 1
+        assert len(embedder.texts) == 3
+
+        reloaded = FridayMemory(memory.search_index, embedder=embedder, path=tmp_path / "memory")
+        assert reloaded.chunks == 3
+        assert reloaded.retrieve("What is my cat called?", top_k=1)[0].text.startswith("user: My cat is called Tigger.")
+        assert len(embedder.texts) == 4
+
+    def test_interrupted_update_is_recovered(self, store, memory, embedder, tmp_path):
+        """Test chunks written without their vectors are dropped on load and embedded again."""
+        session = store.session(fsync=False)
+        session.append_turn(user="My cat is called Tigger.", model="Nice name.")
+        session.append_turn(user="I live in Lisbon.", model="Sunny city.")
+        memory.update()
+        vectors_path = tmp_path / "memory" / "vectors.f32"
+        with open(vectors_path, "r+b") as file:
+            file.truncate(vectors_path.stat().st_size // 2)
+
+        reloaded = FridayMemory(memory.search_index, embedder=embedder, path=tmp_path / "memory")
+        assert reloaded.chunks == 1
+        assert reloaded.update() == 1
+        assert [hit.turn for hit in reloaded.retrieve("Lisbon", top_k=1)] == [2]
+
+    def test_prompt_size_bounded(self, store, memory):
+        """Test a fact from many turns ago is sent with the message, while the prompt size stays bounded."""
+        generation = GoogleAIGeneration(GoogleAIModel(fake_backend=FridayFakeBackend()))
+        manager = FridayHistoryManager(
+            generation, session=store.session(fsync=False), keep_last_turns=2, memory=memory, memory_top_k=2
+        )
+        manager.send_message("Remember that my cat is called Tigger.")
+        prompt_tokens = [
+            manager.send_message(FILLER[turn % len(FILLER)]).response_object.usage_metadata.prompt_token_count
+            for turn in range(40)
+        ]
+
+        assert len(manager.chat.history) == 4
+        assert manager.chat.history[-2].parts[0].text == FILLER[39 % len(FILLER)]
+        assert "Tigger" in manager._with_memory("What is my cat called?")
+        assert max(prompt_tokens[20:]) <= max(prompt_tokens[:10]) * 1.5
+
+    def test_resumed_summary_kept_with_memory(self, store, memory):
+        """Test the summary of a resumed session stays at the start of the history trimmed by the memory."""
+        session = store.session(fsync=False)
+        for turn in range(3):
+            session.append_turn(user=FILLER[turn], model="Sure.")
+        session.append_summary("The user's cat is called Tigger.", keep_last_turns=1)
+        generation = GoogleAIGeneration(GoogleAIModel(fake_backend=FridayFakeBackend()))
+        manager = FridayHistoryManager.resume(generation, session, keep_last_turns=1, memory=memory)
+        for turn in range(3, 5):
+            manager.send_message(FILLER[turn])
+
+        history = manager.chat.history
+        assert len(history) == 2 + 2
+        assert history[0].parts[0].text.endswith("The user's cat is called Tigger.")
+        assert history[-2].parts[0].text == FILLER[4]
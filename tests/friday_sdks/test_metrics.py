@@ -0,0 +1,142 @@
+"""Test Friday SDK per-request latency and token metrics against the fake backend."""
+
+# Standard Library
+import asyncio
+import threading
+
+# Third Party Library
+import pytest
+from google.api_core import exceptions
+
+# Project Library
+from friday.sdk.fake import FridayFakeBackend
+from friday.sdk.model import GoogleAIModel
+from friday.sdk.metrics import FridayHistogram, FridayMetrics
+from friday.sdk.generation import GoogleAIGeneration
+from friday.sdk.rate_limit import FridayRetryPolicy
+from friday.sdk.async_generation import AsyncGoogleAIGeneration
+
+
+def series(metrics: FridayMetrics, operation: str) -> dict:
+    """Return the series of an operation from a metrics snapshot."""
+    return next(data for data in metrics.snapshot()["series"] if data["operation"] == operation)
+
+
+def fail(error: Exception) -> None:
+    """Raise an error from a call."""
+    raise error
+
+
+class TestMetrics:
+    """Test Friday SDK per-request latency and token metrics."""
+
+    @pytest.fixture
+    def metrics(self, tmp_path):
+        """Metrics persisted under a temporary directory."""
+        return FridayMetrics(tmp_path / "metrics.json")
+
+    def test_histogram_quantiles(self):
+        """Test quantiles are interpolated within their bucket."""
+        histogram = FridayHistogram((1, 2, 4))
+        for value in (0.5, 1.5, 1.5, 3, 10):
+            histogram.observe(value)
+
+        assert histogram.counts == [1, 2, 1, 1]
+        assert histogram.quantile(0.5) == pytest.approx(1.75)
+        assert histogram.quantile(0.99) == 4
+        assert FridayHistogram((1,)).quantile(0.5) is None
+
+    def test_calls_recorded(self, metrics):
+        """Test wall time, time to first token, tokens and tokens per second are recorded per operation."""
+        backend = FridayFakeBackend(ttft_seconds=0.1, inter_token_seconds=0.001)
+        generation = GoogleAIGeneration(GoogleAIModel(fake_backend=backend), metrics=metrics)
+
+        response = generation.generate_content("Hello")
+        generation.generate_content_stream("Hello").resolve()
+
+        data = series(metrics, "generate_content")
+        usage = response.response_object.usage_metadata
+        assert data["model"] == "gemini-1.5-flash"
+        assert data["requests"] == 1
+        assert data["histograms"]["total_tokens"]["sum"] == usage.total_token_count
+        assert data["histograms"]["request_duration_seconds"]["sum"] >= 0.1
+        assert data["histograms"]["time_to_first_token_seconds"]["count"] == 0
+        assert data["histograms"]["output_tokens_per_second"]["count"] == 1
+
+        stream = series(metrics, "generate_content_stream")["histograms"]
+        assert stream["time_to_first_token_seconds"]["sum"] == pytest.approx(0.1 + 0.004, abs=0.05)
+        assert stream["request_duration_seconds"]["sum"] > stream["time_to_first_token_seconds"]["sum"]
+        assert stream["candidates_tokens"]["sum"] == usage.candidates_token_count
+
+    def test_errors_and_async_recorded(self, metrics):
+        """Test failed calls are counted by error type, and the async SDK records its calls."""
+        backend = FridayFakeBackend(error_rate=1.0)
+        retry_policy = FridayRetryPolicy(max_retries=0)
+        generation = GoogleAIGeneration(GoogleAIModel(fake_backend=backend), retry_policy=retry_policy, metrics=metrics)
+        with pytest.raises(exceptions.ServiceUnavailable):
+            generation.send_chat_message(generation.start_new_chat(), "Hello")
+
+        assert series(metrics, "send_chat_message")["errors"] == {"ServiceUnavailable": 1}
+
+        async_generation = AsyncGoogleAIGeneration(GoogleAIModel(fake_backend=FridayFakeBackend()), metrics=metrics)
+        asyncio.run(async_generation.send_chat_message(async_generation.start_new_chat(), "Hello"))
+        assert series(metrics, "send_chat_message")["requests"] == 2
+
+    def test_prometheus_export(self, metrics):
+        """Test the Prometheus export has cumulative buckets, sums and counts per label pair."""
+        metrics.record("generate_content", "models/gemini-1.5-flash", wall_seconds=0.2)
+        metrics.record("generate_content", "models/gemini-1.5-flash", wall_seconds=3, error=TimeoutError())
+        text = metrics.to_prometheus()
+
+        labels = 'operation="generate_content",model="gemini-1.5-flash"'
+        assert f"friday_requests_total{{{labels}}} 2" in text
+        assert f'friday_errors_total{{{labels},error="TimeoutError"}} 1' in text
+        assert f'friday_request_duration_seconds_bucket{{{labels},le="0.25"}} 1' in text
+        assert f'friday_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+        assert f"friday_request_duration_seconds_sum{{{labels}}} 3.2" in text
+        assert "# TYPE friday_time_to_first_token_seconds histogram" in text
+
+    def test_saved_metrics_merged(self, metrics):
+        """Test saved metrics are merged into the persisted metrics without being counted twice."""
+        metrics.record("generate_content", "gemini-1.5-flash", wall_seconds=0.2)
+        metrics.save()
+        metrics.save()
+        metrics.record("generate_content", "gemini-1.5-flash", wall_seconds=0.4)
+        metrics.save()
+
+        persisted = series(metrics.load(), "generate_content")
+        assert persisted["requests"] == 2
+        assert persisted["histograms"]["request_duration_seconds"]["sum"] == pytest.approx(0.6)
+        assert metrics.snapshot() == {"series": []}
+
+    def test_failed_save_keeps_metrics(self, metrics, monkeypatch):
+        """Test metrics are only cleared once saved, so that a failed save does not lose them."""
+        metrics.record("generate_content", "gemini-1.5-flash", wall_seconds=0.2)
+        monkeypatch.setattr("friday.sdk.metrics.os.replace", lambda *args: fail(OSError("Disk full.")))
+        with pytest.raises(OSError):
+            metrics.save()
+        assert series(metrics, "generate_content")["requests"] == 1
+
+        monkeypatch.undo()
+        metrics.save()
+        assert series(metrics.load(), "generate_content")["requests"] == 1
+        assert metrics.snapshot() == {"series": []}
+
+    def test_concurrent_saves_merged(self, tmp_path):
+        """Test metrics saved at the same time by several registries are all merged."""
+        path = tmp_path / "metrics.json"
+
+        def save() -> None:
+            metrics = FridayMetrics(path)
+            for _ in range(5):
+                metrics.record("generate_content", "gemini-1.5-flash", wall_seconds=0.1)
+                metrics.save()
+
+        threads = [threading.Thread(target=save) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert series(FridayMetrics(path).load(), "generate_content")["requests"] == 40
+        assert sorted(file.name for file in tmp_path.iterdir()) == ["metrics.json", "metrics.json.lock"]
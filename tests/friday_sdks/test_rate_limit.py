@@ -0,0 +1,148 @@
+"""Test Friday SDK client-side rate limiting and retries."""
+
+# Standard Library
+from types import SimpleNamespace
+
+# Third Party Library
+import pytest
+from google.api_core import exceptions
+from google.protobuf.duration_pb2 import Duration
+
+# Project Library
+from friday.sdk.generation import GoogleAIGeneration
+from friday.sdk.rate_limit import FridayRateLimiter, FridayRetryPolicy, retry_after
+
+# Local Library
+from tests.friday_sdks.test_history import StubGoogleAIModel, StubModel
+
+
+def rate_limit_error(seconds: float) -> exceptions.TooManyRequests:
+    """Make a rate limit error requesting a retry delay."""
+    retry_info = SimpleNamespace(retry_delay=Duration(seconds=int(seconds), nanos=int(seconds % 1 * 1e9)))
+    return exceptions.TooManyRequests("Quota exceeded.", details=[retry_info])
+
+
+def fail(error: Exception) -> None:
+    """Raise an error from a call."""
+    raise error
+
+
+class FlakyStubModel(StubModel):
+    """Stub backend which fails with the given errors before succeeding."""
+
+    def __init__(self, errors: list[Exception]) -> None:
+        super().__init__()
+        self.errors = errors
+
+    def generate_content(self, contents, *, stream=False, **kwargs):
+        if self.errors:
+            raise self.errors.pop(0)
+        return super().generate_content(contents, stream=stream, **kwargs)
+
+
+class TestRateLimit:
+    """Test Friday SDK client-side rate limiting and retries."""
+
+    def test_requests_per_minute(self):
+        """Test requests are throttled once the requests per minute are spent."""
+        limiter = FridayRateLimiter("stub", requests_per_minute=60, tokens_per_minute=1_000_000)
+        delays = [limiter.reserve(tokens=0) for _ in range(62)]
+
+        assert delays[:60] == [0] * 60
+        assert delays[60] == pytest.approx(1, abs=0.05)
+        assert delays[61] == pytest.approx(2, abs=0.05)
+        assert limiter.stats()["throttled_requests"] == 2
+        assert limiter.stats()["throttled_seconds"] == pytest.approx(3, abs=0.1)
+
+    def test_tokens_per_minute_settled_with_usage(self):
+        """Test tokens are throttled on the estimate and settled with the actual usage."""
+        limiter = FridayRateLimiter("stub", requests_per_minute=1000, tokens_per_minute=600)
+
+        assert limiter.reserve(tokens=600) == 0
+        assert limiter.reserve(tokens=10) == pytest.approx(1, abs=0.05)
+        # The first request used fewer tokens than estimated
+        limiter.settle(estimated_tokens=600, actual_tokens=100)
+        assert limiter.reserve(tokens=10) == 0
+
+    def test_shared_by_model(self, monkeypatch):
+        """Test the limiter is shared by model name and reads its quota from the environment."""
+        monkeypatch.setenv("FRIDAY_RPM", "123")
+        limiter = FridayRateLimiter.for_model("models/stub-shared")
+
+        assert limiter is FridayRateLimiter.for_model("stub-shared")
+        assert limiter.requests_per_minute == 123
+
+    def test_disabled_unless_configured(self, monkeypatch):
+        """Test client-side rate limiting is only enabled by FRIDAY_RPM or FRIDAY_TPM."""
+        monkeypatch.delenv("FRIDAY_RPM", raising=False)
+        monkeypatch.delenv("FRIDAY_TPM", raising=False)
+        assert FridayRateLimiter.from_env("stub-env") is None
+
+        monkeypatch.setenv("FRIDAY_TPM", "5000")
+        limiter = FridayRateLimiter.from_env("models/stub-env")
+        assert limiter is FridayRateLimiter.for_model("stub-env")
+        assert limiter.tokens_per_minute == 5000
+        assert limiter.requests_per_minute == 15
+
+    def test_retry_after(self):
+        """Test the retry delay is read from the error details or the Retry-After header."""
+        assert retry_after(rate_limit_error(1.5)) == 1.5
+        response = SimpleNamespace(headers={"retry-after": "3"})
+        assert retry_after(exceptions.ServiceUnavailable("Unavailable.", response=response)) == 3
+        assert retry_after(exceptions.ServiceUnavailable("Unavailable.")) is None
+
+    def test_retry_holds_back_every_caller(self):
+        """Test rate limit errors are retried after the requested delay, which holds back the other callers."""
+        limiter = FridayRateLimiter("stub", requests_per_minute=1000, tokens_per_minute=1_000_000)
+        policy = FridayRetryPolicy(base_delay=0.01)
+        errors = [rate_limit_error(0.05), exceptions.InternalServerError("Internal.")]
+
+        def call() -> str:
+            if errors:
+                raise errors.pop(0)
+            return "ok"
+
+        assert policy.call(call, rate_limiter=limiter) == "ok"
+        assert policy.retries == 2
+        assert limiter.stats()["rate_limited"] == 1
+
+        limiter.block(10)
+        assert limiter.reserve(tokens=0) == pytest.approx(10, abs=0.05)
+
+    def test_failed_attempt_tokens_refunded(self):
+        """Test the estimated tokens of a failed attempt are refunded, so that the retry is not throttled by them."""
+        limiter = FridayRateLimiter("stub", requests_per_minute=1000, tokens_per_minute=600)
+        policy = FridayRetryPolicy(base_delay=0)
+        errors = [exceptions.ServiceUnavailable("Unavailable.")]
+
+        def call() -> str:
+            if errors:
+                raise errors.pop(0)
+            return "ok"
+
+        assert policy.call(call, rate_limiter=limiter, tokens=600) == "ok"
+        assert limiter.stats()["requests"] == 2
+        assert limiter.stats()["throttled_requests"] == 0
+
+    def test_non_retryable_error_raised(self):
+        """Test other errors and exhausted retries are raised."""
+        policy = FridayRetryPolicy(max_retries=1, base_delay=0)
+
+        with pytest.raises(exceptions.InvalidArgument):
+            policy.call(lambda: fail(exceptions.InvalidArgument("Invalid.")))
+        errors = [exceptions.ServiceUnavailable("Unavailable.")] * 2
+        with pytest.raises(exceptions.ServiceUnavailable):
+            policy.call(lambda: fail(errors.pop()))
+
+    def test_generation_retries_transient_errors(self):
+        """Test the generation SDK retries transient errors and settles the reserved tokens."""
+        ai_model = StubGoogleAIModel()
+        ai_model.model = FlakyStubModel([exceptions.ServiceUnavailable("Unavailable.")])
+        limiter = FridayRateLimiter("stub", requests_per_minute=1000, tokens_per_minute=1_000_000)
+        generation = GoogleAIGeneration(
+            genai_model=ai_model, rate_limiter=limiter, retry_policy=FridayRetryPolicy(base_delay=0.01)
+        )
+
+        assert generation.generate_content("Hello there").response == "summary"
+        assert generation.retry_policy.retries == 1
+        assert limiter.stats()["requests"] == 2
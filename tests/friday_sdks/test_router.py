@@ -0,0 +1,98 @@
+"""Test Friday latency-aware model router."""
+
+# Third Party Library
+import pytest
+
+# Project Library
+from friday.sdk.fake import FridayFakeBackend
+from friday.sdk.model import GoogleAIModel
+from friday.sdk.metrics import FridayMetrics
+from friday.sdk.generation import GoogleAIGeneration
+from friday.sdk.rate_limit import FridayRateLimiter
+from friday.sdk.router import FridayModelRouter, FridayRouterError
+
+
+LONG_MESSAGE = "Please review the following design document and list its risks. " * 20
+
+
+class TestRouter:
+    """Test Friday latency-aware model router."""
+
+    @pytest.fixture
+    def model(self):
+        """Default model on the fake backend."""
+        return GoogleAIModel(fake_backend=FridayFakeBackend())
+
+    @pytest.fixture
+    def router(self, model):
+        """Router over the default models."""
+        return FridayModelRouter.default(model)
+
+    def requests(self, router):
+        """Number of requests received by the fake model of each route."""
+        return {route.model_name: route.model.model.requests for route in router.routes}
+
+    def test_classify(self, router, model):
+        """Test requests are classified by prompt size, history length and hint, never below the minimum tier."""
+        assert router.classify(prompt_tokens=10) == "fast"
+        assert router.classify(prompt_tokens=10, history_turns=10) == "balanced"
+        assert router.classify(prompt_tokens=500) == "balanced"
+        assert router.classify(prompt_tokens=10_000) == "best"
+        assert router.classify(prompt_tokens=10, hint="best") == "best"
+        assert FridayModelRouter.default(model, min_tier="balanced").classify(prompt_tokens=10) == "balanced"
+        with pytest.raises(FridayRouterError):
+            router.classify(prompt_tokens=10, hint="fastest")
+
+    def test_learned_latency(self, router, model):
+        """Test the fastest model meeting the tier is chosen from the observed timings, unlike the cheapest."""
+        assert router.route("generate_content", prompt_tokens=10).model_name == "gemini-1.5-flash-8b"
+
+        for _ in range(10):
+            router.observe("gemini-1.5-flash-8b", "generate_content", 3.0)
+        assert router.route("generate_content", prompt_tokens=10).model_name == "gemini-1.5-flash"
+        assert router.route("generate_content_stream", prompt_tokens=10).model_name == "gemini-1.5-flash-8b"
+
+        cheapest = FridayModelRouter.default(model, prefer="cheapest")
+        cheapest.observe("gemini-1.5-flash-8b", "generate_content", 3.0)
+        assert cheapest.route("generate_content", prompt_tokens=10).model_name == "gemini-1.5-flash-8b"
+
+        router.stale_seconds = 0.0
+        assert router.route("generate_content", prompt_tokens=10).model_name == "gemini-1.5-flash-8b"
+
+    def test_generation_routed(self, router, model, tmp_path):
+        """Test short questions hit the fastest model, and a chat session stays on the model of its first message."""
+        metrics = FridayMetrics(tmp_path / "metrics.json")
+        generation = GoogleAIGeneration(model, metrics=metrics, router=router)
+
+        generation.generate_content("Who are you?")
+        generation.generate_content(LONG_MESSAGE)
+        assert self.requests(router) == {"gemini-1.5-flash-8b": 1, "gemini-1.5-flash": 1, "gemini-1.5-pro": 0}
+
+        chat = generation.start_new_chat()
+        generation.send_chat_message(chat, "Hi!")
+        generation.send_chat_message(chat, LONG_MESSAGE)
+        generation.send_chat_message_stream(chat, "Thanks!").resolve()
+        assert self.requests(router)["gemini-1.5-flash-8b"] == 4
+        assert len(chat.history) == 6
+
+        other = generation.start_new_chat()
+        generation.send_chat_message(other, "Hello", hint="best")
+        assert self.requests(router)["gemini-1.5-pro"] == 1
+        assert router.stats()["gemini-1.5-pro"]["latency"]["send_chat_message"] > 0
+
+        models = {(data["operation"], data["model"]) for data in metrics.snapshot()["series"]}
+        assert ("send_chat_message", "gemini-1.5-flash-8b") in models
+
+    def test_routed_models_rate_limited_separately(self, router, model, tmp_path):
+        """Test each routed model is throttled by the rate limiter of its own quota."""
+        limiter = FridayRateLimiter(model.model_name, requests_per_minute=1000, tokens_per_minute=1_000_000)
+        routed_limiter = FridayRateLimiter.for_model("gemini-1.5-flash-8b")
+        routed_requests = routed_limiter.stats()["requests"]
+        generation = GoogleAIGeneration(
+            model, metrics=FridayMetrics(tmp_path / "metrics.json"), rate_limiter=limiter, router=router
+        )
+
+        generation.generate_content("Who are you?")
+        generation.send_chat_message(generation.start_new_chat(), LONG_MESSAGE)
+        assert routed_limiter.stats()["requests"] == routed_requests + 1
+        assert limiter.stats()["requests"] == 1
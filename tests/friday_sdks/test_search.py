@@ -0,0 +1,97 @@
+"""Test Friday SDK full-text search over persisted chat sessions."""
+
+# Standard Library
+import time
+
+# Third Party Library
+import pytest
+
+# Project Library
+from friday.sdk.sessions import FridaySessionStore
+from friday.sdk.search import FridaySearchIndex
+
+
+class TestSearch:
+    """Test Friday SDK full-text search over persisted chat sessions."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Session store in a temporary directory."""
+        return FridaySessionStore(root=tmp_path / "sessions")
+
+    @pytest.fixture
+    def index(self, store, tmp_path):
+        """Search index of the session store."""
+        index = FridaySearchIndex(store, path=tmp_path / "search.sqlite3")
+        yield index
+        index.close()
+
+    def test_only_new_turns_are_indexed(self, store, index):
+        """Test indexing reads the turns appended since the last update, and skips a partially written record."""
+        session = store.session()
+        session.append_turn(user="Where is the Eiffel Tower?", model="The Eiffel Tower is in Paris.")
+        assert index.update() == 1
+        assert index.update() == 0
+
+        session.append_turn(user="And the Colosseum?", model="The Colosseum is in Rome.")
+        with open(session.path, "a") as file:
+            file.write('{"type": "turn", "user": "Big Ben')
+        assert index.update() == 1
+        assert [hit.turn for hit in index.search("colosseum")] == [2, 2]
+        assert index.search("big ben") == []
+
+    def test_ranked_keyword_and_phrase_queries(self, store, index):
+        """Test every keyword must match, phrases match in order and hits are ranked by relevance."""
+        session = store.session()
+        session.append_turn(user="Tell me about python", model="Python is a programming language.")
+        session.append_turn(user="Python snakes?", model="Pythons are large snakes, python python python.")
+        session.append_turn(user="What is a language model?", model="A model of a language.")
+        index.update()
+
+        hits = index.search("python")
+        assert len(hits) == 4
+        assert hits[0].text == "Pythons are large snakes, python python python."
+        assert hits == sorted(hits, key=lambda hit: hit.score, reverse=True)
+        assert [hit.turn for hit in index.search('"programming language"')] == [1]
+        assert [hit.turn for hit in index.search("python language")] == [1]
+        assert "[Python]" in index.search("python", role="user")[0].snippet
+
+    def test_prefix_and_filters(self, store, index):
+        """Test a trailing * matches a prefix and the hits are filtered by session and role."""
+        first, second = store.session(), store.session()
+        first.append_turn(user="Schedule the meeting", model="Meeting scheduled.")
+        second.append_turn(user="Cancel the meeting", model="Meeting cancelled.")
+        index.update()
+
+        assert len(index.search("sched*")) == 2
+        assert {hit.session_id for hit in index.search("meeting", session_id=second.session_id)} == {
+            second.session_id
+        }
+        assert [hit.role for hit in index.search("meeting", role="model")] == ["model", "model"]
+        assert index.search('"" * ()') == []
+
+    def test_compacted_session_keeps_folded_turns(self, store, index):
+        """Test folded turns stay searchable after compaction, and the kept turns are not indexed twice."""
+        session = store.session()
+        for turn in range(4):
+            session.append_turn(user=f"question {turn}", model=f"answer {turn}", timestamp=1000.0 + turn)
+        session.append_summary("summary", keep_last_turns=1)
+        index.update()
+
+        session.compact()
+        session.append_turn(user="question 4", model="answer 4", timestamp=1004.0)
+        assert index.update() == 1
+        assert len(index.search("question", role="user", limit=100)) == 5
+
+    def test_turns_indexed_on_append(self, store, index):
+        """Test the turns are searchable as soon as they are appended, with lookups well under a millisecond."""
+        store.on_append = index.index_session
+        session = store.session(fsync=False)
+        for turn in range(200):
+            session.append_turn(user=f"message {turn} about topic{turn % 20}", model=f"reply {turn}")
+
+        assert len(index.search("topic7", limit=100)) == 10
+        started = time.perf_counter()
+        for _ in range(100):
+            index.search("topic7")
+        assert (time.perf_counter() - started) / 100 < 1e-3
@@ -0,0 +1,103 @@
+"""Test Friday SDK semantic response cache."""
+
+# Standard Library
+import time
+
+# Third Party Library
+import pytest
+
+# Project Library
+from friday.sdk import semantic_cache
+from friday.sdk.fake import FridayFakeBackend
+from friday.sdk.model import GoogleAIModel
+from friday.sdk.generation import GoogleAIGeneration
+from friday.sdk.semantic_cache import FridayHashingEmbedder, FridaySemanticCache
+
+# Local Library
+from tests.friday_sdks.test_cache import make_response
+
+
+class CountingEmbedder(FridayHashingEmbedder):
+    """Local embedder counting the embedded texts."""
+
+    def __init__(self):
+        super().__init__()
+        self.texts = []
+
+    def __call__(self, texts):
+        self.texts.extend(texts)
+        return super().__call__(texts)
+
+
+class TestSemanticCache:
+    """Test Friday SDK semantic response cache."""
+
+    @pytest.fixture(params=["numpy", "python"], autouse=True)
+    def backend(self, request, monkeypatch):
+        """Search the vectors with NumPy, when installed, and in plain Python."""
+        if request.param == "numpy" and semantic_cache.np is None:
+            pytest.skip("NumPy is not installed.")
+        if request.param == "python":
+            monkeypatch.setattr(semantic_cache, "np", None)
+        return request.param
+
+    @pytest.fixture
+    def scope(self):
+        """Scope of the cached requests."""
+        return FridaySemanticCache.make_scope("models/gemini-1.5-flash", "system", None)
+
+    def test_similar_prompts_hit(self, scope):
+        """Test a similar prompt of the same scope is served, and a different prompt or scope misses."""
+        cache = FridaySemanticCache(embedder=FridayHashingEmbedder(), threshold=0.6)
+        cache.put(scope, "Who are you?", make_response("I am Friday."))
+        cache.put(scope, "What is the weather today?", make_response("Sunny."))
+
+        assert cache.get(scope, "what are you").text == "I am Friday."
+        assert cache.get(scope, "How is the weather today?").text == "Sunny."
+        assert cache.get(scope, "Tell me a joke") is None
+        other_scope = FridaySemanticCache.make_scope("models/gemini-1.5-pro", "system", None)
+        assert cache.get(other_scope, "Who are you?") is None
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_embeddings_memoized(self, scope):
+        """Test a repeated prompt is served without embedding it again."""
+        embedder = CountingEmbedder()
+        cache = FridaySemanticCache(embedder=embedder)
+        cache.get(scope, "Who are you?")
+        cache.put(scope, "Who are you?", make_response("I am Friday."))
+        for _ in range(3):
+            assert cache.get(scope, "Who are you?").text == "I am Friday."
+
+        assert embedder.texts == ["Who are you?"]
+
+    def test_lru_and_ttl_eviction(self, scope):
+        """Test the least recently used entries are evicted beyond the maximum and entries expire after the TTL."""
+        cache = FridaySemanticCache(embedder=FridayHashingEmbedder(), max_entries=2, ttl_seconds=0.2)
+        cache.put(scope, "first prompt", make_response("1"))
+        cache.put(scope, "second prompt", make_response("2"))
+        cache.get(scope, "first prompt")
+        cache.put(scope, "third prompt", make_response("3"))
+
+        assert cache.get(scope, "second prompt") is None
+        assert cache.get(scope, "first prompt").text == "1"
+        assert cache.stats()["entries"] == 2
+
+        time.sleep(0.2)
+        assert cache.get(scope, "third prompt") is None
+        cache.put(scope, "fourth prompt", make_response("4"))
+        assert cache.stats()["entries"] == 1
+
+    def test_generation_served_from_semantic_cache(self):
+        """Test a paraphrased prompt is answered without a generation call, unless the cache is not used."""
+        model = GoogleAIModel(fake_backend=FridayFakeBackend())
+        generation = GoogleAIGeneration(
+            model, semantic_cache=FridaySemanticCache(embedder=FridayHashingEmbedder(), threshold=0.6)
+        )
+        response = generation.generate_content("Who are you?", use_cache=True)
+        requests = model.model.requests
+
+        assert generation.generate_content("who are you", use_cache=True).response == response.response
+        assert "".join(chunk.response for chunk in generation.generate_content_stream("what are you", use_cache=True))
+        assert model.model.requests == requests
+        assert generation.generate_content("who are you", use_cache=False).response
+        assert model.model.requests == requests + 1
@@ -0,0 +1,105 @@
+"""Test Friday SDK persistent chat sessions."""
+
+# Third Party Library
+import pytest
+
+# Project Library
+from friday.sdk.generation import GoogleAIGeneration
+from friday.sdk.history import FridayHistoryManager
+from friday.sdk.sessions import FridaySessionError, FridaySessionStore
+
+# Local Library
+from tests.friday_sdks.test_history import StubGoogleAIModel, count_words
+
+
+class TestSessions:
+    """Test Friday SDK persistent chat sessions."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Session store in a temporary directory."""
+        return FridaySessionStore(root=tmp_path)
+
+    @pytest.fixture
+    def generation(self):
+        """Generation SDK on the stub backend."""
+        return GoogleAIGeneration(genai_model=StubGoogleAIModel())
+
+    def test_turns_are_replayed(self, store):
+        """Test appended turns are replayed in order."""
+        session = store.session()
+        for turn in range(3):
+            session.append_turn(user=f"message {turn}", model=f"response {turn}")
+        session.close()
+
+        session_log = store.session(session.session_id).load()
+        assert session_log.turns == [(f"message {turn}", f"response {turn}") for turn in range(3)]
+        assert session_log.total_turns == 3
+        assert session_log.summary == ""
+
+    def test_partial_record_is_ignored(self, store):
+        """Test a partially written last record is ignored on replay and terminated on the next append."""
+        session = store.session()
+        session.append_turn(user="message", model="response")
+        session.close()
+        with open(session.path, "a") as file:
+            file.write('{"type": "turn", "user": "lost')
+
+        assert store.session(session.session_id).load().turns == [("message", "response")]
+
+        session.append_turn(user="message 2", model="response 2")
+        assert session.load().turns == [("message", "response"), ("message 2", "response 2")]
+
+    def test_summary_is_replayed_and_compacted(self, store):
+        """Test a summary drops the folded turns on replay, and compaction keeps the replayed session unchanged."""
+        session = store.session()
+        for turn in range(4):
+            session.append_turn(user=f"message {turn}", model=f"response {turn}")
+        session.append_summary("summary", keep_last_turns=1)
+        session.append_turn(user="message 4", model="response 4")
+
+        session_log = session.load()
+        assert session_log.summary == "summary"
+        assert session_log.turns == [("message 3", "response 3"), ("message 4", "response 4")]
+        assert session_log.total_turns == 5
+
+        session.compact()
+        assert len(list(session.records())) == 3
+        assert session.load() == session_log
+
+        # The folded turns are still counted once compacted again
+        session.append_summary("summary 2", keep_last_turns=1)
+        session.compact()
+        assert session.load().turns == [("message 4", "response 4")]
+        assert session.load().total_turns == 5
+
+    def test_list_and_latest_sessions(self, store):
+        """Test sessions are listed oldest first, and invalid identifiers are rejected."""
+        assert store.latest_session_id() is None
+        for session_id in ("20240101-000000-a", "20240102-000000-b"):
+            store.session(session_id).append_turn(user="message", model="response")
+
+        assert store.list_sessions() == ["20240101-000000-a", "20240102-000000-b"]
+        assert store.latest_session_id() == "20240102-000000-b"
+        with pytest.raises(FridaySessionError):
+            store.session("../escape")
+
+    def test_history_manager_resume(self, store, generation):
+        """Test a managed chat session is persisted and resumed with its summary and recent turns."""
+        session = store.session()
+        manager = FridayHistoryManager(
+            generation, token_budget=50, keep_last_turns=2, token_counter=count_words, session=session
+        )
+        for turn in range(10):
+            manager.send_message(f"message number {turn}")
+        manager.send_message_stream("message number 10").resolve()
+        session.close()
+
+        resumed = FridayHistoryManager.resume(
+            generation, store.session(session.session_id), token_budget=50, keep_last_turns=2, token_counter=count_words
+        )
+        assert resumed.summary == manager.summary
+        assert resumed.stats.turns == 11
+        assert [content.parts[0].text for content in resumed.chat.history] == [
+            content.parts[0].text for content in manager.chat.history
+        ]
@@ -0,0 +1,131 @@
+"""Test Friday SDK offline token estimation."""
+
+# Third Party Library
+import pytest
+from google.generativeai import protos
+
+# Project Library
+from friday.sdk.fake import FridayFakeBackend
+from friday.sdk.model import GoogleAIModel
+from friday.sdk.generation import GoogleAIGeneration
+from friday.sdk.tokens import MIN_ERROR_BOUND, FridayHistoryTokenCounter, FridayTokenEstimator
+
+
+def make_content(role: str, text: str) -> protos.Content:
+    """Make a chat history content."""
+    return protos.Content(role=role, parts=[protos.Part(text=text)])
+
+
+def make_usage(prompt_tokens: int, candidates_tokens: int) -> protos.GenerateContentResponse.UsageMetadata:
+    """Make usage metadata."""
+    return protos.GenerateContentResponse.UsageMetadata(
+        prompt_token_count=prompt_tokens,
+        candidates_token_count=candidates_tokens,
+        total_token_count=prompt_tokens + candidates_tokens,
+    )
+
+
+class TestTokenEstimator:
+    """Test Friday SDK offline token estimation."""
+
+    def test_uncalibrated_estimate(self):
+        """Test the uncalibrated estimate of ~4 characters per token and its bounds."""
+        estimator = FridayTokenEstimator()
+        text = "a" * 400
+
+        assert estimator.count(text) == 100
+        low, high = estimator.bounds(text)
+        assert low <= 100 <= high
+        assert (low, high) == (75, 125)
+
+    def test_remote_fallback(self):
+        """Test the remote counter is used only when asked for."""
+        estimator = FridayTokenEstimator(remote_counter=lambda text: 42)
+
+        assert estimator.count("hello world", remote=True) == 42
+        assert estimator.count("hello world") != 42
+
+    def test_calibration(self):
+        """Test the calibration fits the recorded usage metadata."""
+        estimator = FridayTokenEstimator()
+        # Simulated tokenizer: one token per word plus 7 tokens of system instruction per prompt
+        for words in range(1, 40):
+            prompt = " ".join(["word"] * words)
+            response = " ".join(["reply"] * (2 * words))
+            estimator.record(prompt, response, make_usage(prompt_tokens=words + 7, candidates_tokens=2 * words))
+
+        report = estimator.calibrate()
+
+        assert report.samples == 78
+        assert report.max_error < 0.05
+        assert estimator.count(" ".join(["word"] * 100)) == pytest.approx(100, rel=0.05)
+        assert estimator.error_bound == max(report.max_error, MIN_ERROR_BOUND)
+
+    def test_degenerate_calibration_rejected(self):
+        """Test fits with too few distinct samples or negative weights are rejected and leave the estimator as is."""
+        estimator = FridayTokenEstimator()
+        for _ in range(40):
+            estimator.record("same prompt", "", make_usage(prompt_tokens=3, candidates_tokens=0))
+        assert estimator.calibrate() is None
+
+        for words in range(1, 40):
+            estimator.record(" ".join(["word"] * words), "", make_usage(prompt_tokens=100 - words, candidates_tokens=0))
+        assert estimator.calibrate() is None
+        assert estimator.weights == FridayTokenEstimator().weights
+        assert estimator.error_bound == FridayTokenEstimator().error_bound
+
+    def test_save_and_load(self, tmp_path):
+        """Test the calibration is persisted."""
+        path = tmp_path / "token_estimator.json"
+        FridayTokenEstimator(weights=(0.1, 0.5, 3.0, 7.0), error_bound=0.1).save(path)
+        estimator = FridayTokenEstimator.load(path)
+
+        assert estimator.weights == (0.1, 0.5, 3.0, 7.0)
+        assert estimator.error_bound == 0.1
+        assert FridayTokenEstimator.load(tmp_path / "missing.json").weights == FridayTokenEstimator().weights
+
+    def test_calibration_saved_periodically(self, tmp_path):
+        """Test an estimator loaded from a path calibrates and saves itself every `calibrate_every` recorded samples."""
+        path = tmp_path / "token_estimator.json"
+        estimator = FridayTokenEstimator.load(path)
+        estimator.calibrate_every = 30
+
+        def record(words: int) -> None:
+            prompt, response = " ".join(["word"] * words), " ".join(["reply"] * (2 * words))
+            estimator.record(prompt, response, make_usage(prompt_tokens=words + 7, candidates_tokens=2 * words))
+
+        for words in range(1, 15):
+            record(words)
+        assert not path.exists()
+
+        record(15)
+        assert FridayTokenEstimator.load(path).weights == estimator.weights != FridayTokenEstimator().weights
+
+    def test_default_calibration_not_saved(self):
+        """Test an estimator loaded without a path reads the default calibration but never saves to it."""
+        estimator = FridayTokenEstimator.load()
+        estimator.calibrate_every = 1
+        for words in range(1, 40):
+            estimator.record(" ".join(["word"] * words), "", make_usage(prompt_tokens=words + 7, candidates_tokens=0))
+
+        assert estimator.path is None
+        assert not FridayTokenEstimator.default_path().exists()
+
+    def test_fake_backend_calibration_not_saved(self, tmp_path):
+        """Test a calibration fitted against the fake backend is never saved."""
+        estimator = FridayTokenEstimator.load(tmp_path / "token_estimator.json")
+        GoogleAIGeneration(GoogleAIModel(fake_backend=FridayFakeBackend()), token_estimator=estimator)
+
+        assert estimator.path is None
+
+    def test_incremental_history_count(self):
+        """Test the incremental history count matches a full count, including after a rewrite."""
+        estimator = FridayTokenEstimator(weights=(0.25, 0.5, 4.0, 0.0))
+        counter = FridayHistoryTokenCounter(estimator)
+        history = []
+        for turn in range(20):
+            history.extend([make_content("user", f"question {turn} " * 3), make_content("model", f"answer {turn}")])
+            assert counter.count(history) == estimator.count(history)
+
+        history = history[-4:]
+        assert counter.count(history) == estimator.count(history)
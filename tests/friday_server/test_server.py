@@ -0,0 +1,184 @@
+"""Test Friday server against a local stub backend."""
+
+# Standard Library
+import json
+import asyncio
+
+# Third Party Library
+import pytest
+
+# Project Library
+from friday.server import FridayServer, FridaySessionRegistry
+from friday.sdk.async_generation import AsyncGoogleAIGeneration
+
+# Local Library
+from tests.friday_sdks.test_async_generation import StubGoogleAIModel
+
+
+async def request(server: FridayServer, method: str, path: str, body: dict = None, stream: bool = False):
+    """Send an HTTP request to the server and return the status, headers and body."""
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+    payload = json.dumps(body).encode() if body is not None else b""
+    headers = f"Content-Length: {len(payload)}\r\n" + ("Accept: text/event-stream\r\n" if stream else "")
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n".encode() + payload)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+
+    head, _, content = response.decode().partition("\r\n\r\n")
+    status_line, *header_lines = head.split("\r\n")
+    headers = {name.lower(): value for name, _, value in (line.partition(": ") for line in header_lines)}
+    return int(status_line.split()[1]), headers, content
+
+
+def events(content: str) -> list[tuple[str, dict]]:
+    """Parse server-sent events."""
+    parsed = []
+    for block in content.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        parsed.append((lines["event"], json.loads(lines["data"])))
+    return parsed
+
+
+class TestServer:
+    """Test Friday server."""
+
+    def serve(self, test, latency: float = 0.05, **kwargs):
+        """Run a test coroutine against a server on a free port."""
+        registry = FridaySessionRegistry(
+            AsyncGoogleAIGeneration(genai_model=StubGoogleAIModel(latency=latency)), **kwargs
+        )
+
+        async def run():
+            server = FridayServer(registry, port=0, max_in_flight=kwargs.get("max_sessions", 1000))
+            await server.start()
+            try:
+                await test(server)
+            finally:
+                await server.close()
+
+        asyncio.run(run())
+
+    def test_chat_streamed_over_sse(self):
+        """Test a reply is streamed as server-sent events and kept in the session history."""
+
+        async def test(server):
+            status, _, content = await request(server, "POST", "/sessions")
+            session_id = json.loads(content)["session_id"]
+            assert status == 201
+
+            status, headers, content = await request(
+                server, "POST", f"/sessions/{session_id}/messages", {"message": "hi there"}, stream=True
+            )
+            replies = events(content)
+            assert status == 200
+            assert headers["content-type"] == "text/event-stream"
+            assert [event for event, _ in replies] == ["chunk", "chunk", "chunk", "done"]
+            assert replies[-1][1]["response"] == "echo: hi there"
+
+            _, _, content = await request(server, "GET", f"/sessions/{session_id}/history")
+            assert [entry["text"] for entry in json.loads(content)["history"]] == ["hi there", "echo: hi there"]
+
+        self.serve(test)
+
+    def test_chat_json_reply(self):
+        """Test a reply is returned as JSON without event stream."""
+
+        async def test(server):
+            _, _, content = await request(server, "POST", "/sessions")
+            session_id = json.loads(content)["session_id"]
+            status, _, content = await request(server, "POST", f"/sessions/{session_id}/messages", {"message": "hi"})
+
+            assert status == 200
+            assert json.loads(content) == {"response": "echo: hi"}
+
+            status, headers, content = await request(server, "GET", "/metrics")
+            assert status == 200
+            assert headers["content-type"].startswith("text/plain")
+            assert 'friday_requests_total{operation="send_chat_message",model="stub"}' in content
+
+        self.serve(test)
+
+    def test_concurrent_sessions(self):
+        """Test many sessions are served concurrently from one process."""
+
+        async def test(server):
+            async def chat():
+                _, _, content = await request(server, "POST", "/sessions")
+                session_id = json.loads(content)["session_id"]
+                return await request(server, "POST", f"/sessions/{session_id}/messages", {"message": "hi"})
+
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            replies = await asyncio.gather(*(chat() for _ in range(100)))
+            assert [status for status, _, _ in replies] == [200] * 100
+            assert loop.time() - started < 100 * 0.05 / 4
+
+        self.serve(test)
+
+    def test_busy_session_and_backpressure(self):
+        """Test a busy session and a full server refuse requests with a retry delay instead of queueing."""
+
+        async def test(server):
+            _, _, content = await request(server, "POST", "/sessions")
+            session_id = json.loads(content)["session_id"]
+            path = f"/sessions/{session_id}/messages"
+
+            first = asyncio.create_task(request(server, "POST", path, {"message": "hi"}))
+            await asyncio.sleep(0.05)
+            status, headers, _ = await request(server, "POST", path, {"message": "hi"})
+            assert status == 429
+            assert headers["retry-after"] == "1"
+
+            server.max_in_flight = 1
+            _, _, content = await request(server, "POST", "/sessions")
+            other_path = f"/sessions/{json.loads(content)['session_id']}/messages"
+            status, _, _ = await request(server, "POST", other_path, {"message": "hi"})
+            assert status == 503
+
+            assert (await first)[0] == 200
+            assert server.stats()["rejected"] == 2
+
+        self.serve(test, latency=0.2)
+
+    def test_idle_sessions_evicted(self):
+        """Test idle sessions are evicted and unknown sessions are not found."""
+
+        async def test(server):
+            _, _, content = await request(server, "POST", "/sessions")
+            session_id = json.loads(content)["session_id"]
+            status, _, _ = await request(server, "POST", "/sessions")
+            assert status == 503
+
+            assert server.registry.evict_idle(idle_timeout=0) == 1
+            status, _, _ = await request(server, "GET", f"/sessions/{session_id}/history")
+            assert status == 404
+            status, _, _ = await request(server, "POST", "/sessions")
+            assert status == 201
+
+        self.serve(test, max_sessions=1)
+
+    @pytest.mark.parametrize("method, path", [("GET", "/unknown"), ("DELETE", "/sessions/unknown")])
+    def test_not_found(self, method, path):
+        """Test unknown routes and sessions are not found."""
+
+        async def test(server):
+            status, _, content = await request(server, method, path)
+            assert status == 404
+            assert "error" in json.loads(content)
+
+        self.serve(test)
+
+    @pytest.mark.parametrize("content_length", ["abc", "-1"])
+    def test_invalid_content_length(self, content_length):
+        """Test a non-numeric or negative Content-Length is a bad request."""
+
+        async def test(server):
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            writer.write(f"POST /sessions HTTP/1.1\r\nContent-Length: {content_length}\r\n\r\n".encode())
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            assert response.startswith(b"HTTP/1.1 400")
+
+        self.serve(test)
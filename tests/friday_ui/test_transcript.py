@@ -0,0 +1,112 @@
+"""Test Friday UI chat transcript view model."""
+
+# Third Party Library
+import pytest
+
+# Project Library
+from friday.sdk.sessions import FridaySessionStore
+from friday.ui.transcript import FridayTranscript, FridayTranscriptUpdate
+
+
+class ChatDisplay:
+    """Chat display keeping lines like a text widget."""
+
+    def __init__(self):
+        self.text = ""
+
+    def apply(self, update: FridayTranscriptUpdate) -> None:
+        self.text += update.text
+        self.text = "".join(self.text.splitlines(keepends=True)[update.delete_lines :])
+
+    def lines(self) -> int:
+        return self.text.count("\n")
+
+
+class TestTranscript:
+    """Test Friday UI chat transcript view model."""
+
+    @pytest.fixture
+    def session(self, tmp_path):
+        """Session log in a temporary directory."""
+        return FridaySessionStore(root=tmp_path).session(fsync=False)
+
+    def chat(self, transcript, session, display, turns, start=0):
+        """Chat a number of turns, streamed in chunks and flushed once per turn."""
+        for index in range(start, start + turns):
+            transcript.start_block()
+            transcript.append(f"User: message {index}\n")
+            transcript.append("Friday: ")
+            for chunk in ("response ", f"{index}"):
+                transcript.append(chunk)
+            transcript.append("\n\n")
+            session.append_turn(user=f"message {index}", model=f"response {index}")
+            transcript.end_block(turn=True)
+            display.apply(transcript.flush())
+
+    def test_text_batched_until_flush(self):
+        """Test text is buffered and applied in one update, and an empty flush has no update."""
+        transcript = FridayTranscript()
+        transcript.append("Friday: ")
+        transcript.append("Hello")
+        transcript.append("\n\n")
+        transcript.end_block(turn=False)
+
+        assert transcript.flush() == FridayTranscriptUpdate(text="Friday: Hello\n\n")
+        assert transcript.flush() is None
+
+    def test_lines_capped(self, session):
+        """Test the oldest blocks are deleted from the chat display beyond the maximum number of lines."""
+        transcript, display = FridayTranscript(max_lines=30, session=session), ChatDisplay()
+        transcript.append("Friday: Hi, I am Friday.\n\n")
+        transcript.end_block(turn=False)
+        self.chat(transcript, session, display, turns=1000)
+
+        assert display.lines() == transcript.lines <= 30
+        assert display.text.startswith("User: message 990\n")
+        assert display.text.endswith("Friday: response 999\n\n")
+
+    def test_older_turns_paged_in(self, session):
+        """Test the deleted turns are paged back in from the session log, a page at a time."""
+        transcript, display = FridayTranscript(max_lines=30, page_turns=4, session=session), ChatDisplay()
+        self.chat(transcript, session, display, turns=20)
+
+        page = transcript.page_older()
+        turns = [FridayTranscript.format_turn(f"message {index}", f"response {index}") for index in range(6, 10)]
+        assert page == "".join(turns)
+        display.text = page + display.text
+        assert display.lines() == transcript.lines
+
+        while transcript.page_older():
+            pass
+        assert transcript.page_older() is None
+        assert transcript.lines == 20 * 3
+
+        self.chat(transcript, session, display, turns=1, start=20)
+        assert transcript.lines <= 30
+
+    def test_block_per_request(self, session):
+        """Test the turn of a request starts a new block, so that open text is not evicted or paged with it."""
+        transcript, display = FridayTranscript(max_lines=6, page_turns=1, session=session), ChatDisplay()
+        transcript.append("Friday: Open message\n\n")
+        self.chat(transcript, session, display, turns=2)
+
+        assert display.text == "User: message 0\nFriday: response 0\n\nUser: message 1\nFriday: response 1\n\n"
+        assert display.lines() == transcript.lines
+        assert transcript.page_older() is None
+
+    def test_greeting_replaced(self):
+        """Test the greeting shown is replaced, whether it was flushed or not."""
+        transcript, display = FridayTranscript(), ChatDisplay()
+        transcript.append("Friday: Hello!\n\n")
+        transcript.end_block(turn=False)
+        display.apply(transcript.flush())
+
+        transcript.clear()
+        transcript.append("Friday: Pending\n\n")
+        transcript.clear()
+        transcript.append("Friday: I am Friday.\n\n")
+        transcript.end_block(turn=False)
+        display.apply(transcript.flush())
+
+        assert display.text == "Friday: I am Friday.\n\n"
+        assert display.lines() == transcript.lines == 2
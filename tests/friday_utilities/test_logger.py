@@ -0,0 +1,76 @@
+"""Test Friday logger registry and background logging pipeline."""
+
+# Standard Library
+import uuid
+import logging
+import threading
+
+# Third Party Library
+import pytest
+
+# Project Library
+from friday.utilities.logger import CustomLogger
+
+
+class TestLogger:
+    """Test Friday logger registry and background logging pipeline."""
+
+    @pytest.fixture
+    def name(self, monkeypatch, tmp_path):
+        """Unique logger name, logging under a temporary directory."""
+        monkeypatch.setenv("FRIDAY_LOG_DIR", str(tmp_path))
+        return f"friday-test-{uuid.uuid4().hex[:8]}"
+
+    def test_handlers_configured_once(self, name):
+        """Test creating a logger again returns the same logger without adding handlers."""
+        logger = CustomLogger(name=name)
+
+        assert CustomLogger(name=name) is logger
+        assert CustomLogger(name=name, log_level="ERROR") is logger
+        assert len(logger.handlers) == 1
+        assert not logger.propagate
+
+    def test_records_written_by_listener(self, name, tmp_path):
+        """Test records are formatted and written on the listener thread, not on the caller thread."""
+        logger = CustomLogger(name=name)
+        threads = []
+
+        class Argument:
+            def __str__(self):
+                threads.append(threading.current_thread())
+                return "argument"
+
+        logger.info("Message with %s", Argument())
+        CustomLogger.flush()
+
+        assert threads and threads[0] is not threading.current_thread()
+        assert "INFO - Message with argument" in (tmp_path / f"{name}.log").read_text()
+
+    def test_file_only_records(self, name, tmp_path, capsys):
+        """Test records logged with `console` False are written to the log file only."""
+        logger = CustomLogger(name=name)
+
+        logger.info("File only message", extra={"console": False})
+        logger.info("Console message")
+        CustomLogger.flush()
+
+        console = capsys.readouterr().err
+        assert "Console message" in console and "File only message" not in console
+        assert "File only message" in (tmp_path / f"{name}.log").read_text()
+
+    def test_configured_from_env(self, name, monkeypatch, tmp_path):
+        """Test the level and the rotation size are read from the environment."""
+        monkeypatch.setenv("FRIDAY_LOG_LEVEL", "WARNING")
+        monkeypatch.setenv("FRIDAY_LOG_MAX_BYTES", "200")
+        monkeypatch.setenv("FRIDAY_LOG_BACKUP_COUNT", "2")
+        logger = CustomLogger(name=name)
+
+        logger.info("Skipped %s", "message")
+        for index in range(10):
+            logger.warning("Warning message number %d", index)
+        CustomLogger.flush()
+
+        assert logger.level == logging.WARNING
+        log_files = sorted(path.name for path in tmp_path.iterdir())
+        assert log_files == [f"{name}.log", f"{name}.log.1", f"{name}.log.2"]
+        assert "Skipped" not in "".join(path.read_text() for path in tmp_path.iterdir())